@@ -2,6 +2,11 @@ import network
 import machine
 import time
 
+try:
+    from wifi_manager import WifiManager  # esp32-websockets/wifi_manager.py (opcional)
+except ImportError:
+    WifiManager = None
+
 # Configuración WiFi
 SSID = "motog35"        # Cambia por tu red WiFi
 PASSWORD = "12345678"   # Cambia por tu contraseña
@@ -69,16 +74,17 @@ def crear_barras_visuales(leds_encendidos):
     return barras
 
 def conectar_wifi():
-    """Conecta a la red WiFi con manejo robusto de errores"""
+    """Conecta a la red WiFi con manejo robusto de errores
+
+    Con wifi_manager.py en el ESP32 se reconecta al último AP (BSSID en caché)
+    sin escanear; si no, connect() normal. Ya no se desactiva la interfaz
+    con sleep(1)/sleep(2): solo alargaba cada reconexión"""
     try:
-        # Desactivar WiFi primero (limpia estado)
-        wlan = network.WLAN(network.STA_IF)
-        wlan.active(False)
-        time.sleep(1)
+        if WifiManager is not None:
+            return conectar_wifi_manager()
 
-        # Activar WiFi
+        wlan = network.WLAN(network.STA_IF)
         wlan.active(True)
-        time.sleep(2)
 
         # Verificar si ya está conectado
         if wlan.isconnected():
@@ -124,6 +130,29 @@ def conectar_wifi():
         print(f"Error crítico de WiFi: {e}")
         return None
 
+wifi = None
+
+def conectar_wifi_manager():
+    """Conexión con WifiManager: rápida con caché, completa si falla"""
+    global wifi
+    if wifi is None:
+        wifi = WifiManager([(SSID, PASSWORD)])
+        print("Conectando a WiFi...")
+        print(f"Red: {SSID}")
+        wifi.begin()
+    inicio = time.ticks_ms()
+    # Hasta 3 vueltas (rápida + completa) antes de rendirse
+    while not wifi.poll():
+        if time.ticks_diff(time.ticks_ms(), inicio) >= 3 * wifi.full_timeout_ms:
+            print("Error: No se pudo conectar a WiFi")
+            return None
+        time.sleep_ms(100)
+    wlan = wifi.wlan
+    print("WiFi conectado!")
+    print(f"IP: {wlan.ifconfig()[0]}")
+    print(f"Gateway: {wlan.ifconfig()[2]}")
+    return wlan
+
 def main():
     """Función principal"""
     print("=== Indicador de Señal WiFi con LEDs ===")
@@ -172,8 +201,10 @@ def main():
                 else:
                     print("WiFi desconectado - Reintentando...")
                     apagar_todos_leds()
-                    time.sleep(1)
                     wlan = conectar_wifi()
+                    if wlan is None:
+                        time.sleep(2)
+                        wlan = network.WLAN(network.STA_IF)
 
             except Exception as e:
                 print(f"Error en bucle principal: {e}")
@@ -0,0 +1,139 @@
+# backoff.py - Espera entre reintentos: exponencial con jitter y circuit breaker
+# Guarda este archivo en el ESP32 junto con tu boot.py
+#
+# Con una escalera fija (5s, 30s, 60s) todos los equipos que perdieron el
+# servidor al mismo tiempo reintentan al mismo tiempo: cuando el backend
+# reinicia, lo tapan de conexiones juntas. Acá:
+#   - la espera crece x`factor` por fallo hasta `cap_ms`
+#   - jitter completo: se sortea entre `min_ms` y ese tope, así los equipos
+#     se reparten en toda la ventana
+#   - al conectar, el exponente baja a la mitad (un servidor que se cae y
+#     vuelve enseguida no resetea la espera); si la conexión duró
+#     `stable_ms`, el próximo fallo empieza de cero
+#   - circuit breaker: tras `breaker_after` fallos seguidos el circuito se
+#     abre y no se intenta durante `breaker_ms` (jitter solo en la mitad de
+#     arriba, para que el circuito abierto frene de verdad). Después se
+#     permite un solo intento (semiabierto): si sale bien se cierra, si no
+#     se vuelve a abrir
+# Simulación de un reinicio del backend con muchos equipos: tools/sim/storm.py
+#
+# Uso:
+#   backoff = Backoff(base_ms=2000, cap_ms=60000)
+#   if backoff.allow():
+#       if ws.connect(URL):
+#           backoff.success()
+#       else:
+#           espera = backoff.failure()    # ms hasta el próximo intento
+
+import time
+import random
+
+CLOSED = "cerrado"
+OPEN = "abierto"
+HALF_OPEN = "semiabierto"
+
+
+class Backoff:
+    def __init__(self, base_ms=2000, cap_ms=60000, factor=2, min_ms=500,
+                 breaker_after=8, breaker_ms=300000, stable_ms=60000):
+        self.base_ms = base_ms
+        self.cap_ms = cap_ms
+        self.factor = factor
+        self.min_ms = min_ms
+        self.breaker_after = breaker_after
+        self.breaker_ms = breaker_ms
+        self.stable_ms = stable_ms
+        self.state = CLOSED
+        self.attempt = 0          # Exponente actual
+        self.fails = 0            # Fallos seguidos
+        self.open_until = 0
+        self.up_since = None      # Cuándo conectó por última vez
+        self.last_delay = 0
+        # Estadísticas
+        self.total_fails = 0
+        self.successes = 0
+        self.opens = 0
+
+    def _jitter(self, ceiling, floor=None):
+        if floor is None:
+            floor = self.min_ms
+        if ceiling <= floor:
+            return floor
+        return random.randint(floor, ceiling)
+
+    def ceiling(self):
+        """Tope de la espera para el próximo fallo (sin jitter)"""
+        delay = self.base_ms
+        for _ in range(self.attempt):
+            delay *= self.factor
+            if delay >= self.cap_ms:
+                return self.cap_ms
+        return delay
+
+    def allow(self, now=None):
+        """True si se puede intentar ahora (False con el circuito abierto)"""
+        if self.state != OPEN:
+            return True
+        if now is None:
+            now = time.ticks_ms()
+        if time.ticks_diff(now, self.open_until) < 0:
+            return False
+        self.state = HALF_OPEN
+        return True
+
+    def success(self):
+        self.state = CLOSED
+        self.fails = 0
+        self.attempt //= 2
+        self.up_since = time.ticks_ms()
+        self.successes += 1
+
+    def failure(self):
+        """Registra un intento fallido. Retorna la espera (ms) hasta el próximo"""
+        now = time.ticks_ms()
+        if self.up_since is not None and time.ticks_diff(now, self.up_since) >= self.stable_ms:
+            self.attempt = 0
+        self.up_since = None
+        self.fails += 1
+        self.total_fails += 1
+
+        if self.state == HALF_OPEN or self.fails >= self.breaker_after:
+            # Jitter en la mitad de arriba: el circuito abierto tiene que frenar
+            delay = self._jitter(self.breaker_ms, self.breaker_ms // 2)
+            if self.state != OPEN:
+                self.opens += 1
+            self.state = OPEN
+            self.open_until = time.ticks_add(now, delay)
+        else:
+            delay = self._jitter(self.ceiling())
+            self.attempt += 1
+        self.last_delay = delay
+        return delay
+
+    def remaining(self, now=None):
+        """ms hasta que se cierre la espera del circuito abierto (0 si no)"""
+        if self.state != OPEN:
+            return 0
+        if now is None:
+            now = time.ticks_ms()
+        return max(0, time.ticks_diff(self.open_until, now))
+
+    def summary(self):
+        return {
+            "state": self.state,
+            "fails": self.fails,
+            "attempt": self.attempt,
+            "lastDelayMs": self.last_delay,
+            "openMs": self.remaining(),
+            "opens": self.opens,
+            "totalFails": self.total_fails,
+            "successes": self.successes,
+        }
+
+    def report(self):
+        """Imprime el estado (para usar desde el REPL)"""
+        print(f"⏳ Backoff: circuito {self.state}, {self.fails} fallos seguidos, "
+              f"próximo tope {self.ceiling() // 1000}s, última espera {self.last_delay // 1000}s")
+        if self.state == OPEN:
+            print(f"   Abierto por {self.remaining() // 1000}s más")
+        print(f"   Aperturas {self.opens}, fallos {self.total_fails}, conexiones {self.successes}")
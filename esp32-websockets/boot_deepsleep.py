@@ -0,0 +1,262 @@
+# ESP32 Monitor en modo DEEP SLEEP (batería) con envío por lotes
+# Para sitios que solo necesitan una lectura cada pocos minutos
+#
+# Cada despertar (timer RTC o puerta MC-38):
+#   1. Lee DS18B20 + DHT22 y guarda la muestra en la memoria RTC (rtc_log.py)
+#   2. Cada FLUSH_EVERY despertares (o al abrirse la puerta) levanta WiFi +
+#      WebSocket, envía todas las muestras pendientes y sincroniza NTP
+#   3. Vuelve a deep sleep. Sin OLED ni LEDs: todo apagado mientras duerme
+#
+# El número de secuencia, la hora de NTP y el tiempo despierto sobreviven
+# al deep sleep en la memoria RTC (se pierden al cortar la alimentación).
+# Nota: en deep sleep el pull-down interno del pin de la puerta no siempre
+# se mantiene: usar una resistencia externa de 10k a GND.
+
+import network
+import machine
+import time
+import dht
+import onewire
+import ds18x20
+import json
+import esp32
+from machine import Pin
+from ws_client import WebSocket
+from rtc_log import RtcLog, CAPACITY, DOOR_CLOSED, PIN_WAKE, TIME_VALID
+
+T_WAKE = time.ticks_ms()  # Inicio del despertar (para medir cuánto dura)
+
+# Configuración
+SSID = "motog35"
+PASSWORD = "12345678"
+WEBSOCKET_URL = "wss://bio-data-production.up.railway.app/"
+USERNAME = "MHT-prueba"
+
+# Pines
+DHT22_PIN = 4
+DS18B20_PIN = 5
+MC38_SENSOR_PIN = 15
+
+# Muestreo y envío
+SAMPLE_INTERVAL_MS = 300000   # Una muestra cada 5 min
+FLUSH_EVERY = 6               # Enviar cada 6 despertares (30 min)
+FLUSH_ON_DOOR = True          # Enviar apenas cambia la puerta
+BATCH_SIZE = 20               # Muestras por mensaje (memoria)
+WIFI_TIMEOUT_MS = 10000
+NTP_INTERVAL_S = 6 * 3600     # El RTC del ESP32 deriva: resincronizar cada 6 h
+
+# Sensores
+dht22 = dht.DHT22(Pin(DHT22_PIN))
+ds_sensor = ds18x20.DS18X20(onewire.OneWire(Pin(DS18B20_PIN)))
+mc38_sensor = Pin(MC38_SENSOR_PIN, Pin.IN, Pin.PULL_DOWN)
+
+
+def read_sensors():
+    """Lee DS18B20 y DHT22. Retorna (ds, ds_ok, temp, hum, dht_ok)
+
+    La conversión del DS18B20 tarda 750ms: se lee el DHT22 mientras tanto y
+    el resto se espera en lightsleep (la radio todavía está apagada)."""
+    ds, ds_ok = 0.0, False
+    devices = []
+    try:
+        devices = ds_sensor.scan()
+        if devices:
+            ds_sensor.convert_temp()
+    except Exception as e:
+        print(f"⚠ DS18B20: {e}")
+    t_convert = time.ticks_ms()
+
+    temp, hum, dht_ok = 0.0, 0.0, False
+    try:
+        dht22.measure()
+        temp, hum, dht_ok = dht22.temperature(), dht22.humidity(), True
+    except Exception as e:
+        print(f"⚠ DHT22: {e}")
+
+    if devices:
+        left = 750 - time.ticks_diff(time.ticks_ms(), t_convert)
+        if left > 0:
+            machine.lightsleep(left)
+        try:
+            value = ds_sensor.read_temp(devices[0])
+            if value is not None and value != -127.0:
+                ds, ds_ok = value, True
+        except Exception as e:
+            print(f"⚠ DS18B20: {e}")
+    return ds, ds_ok, temp, hum, dht_ok
+
+
+def connect_wifi(wlan):
+    wlan.active(True)
+    if not wlan.isconnected():
+        wlan.connect(SSID, PASSWORD)
+        start = time.ticks_ms()
+        while not wlan.isconnected():
+            if time.ticks_diff(time.ticks_ms(), start) >= WIFI_TIMEOUT_MS:
+                print("❌ WiFi no conectado")
+                return False
+            time.sleep_ms(100)
+    print(f"✓ WiFi en {time.ticks_diff(time.ticks_ms(), T_WAKE)}ms: {wlan.ifconfig()[0]}")
+    return True
+
+
+def sync_time(log):
+    """NTP si nunca se sincronizó o pasaron NTP_INTERVAL_S"""
+    now = time.time()
+    if log.ntp_epoch and now - log.ntp_epoch < NTP_INTERVAL_S:
+        return
+    try:
+        import ntptime
+        ntptime.settime()
+        after = time.time()
+        if log.ntp_epoch:
+            log.ntp_offset = after - now  # Corrección aplicada (deriva del RTC)
+        else:
+            log.fix_time(after - now)
+        log.ntp_epoch = after
+        print(f"✓ NTP (corrección {after - now}s)")
+    except Exception as e:
+        print(f"⚠ Error NTP: {e}")
+
+
+def _sample_json(sample):
+    seq, epoch, ds, temp, hum, flags = sample
+    if flags & TIME_VALID:
+        t = time.gmtime(epoch)
+        datetime_utc = f"{t[0]:04d}-{t[1]:02d}-{t[2]:02d}T{t[3]:02d}:{t[4]:02d}:{t[5]:02d}Z"
+    else:
+        datetime_utc = None
+    return {
+        "seq": seq,
+        "dsTemperature": ds / 10 if ds != -32768 else None,
+        "temperature": temp / 10 if temp != -32768 else None,
+        "humidity": hum if hum != 255 else None,
+        "datetime": datetime_utc,
+        "doorStatus": "closed" if flags & DOOR_CLOSED else "open",
+        "doorWake": bool(flags & PIN_WAKE),
+    }
+
+
+def send_batches(ws, log):
+    """Envía las muestras pendientes en mensajes de BATCH_SIZE"""
+    batch = []
+    sent = 0
+    for sample in log.pending():
+        batch.append(_sample_json(sample))
+        if len(batch) >= BATCH_SIZE:
+            if not _send_batch(ws, log, batch):
+                return False
+            sent += len(batch)
+            batch = []
+    if batch:
+        if not _send_batch(ws, log, batch):
+            return False
+        sent += len(batch)
+    print(f"📤 {sent} muestras enviadas")
+    return True
+
+
+def _send_batch(ws, log, samples):
+    return ws.send(json.dumps({
+        "type": "batch",
+        "username": USERNAME,
+        "samples": samples,
+        "wake": log.wake_stats(),
+        "ntpOffset": log.ntp_offset,
+        "fails": log.fails,
+    }))
+
+
+def flush(log):
+    """WiFi + NTP + WebSocket: envía todo lo pendiente. Retorna True si salió bien"""
+    ok = False
+    wlan = network.WLAN(network.STA_IF)
+    ws = None
+    try:
+        # wlan.connect() puede lanzar OSError ("Wifi Internal Error")
+        if connect_wifi(wlan):
+            sync_time(log)
+            ws = WebSocket()
+            if ws.connect(WEBSOCKET_URL):
+                ws.send(json.dumps({"username": USERNAME}))
+                ok = send_batches(ws, log)
+    except Exception as e:
+        print(f"❌ Error enviando: {e}")
+    finally:
+        if ws:
+            ws.close()
+        wlan.active(False)
+
+    log.wakes = 0
+    if ok:
+        log.clear_pending()
+        log.fails = 0
+        log.reset_wake_stats()
+    else:
+        log.fails += 1
+        print(f"⚠ Envío fallido ({log.fails}), {log.pending_count()} muestras pendientes")
+    return ok
+
+
+def sleep(log, door_closed):
+    """Arma los despertares (timer + puerta) y entra en deep sleep. Aunque
+    falle algo acá, se duerme igual: despierta en el REPL agota la batería"""
+    try:
+        # Despertar cuando la puerta cambie respecto de lo que se acaba de leer
+        esp32.wake_on_ext0(pin=mc38_sensor,
+                           level=esp32.WAKEUP_ALL_LOW if door_closed else esp32.WAKEUP_ANY_HIGH)
+        awake_ms = time.ticks_diff(time.ticks_ms(), T_WAKE)
+        log.note_wake(awake_ms)
+        log.save()
+        print(f"💤 Despierto {awake_ms}ms -> deep sleep {SAMPLE_INTERVAL_MS // 1000}s")
+    finally:
+        machine.deepsleep(SAMPLE_INTERVAL_MS)
+
+
+def main():
+    """Un despertar. Pase lo que pase (WiFi, WebSocket, sensores...) termina
+    en sleep(); solo Ctrl+C se queda despierto, para llegar al REPL"""
+    log = RtcLog.load()
+    door_closed = mc38_sensor.value()
+    try:
+        wake(log, door_closed)
+    except KeyboardInterrupt:
+        print("⏹ Ctrl+C: sin deep sleep")
+        log.save()
+        raise
+    except Exception as e:
+        print(f"💥 Error en el despertar: {e}")
+    sleep(log, door_closed)
+
+
+def wake(log, door_closed):
+    """Muestra + (cada tanto) envío del lote"""
+    pin_wake = machine.wake_reason() == machine.PIN_WAKE
+    if log.fresh:
+        print(f"🆕 Sin estado en la memoria RTC: empezando (capacidad {CAPACITY} muestras)")
+
+    ds, ds_ok, temp, hum, dht_ok = read_sensors()
+
+    flags = 0
+    if door_closed:
+        flags |= DOOR_CLOSED
+    if pin_wake:
+        flags |= PIN_WAKE
+    if log.ntp_epoch:
+        flags |= TIME_VALID
+    seq = log.append(time.time(), ds, ds_ok, temp, hum, dht_ok, flags)
+    log.wakes += 1
+
+    ds_str = f"{ds:.1f}°C" if ds_ok else "ERROR"
+    dht_str = f"{temp:.1f}°C {hum:.0f}%" if dht_ok else "ERROR"
+    door_str = "CERRADA" if door_closed else "ABIERTA"
+    print(f"📝 #{seq} T.OUT: {ds_str} | T.IN: {dht_str} | Puerta: {door_str}"
+          f"{' (despertó la puerta)' if pin_wake else ''} | pendientes {log.pending_count()}")
+
+    # Al encender se envía enseguida, para tener hora de NTP cuanto antes
+    if log.fresh or log.wakes >= FLUSH_EVERY or (pin_wake and FLUSH_ON_DOOR):
+        flush(log)
+
+
+if __name__ == "__main__":
+    main()
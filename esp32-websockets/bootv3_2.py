@@ -1,57 +1,71 @@
 # ESP32 Monitor con WebSocket usando ws_client.py (DUAL CORE)
 # Dual driver ss1306 (1.54") and sh1106 (1.3") 12/01/2026
 
-import network
 import machine
 import time
 import dht
 import onewire
 import ds18x20
 import json
+import gc
 import _thread
 from machine import Pin, SoftI2C
 from ws_client import WebSocket
+try:
+    # ws_client_v2.py: reanudación de sesiones TLS, caché de DNS y keepalive
+    from ws_client import tls_sessions, dns_cache, Keepalive
+except ImportError:
+    tls_sessions = dns_cache = Keepalive = None
+from oled_governor import FrameStats, FrameGovernor
+from oled_power import OledPower, SHIFT_MAX
+from loop_profiler import LoopProfiler
+from scheduler import Scheduler, DELAY
+from power_mode import PowerManager, SocketWake
+from wifi_manager import WifiManager
+from backoff import Backoff, OPEN
+from commands import Commands
+import ota
+import oled_hal
+
+def heap_libre():
+    try:
+        return gc.mem_free()
+    except AttributeError:
+        return None  # CPython (tools/sim)
+
+# Arranque: en el ESP32 ticks_ms() cuenta desde el reset, así que incluye
+# compilar este archivo y los módulos (o cargar los .mpy, ver tools/build_mpy.py)
+boot_stats = {"importMs": time.ticks_ms(), "heapFreeAfterImport": heap_libre(),
+              "firstTelemetryMs": None, "heapFreeAtTelemetry": None}
 
 # ============================================
 # CONFIGURACIÓN DE DISPLAY (CAMBIAR AQUÍ)
 # ============================================
-DISPLAY_TYPE = "SSD1306"  # Opciones: "SSD1306" o "SH1106"
+DISPLAY_TYPE = "SSD1306"  # Opciones: "SSD1306", "SSD1309" o "SH1106" (ver oled_hal.py)
 # DISPLAY_TYPE = "SH1106"  # Descomentar para usar SH1106
 
 # Configuración adicional
 DISPLAY_ROTATE_180 = False  # True para rotar 180° (útil para SH1106)
 
-# ============================================
-# IMPORTACIÓN DINÁMICA DE LIBRERÍAS
-# ============================================
-OLED_AVAILABLE = False
-oled_driver = None
-
-if DISPLAY_TYPE == "SSD1306":
-    try:
-        import ssd1306
-        OLED_AVAILABLE = True
-        oled_driver = "ssd1306"
-        print("✓ Librería ssd1306 encontrada")
-    except ImportError:
-        print("⚠ Librería ssd1306 no encontrada")
-elif DISPLAY_TYPE == "SH1106":
-    try:
-        import sh1106
-        OLED_AVAILABLE = True
-        oled_driver = "sh1106"
-        print("✓ Librería sh1106 encontrada (SH1106G)")
-    except ImportError:
-        print("⚠ Librería sh1106 no encontrada")
-else:
-    print(f"⚠ DISPLAY_TYPE inválido: {DISPLAY_TYPE}. Usar 'SSD1306' o 'SH1106'")
-
 # Configuración
 SSID = "motog35"
 PASSWORD = "12345678"
 WEBSOCKET_URL = "wss://bio-data-production.up.railway.app/"
 USERNAME = "MHT-prueba"
 
+# Reconexión rápida (ver wifi_manager.py): BSSID e IP en caché
+WIFI_STATIC_IP = None     # o ("192.168.43.50", "255.255.255.0", "192.168.43.1", "8.8.8.8")
+WIFI_REUSE_LEASE = False  # True: reutilizar la última IP de DHCP (si el router la reserva)
+# Redes en orden de prioridad: si la señal de una queda baja se pasa a otra
+WIFI_NETWORKS = [
+    (SSID, PASSWORD, WIFI_STATIC_IP),
+    # ("MACHETE", "clave"),
+]
+WIFI_ROAM_RSSI = -75          # dBm: por debajo, buscar otro AP
+WIFI_ROAM_MARGIN_DB = 8       # El candidato tiene que ser así de mejor (histéresis)
+WIFI_ROAM_LOW_MS = 20000      # ...y la señal estar baja este tiempo
+WIFI_SCAN_INTERVAL_MS = 300000
+
 # Pines
 DHT22_PIN = 4
 DS18B20_PIN = 5
@@ -64,13 +78,98 @@ OLED_SDA_PIN = 21
 # Zona horaria (Perú UTC-5)
 TIMEZONE_OFFSET = -5 * 3600
 
+# Refresco OLED (el governor lo ajusta entre MIN y MAX según la carga)
+OLED_INTERVAL_MS = 1000
+OLED_MIN_INTERVAL_MS = 250
+OLED_MAX_INTERVAL_MS = 5000
+OLED_BOOST_MS = 10000  # Refresco rápido tras abrir/cerrar la puerta
+
+# Energía OLED: atenuar tras inactividad, apagar fuera de horario
+OLED_CONTRAST = 0xFF
+OLED_CONTRAST_DIM = 0x08
+OLED_DIM_AFTER_MS = 120000   # Sin actividad (puerta) durante 2 min -> atenuar
+OLED_ON_HOUR = 6             # Horario activo (hora local): 06:00 - 22:00
+OLED_OFF_HOUR = 22           # Fuera de horario e inactiva -> panel apagado
+OLED_SHIFT_MS = 300000       # Mover el layout cada 5 min (anti-quemado)
+
+# Profiler del loop principal (tiempos por tarea, ver loop_profiler.py)
+LOOP_PROFILE = True
+LOOP_STATS_INTERVAL_MS = 300000  # Resumen por WebSocket cada 5 min (0 = nunca)
+
+# Períodos de las tareas (ms, ver scheduler.py)
+DOOR_INTERVAL_MS = 100
+SENSOR_INTERVAL_MS = 2000
+DETECT_INTERVAL_MS = 5000
+WIFI_CHECK_INTERVAL_MS = 2000
+WIFI_CONNECTING_INTERVAL_MS = 100   # Mientras conecta: medir el tiempo con precisión
+NTP_INTERVAL_MS = 3600000
+DNS_REFRESH_INTERVAL_MS = 600000  # Renovar el DNS del servidor con el WebSocket conectado
+WS_CHECK_INTERVAL_MS = 500     # Detección de WebSocket caído
+WS_CONNECTING_INTERVAL_MS = 50  # Durante un connect por etapas: avanzar seguido...
+WS_CONNECT_SLICE_MS = 50        # ...esperando al socket como mucho esto por vuelta
+# Reintentos del WebSocket (ver backoff.py): exponencial con jitter, tope y
+# circuit breaker para no reconectar todos a la vez cuando reinicia el backend
+WS_BACKOFF_BASE_MS = 2000
+WS_BACKOFF_CAP_MS = 60000
+WS_BREAKER_AFTER = 8            # Fallos seguidos que abren el circuito...
+WS_BREAKER_MS = 300000          # ...que queda abierto hasta 5 min
+WS_RECV_INTERVAL_MS = 500
+WS_SEND_INTERVAL_MS = 2000
+# Keepalive (ws_client_v2.py): PING/PONG de protocolo con RTT. El período
+# sube solo mientras lleguen los pongs y baja si el router (NAT) corta
+WS_PING_INTERVAL_MS = 30000     # Período inicial...
+WS_PING_MIN_MS = 15000
+WS_PING_MAX_MS = 240000         # ...entre estos límites
+WS_PONG_TIMEOUT_MS = 10000      # Espera del pong
+WS_PING_MAX_MISSED = 2          # Pongs perdidos seguidos = servidor caído
+WS_PONG_POLL_MS = 20            # recv seguido mientras se espera el pong (resolución del RTT)
+# Banda muerta del envío: solo se envía si una medición cambió al menos
+# esto, cambió la puerta o pasó WS_MAX_SILENCE_MS (0 y 0 = enviar siempre)
+WS_DEADBAND_TEMP = 0.0          # °C
+WS_DEADBAND_HUM = 0             # %
+WS_MAX_SILENCE_MS = 60000
+
+# Comandos del servidor (ver commands.py): set_interval, set_deadband,
+# request_snapshot, request_stats, reboot y ota_begin/end/apply/abort (ota.py)
+CMD_CHECK_INTERVAL_MS = 1000    # La cola se revisa al recibir; esto es el respaldo
+CMD_INTERVAL_TASKS = ("ws_send", "loop_stats", "ntp", "dns")  # Ajustables por set_interval (wifi no: tarea_wifi fija su período)
+CMD_MIN_INTERVAL_MS = 500
+CMD_REBOOT_DELAY_MS = 1000      # Tiempo para que salga la respuesta antes de reiniciar
+
+# Modo de energía (ver power_mode.py): "normal", "ahorro" (WiFi en modem
+# sleep) o "bateria" (ahorro + lightsleep sin WiFi, para cortes de luz)
+POWER_MODE = "normal"
+POWER_LIGHTSLEEP_MIN_MS = 200       # Hueco mínimo para usar lightsleep
+POWER_DOOR_INTERVAL_MS = 2000       # Puerta en "bateria": la IRQ despierta antes
+POWER_WS_RECV_INTERVAL_MS = 5000    # recv fuera de "normal": el socket despierta antes
+BATTERY_MAH = 2000                  # Para estimar autonomía (0 = no estimar)
+
+# OTA por el WebSocket (ver ota.py; ota_main.py va en el ESP32 como main.py)
+OTA_MAX_BOOTS = 3               # Arranques a prueba sin conectar -> versión anterior
+OTA_ACK_BYTES = 16384           # Aviso de avance al servidor cada tantos bytes
+OTA_POLL_MS = 5                 # recv seguido mientras llega un archivo
+
+# Si el arranque anterior aplicó una actualización, contarlo (y volver a la
+# versión anterior tras OTA_MAX_BOOTS arranques sin confirmar)
+ota_state = ota.boot_check(OTA_MAX_BOOTS)
+
 # Estado del sistema (compartido entre núcleos)
 time_synced = False
 wifi_connected = False
 door_closed = False
 wlan = None
+wifi = None
 ws = None
 network_thread_running = False
+wifi_was_connected = False
+ws_reconnect_attempts = 0
+ws_last_sent = None             # Último envío de datos (para la banda muerta)
+ws_last_sent_ms = 0
+ws_send_skipped = 0
+commands = None
+ota_rx = ota.OtaReceiver(lambda data: ws.send(data), OTA_ACK_BYTES)
+ws_backoff = Backoff(base_ms=WS_BACKOFF_BASE_MS, cap_ms=WS_BACKOFF_CAP_MS,
+                     breaker_after=WS_BREAKER_AFTER, breaker_ms=WS_BREAKER_MS)
 
 # Lock para datos compartidos
 data_lock = _thread.allocate_lock()
@@ -81,25 +180,25 @@ data_lock = _thread.allocate_lock()
 oled_initialized = False
 oled = None
 
-if OLED_AVAILABLE:
-    try:
-        i2c = SoftI2C(scl=Pin(OLED_SCL_PIN), sda=Pin(OLED_SDA_PIN))
-
-        if oled_driver == "ssd1306":
-            oled = ssd1306.SSD1306_I2C(128, 64, i2c)
-            print("✓ OLED SSD1306 inicializado (128x64)")
-        elif oled_driver == "sh1106":
-            if DISPLAY_ROTATE_180:
-                oled = sh1106.SH1106_I2C(128, 64, i2c, rotate=180)
-                print("✓ OLED SH1106G inicializado (128x64, rotado 180°)")
-            else:
-                oled = sh1106.SH1106_I2C(128, 64, i2c)
-                print("✓ OLED SH1106G inicializado (128x64)")
-
-        oled_initialized = True
-    except Exception as e:
-        oled_initialized = False
-        print(f"⚠ Error OLED: {e}")
+try:
+    i2c = SoftI2C(scl=Pin(OLED_SCL_PIN), sda=Pin(OLED_SDA_PIN))
+    oled = oled_hal.create(DISPLAY_TYPE, i2c, 128, 64,
+                           rotate=180 if DISPLAY_ROTATE_180 else 0)
+    oled_initialized = True
+    print(f"✓ OLED {DISPLAY_TYPE} inicializado (128x64{', rotado 180°' if DISPLAY_ROTATE_180 else ''})")
+except ImportError as e:
+    print(f"⚠ Driver de {DISPLAY_TYPE} no encontrado: {e}")
+except Exception as e:
+    print(f"⚠ Error OLED: {e}")
+
+oled_power = None
+if oled_initialized:
+    oled_power = OledPower(oled, OLED_DIM_AFTER_MS, OLED_CONTRAST, OLED_CONTRAST_DIM,
+                           OLED_ON_HOUR, OLED_OFF_HOUR, OLED_SHIFT_MS)
+    # Fuentes resueltas una vez (None = fuente 8x8 del framebuf)
+    F_SMALL = oled.font('small')
+    F_PROP = oled.font('prop')
+    F_BIG = oled.font('big3')
 
 # Inicializar sensores
 dht22 = dht.DHT22(Pin(DHT22_PIN))
@@ -124,6 +223,30 @@ class SensorData:
 current_data = SensorData()
 ds_devices = []
 
+# Estadísticas y governor de la OLED
+oled_stats = FrameStats()
+oled_governor = FrameGovernor(OLED_INTERVAL_MS, OLED_MIN_INTERVAL_MS,
+                              OLED_MAX_INTERVAL_MS, OLED_BOOST_MS)
+ultima_firma_oled = None
+
+# Profiler del Core 1: el scheduler crea una tarea del profiler por cada
+# tarea del loop de main(). El loop no tiene período fijo (loop_ms=0)
+loop_prof = LoopProfiler(loop_ms=0, enabled=LOOP_PROFILE)
+
+# Energía: la puerta despierta el loop (IRQ / lightsleep en modo "bateria")
+power = PowerManager(POWER_MODE, POWER_LIGHTSLEEP_MIN_MS, wake_pin=mc38_sensor,
+                     battery_mah=BATTERY_MAH)
+
+# Un scheduler por núcleo. Entre tareas duerme power.idle(); el hilo de red
+# despierta también cuando llegan datos al WebSocket
+sched = Scheduler(profiler=loop_prof, idle=power.idle)
+net_wake = SocketWake(lambda: ws.sock if ws and ws.connected else None,
+                      lambda: net_sched.wake(t_ws_recv))
+net_sched = Scheduler(max_sleep_ms=500,
+                      idle=net_wake.idle if POWER_MODE != "normal" else None)
+t_oled = None
+t_wifi = t_ws_connect = t_ws_recv = t_ws_send = t_ws_ping = t_commands = None
+
 def get_wifi_signal_bars(rssi):
     """Convierte RSSI a barras (0-6)"""
     if rssi >= -50:
@@ -162,13 +285,15 @@ def sync_time():
 
 def init_wifi():
     """Inicializa WiFi (sin bloquear)"""
-    global wifi_connected, wlan
-    wlan = network.WLAN(network.STA_IF)
-    wlan.active(True)
+    global wifi_connected, wlan, wifi
+    wifi = WifiManager(WIFI_NETWORKS, reuse_lease=WIFI_REUSE_LEASE,
+                       roam_rssi=WIFI_ROAM_RSSI, roam_margin_db=WIFI_ROAM_MARGIN_DB,
+                       roam_low_ms=WIFI_ROAM_LOW_MS, scan_interval_ms=WIFI_SCAN_INTERVAL_MS)
+    wlan = wifi.wlan
 
     if not wlan.isconnected():
-        print(f"Conectando WiFi a {SSID}...")
-        wlan.connect(SSID, PASSWORD)
+        print(f"Conectando WiFi a {wifi.ssid}...")
+        wifi.begin()
 
     return wlan
 
@@ -234,7 +359,7 @@ def read_sensors():
             current_data.dht_temp = dht22.temperature()
             current_data.dht_humidity = dht22.humidity()
             current_data.dht_valid = True
-    except:
+    except Exception:
         with data_lock:
             current_data.dht_valid = False
 
@@ -251,7 +376,7 @@ def read_sensors():
             else:
                 with data_lock:
                     current_data.ds18b20_valid = False
-        except:
+        except Exception:  # No tragarse Ctrl+C durante el sleep_ms(750)
             with data_lock:
                 current_data.ds18b20_valid = False
     else:
@@ -266,6 +391,12 @@ def check_door():
 
     if state != door_closed:
         door_closed = state
+        now = time.ticks_ms()
+        oled_governor.boost(now)
+        if oled_power:
+            oled_power.wake(now)
+        if t_oled:
+            sched.wake(t_oled)  # Redibujar ya, sin esperar el período
         if door_closed:
             mc38_led.off()
             print("\n🚪 PUERTA CERRADA - LED OFF")
@@ -276,321 +407,550 @@ def check_door():
 # ============================================
 # FUNCIÓN UNIFICADA PARA ACTUALIZAR OLED
 # ============================================
-def update_oled():
-    """Actualiza pantalla OLED (compatible con SSD1306 y SH1106)"""
+def hora_local():
+    """Hora local (0-23) o None si no hay NTP"""
+    if not time_synced:
+        return None
+    return time.localtime(time.time() + TIMEZONE_OFFSET)[3]
+
+def firma_oled(bars, offset):
+    """Resumen de lo que muestra la OLED: si no cambia no se redibuja"""
+    minuto = time.time() // 60 if time_synced else -1
+    ws_ok = bool(ws and ws.connected)
+    with data_lock:
+        return (minuto, bars, ws_ok, door_closed, offset,
+                current_data.ds18b20_valid, round(current_data.ds18b20_temp, 1),
+                current_data.dht_valid, round(current_data.dht_temp, 1),
+                round(current_data.dht_humidity))
+
+def update_oled(force=False):
+    """Actualiza pantalla OLED (compatible con SSD1306 y SH1106)
+    Retorna los microsegundos de render + flush (0 si no se dibujó)"""
+    global ultima_firma_oled
     if not oled_initialized:
-        return
+        return 0
 
     try:
+        bars = get_wifi_signal_bars(wlan.status('rssi')) if (wlan and wifi_connected) else 0
+        offset = oled_power.offset()
+        firma = firma_oled(bars, offset)
+        if not force and firma == ultima_firma_oled:
+            oled_stats.skip()
+            return 0
+        ultima_firma_oled = firma
+
+        t_start = time.ticks_us()
         oled.fill(0)
+        dibujar_dashboard(bars, offset[0], offset[1])
 
-        # Determinar si usar text() o text_small() según driver
-        # SSD1306 tiene text_small(), SH1106 solo tiene text()
-        use_small_text = (oled_driver == "ssd1306" and hasattr(oled, 'text_small'))
+        t_render = time.ticks_us()
+        bytes_before = oled.bytes_sent
+        oled.show()
+        t_flush = time.ticks_us()
 
-        # Línea 1: Fecha y hora
-        if time_synced:
-            t = time.localtime(time.time() + TIMEZONE_OFFSET)
-            fecha_str = f"{t[2]:02d}/{t[1]:02d}/{t[0]%100:02d} {t[3]:02d}:{t[4]:02d}"
-            if use_small_text:
-                oled.text_small(fecha_str, 0, 0, 'small')
-            else:
-                oled.text(fecha_str, 0, 0)
+        render_us = time.ticks_diff(t_render, t_start)
+        flush_us = time.ticks_diff(t_flush, t_render)
+        oled_stats.record(render_us, flush_us, oled.bytes_sent - bytes_before)
+        return render_us + flush_us
+    except Exception as e:
+        print(f"Error OLED: {e}")
+        return 0
+
+def display_stats():
+    """Muestra estadísticas de la OLED (llamar desde el REPL)"""
+    oled_stats.report(oled_governor.interval)
+    if oled_power:
+        print(f"   Energía: {oled_power.state}, apagada {oled_power.off_ms(time.ticks_ms()) // 1000}s")
+
+def loop_stats(reset=False):
+    """Muestra los tiempos del loop principal (llamar desde el REPL)"""
+    loop_prof.report()
+    sched.report()
+    net_sched.report()
+    power.report()
+    if wifi:
+        wifi.report()
+    if tls_sessions:
+        tls_sessions.report()
+    if dns_cache:
+        dns_cache.report()
+    ws_backoff.report()
+    if hasattr(ws, "keepalive"):
+        ws.keepalive.report()
+    if commands:
+        commands.report()
+    ota_rx.report()
+    print(f"⏱ Arranque: imports {boot_stats['importMs']}ms, primera telemetría "
+          f"{boot_stats['firstTelemetryMs']}ms, heap libre {boot_stats['heapFreeAfterImport']} -> "
+          f"{boot_stats['heapFreeAtTelemetry']} bytes")
+    print(f"📤 Banda muerta: {WS_DEADBAND_TEMP}°C / {WS_DEADBAND_HUM}%, "
+          f"envíos salteados {ws_send_skipped}")
+    if reset:
+        loop_prof.reset()
+
+def enviar_loop_stats():
+    """Resumen compacto del profiler por WebSocket"""
+    return ws.send(json.dumps({
+        "type": "loop_stats",
+        "username": USERNAME,
+        "loop": loop_prof.summary(),
+        "power": power.summary(),
+        "wifi": wifi.summary() if wifi else None,
+        "tls": tls_sessions.summary() if tls_sessions else None,
+        "dns": dns_cache.summary() if dns_cache else None,
+        "backoff": ws_backoff.summary(),
+        "keepalive": ws.keepalive.summary() if hasattr(ws, "keepalive") else None,
+        "commands": commands.summary() if commands else None,
+        "ota": ota_rx.summary(),
+        "boot": boot_stats,
+        "deadband": {"temp": WS_DEADBAND_TEMP, "hum": WS_DEADBAND_HUM,
+                     "skipped": ws_send_skipped}
+    }))
+
+def enviar_display_stats():
+    """Estadísticas de la OLED por WebSocket"""
+    return ws.send(json.dumps({
+        "type": "display_stats",
+        "username": USERNAME,
+        "display": oled_stats.as_dict(oled_governor.interval)
+    }))
+
+def dibujar_dashboard(bars, dx, dy):
+    """Dashboard (igual en todos los paneles): T.OUT en dígitos grandes 3x
+    dx, dy: desplazamiento anti-quemado (0..SHIFT_MAX)"""
+    right = oled.width - SHIFT_MAX + dx
+    # Línea 1: Fecha y hora (proporcional)
+    if time_synced:
+        t = time.localtime(time.time() + TIMEZONE_OFFSET)
+        fecha_str = f"{t[2]:02d}/{t[1]:02d}/{t[0]%100:02d} {t[3]:02d}:{t[4]:02d}"
+        oled.text(fecha_str, dx, dy, F_PROP)
+    else:
+        oled.text("NO SYNC", dx, dy, F_PROP)
+
+    # Línea 2: ID (y aviso de puerta abierta a la derecha)
+    oled.text8(USERNAME, dx, dy + 9)
+    if not door_closed:
+        oled.text("ABIERTA", right - oled.text_width("ABIERTA", F_PROP), dy + 9, F_PROP)
+
+    with data_lock:
+        # Temp OUT en grande, alineada a la derecha contra la unidad
+        oled.text("T.OUT", dx, dy + 19, F_SMALL)
+        if current_data.ds18b20_valid:
+            temp_str = f"{current_data.ds18b20_temp:.1f}"
+        else:
+            temp_str = "--.-"
+        unit_x = right - oled.text_width("°C", F_SMALL)
+        temp_x = unit_x - 2 - oled.text_width(temp_str, F_BIG)
+        oled.text(temp_str, temp_x, dy + 19, F_BIG)
+        oled.text("°C", unit_x, dy + 19, F_SMALL)
+
+        # Temp IN y humedad en una sola línea proporcional
+        if current_data.dht_valid:
+            in_str = f"T.IN: {current_data.dht_temp:.1f}°C  Hum: {current_data.dht_humidity:.0f}%"
+        else:
+            in_str = "T.IN: ERROR  Hum: ERROR"
+        oled.text(in_str, dx, dy + 44, F_PROP)
+
+    # Línea 6: Estado WiFi y WebSocket
+    if wlan and wifi_connected:
+        barras_visual = crear_barras_wifi(bars)
+        ws_status = "OK" if (ws and ws.connected) else "--"
+        oled.text(f"WiFi:{barras_visual} {bars}/6 WS:{ws_status}", dx, dy + 54, F_SMALL)
+    else:
+        oled.text("WiFi: DESCONECTADO", dx, dy + 54, F_SMALL)
+
+# ============================================
+# NÚCLEO 0: Red y WebSocket (bloqueante OK)
+# ============================================
+def tarea_wifi():
+    """Verifica el WiFi y reconecta si hace falta"""
+    global wifi_connected, wifi_was_connected, ws_reconnect_attempts
+    try:
+        if wifi and wifi.poll():
+            if not wifi_connected:
+                print("\n✅ WiFi RECONECTADO")
+                print(f"   IP: {wlan.ifconfig()[0]}")
+                print(f"   RSSI: {wlan.status('rssi')} dBm")
+                wifi_connected = True
+                wifi_led.on()
+                ws_reconnect_attempts = 0
+
+                if wifi_was_connected:
+                    # El socket viejo quedó colgado del WiFi anterior
+                    try:
+                        ws.close()
+                    except:
+                        pass
+
+                if not time_synced:
+                    sync_time()
+
+            wifi_was_connected = True
+            net_sched.set_period(t_wifi, WIFI_CHECK_INTERVAL_MS)
         else:
-            if use_small_text:
-                oled.text_small("NO SYNC", 0, 0, 'small')
+            if wifi_connected:
+                print("\n⚠️  WiFi DESCONECTADO")
+                wifi_connected = False
+                wifi_was_connected = False
+                wifi_led.off()
+                if ws:
+                    try:
+                        ws.close()
+                    except:
+                        pass
+                    ws.connected = False
+                    print("⚠️ WebSocket marcado como desconectado (sin WiFi)")
+
+            # wifi.poll() ya reintenta (rápida -> completa); revisar seguido
+            # para que el tiempo medido sea el real
+            net_sched.set_period(t_wifi, WIFI_CONNECTING_INTERVAL_MS)
+
+    except Exception as e:
+        print(f"Error verificando WiFi: {e}")
+
+def tarea_ntp():
+    if wifi_connected:
+        sync_time()
+
+def tarea_dns():
+    """Renueva la caché de DNS mientras hay conexión: las reconexiones
+    usan la dirección guardada sin consultar el DNS"""
+    if wifi_connected and ws.connected:
+        dns_cache.refresh()
+
+def tarea_ws_connect():
+    """Conecta el WebSocket si está caído. El período de esta tarea es la
+    espera entre intentos: WS_CHECK_INTERVAL_MS conectado; si falla, lo que
+    diga ws_backoff (exponencial con jitter, circuit breaker).
+    Con ws_client_v2.py el connect va por etapas (connect_step): cada vuelta
+    espera como mucho WS_CONNECT_SLICE_MS y el resto del loop sigue andando"""
+    global ws_reconnect_attempts, ws_last_sent, ota_state
+    if not wifi_connected or ws.connected:
+        return
+
+    try:
+        if getattr(ws, "connecting", False):
+            result = ws.connect_step(WS_CONNECT_SLICE_MS)
+            if result is None:
+                return
+        else:
+            if not ws_backoff.allow():
+                # Circuito abierto: esperar hasta que se pueda probar de nuevo
+                net_sched.set_period(t_ws_connect,
+                                     max(ws_backoff.remaining(), WS_CHECK_INTERVAL_MS))
+                return
+            ws_reconnect_attempts += 1
+            print(f"\n🔌 Conectando WebSocket (intento {ws_reconnect_attempts})...")
+            if hasattr(ws, "connect_start"):
+                ws.connect_start(WEBSOCKET_URL)
+                if ws.connecting or ws.connected:
+                    net_sched.set_period(t_ws_connect, WS_CONNECTING_INTERVAL_MS)
+                    return
+                result = False  # Falló al empezar (URL inválida): como cualquier fallo
             else:
-                oled.text("NO SYNC", 0, 0)
+                connect_start = time.ticks_ms()
+                result = ws.connect(WEBSOCKET_URL)
+                ws.connect_ms = time.ticks_diff(time.ticks_ms(), connect_start)
+    except Exception as e:
+        print(f"❌ Error conectando WebSocket: {e}")
+        try:
+            ws.close()
+        except:
+            pass
+        result = False
+
+    if result:
+        resumed = " (sesión TLS reanudada)" if getattr(ws, "resumed", False) else ""
+        print(f"✓ WebSocket conectado en {ws.connect_ms}ms{resumed}")
+
+        time.sleep_ms(500)
+        intro = json.dumps({"username": USERNAME})
+        ws.send(intro)
+        print(f"✓ Username enviado: {USERNAME}")
+
+        ws_reconnect_attempts = 0
+        ws_last_sent = None  # El primer envío va siempre
+        if ota_state and ota_state.get("state") == ota.TRIAL:
+            # La versión nueva llega al servidor: ya no hace falta la anterior
+            ota.confirm()
+            ota_state = ota.load_state()
+        ws_backoff.success()
+        net_sched.set_period(t_ws_connect, WS_CHECK_INTERVAL_MS)
+        # Reiniciar la cuenta de recv, envío y ping
+        now = time.ticks_ms()
+        net_sched.restart(t_ws_recv, now)
+        net_sched.restart(t_ws_send, now)
+        net_sched.restart(t_ws_ping, now)
+    else:
+        # El mismo objeto WebSocket sirve para el próximo intento
+        delay = ws_backoff.failure()
+        print(f"❌ WebSocket no conectado (intento {ws_reconnect_attempts})")
+        if ws_backoff.state == OPEN:
+            print(f"⛔ Circuito abierto: {ws_backoff.fails} fallos seguidos, "
+                  f"próximo intento en {delay // 1000}s")
+        else:
+            print(f"⏳ Próximo intento en {delay / 1000:.1f}s")
+        net_sched.set_period(t_ws_connect, delay)
 
-        # Línea 2: ID
-        y_pos = 9 if use_small_text else 10
-        oled.text(USERNAME, 0, y_pos)
+def tarea_ws_recv():
+    """Recibe mensajes del servidor: los comandos se encolan y los ejecuta
+    tarea_comandos (ver commands.py)"""
+    if not (wifi_connected and ws.connected):
+        return
+    try:
+        msg = ws.recv()
+        keepalive = getattr(ws, "keepalive", None)
+        if keepalive and keepalive.pending is not None:
+            net_sched.wake(t_ws_recv, WS_PONG_POLL_MS)
+        if isinstance(msg, bytes):
+            # Frames del OTA: antes, los comandos en cola (ota_begin/ota_end)
+            while commands.pending:
+                commands.run()
+            if not ota_rx.write(msg):
+                print(f"📥 Servidor: {len(msg)} bytes binarios")
+        elif msg:
+            print(f"📥 Servidor: {msg}")
+            # Los pongs llegan como frames de control (ws.keepalive) y
+            # commands.feed() solo decodifica los comandos
+            if commands.feed(msg):
+                net_sched.wake(t_commands)
+        if ota_rx.active:
+            # Llegando un archivo: leer seguido en vez de cada WS_RECV_INTERVAL_MS
+            net_sched.wake(t_ws_recv, 0 if msg else OTA_POLL_MS)
+    except OSError as e:
+        if e.args[0] != 11:  # 11 = EAGAIN
+            print(f"⚠️ Error recv OSError: {e}")
+    except Exception as e:
+        if "timeout" not in str(e).lower():
+            print(f"⚠️ Error en recv: {e}")
+
+def envio_necesario(data):
+    """True si hay que enviar: una medición se movió al menos la banda
+    muerta (o dejó de ser válida), cambió la puerta o pasó WS_MAX_SILENCE_MS"""
+    last = ws_last_sent
+    if last is None or not (WS_DEADBAND_TEMP or WS_DEADBAND_HUM):
+        return True
+    if time.ticks_diff(time.ticks_ms(), ws_last_sent_ms) >= WS_MAX_SILENCE_MS:
+        return True
+    if data["doorStatus"] != last["doorStatus"]:
+        return True
+    for key, band in (("dsTemperature", WS_DEADBAND_TEMP), ("temperature", WS_DEADBAND_TEMP),
+                      ("humidity", WS_DEADBAND_HUM)):
+        new, old = data[key], last[key]
+        if (new is None) != (old is None):
+            return True
+        if new is not None and abs(new - old) >= band:
+            return True
+    return False
+
+def tarea_ws_send(force=False):
+    """Envía los datos de los sensores (con banda muerta salvo `force`)"""
+    global ws_last_sent, ws_last_sent_ms, ws_send_skipped
+    if not (wifi_connected and ws.connected):
+        return
+    try:
+        t = time.gmtime()
+        datetime_utc = f"{t[0]:04d}-{t[1]:02d}-{t[2]:02d}T{t[3]:02d}:{t[4]:02d}:{t[5]:02d}Z"
 
-        # Línea 3: Temp OUT
-        y_pos = 27 if use_small_text else 20
         with data_lock:
-            if current_data.ds18b20_valid:
-                temp_str = f"T.OUT:{current_data.ds18b20_temp:.1f}C" if not use_small_text else f"T.OUT: {current_data.ds18b20_temp:.1f}C"
-                if use_small_text:
-                    oled.text_small(temp_str, 0, y_pos, 'small')
-                else:
-                    oled.text(temp_str, 0, y_pos)
-            else:
-                error_str = "T.OUT:ERROR" if not use_small_text else "T.OUT: ERROR"
-                if use_small_text:
-                    oled.text_small(error_str, 0, y_pos, 'small')
-                else:
-                    oled.text(error_str, 0, y_pos)
-
-            # Línea 4: Temp IN
-            y_pos = 36 if use_small_text else 30
-            if current_data.dht_valid:
-                temp_str = f"T.IN:{current_data.dht_temp:.1f}C" if not use_small_text else f"T.IN: {current_data.dht_temp:.1f}C"
-                if use_small_text:
-                    oled.text_small(temp_str, 0, y_pos, 'small')
-                else:
-                    oled.text(temp_str, 0, y_pos)
-            else:
-                error_str = "T.IN:ERROR" if not use_small_text else "T.IN: ERROR"
-                if use_small_text:
-                    oled.text_small(error_str, 0, y_pos, 'small')
-                else:
-                    oled.text(error_str, 0, y_pos)
-
-            # Línea 5: Humedad
-            y_pos = 45 if use_small_text else 40
-            if current_data.dht_valid:
-                hum_str = f"Hum:{current_data.dht_humidity:.0f}%" if not use_small_text else f"Hum: {current_data.dht_humidity:.0f}%"
-                if use_small_text:
-                    oled.text_small(hum_str, 0, y_pos, 'small')
-                else:
-                    oled.text(hum_str, 0, y_pos)
-            else:
-                error_str = "Hum:ERROR" if not use_small_text else "Hum: ERROR"
-                if use_small_text:
-                    oled.text_small(error_str, 0, y_pos, 'small')
-                else:
-                    oled.text(error_str, 0, y_pos)
-
-        # Línea 6: Estado WiFi y WebSocket
-        y_pos = 54 if use_small_text else 50
-        if wlan and wifi_connected:
-            rssi = wlan.status('rssi')
-            bars = get_wifi_signal_bars(rssi)
-            barras_visual = crear_barras_wifi(bars)
-            ws_status = "OK" if (ws and ws.connected) else "--"
-
-            if use_small_text:
-                status_str = f"WiFi:{barras_visual} {bars}/6 WS:{ws_status}"
-                oled.text_small(status_str, 0, y_pos, 'small')
-            else:
-                status_str = f"W:{barras_visual} WS:{ws_status}"
-                oled.text(status_str, 0, y_pos)
+            data = {
+                "username": USERNAME,
+                "dsTemperature": round(current_data.ds18b20_temp, 1) if current_data.ds18b20_valid else None,
+                "temperature": round(current_data.dht_temp, 1) if current_data.dht_valid else None,
+                "humidity": int(round(current_data.dht_humidity, 0)) if current_data.dht_valid else None,
+                "datetime": datetime_utc,
+                "doorStatus": "closed" if door_closed else "open"
+            }
+
+        if not force and not envio_necesario(data):
+            ws_send_skipped += 1
+            return
+
+        json_str = json.dumps(data)
+
+        if ws.send(json_str):
+            ws_last_sent = data
+            ws_last_sent_ms = time.ticks_ms()
+            if boot_stats["firstTelemetryMs"] is None:
+                boot_stats["firstTelemetryMs"] = ws_last_sent_ms
+                boot_stats["heapFreeAtTelemetry"] = heap_libre()
+                print(f"⏱ Primera telemetría a {ws_last_sent_ms}ms del reset "
+                      f"(imports {boot_stats['importMs']}ms)")
+            ds_temp_str = f"{data['dsTemperature']}°C" if data['dsTemperature'] is not None else "ERROR"
+            dht_temp_str = f"{data['temperature']}°C" if data['temperature'] is not None else "ERROR"
+            humidity_str = f"{data['humidity']}%" if data['humidity'] is not None else "ERROR"
+            door_icon = "🚪✅" if door_closed else "🚪⚠️"
+
+            print(f"📤 WS | T.OUT: {ds_temp_str} | T.IN: {dht_temp_str} | H: {humidity_str} | {door_icon}")
         else:
-            if use_small_text:
-                oled.text_small("WiFi: DESCONECTADO", 0, y_pos, 'small')
-            else:
-                oled.text("WiFi:OFF", 0, y_pos)
+            print("❌ Error enviando datos")
+            ws.connected = False
 
-        oled.show()
     except Exception as e:
-        print(f"Error OLED: {e}")
+        print(f"❌ Error en envío: {e}")
+        ws.connected = False
+
+def tarea_ws_ping():
+    """Keepalive. Con ws_client_v2.py el período lo decide ws.keepalive
+    (ping de protocolo, espera del pong, período adaptativo); con el
+    ws_client.py viejo, ping JSON cada WS_PING_INTERVAL_MS"""
+    if not (wifi_connected and ws.connected):
+        return
+    keepalive = getattr(ws, "keepalive", None)
+    if keepalive is None:
+        try:
+            ws.send('{"type":"ping"}')
+            print("📶 Ping enviado")
+        except:
+            ws.connected = False
+        return
+
+    net_sched.set_period(t_ws_ping, keepalive.tick(ws))
+    if keepalive.pending is not None:
+        net_sched.wake(t_ws_recv, WS_PONG_POLL_MS)
+    if not ws.connected:
+        print(f"💀 Sin PONG del servidor ({keepalive.max_missed} perdidos): reconectando "
+              f"(keepalive cada {keepalive.interval // 1000}s)")
+        ws.close()
+        net_sched.wake(t_ws_connect)
+
+def tarea_comandos():
+    """Ejecuta los comandos del servidor de a uno por vuelta"""
+    if commands.run():
+        net_sched.wake(t_commands)
+
+# Handlers de comandos: reciben el mensaje y retornan el resultado.
+# ValueError = comando rechazado (el servidor recibe el texto del error)
+def cmd_set_interval(msg):
+    """{"cmd": "set_interval", "task": "ws_send", "ms": 5000}"""
+    name = msg.get("task")
+    task = net_sched.get(name) if name in CMD_INTERVAL_TASKS else None
+    if task is None:
+        raise ValueError(f"tarea no ajustable: {name}")
+    ms = int(msg.get("ms", 0))
+    if ms < CMD_MIN_INTERVAL_MS:
+        raise ValueError(f"período mínimo {CMD_MIN_INTERVAL_MS}ms")
+    net_sched.set_period(task, ms)
+    print(f"⚙️ {name}: cada {ms}ms")
+    return {"task": name, "ms": ms}
+
+def cmd_set_deadband(msg):
+    """{"cmd": "set_deadband", "temp": 0.2, "hum": 1, "maxSilenceMs": 60000}"""
+    global WS_DEADBAND_TEMP, WS_DEADBAND_HUM, WS_MAX_SILENCE_MS
+    temp = float(msg.get("temp", WS_DEADBAND_TEMP))
+    hum = float(msg.get("hum", WS_DEADBAND_HUM))
+    silence = int(msg.get("maxSilenceMs", WS_MAX_SILENCE_MS))
+    if temp < 0 or hum < 0 or silence < CMD_MIN_INTERVAL_MS:
+        raise ValueError("valores fuera de rango")
+    WS_DEADBAND_TEMP, WS_DEADBAND_HUM, WS_MAX_SILENCE_MS = temp, hum, silence
+    print(f"⚙️ Banda muerta: {temp}°C / {hum}%, silencio máximo {silence // 1000}s")
+    return {"temp": temp, "hum": hum, "maxSilenceMs": silence}
+
+def cmd_request_snapshot(msg):
+    """{"cmd": "request_snapshot"}: envía los datos ahora"""
+    tarea_ws_send(force=True)
+
+def cmd_request_stats(msg):
+    """{"cmd": "request_stats", "what": "loop" | "display"}"""
+    what = msg.get("what", "loop")
+    if what == "loop":
+        enviar_loop_stats()
+    elif what == "display":
+        enviar_display_stats()
+    else:
+        raise ValueError(f"estadística desconocida: {what}")
+
+def cmd_reboot(msg):
+    """{"cmd": "reboot"}: reinicia tras CMD_REBOOT_DELAY_MS (sale la respuesta)"""
+    if net_sched.get("reboot") is None:
+        net_sched.add("reboot", reiniciar, CMD_REBOOT_DELAY_MS, delay_ms=CMD_REBOOT_DELAY_MS)
+    return {"inMs": CMD_REBOOT_DELAY_MS}
+
+def cmd_ota_begin(msg):
+    """{"cmd": "ota_begin", "file": "boot.py", "size": 23817, "sha256": "...", "sig": "..."}"""
+    ota_rx.begin(msg.get("file"), int(msg.get("size", 0)), str(msg.get("sha256", "")),
+                 msg.get("sig"))
+    net_sched.wake(t_ws_recv)
+    return {"file": msg.get("file"), "ackBytes": OTA_ACK_BYTES,
+            "counter": ota.counter()}  # Lo que firma ota_apply (ver ota.py)
+
+def cmd_ota_end(msg):
+    """{"cmd": "ota_end"}: verifica el archivo; retorna bytes, ms y KB/s"""
+    return ota_rx.end()
+
+def cmd_ota_apply(msg):
+    """{"cmd": "ota_apply", "version": "3.3", "sig": "..."}: cambia los archivos y reinicia"""
+    result = ota_rx.apply(msg.get("version"), msg.get("sig"))
+    cmd_reboot(msg)
+    return result
+
+def cmd_ota_abort(msg):
+    """{"cmd": "ota_abort"}: descarta lo recibido"""
+    return {"discarded": ota_rx.abort()}
+
+def reiniciar():
+    print("🔁 Reiniciando por pedido del servidor...")
+    ws.close()
+    machine.reset()
+
+def tarea_loop_stats():
+    """Resumen del profiler del loop principal"""
+    if not (wifi_connected and ws.connected):
+        return
+    try:
+        enviar_loop_stats()
+    except Exception as e:
+        print(f"⚠️ Error enviando loop_stats: {e}")
 
-# ============================================
-# NÚCLEO 0: Red y WebSocket (bloqueante OK)
-# ============================================
 def network_thread():
     """Hilo que maneja WiFi y WebSocket en núcleo separado"""
-    global wifi_connected, ws, wlan, network_thread_running, time_synced
+    global ws, commands, network_thread_running
+    global t_wifi, t_ws_connect, t_ws_recv, t_ws_send, t_ws_ping, t_commands
 
     network_thread_running = True
     print("🔷 Núcleo de Red iniciado (Core 0)")
 
     # Crear WebSocket
-    ws = WebSocket()
-
-    last_wifi_check = time.ticks_ms()
-    last_send = time.ticks_ms()
-    last_ping = time.ticks_ms()
-    last_ntp_sync = time.ticks_ms()
-    last_recv = time.ticks_ms()  # ⬅️ AGREGADO
-    reconnect_attempts = 0
-    ws_reconnect_delay = 5000
-    last_ws_attempt = 0
-    wifi_was_connected = False
+    if Keepalive:
+        ws = WebSocket(keepalive=Keepalive(
+            interval_ms=WS_PING_INTERVAL_MS, min_ms=WS_PING_MIN_MS, max_ms=WS_PING_MAX_MS,
+            timeout_ms=WS_PONG_TIMEOUT_MS, max_missed=WS_PING_MAX_MISSED))
+    else:
+        ws = WebSocket()
+
+    # Comandos del servidor (los pedidos "get_..." viejos siguen andando)
+    commands = Commands(ws.send)
+    commands.register("set_interval", cmd_set_interval)
+    commands.register("set_deadband", cmd_set_deadband)
+    commands.register("request_snapshot", cmd_request_snapshot)
+    commands.register("request_stats", cmd_request_stats)
+    commands.register("reboot", cmd_reboot)
+    commands.register("ota_begin", cmd_ota_begin)
+    commands.register("ota_end", cmd_ota_end)
+    commands.register("ota_apply", cmd_ota_apply)
+    commands.register("ota_abort", cmd_ota_abort)
+    commands.alias("get_loop_stats", "request_stats", what="loop")
+    commands.alias("get_display_stats", "request_stats", what="display")
+
+    # Tareas del núcleo de red (intervalos en la configuración)
+    t_wifi = net_sched.add("wifi", tarea_wifi, WIFI_CHECK_INTERVAL_MS,
+                           delay_ms=WIFI_CHECK_INTERVAL_MS)
+    net_sched.add("ntp", tarea_ntp, NTP_INTERVAL_MS, delay_ms=NTP_INTERVAL_MS)
+    if dns_cache:
+        net_sched.add("dns", tarea_dns, DNS_REFRESH_INTERVAL_MS, delay_ms=DNS_REFRESH_INTERVAL_MS)
+    t_ws_connect = net_sched.add("ws_connect", tarea_ws_connect, WS_CHECK_INTERVAL_MS,
+                                 priority=1, overrun=DELAY)
+    recv_ms = WS_RECV_INTERVAL_MS if POWER_MODE == "normal" else POWER_WS_RECV_INTERVAL_MS
+    t_ws_recv = net_sched.add("ws_recv", tarea_ws_recv, recv_ms, priority=3)
+    t_ws_send = net_sched.add("ws_send", tarea_ws_send, WS_SEND_INTERVAL_MS, priority=2)
+    t_ws_ping = net_sched.add("ws_ping", tarea_ws_ping, WS_PING_INTERVAL_MS)
+    t_commands = net_sched.add("commands", tarea_comandos, CMD_CHECK_INTERVAL_MS, priority=2)
+    if LOOP_PROFILE and LOOP_STATS_INTERVAL_MS:
+        net_sched.add("loop_stats", tarea_loop_stats, LOOP_STATS_INTERVAL_MS,
+                      delay_ms=LOOP_STATS_INTERVAL_MS)
 
     try:
-        while network_thread_running:
-            now = time.ticks_ms()
-
-            # ===== VERIFICAR WIFI ===== (sin cambios)
-            if time.ticks_diff(now, last_wifi_check) >= 5000:
-                try:
-                    if wlan and wlan.isconnected():
-                        if not wifi_connected:
-                            print("\n✅ WiFi RECONECTADO")
-                            print(f"   IP: {wlan.ifconfig()[0]}")
-                            print(f"   RSSI: {wlan.status('rssi')} dBm")
-                            wifi_connected = True
-                            wifi_led.on()
-                            reconnect_attempts = 0
-
-                            if wifi_was_connected:
-                                print("🔄 Recreando WebSocket después de reconexión WiFi...")
-                                try:
-                                    ws.close()
-                                except:
-                                    pass
-                                time.sleep_ms(500)
-                                ws = WebSocket()
-                                print("✓ WebSocket recreado")
-
-                            if not time_synced:
-                                sync_time()
-
-                        wifi_was_connected = True
-                    else:
-                        if wifi_connected:
-                            print("\n⚠️  WiFi DESCONECTADO")
-                            wifi_connected = False
-                            wifi_was_connected = False
-                            wifi_led.off()
-                            if ws:
-                                try:
-                                    ws.close()
-                                except:
-                                    pass
-                                ws.connected = False
-
-                        print("🔄 Reintentando WiFi...")
-                        if wlan:
-                            try:
-                                wlan.disconnect()
-                                time.sleep_ms(200)
-                            except:
-                                pass
-                            wlan.connect(SSID, PASSWORD)
-
-                except Exception as e:
-                    print(f"Error verificando WiFi: {e}")
-
-                last_wifi_check = now
-
-            # ===== SINCRONIZAR NTP ===== (sin cambios)
-            if wifi_connected and time.ticks_diff(now, last_ntp_sync) >= 3600000:
-                sync_time()
-                last_ntp_sync = now
-
-            # ===== WEBSOCKET =====
-            if wifi_connected:
-                # Conectar WebSocket si está desconectado (sin cambios)
-                if not ws.connected:
-                    if time.ticks_diff(now, last_ws_attempt) >= ws_reconnect_delay:
-                        reconnect_attempts += 1
-                        print(f"\n🔌 Conectando WebSocket (intento {reconnect_attempts})...")
-                        last_ws_attempt = now
-
-                        try:
-                            connect_start = time.ticks_ms()
-
-                            if ws.connect(WEBSOCKET_URL):
-                                connect_time = time.ticks_diff(time.ticks_ms(), connect_start)
-                                print(f"✓ WebSocket conectado en {connect_time}ms")
-
-                                time.sleep_ms(500)
-                                intro = json.dumps({"username": USERNAME})
-                                ws.send(intro)
-                                print(f"✓ Username enviado: {USERNAME}")
-
-                                reconnect_attempts = 0
-                                ws_reconnect_delay = 5000
-                                last_ping = now
-                                last_send = now
-                                last_recv = now  # ⬅️ AGREGADO: Resetear recv
-                            else:
-                                print(f"❌ WebSocket no conectado (intento {reconnect_attempts})")
-
-                                if reconnect_attempts >= 5:
-                                    ws_reconnect_delay = 60000
-                                    print("⏳ Esperando 60s antes del próximo intento...")
-                                elif reconnect_attempts >= 3:
-                                    ws_reconnect_delay = 30000
-                                    print("⏳ Esperando 30s antes del próximo intento...")
-                                else:
-                                    ws_reconnect_delay = 5000
-
-                                if reconnect_attempts >= 3:
-                                    print("🔄 Recreando WebSocket por múltiples fallos...")
-                                    try:
-                                        ws.close()
-                                    except:
-                                        pass
-                                    time.sleep_ms(500)
-                                    ws = WebSocket()
-
-                        except Exception as e:
-                            print(f"❌ Error conectando WebSocket: {e}")
-                            ws.connected = False
-
-                            try:
-                                ws.close()
-                            except:
-                                pass
-                            time.sleep_ms(500)
-                            ws = WebSocket()
-
-                # ⬇️⬇️⬇️ NUEVO BLOQUE: RECIBIR MENSAJES ⬇️⬇️⬇️
-                if ws.connected and time.ticks_diff(now, last_recv) >= 500:
-                    try:
-                        msg = ws.recv()
-                        if msg:
-                            print(f"📥 Servidor: {msg}")
-                            try:
-                                parsed = json.loads(msg)
-                                if parsed.get('type') == 'pong':
-                                    print("📶 PONG recibido del servidor")
-                            except:
-                                pass
-                    except OSError as e:
-                        if e.args[0] != 11:  # 11 = EAGAIN
-                            print(f"⚠️ Error recv OSError: {e}")
-                    except Exception as e:
-                        if "timeout" not in str(e).lower():
-                            print(f"⚠️ Error en recv: {e}")
-
-                    last_recv = now
-                # ⬆️⬆️⬆️ FIN NUEVO BLOQUE ⬆️⬆️⬆️
-
-                # Enviar datos cada 2s (sin cambios)
-                if ws.connected and time.ticks_diff(now, last_send) >= 2000:
-                    try:
-                        t = time.gmtime()
-                        datetime_utc = f"{t[0]:04d}-{t[1]:02d}-{t[2]:02d}T{t[3]:02d}:{t[4]:02d}:{t[5]:02d}Z"
-
-                        with data_lock:
-                            data = {
-                                "username": USERNAME,
-                                "dsTemperature": round(current_data.ds18b20_temp, 1) if current_data.ds18b20_valid else None,
-                                "temperature": round(current_data.dht_temp, 1) if current_data.dht_valid else None,
-                                "humidity": int(round(current_data.dht_humidity, 0)) if current_data.dht_valid else None,
-                                "datetime": datetime_utc,
-                                "doorStatus": "closed" if door_closed else "open"
-                            }
-
-                        json_str = json.dumps(data)
-
-                        if ws.send(json_str):
-                            ds_temp_str = f"{data['dsTemperature']}°C" if data['dsTemperature'] is not None else "ERROR"
-                            dht_temp_str = f"{data['temperature']}°C" if data['temperature'] is not None else "ERROR"
-                            humidity_str = f"{data['humidity']}%" if data['humidity'] is not None else "ERROR"
-                            door_icon = "🚪✅" if door_closed else "🚪⚠️"
-
-                            print(f"📤 WS | T.OUT: {ds_temp_str} | T.IN: {dht_temp_str} | H: {humidity_str} | {door_icon}")
-                        else:
-                            print("❌ Error enviando datos")
-                            ws.connected = False
-
-                    except Exception as e:
-                        print(f"❌ Error en envío: {e}")
-                        ws.connected = False
-
-                    last_send = now
-
-                # Ping cada 30s (sin cambios)
-                if ws.connected and time.ticks_diff(now, last_ping) >= 30000:
-                    try:
-                        ws.send('{"type":"ping"}')
-                        print("📶 Ping enviado")
-                    except:
-                        ws.connected = False
-                    last_ping = now
-
-            else:
-                if ws and ws.connected:
-                    ws.connected = False
-                    print("⚠️ WebSocket marcado como desconectado (sin WiFi)")
-
-            time.sleep_ms(100)
+        net_sched.run(lambda: not network_thread_running)
 
     except Exception as e:
         print(f"💥 Error crítico en núcleo de red: {e}")
@@ -598,6 +958,16 @@ def network_thread():
         network_thread_running = False
         print("🔷 Núcleo de Red detenido")
 
+def tarea_oled():
+    """Frame de la OLED: el governor decide el intervalo (1s por defecto)
+    Con el panel apagado (oled_power) no se dibuja nada"""
+    now = time.ticks_ms()
+    frame_us = 0
+    if oled_power and oled_power.update(now, hora_local()):
+        frame_us = update_oled()
+    oled_governor.frame_done(now, frame_us)
+    sched.set_period(t_oled, oled_governor.interval, now)
+
 # ============================================
 # NÚCLEO 1: Sensores y Display (Main)
 # ============================================
@@ -619,13 +989,14 @@ def main():
 
     # Inicializar WiFi
     wlan = init_wifi()
+    power.set_wlan(wlan)
+    print(f"🔋 Modo de energía: {POWER_MODE}")
 
     # Esperar conexión inicial WiFi (máximo 15s)
     print("Esperando conexión WiFi inicial...")
-    timeout = 15
-    while not wlan.isconnected() and timeout > 0:
-        time.sleep(1)
-        timeout -= 1
+    start = time.ticks_ms()
+    while not wifi.poll() and time.ticks_diff(time.ticks_ms(), start) < 15000:
+        time.sleep_ms(100)
 
     if wlan.isconnected():
         global wifi_connected
@@ -647,39 +1018,25 @@ def main():
     print("🔷 Core 0: WiFi y WebSocket")
     print("="*50 + "\n")
 
-    # Timers para Core 1
-    last_sensor = time.ticks_ms()
-    last_door = time.ticks_ms()
-    last_oled = time.ticks_ms()
-    last_detect = time.ticks_ms()
+    # Tareas del Core 1 (por prioridad: la puerta primero)
+    global t_oled
+    door_ms = POWER_DOOR_INTERVAL_MS if POWER_MODE == "bateria" else DOOR_INTERVAL_MS
+    t_door = sched.add("check_door", check_door, door_ms, priority=3)
+    power.on_wake = lambda: sched.wake(t_door)
+    sched.add("read_sensors", read_sensors, SENSOR_INTERVAL_MS, priority=1,
+              delay_ms=SENSOR_INTERVAL_MS)
+    sched.add("detect_sensors", detect_sensors, DETECT_INTERVAL_MS,
+              delay_ms=DETECT_INTERVAL_MS)
+    if oled_initialized:
+        t_oled = sched.add("update_oled", tarea_oled, OLED_INTERVAL_MS, priority=2,
+                           overrun=DELAY)
 
     try:
-        while True:
-            now = time.ticks_ms()
-
-            # Detectar sensores cada 5 segundos
-            if time.ticks_diff(now, last_detect) >= 5000:
-                detect_sensors()
-                last_detect = now
-
-            # Leer sensores cada 2s
-            if time.ticks_diff(now, last_sensor) >= 2000:
-                read_sensors()
-                last_sensor = now
-
-            # Puerta cada 100ms
-            if time.ticks_diff(now, last_door) >= 100:
-                check_door()
-                last_door = now
-
-            # OLED cada 1s
-            if time.ticks_diff(now, last_oled) >= 1000:
-                update_oled()
-                last_oled = now
-
-            time.sleep_ms(10)
+        # Duerme exactamente hasta el próximo vencimiento
+        sched.run()
 
     except KeyboardInterrupt:
+        ota.user_stop()  # main.py (ota_main.py) no debe tomarlo como falla
         print("\n\n" + "="*50)
         print("Deteniendo sistema...")
         print("="*50)
@@ -697,8 +1054,9 @@ def main():
 
         if oled_initialized:
             oled.fill(0)
-            oled.text_small("Sistema", 0, 20, 'small')
-            oled.text_small("Detenido", 0, 32, 'small')
+            oled.poweron()
+            oled.text("Sistema", 0, 20, F_SMALL)
+            oled.text("Detenido", 0, 32, F_SMALL)
             oled.show()
             time.sleep(1)
 
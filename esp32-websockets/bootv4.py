@@ -0,0 +1,29 @@
+# ESP32 Monitor con WebSocket (DUAL CORE) - bootv3_2.py separado en el paquete monitor/
+# Guardar en el ESP32 como boot.py, con la carpeta monitor/ y los módulos
+# (ws_client_v2.py como ws_client.py, scheduler.py, oled_hal.py, ...)
+#
+# La configuración está en monitor/config.py. Importar el paquete no
+# inicializa nada: app.main() arranca en orden y mide cada etapa. Desde el
+# REPL (tras Ctrl+C): loop_stats(), display_stats(), log_dump().
+
+from monitor import app, config  # config: bootv4.config.NOMBRE = ... antes de main() (REPL, tools/sim)
+
+
+def loop_stats(reset=False):
+    app.loop_stats(reset)
+
+
+def display_stats():
+    app.display_stats()
+
+
+def log_dump(last=None, previous=False):
+    app.log_dump(last, previous)
+
+
+def main():
+    app.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# commands.py - Comandos del servidor al ESP32 por el WebSocket
+# Guarda este archivo en el ESP32 junto con tu boot.py
+#
+# El servidor manda, por ejemplo:
+#   {"cmd": "set_interval", "task": "ws_send", "ms": 5000, "id": 7}
+# y el equipo responde:
+#   {"type": "cmd_result", "cmd": "set_interval", "id": 7, "ok": true, "result": {...}}
+#   {"type": "cmd_result", "cmd": "set_interval", "id": 7, "ok": false, "error": "..."}
+# Así se ajustan parámetros de toda la flota sin reflashear.
+#
+#   - Camino rápido: feed() descarta sin json.loads lo que no es un comando
+#     (ecos, datos del servidor): alcanza con buscar '"cmd"' en el texto.
+#     Los pedidos viejos {"type": "get_..."} entran con alias() y no llevan
+#     respuesta cmd_result (el servidor viejo no la espera)
+#   - feed() solo encola; run() (una tarea del scheduler) ejecuta un comando
+#     por vuelta para no frenar el recv ni los envíos. La cola tiene tope
+#   - Cada handler recibe el dict del mensaje y retorna el resultado (algo
+#     que se pueda pasar a JSON, o None). Para rechazar el comando lanza
+#     ValueError; cualquier otra excepción se reporta igual
+#
+# Uso:
+#   commands = Commands(ws.send)
+#   commands.register("reboot", pedir_reinicio)
+#   commands.alias("get_loop_stats", "request_stats", what="loop")
+#   msg = ws.recv()
+#   if msg and commands.feed(msg):
+#       sched.wake(t_commands)
+#   commands.run()                   # tarea del scheduler
+
+import json
+
+
+class Commands:
+    def __init__(self, send, max_queue=8):
+        self.send = send              # send(str) -> bool (ws.send)
+        self.max_queue = max_queue
+        self.handlers = {}
+        self.aliases = {}             # "type" viejo -> (comando, valores por defecto)
+        self.queue = []
+        # Estadísticas
+        self.received = 0
+        self.done = 0
+        self.errors = 0
+        self.dropped = 0
+        self.ignored = 0              # Mensajes que no eran comandos
+        self.last = None
+
+    def register(self, name, handler):
+        self.handlers[name] = handler
+
+    def alias(self, msg_type, name, **defaults):
+        """Acepta {"type": msg_type} como el comando `name` (sin respuesta)"""
+        self.aliases[msg_type] = (name, defaults)
+
+    def _match_alias(self, msg):
+        for msg_type in self.aliases:
+            if msg_type in msg:
+                return True
+        return False
+
+    def feed(self, msg):
+        """Revisa un mensaje recibido. Retorna True si encoló un comando"""
+        if not isinstance(msg, str) or not msg.startswith("{"):
+            return False
+        if '"cmd"' not in msg and not (self.aliases and self._match_alias(msg)):
+            self.ignored += 1
+            return False
+        try:
+            parsed = json.loads(msg)
+        except ValueError:
+            self.ignored += 1
+            return False
+        if not isinstance(parsed, dict) or parsed.get("type") == "cmd_result":
+            return False  # Nuestras propias respuestas (servidores que reenvían todo)
+
+        if "cmd" in parsed:
+            reply = True
+        else:
+            entry = self.aliases.get(parsed.get("type"))
+            if entry is None:
+                self.ignored += 1
+                return False
+            name, defaults = entry
+            for key, value in defaults.items():
+                parsed.setdefault(key, value)
+            parsed["cmd"] = name
+            reply = False
+
+        self.received += 1
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            if reply:
+                self._reply(parsed, False, "cola de comandos llena")
+            return False
+        self.queue.append((parsed, reply))
+        return True
+
+    @property
+    def pending(self):
+        return len(self.queue)
+
+    def run(self):
+        """Ejecuta el próximo comando de la cola. Retorna True si quedan más"""
+        if not self.queue:
+            return False
+        parsed, reply = self.queue.pop(0)
+        name = parsed.get("cmd")
+        self.last = name
+        handler = self.handlers.get(name)
+        if handler is None:
+            self.errors += 1
+            print(f"⚠️ Comando desconocido: {name}")
+            if reply:
+                self._reply(parsed, False, "comando desconocido")
+            return bool(self.queue)
+
+        print(f"📨 Comando: {name}")
+        try:
+            result = handler(parsed)
+        except Exception as e:
+            self.errors += 1
+            print(f"❌ Comando {name}: {e}")
+            if reply:
+                self._reply(parsed, False, str(e))
+        else:
+            self.done += 1
+            if reply:
+                self._reply(parsed, True, result)
+        return bool(self.queue)
+
+    def _reply(self, parsed, ok, data):
+        answer = {"type": "cmd_result", "cmd": parsed.get("cmd"), "ok": ok}
+        if "id" in parsed:
+            answer["id"] = parsed["id"]
+        if not ok:
+            answer["error"] = data
+        elif data is not None:
+            answer["result"] = data
+        try:
+            self.send(json.dumps(answer))
+        except Exception as e:
+            print(f"⚠️ No se pudo responder {parsed.get('cmd')}: {e}")
+
+    def summary(self):
+        return {
+            "received": self.received,
+            "done": self.done,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "ignored": self.ignored,
+            "last": self.last,
+        }
+
+    def report(self):
+        """Imprime los comandos y contadores (para usar desde el REPL)"""
+        print(f"📨 Comandos: {', '.join(sorted(self.handlers))}")
+        print(f"   Recibidos {self.received}, ejecutados {self.done}, errores {self.errors}, "
+              f"descartados {self.dropped}, otros mensajes {self.ignored}, en cola {len(self.queue)}")
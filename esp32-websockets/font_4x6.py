@@ -0,0 +1,45 @@
+# font_4x6.py - Generado por tools/bdf2font.py desde tiny-4x6.bdf
+# ¡No editar a mano! Regenerar con:
+#   python tools/bdf2font.py tools/fonts/tiny-4x6.bdf -o esp32-websockets/font_4x6.py --fold-case
+from micropython import const
+
+HEIGHT = const(6)
+PAGES = const(1)
+SPACING = const(1)
+FIRST = const(32)
+LAST = const(127)  # 127 = '°'
+
+# Offset de cada glifo en GLYPHS (uint16 little-endian)
+INDEX = (
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x04\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x08\x00\x0c\x00\x00\x00'
+    b'\x10\x00\x14\x00\x18\x00\x1c\x00\x20\x00\x24\x00\x28\x00\x2c\x00'
+    b'\x30\x00\x34\x00\x38\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x40\x00'
+)
+
+# Columnas de cada glifo
+WIDTHS = (
+    b'\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+)
+
+# Columnas MONO_VLSB (bit 0 = fila superior)
+GLYPHS = (
+    b'\x00\x00\x00\x00\x06\x26\x32\x31\x08\x08\x08\x08\x20\x20\x00\x00'
+    b'\x3e\x01\x01\x3e\x02\x3f\x00\x00\x22\x11\x09\x06\x22\x09\x09\x36'
+    b'\x18\x14\x3f\x10\x27\x05\x05\x39\x3e\x09\x09\x30\x01\x31\x09\x07'
+    b'\x36\x09\x09\x36\x06\x09\x09\x3e\x36\x36\x00\x00\x3e\x01\x01\x22'
+    b'\x06\x09\x09\x06'
+)
@@ -0,0 +1,70 @@
+# font_5x7.py - Generado por tools/bdf2font.py desde small-5x7.bdf
+# ¡No editar a mano! Regenerar con:
+#   python tools/bdf2font.py tools/fonts/small-5x7.bdf -o esp32-websockets/font_5x7.py
+from micropython import const
+
+HEIGHT = const(7)
+PAGES = const(1)
+SPACING = const(1)
+FIRST = const(32)
+LAST = const(127)  # 127 = '°'
+
+# Offset de cada glifo en GLYPHS (uint16 little-endian)
+INDEX = (
+    b'\x00\x00\x05\x00\x0a\x00\x0f\x00\x14\x00\x19\x00\x1e\x00\x23\x00'
+    b'\x28\x00\x2d\x00\x32\x00\x37\x00\x3c\x00\x41\x00\x46\x00\x4b\x00'
+    b'\x50\x00\x55\x00\x5a\x00\x5f\x00\x64\x00\x69\x00\x6e\x00\x73\x00'
+    b'\x78\x00\x7d\x00\x82\x00\x87\x00\x8c\x00\x91\x00\x96\x00\x9b\x00'
+    b'\xa0\x00\xa5\x00\xaa\x00\xaf\x00\xb4\x00\xb9\x00\xbe\x00\xc3\x00'
+    b'\xc8\x00\xcd\x00\xd2\x00\xd7\x00\xdc\x00\xe1\x00\xe6\x00\xeb\x00'
+    b'\xf0\x00\xf5\x00\xfa\x00\xff\x00\x04\x01\x09\x01\x0e\x01\x13\x01'
+    b'\x18\x01\x1d\x01\x22\x01\x27\x01\x2c\x01\x31\x01\x36\x01\x3b\x01'
+    b'\x40\x01\x45\x01\x4a\x01\x4f\x01\x54\x01\x59\x01\x5e\x01\x63\x01'
+    b'\x68\x01\x6d\x01\x72\x01\x77\x01\x7c\x01\x81\x01\x86\x01\x8b\x01'
+    b'\x90\x01\x95\x01\x9a\x01\x9f\x01\xa4\x01\xa9\x01\xae\x01\xb3\x01'
+    b'\xb8\x01\xbd\x01\xc2\x01\xc7\x01\xcc\x01\xd1\x01\xd6\x01\xdb\x01'
+)
+
+# Columnas de cada glifo
+WIDTHS = (
+    b'\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05'
+    b'\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05'
+    b'\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05'
+    b'\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05'
+    b'\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05'
+    b'\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05'
+)
+
+# Columnas MONO_VLSB (bit 0 = fila superior)
+GLYPHS = (
+    b'\x00\x00\x00\x00\x00\x00\x00\x5f\x00\x00\x00\x07\x00\x07\x00\x14'
+    b'\x7f\x14\x7f\x14\x24\x2a\x7f\x2a\x12\x46\x26\x10\x08\x32\x36\x49'
+    b'\x55\x22\x50\x00\x05\x03\x00\x00\x00\x1c\x22\x41\x00\x00\x41\x22'
+    b'\x1c\x00\x14\x08\x3e\x08\x14\x08\x08\x3e\x08\x08\x00\x50\x30\x00'
+    b'\x00\x08\x08\x08\x08\x08\x00\x60\x60\x00\x00\x20\x10\x08\x04\x02'
+    b'\x3e\x51\x49\x45\x3e\x00\x42\x7f\x40\x00\x42\x61\x51\x49\x46\x21'
+    b'\x41\x45\x4b\x31\x18\x14\x12\x7f\x10\x27\x45\x45\x45\x39\x3c\x4a'
+    b'\x49\x49\x30\x01\x71\x09\x05\x03\x36\x49\x49\x49\x36\x06\x49\x49'
+    b'\x29\x1e\x00\x36\x36\x00\x00\x00\x56\x36\x00\x00\x08\x14\x22\x41'
+    b'\x00\x14\x14\x14\x14\x14\x00\x41\x22\x14\x08\x02\x01\x51\x09\x06'
+    b'\x32\x49\x79\x41\x3e\x7e\x11\x11\x11\x7e\x7f\x49\x49\x49\x36\x3e'
+    b'\x41\x41\x41\x22\x7f\x41\x41\x22\x1c\x7f\x49\x49\x49\x41\x7f\x09'
+    b'\x09\x09\x01\x3e\x41\x49\x49\x7a\x7f\x08\x08\x08\x7f\x00\x41\x7f'
+    b'\x41\x00\x20\x40\x41\x3f\x01\x7f\x08\x14\x22\x41\x7f\x40\x40\x40'
+    b'\x40\x7f\x02\x0c\x02\x7f\x7f\x04\x08\x10\x7f\x3e\x41\x41\x41\x3e'
+    b'\x7f\x09\x09\x09\x06\x3e\x41\x51\x21\x5e\x7f\x09\x19\x29\x46\x46'
+    b'\x49\x49\x49\x31\x01\x01\x7f\x01\x01\x3f\x40\x40\x40\x3f\x1f\x20'
+    b'\x40\x20\x1f\x3f\x40\x38\x40\x3f\x63\x14\x08\x14\x63\x07\x08\x70'
+    b'\x08\x07\x61\x51\x49\x45\x43\x00\x7f\x41\x41\x00\x02\x04\x08\x10'
+    b'\x20\x00\x41\x41\x7f\x00\x04\x02\x01\x02\x04\x40\x40\x40\x40\x40'
+    b'\x00\x01\x02\x04\x00\x20\x54\x54\x54\x78\x7f\x48\x44\x44\x38\x38'
+    b'\x44\x44\x44\x20\x38\x44\x44\x48\x7f\x38\x54\x54\x54\x18\x08\x7e'
+    b'\x09\x01\x02\x0c\x52\x52\x52\x3e\x7f\x08\x04\x04\x78\x00\x44\x7d'
+    b'\x40\x00\x20\x40\x44\x3d\x00\x7f\x10\x28\x44\x00\x00\x41\x7f\x40'
+    b'\x00\x7c\x04\x18\x04\x78\x7c\x08\x04\x04\x78\x38\x44\x44\x44\x38'
+    b'\x7c\x14\x14\x14\x08\x08\x14\x14\x18\x7c\x7c\x08\x04\x04\x08\x48'
+    b'\x54\x54\x54\x20\x04\x3f\x44\x40\x20\x3c\x40\x40\x20\x7c\x1c\x20'
+    b'\x40\x20\x1c\x3c\x40\x30\x40\x3c\x44\x28\x10\x28\x44\x0c\x50\x50'
+    b'\x50\x3c\x44\x64\x54\x4c\x44\x00\x08\x36\x41\x00\x00\x00\x7f\x00'
+    b'\x00\x00\x41\x36\x08\x00\x08\x04\x08\x10\x08\x00\x06\x09\x09\x06'
+)
@@ -0,0 +1,57 @@
+# font_big2.py - Generado por tools/bdf2font.py desde small-5x7.bdf
+# ¡No editar a mano! Regenerar con:
+#   python tools/bdf2font.py tools/fonts/small-5x7.bdf -o esp32-websockets/font_big2.py --scale 2 --only 0123456789.-+ --proportional --tabular-digits
+from micropython import const
+
+HEIGHT = const(14)
+PAGES = const(2)
+SPACING = const(2)
+FIRST = const(32)
+LAST = const(127)  # 127 = '°'
+
+# Offset de cada glifo en GLYPHS (uint16 little-endian)
+INDEX = (
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x0c\x00\x00\x00\x20\x00\x34\x00\x00\x00'
+    b'\x3c\x00\x50\x00\x64\x00\x78\x00\x8c\x00\xa0\x00\xb4\x00\xc8\x00'
+    b'\xdc\x00\xf0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+)
+
+# Columnas de cada glifo
+WIDTHS = (
+    b'\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x0a\x06\x0a\x04\x06'
+    b'\x0a\x0a\x0a\x0a\x0a\x0a\x0a\x0a\x0a\x0a\x06\x06\x06\x06\x06\x06'
+    b'\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06'
+)
+
+# Columnas MONO_VLSB (bit 0 = fila superior)
+GLYPHS = (
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xc0\x00\xc0\x00'
+    b'\xc0\x00\xc0\x00\xfc\x0f\xfc\x0f\xc0\x00\xc0\x00\xc0\x00\xc0\x00'
+    b'\xc0\x00\xc0\x00\xc0\x00\xc0\x00\xc0\x00\xc0\x00\xc0\x00\xc0\x00'
+    b'\xc0\x00\xc0\x00\x00\x3c\x00\x3c\x00\x3c\x00\x3c\xfc\x0f\xfc\x0f'
+    b'\x03\x33\x03\x33\xc3\x30\xc3\x30\x33\x30\x33\x30\xfc\x0f\xfc\x0f'
+    b'\x00\x00\x00\x00\x0c\x30\x0c\x30\xff\x3f\xff\x3f\x00\x30\x00\x30'
+    b'\x00\x00\x00\x00\x0c\x30\x0c\x30\x03\x3c\x03\x3c\x03\x33\x03\x33'
+    b'\xc3\x30\xc3\x30\x3c\x30\x3c\x30\x03\x0c\x03\x0c\x03\x30\x03\x30'
+    b'\x33\x30\x33\x30\xcf\x30\xcf\x30\x03\x0f\x03\x0f\xc0\x03\xc0\x03'
+    b'\x30\x03\x30\x03\x0c\x03\x0c\x03\xff\x3f\xff\x3f\x00\x03\x00\x03'
+    b'\x3f\x0c\x3f\x0c\x33\x30\x33\x30\x33\x30\x33\x30\x33\x30\x33\x30'
+    b'\xc3\x0f\xc3\x0f\xf0\x0f\xf0\x0f\xcc\x30\xcc\x30\xc3\x30\xc3\x30'
+    b'\xc3\x30\xc3\x30\x00\x0f\x00\x0f\x03\x00\x03\x00\x03\x3f\x03\x3f'
+    b'\xc3\x00\xc3\x00\x33\x00\x33\x00\x0f\x00\x0f\x00\x3c\x0f\x3c\x0f'
+    b'\xc3\x30\xc3\x30\xc3\x30\xc3\x30\xc3\x30\xc3\x30\x3c\x0f\x3c\x0f'
+    b'\x3c\x00\x3c\x00\xc3\x30\xc3\x30\xc3\x30\xc3\x30\xc3\x0c\xc3\x0c'
+    b'\xfc\x03\xfc\x03'
+)
@@ -0,0 +1,77 @@
+# font_big3.py - Generado por tools/bdf2font.py desde small-5x7.bdf
+# ¡No editar a mano! Regenerar con:
+#   python tools/bdf2font.py tools/fonts/small-5x7.bdf -o esp32-websockets/font_big3.py --scale 3 --only 0123456789.-+ --proportional --tabular-digits
+from micropython import const
+
+HEIGHT = const(21)
+PAGES = const(3)
+SPACING = const(3)
+FIRST = const(32)
+LAST = const(127)  # 127 = '°'
+
+# Offset de cada glifo en GLYPHS (uint16 little-endian)
+INDEX = (
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x1b\x00\x00\x00\x48\x00\x75\x00\x00\x00'
+    b'\x87\x00\xb4\x00\xe1\x00\x0e\x01\x3b\x01\x68\x01\x95\x01\xc2\x01'
+    b'\xef\x01\x1c\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+)
+
+# Columnas de cada glifo
+WIDTHS = (
+    b'\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x0f\x09\x0f\x06\x09'
+    b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x09\x09\x09\x09\x09\x09'
+    b'\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09'
+    b'\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09'
+    b'\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09'
+    b'\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09\x09'
+)
+
+# Columnas MONO_VLSB (bit 0 = fila superior)
+GLYPHS = (
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x0e\x00\x00\x0e'
+    b'\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\xf8\xff\x03'
+    b'\xf8\xff\x03\xf8\xff\x03\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00'
+    b'\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e'
+    b'\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00'
+    b'\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00\x0e\x00\x00'
+    b'\x0e\x00\x00\x0e\x00\x00\x80\x1f\x00\x80\x1f\x00\x80\x1f\x00\x80'
+    b'\x1f\x00\x80\x1f\x00\x80\x1f\xf8\xff\x03\xf8\xff\x03\xf8\xff\x03'
+    b'\x07\x70\x1c\x07\x70\x1c\x07\x70\x1c\x07\x0e\x1c\x07\x0e\x1c\x07'
+    b'\x0e\x1c\xc7\x01\x1c\xc7\x01\x1c\xc7\x01\x1c\xf8\xff\x03\xf8\xff'
+    b'\x03\xf8\xff\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00\x38\x00\x1c'
+    b'\x38\x00\x1c\x38\x00\x1c\xff\xff\x1f\xff\xff\x1f\xff\xff\x1f\x00'
+    b'\x00\x1c\x00\x00\x1c\x00\x00\x1c\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x38\x00\x1c\x38\x00\x1c\x38\x00\x1c\x07\x80\x1f\x07\x80\x1f'
+    b'\x07\x80\x1f\x07\x70\x1c\x07\x70\x1c\x07\x70\x1c\x07\x0e\x1c\x07'
+    b'\x0e\x1c\x07\x0e\x1c\xf8\x01\x1c\xf8\x01\x1c\xf8\x01\x1c\x07\x80'
+    b'\x03\x07\x80\x03\x07\x80\x03\x07\x00\x1c\x07\x00\x1c\x07\x00\x1c'
+    b'\xc7\x01\x1c\xc7\x01\x1c\xc7\x01\x1c\x3f\x0e\x1c\x3f\x0e\x1c\x3f'
+    b'\x0e\x1c\x07\xf0\x03\x07\xf0\x03\x07\xf0\x03\x00\x7e\x00\x00\x7e'
+    b'\x00\x00\x7e\x00\xc0\x71\x00\xc0\x71\x00\xc0\x71\x00\x38\x70\x00'
+    b'\x38\x70\x00\x38\x70\x00\xff\xff\x1f\xff\xff\x1f\xff\xff\x1f\x00'
+    b'\x70\x00\x00\x70\x00\x00\x70\x00\xff\x81\x03\xff\x81\x03\xff\x81'
+    b'\x03\xc7\x01\x1c\xc7\x01\x1c\xc7\x01\x1c\xc7\x01\x1c\xc7\x01\x1c'
+    b'\xc7\x01\x1c\xc7\x01\x1c\xc7\x01\x1c\xc7\x01\x1c\x07\xfe\x03\x07'
+    b'\xfe\x03\x07\xfe\x03\xc0\xff\x03\xc0\xff\x03\xc0\xff\x03\x38\x0e'
+    b'\x1c\x38\x0e\x1c\x38\x0e\x1c\x07\x0e\x1c\x07\x0e\x1c\x07\x0e\x1c'
+    b'\x07\x0e\x1c\x07\x0e\x1c\x07\x0e\x1c\x00\xf0\x03\x00\xf0\x03\x00'
+    b'\xf0\x03\x07\x00\x00\x07\x00\x00\x07\x00\x00\x07\xf0\x1f\x07\xf0'
+    b'\x1f\x07\xf0\x1f\x07\x0e\x00\x07\x0e\x00\x07\x0e\x00\xc7\x01\x00'
+    b'\xc7\x01\x00\xc7\x01\x00\x3f\x00\x00\x3f\x00\x00\x3f\x00\x00\xf8'
+    b'\xf1\x03\xf8\xf1\x03\xf8\xf1\x03\x07\x0e\x1c\x07\x0e\x1c\x07\x0e'
+    b'\x1c\x07\x0e\x1c\x07\x0e\x1c\x07\x0e\x1c\x07\x0e\x1c\x07\x0e\x1c'
+    b'\x07\x0e\x1c\xf8\xf1\x03\xf8\xf1\x03\xf8\xf1\x03\xf8\x01\x00\xf8'
+    b'\x01\x00\xf8\x01\x00\x07\x0e\x1c\x07\x0e\x1c\x07\x0e\x1c\x07\x0e'
+    b'\x1c\x07\x0e\x1c\x07\x0e\x1c\x07\x8e\x03\x07\x8e\x03\x07\x8e\x03'
+    b'\xf8\x7f\x00\xf8\x7f\x00\xf8\x7f\x00'
+)
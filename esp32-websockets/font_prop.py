@@ -0,0 +1,67 @@
+# font_prop.py - Generado por tools/bdf2font.py desde small-5x7.bdf
+# ¡No editar a mano! Regenerar con:
+#   python tools/bdf2font.py tools/fonts/small-5x7.bdf -o esp32-websockets/font_prop.py --proportional
+from micropython import const
+
+HEIGHT = const(7)
+PAGES = const(1)
+SPACING = const(1)
+FIRST = const(32)
+LAST = const(127)  # 127 = '°'
+
+# Offset de cada glifo en GLYPHS (uint16 little-endian)
+INDEX = (
+    b'\x00\x00\x03\x00\x04\x00\x07\x00\x0c\x00\x11\x00\x16\x00\x1b\x00'
+    b'\x1d\x00\x20\x00\x23\x00\x28\x00\x2d\x00\x2f\x00\x34\x00\x36\x00'
+    b'\x3b\x00\x40\x00\x43\x00\x48\x00\x4d\x00\x52\x00\x57\x00\x5c\x00'
+    b'\x61\x00\x66\x00\x6b\x00\x6d\x00\x6f\x00\x73\x00\x78\x00\x7c\x00'
+    b'\x81\x00\x86\x00\x8b\x00\x90\x00\x95\x00\x9a\x00\x9f\x00\xa4\x00'
+    b'\xa9\x00\xae\x00\xb1\x00\xb6\x00\xbb\x00\xc0\x00\xc5\x00\xca\x00'
+    b'\xcf\x00\xd4\x00\xd9\x00\xde\x00\xe3\x00\xe8\x00\xed\x00\xf2\x00'
+    b'\xf7\x00\xfc\x00\x01\x01\x06\x01\x09\x01\x0e\x01\x11\x01\x16\x01'
+    b'\x1b\x01\x1e\x01\x23\x01\x28\x01\x2d\x01\x32\x01\x37\x01\x3c\x01'
+    b'\x41\x01\x46\x01\x49\x01\x4d\x01\x51\x01\x54\x01\x59\x01\x5e\x01'
+    b'\x63\x01\x68\x01\x6d\x01\x72\x01\x77\x01\x7c\x01\x81\x01\x86\x01'
+    b'\x8b\x01\x90\x01\x95\x01\x9a\x01\x9d\x01\x9e\x01\xa1\x01\xa6\x01'
+)
+
+# Columnas de cada glifo
+WIDTHS = (
+    b'\x03\x01\x03\x05\x05\x05\x05\x02\x03\x03\x05\x05\x02\x05\x02\x05'
+    b'\x05\x03\x05\x05\x05\x05\x05\x05\x05\x05\x02\x02\x04\x05\x04\x05'
+    b'\x05\x05\x05\x05\x05\x05\x05\x05\x05\x03\x05\x05\x05\x05\x05\x05'
+    b'\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x03\x05\x03\x05\x05'
+    b'\x03\x05\x05\x05\x05\x05\x05\x05\x05\x03\x04\x04\x03\x05\x05\x05'
+    b'\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x03\x01\x03\x05\x04'
+)
+
+# Columnas MONO_VLSB (bit 0 = fila superior)
+GLYPHS = (
+    b'\x00\x00\x00\x5f\x07\x00\x07\x14\x7f\x14\x7f\x14\x24\x2a\x7f\x2a'
+    b'\x12\x46\x26\x10\x08\x32\x36\x49\x55\x22\x50\x05\x03\x1c\x22\x41'
+    b'\x41\x22\x1c\x14\x08\x3e\x08\x14\x08\x08\x3e\x08\x08\x50\x30\x08'
+    b'\x08\x08\x08\x08\x60\x60\x20\x10\x08\x04\x02\x3e\x51\x49\x45\x3e'
+    b'\x42\x7f\x40\x42\x61\x51\x49\x46\x21\x41\x45\x4b\x31\x18\x14\x12'
+    b'\x7f\x10\x27\x45\x45\x45\x39\x3c\x4a\x49\x49\x30\x01\x71\x09\x05'
+    b'\x03\x36\x49\x49\x49\x36\x06\x49\x49\x29\x1e\x36\x36\x56\x36\x08'
+    b'\x14\x22\x41\x14\x14\x14\x14\x14\x41\x22\x14\x08\x02\x01\x51\x09'
+    b'\x06\x32\x49\x79\x41\x3e\x7e\x11\x11\x11\x7e\x7f\x49\x49\x49\x36'
+    b'\x3e\x41\x41\x41\x22\x7f\x41\x41\x22\x1c\x7f\x49\x49\x49\x41\x7f'
+    b'\x09\x09\x09\x01\x3e\x41\x49\x49\x7a\x7f\x08\x08\x08\x7f\x41\x7f'
+    b'\x41\x20\x40\x41\x3f\x01\x7f\x08\x14\x22\x41\x7f\x40\x40\x40\x40'
+    b'\x7f\x02\x0c\x02\x7f\x7f\x04\x08\x10\x7f\x3e\x41\x41\x41\x3e\x7f'
+    b'\x09\x09\x09\x06\x3e\x41\x51\x21\x5e\x7f\x09\x19\x29\x46\x46\x49'
+    b'\x49\x49\x31\x01\x01\x7f\x01\x01\x3f\x40\x40\x40\x3f\x1f\x20\x40'
+    b'\x20\x1f\x3f\x40\x38\x40\x3f\x63\x14\x08\x14\x63\x07\x08\x70\x08'
+    b'\x07\x61\x51\x49\x45\x43\x7f\x41\x41\x02\x04\x08\x10\x20\x41\x41'
+    b'\x7f\x04\x02\x01\x02\x04\x40\x40\x40\x40\x40\x01\x02\x04\x20\x54'
+    b'\x54\x54\x78\x7f\x48\x44\x44\x38\x38\x44\x44\x44\x20\x38\x44\x44'
+    b'\x48\x7f\x38\x54\x54\x54\x18\x08\x7e\x09\x01\x02\x0c\x52\x52\x52'
+    b'\x3e\x7f\x08\x04\x04\x78\x44\x7d\x40\x20\x40\x44\x3d\x7f\x10\x28'
+    b'\x44\x41\x7f\x40\x7c\x04\x18\x04\x78\x7c\x08\x04\x04\x78\x38\x44'
+    b'\x44\x44\x38\x7c\x14\x14\x14\x08\x08\x14\x14\x18\x7c\x7c\x08\x04'
+    b'\x04\x08\x48\x54\x54\x54\x20\x04\x3f\x44\x40\x20\x3c\x40\x40\x20'
+    b'\x7c\x1c\x20\x40\x20\x1c\x3c\x40\x30\x40\x3c\x44\x28\x10\x28\x44'
+    b'\x0c\x50\x50\x50\x3c\x44\x64\x54\x4c\x44\x08\x36\x41\x7f\x41\x36'
+    b'\x08\x08\x04\x08\x10\x08\x06\x09\x09\x06'
+)
@@ -0,0 +1,97 @@
+# import_bench.py - Cuánto cuesta importar cada módulo en el ESP32
+# Guarda este archivo en el ESP32 (o córrelo con: mpremote run import_bench.py)
+#
+# Por cada módulo (en orden, así las dependencias ya están cargadas):
+#   ms     tiempo de import: con un .py incluye compilar en el equipo
+#   peak   bytes asignados durante el import con el GC desactivado: todo lo
+#          que se pidió (compilador incluido), cota del pico de heap
+#   kept   bytes que quedan ocupados después de gc.collect()
+#   kind   "py", "mpy" o "frozen" (lo que encontró el import)
+# Comparar un equipo con .py contra uno con .mpy (tools/build_mpy.py) da el
+# ahorro de arranque. El tiempo hasta la primera telemetría lo reporta la
+# app ("boot" en loop_stats; bootv4.py además mide cada etapa del arranque).
+# monitor.timesync y monitor.diag son los que bootv4.py importa recién al usarlos.
+#
+# Uso:
+#   import import_bench
+#   import_bench.run()                       # tabla
+#   import_bench.run(["ws_client"], as_json=True)
+
+import gc
+import os
+import sys
+import time
+
+MODULES = ("scheduler", "loop_profiler", "backoff", "commands", "ota",
+           "oled_governor", "oled_power", "oledfont", "font_5x7", "font_4x6",
+           "font_prop", "font_big2", "font_big3", "ssd1306", "sh1106",
+           "oled_hal", "power_mode", "memory", "log", "wifi_manager",
+           "ws_client", "monitor.config", "monitor.state", "monitor.sensors",
+           "monitor.display", "monitor.telemetry", "monitor.remote", "monitor.net",
+           "monitor.app", "monitor.timesync", "monitor.diag")
+
+
+def _kind(name):
+    path = name.replace(".", "/")
+    for ext in (".py", ".mpy"):  # El import prefiere el .py si están los dos
+        try:
+            os.stat(path + ext)
+            return ext[1:]
+        except OSError:
+            pass
+    return "frozen"
+
+
+def measure(name):
+    """Importa `name` de cero. Retorna dict con ms, peak, kept, kind"""
+    if name in sys.modules:
+        del sys.modules[name]
+    gc.collect()
+    base = gc.mem_alloc()
+    result = {"module": name, "kind": _kind(name)}
+    gc.disable()
+    t0 = time.ticks_us()
+    try:
+        __import__(name)
+        result["ms"] = time.ticks_diff(time.ticks_us(), t0) // 100 / 10
+        result["peak"] = gc.mem_alloc() - base
+    except MemoryError:
+        # Sin GC no alcanzó el heap: medir solo el tiempo
+        gc.enable()
+        sys.modules.pop(name, None)
+        gc.collect()
+        t0 = time.ticks_us()
+        __import__(name)
+        result["ms"] = time.ticks_diff(time.ticks_us(), t0) // 100 / 10
+        result["peak"] = None
+    except Exception as e:
+        result["error"] = str(e)
+    gc.enable()
+    gc.collect()
+    result["kept"] = gc.mem_alloc() - base
+    return result
+
+
+def run(modules=MODULES, as_json=False):
+    gc.collect()
+    free0 = gc.mem_free()
+    results = [measure(name) for name in modules]
+    total_ms = sum(r.get("ms") or 0 for r in results)
+    if as_json:
+        import json
+        print(json.dumps({"modules": results, "totalMs": total_ms,
+                          "heapFree": gc.mem_free(), "heapFreeBefore": free0}))
+        return results
+    print(f"{'módulo':<18} {'tipo':<6} {'ms':>7} {'pico':>8} {'queda':>7}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['module']:<18} {r['kind']:<6} error: {r['error']}")
+            continue
+        peak = r["peak"] if r["peak"] is not None else "-"
+        print(f"{r['module']:<18} {r['kind']:<6} {r['ms']:>7} {peak:>8} {r['kept']:>7}")
+    print(f"Total {total_ms:.1f}ms, heap libre {free0} -> {gc.mem_free()} bytes")
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,217 @@
+# log.py - Log de consola por niveles y buffer circular binario de eventos
+# Guarda este archivo en el ESP32 junto con tu boot.py
+#
+# Un print() con f-string arma el texto aunque nadie mire la consola, y con
+# el USB conectado además tarda lo que tarda la UART. Acá:
+#
+#   - Niveles (debug, info, warn, error): debug()/info()/... reciben el
+#     formato y hasta 4 valores sueltos; el texto se arma (str.format) solo
+#     si el nivel está habilitado. Filtrado no asigna memoria
+#   - Borrables al compilar: los mensajes del camino caliente van dentro de
+#     `if __debug__:`. Con `mpy-cross -O1` (tools/build_mpy.py -O 1)
+#     __debug__ es False y el bloque ni se compila
+#   - Buffer circular binario: record(ev, a, b, c) guarda ticks_ms, nivel,
+#     evento y tres enteros (int32) en un bytearray preasignado con
+#     struct.pack_into. Siempre activo y sin asignar memoria. Los eventos se
+#     registran con event("nombre") al importar (hasta 256)
+#   - Tras una falla: save() escribe el buffer en la flash; al arrancar,
+#     load_saved() lo recupera (dump() lo imprime, entries() lo pasa a JSON)
+#
+# Uso:
+#   from log import Log, event
+#   EV_SEND = event("ws_send")                  # al importar el módulo
+#   log = Log(level="info", ring=64)
+#   log.info("✓ WebSocket conectado en {}ms", ms)
+#   if __debug__:
+#       log.debug("📤 WS | T.OUT: {}", temp)     # desaparece con -O1
+#   log.record(EV_SEND, temp10, hum)            # buffer circular
+#   log.dump()                                  # desde el REPL
+#   log.save()                                  # en el except de una falla
+
+from micropython import const
+import os
+import struct
+import time
+import _thread
+
+DEBUG = const(0)
+INFO = const(1)
+WARN = const(2)
+ERROR = const(3)
+OFF = const(4)
+LEVELS = ("debug", "info", "warn", "error", "off")
+
+FAULT_FILE = "log_falla.bin"
+
+# ticks_ms, nivel, evento, a, b, c
+_RECORD = "<IBBiii"
+RECORD_SIZE = struct.calcsize(_RECORD)
+
+EVENTS = []
+
+
+def event(name):
+    """Código (0..255) del evento `name` para record(); lo registra si es nuevo"""
+    if name in EVENTS:
+        return EVENTS.index(name)
+    if len(EVENTS) > 255:
+        raise ValueError("demasiados eventos")
+    EVENTS.append(name)
+    return len(EVENTS) - 1
+
+
+def level_of(level):
+    """Nivel como número ("info" o INFO)"""
+    if isinstance(level, str):
+        if level not in LEVELS:
+            raise ValueError(f"nivel desconocido: {level}")
+        return LEVELS.index(level)
+    return level
+
+
+class Log:
+    def __init__(self, level=INFO, ring=64, path=FAULT_FILE):
+        """level: nivel mínimo que se imprime ("debug"... "off" o DEBUG... OFF).
+        ring: eventos que guarda el buffer circular (RECORD_SIZE bytes cada uno).
+        path: archivo de save() / load_saved()"""
+        self.level = level_of(level)
+        self.size = ring
+        self.path = path
+        self.buf = bytearray(ring * RECORD_SIZE)
+        self.head = 0                 # Próxima posición a escribir
+        self.count = 0                # Eventos guardados (como mucho `ring`)
+        self.lock = _thread.allocate_lock()  # Graban los dos núcleos
+        # Estadísticas
+        self.printed = 0
+        self.filtered = 0
+        self.recorded = 0
+        self.previous = None          # Buffer de la falla anterior (load_saved)
+
+    def enabled(self, level):
+        """Para no calcular los valores de un mensaje que se va a filtrar"""
+        return level >= self.level
+
+    def _log(self, level, fmt, a, b, c, d):
+        if level < self.level:
+            self.filtered += 1
+            return
+        self.printed += 1
+        print(fmt.format(a, b, c, d))  # Los valores de más se ignoran
+
+    def debug(self, fmt, a=None, b=None, c=None, d=None):
+        self._log(DEBUG, fmt, a, b, c, d)
+
+    def info(self, fmt, a=None, b=None, c=None, d=None):
+        self._log(INFO, fmt, a, b, c, d)
+
+    def warn(self, fmt, a=None, b=None, c=None, d=None):
+        self._log(WARN, fmt, a, b, c, d)
+
+    def error(self, fmt, a=None, b=None, c=None, d=None):
+        self._log(ERROR, fmt, a, b, c, d)
+
+    def record(self, ev, a=0, b=0, c=0, level=INFO):
+        """Guarda el evento `ev` (de event()) con tres enteros. No asigna memoria"""
+        lock = self.lock
+        lock.acquire()
+        try:
+            head = self.head
+            # Un valor fuera de int32 lanza struct.error: sin el finally el
+            # lock queda tomado y los dos núcleos se traban en el próximo record()
+            struct.pack_into(_RECORD, self.buf, head * RECORD_SIZE,
+                             time.ticks_ms(), level, ev, a, b, c)
+            head += 1
+            self.head = 0 if head == self.size else head
+            if self.count < self.size:
+                self.count += 1
+            self.recorded += 1
+        finally:
+            lock.release()
+
+    def set_level(self, level):
+        self.level = level_of(level)
+        return LEVELS[self.level]
+
+    def clear(self):
+        self.head = self.count = 0
+
+    def entries(self, last=None, data=None):
+        """[ms, nivel, evento, a, b, c] del más viejo al más nuevo (todos o los
+        últimos `last`). data: bytes de save() en lugar del buffer actual"""
+        if data is None:
+            lock = self.lock
+            lock.acquire()
+            try:
+                data, head, count = bytes(self.buf), self.head, self.count
+            finally:
+                lock.release()
+        else:
+            head, count = struct.unpack_from("<HH", data)
+            data = data[4:]
+        size = len(data) // RECORD_SIZE
+        if last is not None and last < count:
+            count = last
+        out = []
+        for i in range(count):
+            pos = (head - count + i) % size
+            ms, level, ev, a, b, c = struct.unpack_from(_RECORD, data, pos * RECORD_SIZE)
+            name = EVENTS[ev] if ev < len(EVENTS) else ev
+            out.append([ms, LEVELS[level] if level < OFF else level, name, a, b, c])
+        return out
+
+    def save(self):
+        """Escribe el buffer en la flash (en el except de una falla)"""
+        try:
+            with open(self.path, "wb") as f:
+                f.write(struct.pack("<HH", self.head, self.count))
+                f.write(self.buf)
+            return True
+        except Exception as e:
+            print(f"⚠ No se pudo guardar {self.path}: {e}")
+            return False
+
+    def load_saved(self, remove=True):
+        """Recupera el buffer de la falla anterior en self.previous (None si
+        no hay). Los nombres de los eventos salen de los event() actuales"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if remove:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self.previous = self.entries(data=data) if len(data) > 4 else []
+        return self.previous
+
+    def dump(self, last=None, previous=False):
+        """Imprime el buffer (o el de la falla anterior), del más viejo al más nuevo"""
+        rows = self.previous if previous else self.entries(last)
+        if not rows:
+            print("📜 Log: sin eventos")
+            return
+        if previous and last is not None:
+            rows = rows[-last:]
+        print(f"📜 Log: {len(rows)} eventos{' (falla anterior)' if previous else ''}")
+        for ms, level, name, a, b, c in rows:
+            print("   {:>10} {:<5} {:<14} {} {} {}".format(ms, level, name, a, b, c))
+
+    def summary(self):
+        return {
+            "level": LEVELS[self.level],
+            "printed": self.printed,
+            "filtered": self.filtered,
+            "recorded": self.recorded,
+            "ring": self.size,
+            "previous": len(self.previous) if self.previous is not None else None,
+        }
+
+    def report(self):
+        """Imprime el nivel y cuánto se imprimió / filtró (para usar desde el REPL)"""
+        s = self.summary()
+        print(f"📜 Log: nivel {s['level']}, {s['printed']} impresos, {s['filtered']} filtrados, "
+              f"{s['recorded']} eventos en el buffer ({self.count}/{self.size})")
+        if self.previous is not None:
+            print(f"   Falla anterior: {len(self.previous)} eventos (dump(previous=True))")
@@ -0,0 +1,183 @@
+# loop_profiler.py - Tiempos por tarea del loop principal (histogramas fijos)
+# Guarda este archivo en el ESP32 junto con tu boot.py
+#
+# Uso:
+#   import loop_profiler
+#   prof = loop_profiler.LoopProfiler(loop_ms=10)
+#   t_sensores = prof.task("sensores", 2000)   # nombre, intervalo previsto (ms)
+#   while True:
+#       now = time.ticks_ms()
+#       prof.tick(now)                          # jitter del loop completo
+#       if time.ticks_diff(now, last) >= 2000:
+#           t_sensores.run(read_sensors, now)   # o: t0 = t.start(now) ... t.stop(t0)
+#           last = now
+#   prof.report()                               # desde el REPL
+#
+# Todo se guarda en arrays preasignados: medir no asigna memoria en el loop.
+
+from micropython import const
+from array import array
+import time
+
+# Límites superiores de cada balde (el último es "más que eso")
+DURATION_EDGES_US = (100, 250, 500, 1000, 2500, 5000, 10000, 25000,
+                     50000, 100000, 250000, 500000)
+LATE_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+_DUR_BUCKETS = const(13)
+_LATE_BUCKETS = const(12)
+
+
+def _bucket(edges, value):
+    i = 0
+    for edge in edges:
+        if value <= edge:
+            return i
+        i += 1
+    return i
+
+
+def _percentile(hist, edges, pct, maximum):
+    """Límite superior del balde donde cae el percentil `pct`
+    (-1 si no hay datos; `maximum` si cae en el último balde)"""
+    total = 0
+    for n in hist:
+        total += n
+    if not total:
+        return -1
+    target = (total * pct + 99) // 100
+    seen = 0
+    for i in range(len(edges)):
+        seen += hist[i]
+        if seen >= target:
+            return edges[i]
+    return maximum
+
+
+class LoopTask:
+    """Una tarea del loop: duración (us) y retraso contra su intervalo (ms)"""
+
+    def __init__(self, name, interval_ms, profiler):
+        self.name = name
+        self.interval = interval_ms  # Se puede cambiar (p. ej. governor de la OLED)
+        self.profiler = profiler
+        self.dur_hist = array('L', [0] * _DUR_BUCKETS)
+        self.late_hist = array('L', [0] * _LATE_BUCKETS)
+        self.reset()
+
+    def reset(self):
+        for i in range(_DUR_BUCKETS):
+            self.dur_hist[i] = 0
+        for i in range(_LATE_BUCKETS):
+            self.late_hist[i] = 0
+        self.count = 0
+        self.last_us = 0
+        self.max_us = 0
+        self.max_late_ms = 0
+        # Total en ms + resto en us: enteros chicos, sin asignar memoria
+        self.total_ms = 0
+        self.acc_us = 0
+        self.last_start = None
+
+    def start(self, now):
+        """Inicio de la tarea (now = ticks_ms del loop). Retorna ticks_us"""
+        if not self.profiler.enabled:
+            return 0
+        if self.last_start is not None and self.interval:
+            late = time.ticks_diff(now, self.last_start) - self.interval
+            if late < 0:
+                late = 0
+            self.late_hist[_bucket(LATE_EDGES_MS, late)] += 1
+            if late > self.max_late_ms:
+                self.max_late_ms = late
+        self.last_start = now
+        return time.ticks_us()
+
+    def stop(self, t0):
+        """Fin de la tarea (t0 = lo que devolvió start())"""
+        if not self.profiler.enabled:
+            return 0
+        us = time.ticks_diff(time.ticks_us(), t0)
+        self.count += 1
+        self.last_us = us
+        if us > self.max_us:
+            self.max_us = us
+        self.dur_hist[_bucket(DURATION_EDGES_US, us)] += 1
+        self.acc_us += us
+        if self.acc_us >= 1000:
+            self.total_ms += self.acc_us // 1000
+            self.acc_us %= 1000
+        return us
+
+    def run(self, fn, now):
+        """Ejecuta fn() midiendo su duración. Retorna lo que retorne fn"""
+        t0 = self.start(now)
+        result = fn()
+        self.stop(t0)
+        return result
+
+    def avg_us(self):
+        if not self.count:
+            return 0
+        return (self.total_ms * 1000 + self.acc_us) // self.count
+
+    def p_us(self, pct):
+        return _percentile(self.dur_hist, DURATION_EDGES_US, pct, self.max_us)
+
+    def p_late_ms(self, pct):
+        return _percentile(self.late_hist, LATE_EDGES_MS, pct, self.max_late_ms)
+
+
+class LoopProfiler:
+    def __init__(self, loop_ms=10, enabled=True):
+        self.enabled = enabled
+        self.tasks = []
+        # El loop completo es una tarea más: retraso = período - sleep previsto
+        self.loop = LoopTask("loop", loop_ms, self)
+        self._loop_t0 = None
+        self.started = time.ticks_ms()
+
+    def task(self, name, interval_ms=0):
+        t = LoopTask(name, interval_ms, self)
+        self.tasks.append(t)
+        return t
+
+    def tick(self, now):
+        """Llamar al inicio de cada vuelta del loop"""
+        loop = self.loop
+        if self._loop_t0 is not None:
+            loop.stop(self._loop_t0)
+        self._loop_t0 = loop.start(now)
+
+    def reset(self):
+        self.loop.reset()
+        self._loop_t0 = None
+        for t in self.tasks:
+            t.reset()
+        self.started = time.ticks_ms()
+
+    def summary(self):
+        """Resumen compacto para el WebSocket:
+        {nombre: [veces, avg_us, p90_us, max_us, p90_retraso_ms, max_retraso_ms]}"""
+        out = {}
+        for t in self.tasks + [self.loop]:
+            out[t.name] = [t.count, t.avg_us(), t.p_us(90), t.max_us,
+                           t.p_late_ms(90), t.max_late_ms]
+        return out
+
+    def report(self):
+        """Imprime tabla e histogramas (para usar desde el REPL)"""
+        secs = time.ticks_diff(time.ticks_ms(), self.started) // 1000
+        print(f"⏱️  Loop profiler ({secs}s)")
+        print("   tarea           veces   avg_us   p90_us   max_us  p90_tarde  max_tarde")
+        for t in self.tasks + [self.loop]:
+            print("   {:<14} {:>6} {:>8} {:>8} {:>8} {:>8}ms {:>8}ms".format(
+                t.name, t.count, t.avg_us(), t.p_us(90), t.max_us,
+                t.p_late_ms(90), t.max_late_ms))
+        print("   Duración (us, límite superior del balde):")
+        for t in self.tasks + [self.loop]:
+            cells = []
+            for i in range(_DUR_BUCKETS):
+                if t.dur_hist[i]:
+                    edge = DURATION_EDGES_US[i] if i < len(DURATION_EDGES_US) else ">"
+                    cells.append(f"{edge}:{t.dur_hist[i]}")
+            print(f"   {t.name:<14} " + " ".join(cells))
@@ -0,0 +1,230 @@
+# memory.py - Heap y GC: memoria por tarea y recolección en los huecos del scheduler
+# Guarda este archivo en el ESP32 junto con tu boot.py
+#
+# Cada vuelta del loop arma f-strings, dicts, JSON y frames: sin gc.collect()
+# la recolección llega sola cuando el heap se llena, en cualquier momento
+# (a veces en medio del handshake TLS, que además es cuando más memoria
+# hace falta y donde aparecían los MemoryError).
+#
+#   - Por tarea del scheduler: bytes asignados por vuelta (promedio y
+#     máximo), heap libre mínimo al terminar, recolecciones que cayeron
+#     dentro de la tarea y bloque libre más grande (cada 16 vueltas)
+#   - idle(gap): el scheduler lo llama antes de dormir. Si desde la última
+#     recolección se asignaron `collect_bytes` (o quedan menos de
+#     `low_free` libres) y el hueco alcanza para recolectar, gc.collect()
+#     ahí. gc.threshold() queda en 2 x collect_bytes como red de seguridad
+#   - tls_begin() / tls_end(): alrededor del connect del WebSocket.
+#     Recolecta y no deja recolectar en los huecos hasta que termina el
+#     handshake (o se abandona el connect: tls_end() igual)
+#   - El bloque libre más grande es el del heap de ESP-IDF
+#     (esp32.idf_heap_info), de donde sacan memoria mbedTLS y el WiFi.
+#     Una reserva en el heap de MicroPython no le sirve a mbedTLS, así que
+#     acá solo se mide
+#
+# Uso:
+#   mem = Memory(collect_bytes=16384)     # lo antes posible
+#   sched = Scheduler(memory=mem)
+#   mem.tls_begin(); ws.connect(url); mem.tls_end()
+#   mem.report()                     # desde el REPL
+#   mem.summary()                    # dict para enviar por WebSocket
+
+import gc
+import time
+try:
+    import esp32
+except ImportError:
+    esp32 = None
+
+_BLOCK_EVERY = 16  # Vueltas entre mediciones del bloque libre (asigna una lista)
+
+
+def largest_block():
+    """Bloque libre más grande del heap de datos de ESP-IDF (None si no se puede medir)"""
+    info = getattr(esp32, "idf_heap_info", None)
+    if info is None:
+        return None
+    block = 0
+    for region in info(esp32.HEAP_DATA):
+        if region[2] > block:
+            block = region[2]
+    return block
+
+
+class HeapTask:
+    """Memoria de una tarea del scheduler"""
+
+    def __init__(self, name, memory):
+        self.name = name
+        self.memory = memory
+        self.reset()
+
+    def reset(self):
+        self.runs = 0
+        self.avg = 0              # Bytes por vuelta (media móvil 1/8)
+        self.max = 0
+        self.min_free = None
+        self.collected = 0        # Vueltas en las que el GC corrió dentro de la tarea
+        self.min_block = None
+
+    def start(self):
+        return gc.mem_alloc()
+
+    def stop(self, alloc0):
+        alloc = gc.mem_alloc()
+        used = alloc - alloc0
+        self.runs += 1
+        if used < 0:
+            self.collected += 1   # Recolectó en medio (automática o el otro núcleo)
+        else:
+            self.avg += (used - self.avg) >> 3
+            if used > self.max:
+                self.max = used
+        free = gc.mem_free()
+        if self.min_free is None or free < self.min_free:
+            self.min_free = free
+        memory = self.memory
+        if alloc > memory.peak_alloc:
+            memory.peak_alloc = alloc
+        if memory.min_free is None or free < memory.min_free:
+            memory.min_free = free
+        if self.runs % _BLOCK_EVERY == 1:
+            block = largest_block()
+            if block is not None and (self.min_block is None or block < self.min_block):
+                self.min_block = block
+                memory.note_block(block)
+
+
+class Memory:
+    def __init__(self, collect_bytes=16384, low_free=24576, min_gap_ms=10, threshold=True):
+        """collect_bytes: asignado desde la última recolección que dispara una en un hueco.
+        low_free: con menos heap libre que esto, recolectar en cualquier hueco.
+        min_gap_ms: hueco mínimo (se ajusta a lo que tarda gc.collect()).
+        threshold: gc.threshold(2 x collect_bytes) como red de seguridad"""
+        # CPython (tools/sim) no tiene mem_free/mem_alloc: todo queda apagado
+        self.enabled = hasattr(gc, "mem_free")
+        self.collect_bytes = collect_bytes
+        self.low_free = low_free
+        self.min_gap_ms = min_gap_ms
+        self.tasks = []
+        self.hold = False
+        # Estadísticas
+        self.collections = 0          # Total (huecos + TLS)
+        self.idle_collections = 0
+        self.tls_collections = 0
+        self.deferred = 0             # Hacía falta pero el hueco era corto (o TLS en curso)
+        self.collect_ms = 0           # Media móvil de gc.collect()
+        self.collect_max_ms = 0
+        self.peak_alloc = 0
+        self.min_free = None
+        self.min_block = None
+        self.tls_free = None          # Heap libre / bloque al empezar el último handshake
+        self.tls_block = None
+        self._last_alloc = 0
+        if not self.enabled:
+            return
+        self._collect()
+        if threshold:
+            gc.threshold(collect_bytes * 2)
+
+    def task(self, name):
+        """HeapTask para el scheduler (None sin mediciones)"""
+        if not self.enabled:
+            return None
+        t = HeapTask(name, self)
+        self.tasks.append(t)
+        return t
+
+    def note_block(self, block):
+        if self.min_block is None or block < self.min_block:
+            self.min_block = block
+
+    def _collect(self):
+        t0 = time.ticks_ms()
+        gc.collect()
+        ms = time.ticks_diff(time.ticks_ms(), t0)
+        self.collections += 1
+        self.collect_ms += (ms - self.collect_ms) // 4 if self.collections > 1 else ms
+        if ms > self.collect_max_ms:
+            self.collect_max_ms = ms
+        self._last_alloc = gc.mem_alloc()
+
+    def idle(self, gap_ms):
+        """Hueco de `gap_ms` antes del próximo vencimiento. Retorna True si recolectó"""
+        if not self.enabled:
+            return False
+        low = gc.mem_free() < self.low_free
+        if not low and gc.mem_alloc() - self._last_alloc < self.collect_bytes:
+            return False
+        if self.hold or (not low and gap_ms < max(self.min_gap_ms, 2 * self.collect_ms)):
+            self.deferred += 1
+            return False
+        self._collect()
+        self.idle_collections += 1
+        return True
+
+    def tls_begin(self):
+        """Antes del connect: recolecta y frena las recolecciones en los
+        huecos hasta tls_end()"""
+        if not self.enabled:
+            return
+        self._collect()
+        self.tls_collections += 1
+        self.hold = True
+        self.tls_free = gc.mem_free()
+        self.tls_block = largest_block()
+        if self.tls_block is not None:
+            self.note_block(self.tls_block)
+
+    def tls_end(self):
+        """Terminó el handshake (bien, mal o abandonado): vuelven las
+        recolecciones en los huecos"""
+        self.hold = False
+
+    def summary(self):
+        if not self.enabled:
+            return None
+        return {
+            "free": gc.mem_free(),
+            "alloc": gc.mem_alloc(),
+            "minFree": self.min_free,
+            "peakAlloc": self.peak_alloc,
+            "block": largest_block(),
+            "minBlock": self.min_block,
+            "collections": self.collections,
+            "idle": self.idle_collections,
+            "tls": self.tls_collections,
+            "deferred": self.deferred,
+            "collectMs": self.collect_ms,
+            "collectMaxMs": self.collect_max_ms,
+            "tlsFree": self.tls_free,
+            "tlsBlock": self.tls_block,
+            # nombre: [vueltas, bytes/vuelta, máx, libre mín, GC dentro, bloque mín]
+            "tasks": {t.name: [t.runs, t.avg, t.max, t.min_free, t.collected, t.min_block]
+                      for t in self.tasks},
+        }
+
+    def reset(self):
+        for t in self.tasks:
+            t.reset()
+        self.min_free = None
+        self.min_block = None
+        self.deferred = 0
+        self.collect_max_ms = 0
+        if self.enabled:
+            self.peak_alloc = gc.mem_alloc()
+
+    def report(self):
+        """Imprime heap, recolecciones y memoria por tarea (para usar desde el REPL)"""
+        if not self.enabled:
+            print("🧠 Memoria: sin gc.mem_free() (no es MicroPython)")
+            return
+        s = self.summary()
+        print(f"🧠 Heap: libre {s['free']} (mín {s['minFree']}), usado {s['alloc']} "
+              f"(pico {s['peakAlloc']}), bloque IDF {s['block']} (mín {s['minBlock']})")
+        print(f"   GC: {s['collections']} ({s['idle']} en huecos, {s['tls']} antes de TLS, "
+              f"{s['deferred']} postergadas), {s['collectMs']}ms (máx {s['collectMaxMs']}ms)")
+        print(f"   Último TLS: libre {s['tlsFree']}, bloque {s['tlsBlock']}")
+        print("   tarea            vueltas  bytes/v     máx   libre mín  GC dentro  bloque mín")
+        for t in self.tasks:
+            print("   {:<16} {:>7} {:>8} {:>7} {:>11} {:>10} {:>11}".format(
+                t.name, t.runs, t.avg, t.max, str(t.min_free), t.collected, str(t.min_block)))
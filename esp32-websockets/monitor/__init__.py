@@ -0,0 +1,22 @@
+# monitor - bootv3_2.py separado en módulos (lo arranca bootv4.py)
+# Guarda la carpeta monitor/ en el ESP32 junto con tu boot.py (bootv4.py)
+#
+# bootv3_2.py importaba todo e inicializaba I2C, sensores y OLED al
+# importarse. Aquí importar no hace nada: app.main() inicializa en orden y
+# mide cada etapa (state.boot["stages"], va en loop_stats).
+#   config      pines, red, períodos (lo que antes estaba arriba del script)
+#   state       estado compartido entre núcleos, schedulers y tiempos de arranque
+#   sensors     DHT22, DS18B20, puerta MC-38
+#   display     OLED, governor y energía del panel
+#   net         WiFi y WebSocket (Core 0)
+#   telemetry   envío de datos con banda muerta
+#   remote      comandos del servidor (commands.py)
+#   app         secuencia de arranque y loop del Core 1
+# Se importan recién cuando hacen falta:
+#   timesync    NTP (al conectar el WiFi)
+#   diag        estadísticas (REPL, request_stats, loop_stats periódico)
+#   ota.py      solo si hay una actualización en curso o llega ota_begin
+#
+# Uso (bootv4.py como boot.py):
+#   from monitor import app
+#   app.main()
@@ -0,0 +1,181 @@
+# app.py - Arranque del monitor: secuencia de inicialización y loop del Core 1
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# Importar este módulo solo carga lo que hace falta para arrancar. main()
+# inicializa en orden (memoria, log, ota, display, sensores, energía, WiFi,
+# NTP, red) y guarda cuánto tardó cada etapa en state.boot["stages"]. NTP,
+# OTA y las estadísticas se importan cuando se usan (ver monitor/__init__.py).
+# Si main() termina por una excepción, el buffer del log queda en la flash.
+#
+# Uso (bootv4.py):
+#   from monitor import app
+#   app.main()
+
+import os
+import sys
+import time
+import _thread
+from loop_profiler import LoopProfiler
+from scheduler import Scheduler, DELAY
+from power_mode import PowerManager, SocketWake
+from memory import Memory
+from log import Log, event, ERROR
+from monitor import config, state, sensors, display, net
+
+EV_FAULT = event("fault")  # a = 1 loop principal, 2 núcleo de red
+
+state.boot["importMs"] = time.ticks_ms()
+state.boot["heapFreeAfterImport"] = state.heap_libre()
+
+
+def etapa(name, fn, *args):
+    """Corre un paso del arranque y guarda cuánto tardó"""
+    start = time.ticks_ms()
+    result = fn(*args)
+    ms = time.ticks_diff(time.ticks_ms(), start)
+    state.boot["stages"].append([name, ms])
+    print(f"⏱ {name}: {ms}ms")
+    return result
+
+
+def ota_check():
+    """Si el arranque anterior aplicó una actualización, contarlo (y volver a
+    la versión anterior tras OTA_MAX_BOOTS arranques sin confirmar).
+    Sin diario no se importa ota.py"""
+    try:
+        os.stat(config.OTA_STATE_FILE)
+    except OSError:
+        return
+    import ota
+    state.ota_state = ota.boot_check(config.OTA_MAX_BOOTS)
+
+
+def init_memory():
+    """Lo primero: gc.threshold() y las mediciones desde el arranque"""
+    state.mem = Memory(collect_bytes=config.MEM_COLLECT_BYTES, low_free=config.MEM_LOW_FREE)
+
+
+def init_log():
+    """Buffer circular del log; si la corrida anterior terminó en una falla,
+    mostrar sus últimos eventos (también con request_log "previous")"""
+    state.log = Log(level=config.LOG_LEVEL, ring=config.LOG_RING)
+    if state.log.load_saved() is not None:
+        print("⚠ La corrida anterior terminó en una falla:")
+        state.log.dump(last=16, previous=True)
+
+
+def init_power():
+    """Profiler, energía y un scheduler por núcleo. Entre tareas se duerme
+    power.idle(); el hilo de red despierta también cuando llegan datos"""
+    state.loop_prof = LoopProfiler(loop_ms=0, enabled=config.LOOP_PROFILE)
+    state.power = PowerManager(config.POWER_MODE, config.POWER_LIGHTSLEEP_MIN_MS,
+                               wake_pin=sensors.mc38_sensor, battery_mah=config.BATTERY_MAH)
+    state.sched = Scheduler(profiler=state.loop_prof, idle=state.power.idle, memory=state.mem)
+    net_wake = SocketWake(lambda: state.ws.sock if state.ws and state.ws.connected else None,
+                          lambda: state.net_sched.wake(state.t_ws_recv))
+    state.net_sched = Scheduler(max_sleep_ms=500,
+                                idle=net_wake.idle if config.POWER_MODE != "normal" else None,
+                                memory=state.mem)
+
+
+def init_wifi():
+    wlan = net.init_wifi()
+    state.power.set_wlan(wlan)
+    print(f"🔋 Modo de energía: {config.POWER_MODE}")
+    # Esperar conexión inicial WiFi (máximo 15s)
+    print("Esperando conexión WiFi inicial...")
+    if not net.wait_wifi(15000):
+        print("⚠ WiFi no conectado inicialmente (se reintentará)")
+
+
+def start_network():
+    _thread.start_new_thread(net.network_thread, ())
+    time.sleep(1)
+
+
+def init():
+    """Secuencia de arranque (cada etapa medida)"""
+    etapa("memory", init_memory)
+    etapa("log", init_log)
+    etapa("ota", ota_check)
+    etapa("display", display.init)
+    etapa("sensors", sensors.init)
+    etapa("power", init_power)
+    sensors.on_door = display.on_door
+    etapa("wifi", init_wifi)
+    if state.wifi_connected:
+        etapa("ntp", net.sync_time)
+    print("\n🚀 Iniciando núcleo de red...")
+    etapa("network", start_network)
+
+
+def main():
+    print("\n" + "="*50)
+    print("ESP32 Monitor DUAL CORE con WebSocket SSL")
+    print("="*50)
+    print(f"URL: {config.WEBSOCKET_URL}")
+    print(f"Username: {config.USERNAME}")
+    print(f"DHT22: GPIO{config.DHT22_PIN}")
+    print(f"DS18B20: GPIO{config.DS18B20_PIN}")
+    print(f"MC-38: GPIO{config.MC38_SENSOR_PIN} (LED: GPIO{config.MC38_LED_PIN})")
+    print("="*50 + "\n")
+
+    init()
+
+    print("\n" + "="*50)
+    print("Sistema iniciado - Presiona Ctrl+C para detener")
+    print("🔶 Core 1: Sensores y Display")
+    print("🔷 Core 0: WiFi y WebSocket")
+    print("="*50 + "\n")
+
+    # Tareas del Core 1 (por prioridad: la puerta primero)
+    sched = state.sched
+    door_ms = config.POWER_DOOR_INTERVAL_MS if config.POWER_MODE == "bateria" else config.DOOR_INTERVAL_MS
+    state.t_door = sched.add("check_door", sensors.check_door, door_ms, priority=3)
+    state.power.on_wake = lambda: sched.wake(state.t_door)
+    sched.add("read_sensors", sensors.read_sensors, config.SENSOR_INTERVAL_MS, priority=1,
+              delay_ms=config.SENSOR_INTERVAL_MS)
+    sched.add("detect_sensors", sensors.detect_sensors, config.DETECT_INTERVAL_MS,
+              delay_ms=config.DETECT_INTERVAL_MS)
+    if display.oled_initialized:
+        state.t_oled = sched.add("update_oled", display.tarea_oled, config.OLED_INTERVAL_MS,
+                                 priority=2, overrun=DELAY)
+
+    try:
+        # Duerme exactamente hasta el próximo vencimiento
+        sched.run()
+
+    except KeyboardInterrupt:
+        if "ota" in sys.modules:
+            sys.modules["ota"].user_stop()  # main.py (ota_main.py) no debe tomarlo como falla
+        print("\n\n" + "="*50)
+        print("Deteniendo sistema...")
+        print("="*50)
+
+        net.stop()
+        sensors.stop()
+        display.stop()
+
+        print("Sistema detenido")
+
+    except Exception as e:
+        state.log.error("💥 Error en el loop principal: {}", e)
+        state.log.record(EV_FAULT, 1, level=ERROR)
+        state.log.save()
+        raise
+
+
+def loop_stats(reset=False):
+    """Estadísticas desde el REPL (importa diag.py)"""
+    from monitor import diag
+    diag.loop_stats(reset)
+
+
+def display_stats():
+    from monitor import diag
+    diag.display_stats()
+
+
+def log_dump(last=None, previous=False):
+    """Eventos del buffer del log (previous: los de la falla anterior)"""
+    state.log.dump(last, previous)
@@ -0,0 +1,130 @@
+# config.py - Configuración del monitor (pines, red, períodos)
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# Solo constantes: importarlo no inicializa nada. Los demás módulos leen
+# config.NOMBRE al usarlo, así que se puede cambiar desde el REPL (o el sim)
+# antes de app.main().
+
+# ============================================
+# CONFIGURACIÓN DE DISPLAY (CAMBIAR AQUÍ)
+# ============================================
+DISPLAY_TYPE = "SSD1306"  # Opciones: "SSD1306", "SSD1309" o "SH1106" (ver oled_hal.py)
+# DISPLAY_TYPE = "SH1106"  # Descomentar para usar SH1106
+
+# Configuración adicional
+DISPLAY_ROTATE_180 = False  # True para rotar 180° (útil para SH1106)
+
+# Configuración
+SSID = "motog35"
+PASSWORD = "12345678"
+WEBSOCKET_URL = "wss://bio-data-production.up.railway.app/"
+USERNAME = "MHT-prueba"
+
+# Reconexión rápida (ver wifi_manager.py): BSSID e IP en caché
+WIFI_STATIC_IP = None     # o ("192.168.43.50", "255.255.255.0", "192.168.43.1", "8.8.8.8")
+WIFI_REUSE_LEASE = False  # True: reutilizar la última IP de DHCP (si el router la reserva)
+# Redes en orden de prioridad: si la señal de una queda baja se pasa a otra
+WIFI_NETWORKS = [
+    (SSID, PASSWORD, WIFI_STATIC_IP),
+    # ("MACHETE", "clave"),
+]
+WIFI_ROAM_RSSI = -75          # dBm: por debajo, buscar otro AP
+WIFI_ROAM_MARGIN_DB = 8       # El candidato tiene que ser así de mejor (histéresis)
+WIFI_ROAM_LOW_MS = 20000      # ...y la señal estar baja este tiempo
+WIFI_SCAN_INTERVAL_MS = 300000
+
+# Pines
+DHT22_PIN = 4
+DS18B20_PIN = 5
+WIFI_LED_PIN = 2
+MC38_SENSOR_PIN = 15
+MC38_LED_PIN = 13
+OLED_SCL_PIN = 22
+OLED_SDA_PIN = 21
+
+# Zona horaria (Perú UTC-5)
+TIMEZONE_OFFSET = -5 * 3600
+
+# Refresco OLED (el governor lo ajusta entre MIN y MAX según la carga)
+OLED_INTERVAL_MS = 1000
+OLED_MIN_INTERVAL_MS = 250
+OLED_MAX_INTERVAL_MS = 5000
+OLED_BOOST_MS = 10000  # Refresco rápido tras abrir/cerrar la puerta
+
+# Energía OLED: atenuar tras inactividad, apagar fuera de horario
+OLED_CONTRAST = 0xFF
+OLED_CONTRAST_DIM = 0x08
+OLED_DIM_AFTER_MS = 120000   # Sin actividad (puerta) durante 2 min -> atenuar
+OLED_ON_HOUR = 6             # Horario activo (hora local): 06:00 - 22:00
+OLED_OFF_HOUR = 22           # Fuera de horario e inactiva -> panel apagado
+OLED_SHIFT_MS = 300000       # Mover el layout cada 5 min (anti-quemado)
+
+# Profiler del loop principal (tiempos por tarea, ver loop_profiler.py)
+LOOP_PROFILE = True
+LOOP_STATS_INTERVAL_MS = 300000  # Resumen por WebSocket cada 5 min (0 = nunca)
+
+# Períodos de las tareas (ms, ver scheduler.py)
+DOOR_INTERVAL_MS = 100
+SENSOR_INTERVAL_MS = 2000
+DETECT_INTERVAL_MS = 5000
+WIFI_CHECK_INTERVAL_MS = 2000
+WIFI_CONNECTING_INTERVAL_MS = 100   # Mientras conecta: medir el tiempo con precisión
+NTP_INTERVAL_MS = 3600000
+DNS_REFRESH_INTERVAL_MS = 600000  # Renovar el DNS del servidor con el WebSocket conectado
+WS_CHECK_INTERVAL_MS = 500     # Detección de WebSocket caído
+WS_CONNECTING_INTERVAL_MS = 50  # Durante un connect por etapas: avanzar seguido...
+WS_CONNECT_SLICE_MS = 50        # ...esperando al socket como mucho esto por vuelta
+# Reintentos del WebSocket (ver backoff.py): exponencial con jitter, tope y
+# circuit breaker para no reconectar todos a la vez cuando reinicia el backend
+WS_BACKOFF_BASE_MS = 2000
+WS_BACKOFF_CAP_MS = 60000
+WS_BREAKER_AFTER = 8            # Fallos seguidos que abren el circuito...
+WS_BREAKER_MS = 300000          # ...que queda abierto hasta 5 min
+WS_RECV_INTERVAL_MS = 500
+WS_SEND_INTERVAL_MS = 2000
+# Keepalive (ws_client_v2.py): PING/PONG de protocolo con RTT. El período
+# sube solo mientras lleguen los pongs y baja si el router (NAT) corta
+WS_PING_INTERVAL_MS = 30000     # Período inicial...
+WS_PING_MIN_MS = 15000
+WS_PING_MAX_MS = 240000         # ...entre estos límites
+WS_PONG_TIMEOUT_MS = 10000      # Espera del pong
+WS_PING_MAX_MISSED = 2          # Pongs perdidos seguidos = servidor caído
+WS_PONG_POLL_MS = 20            # recv seguido mientras se espera el pong (resolución del RTT)
+# Banda muerta del envío: solo se envía si una medición cambió al menos
+# esto, cambió la puerta o pasó WS_MAX_SILENCE_MS (0 y 0 = enviar siempre)
+WS_DEADBAND_TEMP = 0.0          # °C
+WS_DEADBAND_HUM = 0             # %
+WS_MAX_SILENCE_MS = 60000
+
+# Comandos del servidor (ver commands.py): set_interval, set_deadband,
+# request_snapshot, request_stats, request_log, set_log_level, reboot y
+# ota_begin/end/apply/abort (ota.py)
+CMD_CHECK_INTERVAL_MS = 1000    # La cola se revisa al recibir; esto es el respaldo
+CMD_INTERVAL_TASKS = ("ws_send", "loop_stats", "ntp", "dns")  # Ajustables por set_interval (wifi no: tarea_wifi fija su período)
+CMD_MIN_INTERVAL_MS = 500
+CMD_REBOOT_DELAY_MS = 1000      # Tiempo para que salga la respuesta antes de reiniciar
+
+# Modo de energía (ver power_mode.py): "normal", "ahorro" (WiFi en modem
+# sleep) o "bateria" (ahorro + lightsleep sin WiFi, para cortes de luz)
+POWER_MODE = "normal"
+POWER_LIGHTSLEEP_MIN_MS = 200       # Hueco mínimo para usar lightsleep
+POWER_DOOR_INTERVAL_MS = 2000       # Puerta en "bateria": la IRQ despierta antes
+POWER_WS_RECV_INTERVAL_MS = 5000    # recv fuera de "normal": el socket despierta antes
+BATTERY_MAH = 2000                  # Para estimar autonomía (0 = no estimar)
+
+# Memoria (ver memory.py): gc.collect() en los huecos del scheduler cada
+# tantos bytes asignados, nunca durante el handshake TLS
+MEM_COLLECT_BYTES = 16384       # Asignado desde la última recolección -> recolectar en un hueco
+MEM_LOW_FREE = 24576            # Con menos heap libre, recolectar en cualquier hueco
+
+# Log (ver log.py): lo que se imprime por consola. Los 📤/📥/📶 de cada envío,
+# recv y ping son "debug" (con mpy-cross -O1 ni se compilan); los eventos van
+# siempre al buffer circular (request_log, o log_falla.bin tras una falla)
+LOG_LEVEL = "info"              # "debug", "info", "warn", "error" u "off"
+LOG_RING = 64                   # Eventos en RAM (18 bytes cada uno)
+
+# OTA por el WebSocket (ver ota.py; ota_main.py va en el ESP32 como main.py)
+OTA_MAX_BOOTS = 3               # Arranques a prueba sin conectar -> versión anterior
+OTA_ACK_BYTES = 16384           # Aviso de avance al servidor cada tantos bytes
+OTA_POLL_MS = 5                 # recv seguido mientras llega un archivo
+OTA_STATE_FILE = "ota_state.json"  # = ota.STATE_FILE: si no existe, ota.py no se importa al arrancar
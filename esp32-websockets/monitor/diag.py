@@ -0,0 +1,86 @@
+# diag.py - Estadísticas del monitor (se importa recién cuando se piden)
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# Desde el REPL, o por el WebSocket con request_stats y la tarea loop_stats.
+#
+# Uso:
+#   from monitor import diag
+#   diag.loop_stats()          # scheduler, energía, memoria, log, WiFi, TLS, comandos, arranque...
+#   diag.display_stats()
+
+import time
+import json
+from monitor import config, state, display, net, remote, telemetry
+
+
+def loop_stats(reset=False):
+    """Muestra los tiempos del loop principal"""
+    state.loop_prof.report()
+    state.sched.report()
+    state.net_sched.report()
+    state.power.report()
+    state.mem.report()
+    state.log.report()
+    if state.wifi:
+        state.wifi.report()
+    if net.tls_sessions:
+        net.tls_sessions.report()
+    if net.dns_cache:
+        net.dns_cache.report()
+    net.ws_backoff.report()
+    if hasattr(state.ws, "keepalive"):
+        state.ws.keepalive.report()
+    if remote.commands:
+        remote.commands.report()
+    if remote.ota_rx:
+        remote.ota_rx.report()
+    boot = state.boot
+    print(f"⏱ Arranque: imports {boot['importMs']}ms, primera telemetría "
+          f"{boot['firstTelemetryMs']}ms, heap libre {boot['heapFreeAfterImport']} -> "
+          f"{boot['heapFreeAtTelemetry']} bytes")
+    print("   " + ", ".join(f"{name} {ms}ms" for name, ms in boot["stages"]))
+    print(f"📤 Banda muerta: {config.WS_DEADBAND_TEMP}°C / {config.WS_DEADBAND_HUM}%, "
+          f"envíos salteados {telemetry.ws_send_skipped}")
+    if reset:
+        state.loop_prof.reset()
+        state.mem.reset()
+
+
+def display_stats():
+    """Muestra estadísticas de la OLED"""
+    display.oled_stats.report(display.oled_governor.interval)
+    if display.oled_power:
+        print(f"   Energía: {display.oled_power.state}, "
+              f"apagada {display.oled_power.off_ms(time.ticks_ms()) // 1000}s")
+
+
+def enviar_loop_stats():
+    """Resumen compacto del profiler por WebSocket"""
+    ws = state.ws
+    return ws.send(json.dumps({
+        "type": "loop_stats",
+        "username": config.USERNAME,
+        "loop": state.loop_prof.summary(),
+        "power": state.power.summary(),
+        "memory": state.mem.summary(),
+        "log": state.log.summary(),
+        "wifi": state.wifi.summary() if state.wifi else None,
+        "tls": net.tls_sessions.summary() if net.tls_sessions else None,
+        "dns": net.dns_cache.summary() if net.dns_cache else None,
+        "backoff": net.ws_backoff.summary(),
+        "keepalive": ws.keepalive.summary() if hasattr(ws, "keepalive") else None,
+        "commands": remote.commands.summary() if remote.commands else None,
+        "ota": remote.ota_rx.summary() if remote.ota_rx else None,
+        "boot": state.boot,
+        "deadband": {"temp": config.WS_DEADBAND_TEMP, "hum": config.WS_DEADBAND_HUM,
+                     "skipped": telemetry.ws_send_skipped}
+    }))
+
+
+def enviar_display_stats():
+    """Estadísticas de la OLED por WebSocket"""
+    return state.ws.send(json.dumps({
+        "type": "display_stats",
+        "username": config.USERNAME,
+        "display": display.oled_stats.as_dict(display.oled_governor.interval)
+    }))
@@ -0,0 +1,208 @@
+# display.py - OLED del monitor: dashboard, governor y energía del panel
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# init() crea el I2C y el driver (oled_hal.py importa solo el del panel
+# elegido). Si no hay pantalla, el resto del monitor sigue sin ella.
+# tarea_oled() es la tarea del Core 1; on_door() la despierta.
+
+import time
+from machine import Pin, SoftI2C
+from oled_governor import FrameStats, FrameGovernor
+from oled_power import OledPower, SHIFT_MAX
+import oled_hal
+from monitor import config, state
+
+oled = None
+oled_initialized = False
+oled_power = None
+oled_stats = FrameStats()
+oled_governor = None
+ultima_firma_oled = None
+F_SMALL = F_PROP = F_BIG = None
+
+
+def init():
+    """Crea el driver del panel. Retorna True si hay pantalla"""
+    global oled, oled_initialized, oled_power, oled_governor, F_SMALL, F_PROP, F_BIG
+    oled_governor = FrameGovernor(config.OLED_INTERVAL_MS, config.OLED_MIN_INTERVAL_MS,
+                                  config.OLED_MAX_INTERVAL_MS, config.OLED_BOOST_MS)
+    kind = config.DISPLAY_TYPE
+    rotated = config.DISPLAY_ROTATE_180
+    try:
+        i2c = SoftI2C(scl=Pin(config.OLED_SCL_PIN), sda=Pin(config.OLED_SDA_PIN))
+        oled = oled_hal.create(kind, i2c, 128, 64, rotate=180 if rotated else 0)
+        oled_initialized = True
+        print(f"✓ OLED {kind} inicializado (128x64{', rotado 180°' if rotated else ''})")
+    except ImportError as e:
+        print(f"⚠ Driver de {kind} no encontrado: {e}")
+    except Exception as e:
+        print(f"⚠ Error OLED: {e}")
+
+    if oled_initialized:
+        oled_power = OledPower(oled, config.OLED_DIM_AFTER_MS, config.OLED_CONTRAST,
+                               config.OLED_CONTRAST_DIM, config.OLED_ON_HOUR,
+                               config.OLED_OFF_HOUR, config.OLED_SHIFT_MS)
+        # Fuentes resueltas una vez (None = fuente 8x8 del framebuf)
+        F_SMALL = oled.font('small')
+        F_PROP = oled.font('prop')
+        F_BIG = oled.font('big3')
+    return oled_initialized
+
+
+def get_wifi_signal_bars(rssi):
+    """Convierte RSSI a barras (0-6)"""
+    if rssi >= -50:
+        return 6
+    elif rssi >= -60:
+        return 5
+    elif rssi >= -70:
+        return 4
+    elif rssi >= -80:
+        return 3
+    elif rssi >= -90:
+        return 2
+    else:
+        return 1
+
+
+def crear_barras_wifi(barras_activas):
+    """Crea representación ASCII de barras WiFi"""
+    barras = ""
+    for i in range(6):
+        barras += "X" if i < barras_activas else "O"
+    return barras
+
+
+def hora_local():
+    """Hora local (0-23) o None si no hay NTP"""
+    if not state.time_synced:
+        return None
+    return time.localtime(time.time() + config.TIMEZONE_OFFSET)[3]
+
+
+def on_door(now):
+    """La puerta cambió: refresco rápido, panel encendido y redibujar ya"""
+    if oled_governor:
+        oled_governor.boost(now)
+    if oled_power:
+        oled_power.wake(now)
+    if state.t_oled:
+        state.sched.wake(state.t_oled)
+
+
+def firma_oled(bars, offset):
+    """Resumen de lo que muestra la OLED: si no cambia no se redibuja"""
+    minuto = time.time() // 60 if state.time_synced else -1
+    ws = state.ws
+    ws_ok = bool(ws and ws.connected)
+    data = state.current_data
+    with state.data_lock:
+        return (minuto, bars, ws_ok, state.door_closed, offset,
+                data.ds18b20_valid, round(data.ds18b20_temp, 1),
+                data.dht_valid, round(data.dht_temp, 1),
+                round(data.dht_humidity))
+
+
+def update_oled(force=False):
+    """Actualiza pantalla OLED (compatible con SSD1306 y SH1106)
+    Retorna los microsegundos de render + flush (0 si no se dibujó)"""
+    global ultima_firma_oled
+    if not oled_initialized:
+        return 0
+
+    try:
+        wlan = state.wlan
+        bars = get_wifi_signal_bars(wlan.status('rssi')) if (wlan and state.wifi_connected) else 0
+        offset = oled_power.offset()
+        firma = firma_oled(bars, offset)
+        if not force and firma == ultima_firma_oled:
+            oled_stats.skip()
+            return 0
+        ultima_firma_oled = firma
+
+        t_start = time.ticks_us()
+        oled.fill(0)
+        dibujar_dashboard(bars, offset[0], offset[1])
+
+        t_render = time.ticks_us()
+        bytes_before = oled.bytes_sent
+        oled.show()
+        t_flush = time.ticks_us()
+
+        render_us = time.ticks_diff(t_render, t_start)
+        flush_us = time.ticks_diff(t_flush, t_render)
+        oled_stats.record(render_us, flush_us, oled.bytes_sent - bytes_before)
+        return render_us + flush_us
+    except Exception as e:
+        print(f"Error OLED: {e}")
+        return 0
+
+
+def dibujar_dashboard(bars, dx, dy):
+    """Dashboard (igual en todos los paneles): T.OUT en dígitos grandes 3x
+    dx, dy: desplazamiento anti-quemado (0..SHIFT_MAX)"""
+    right = oled.width - SHIFT_MAX + dx
+    # Línea 1: Fecha y hora (proporcional)
+    if state.time_synced:
+        t = time.localtime(time.time() + config.TIMEZONE_OFFSET)
+        fecha_str = f"{t[2]:02d}/{t[1]:02d}/{t[0]%100:02d} {t[3]:02d}:{t[4]:02d}"
+        oled.text(fecha_str, dx, dy, F_PROP)
+    else:
+        oled.text("NO SYNC", dx, dy, F_PROP)
+
+    # Línea 2: ID (y aviso de puerta abierta a la derecha)
+    oled.text8(config.USERNAME, dx, dy + 9)
+    if not state.door_closed:
+        oled.text("ABIERTA", right - oled.text_width("ABIERTA", F_PROP), dy + 9, F_PROP)
+
+    data = state.current_data
+    with state.data_lock:
+        # Temp OUT en grande, alineada a la derecha contra la unidad
+        oled.text("T.OUT", dx, dy + 19, F_SMALL)
+        if data.ds18b20_valid:
+            temp_str = f"{data.ds18b20_temp:.1f}"
+        else:
+            temp_str = "--.-"
+        unit_x = right - oled.text_width("°C", F_SMALL)
+        temp_x = unit_x - 2 - oled.text_width(temp_str, F_BIG)
+        oled.text(temp_str, temp_x, dy + 19, F_BIG)
+        oled.text("°C", unit_x, dy + 19, F_SMALL)
+
+        # Temp IN y humedad en una sola línea proporcional
+        if data.dht_valid:
+            in_str = f"T.IN: {data.dht_temp:.1f}°C  Hum: {data.dht_humidity:.0f}%"
+        else:
+            in_str = "T.IN: ERROR  Hum: ERROR"
+        oled.text(in_str, dx, dy + 44, F_PROP)
+
+    # Línea 6: Estado WiFi y WebSocket
+    ws = state.ws
+    if state.wlan and state.wifi_connected:
+        barras_visual = crear_barras_wifi(bars)
+        ws_status = "OK" if (ws and ws.connected) else "--"
+        oled.text(f"WiFi:{barras_visual} {bars}/6 WS:{ws_status}", dx, dy + 54, F_SMALL)
+    else:
+        oled.text("WiFi: DESCONECTADO", dx, dy + 54, F_SMALL)
+
+
+def tarea_oled():
+    """Frame de la OLED: el governor decide el intervalo (1s por defecto)
+    Con el panel apagado (oled_power) no se dibuja nada"""
+    now = time.ticks_ms()
+    frame_us = 0
+    if oled_power and oled_power.update(now, hora_local()):
+        frame_us = update_oled()
+    oled_governor.frame_done(now, frame_us)
+    state.sched.set_period(state.t_oled, oled_governor.interval, now)
+
+
+def stop():
+    """Pantalla de sistema detenido"""
+    if not oled_initialized:
+        return
+    oled.fill(0)
+    oled.poweron()
+    oled.text("Sistema", 0, 20, F_SMALL)
+    oled.text("Detenido", 0, 32, F_SMALL)
+    oled.show()
+    time.sleep(1)
@@ -0,0 +1,378 @@
+# net.py - WiFi y WebSocket del monitor (Core 0)
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# init_wifi() arranca la conexión sin bloquear; network_thread() corre en el
+# Core 0 con su propio scheduler (state.net_sched): WiFi, NTP, DNS, connect
+# por etapas con backoff, recv, envío (telemetry.py), keepalive y comandos
+# (remote.py). Los mensajes van por state.log (ver log.py): los de cada
+# recv y ping son debug; los eventos quedan en el buffer circular.
+
+import time
+import json
+from machine import Pin
+from ws_client import WebSocket
+try:
+    # ws_client_v2.py: reanudación de sesiones TLS, caché de DNS y keepalive
+    from ws_client import tls_sessions, dns_cache, Keepalive
+except ImportError:
+    tls_sessions = dns_cache = Keepalive = None
+from scheduler import DELAY
+from wifi_manager import WifiManager
+from backoff import Backoff, OPEN
+from log import event, WARN, ERROR
+from monitor import config, state, telemetry, remote
+
+EV_WIFI_UP = event("wifi_up")         # a = RSSI
+EV_WIFI_DOWN = event("wifi_down")
+EV_WS_CONNECT = event("ws_connect")   # a = intento
+EV_WS_UP = event("ws_up")             # a = ms del connect, b = 1 si reanudó TLS
+EV_WS_FAIL = event("ws_fail")         # a = intento, b = ms hasta el próximo
+EV_RECV = event("ws_recv")            # a = bytes, b = 1 si es binario
+EV_RECV_ERR = event("recv_error")     # a = errno (0 = otra excepción)
+EV_PING = event("ws_ping")            # a = RTT del ping anterior (keepalive)
+EV_PONG_LOST = event("pong_lost")     # a = pongs perdidos, b = período (ms)
+EV_FAULT = event("fault")
+
+wifi_led = None
+wifi_was_connected = False
+ws_reconnect_attempts = 0
+ws_backoff = None
+
+
+def init_wifi():
+    """Inicializa WiFi (sin bloquear)"""
+    global wifi_led, ws_backoff
+    wifi_led = Pin(config.WIFI_LED_PIN, Pin.OUT)
+    wifi_led.off()
+    ws_backoff = Backoff(base_ms=config.WS_BACKOFF_BASE_MS, cap_ms=config.WS_BACKOFF_CAP_MS,
+                         breaker_after=config.WS_BREAKER_AFTER, breaker_ms=config.WS_BREAKER_MS)
+    wifi = WifiManager(config.WIFI_NETWORKS, reuse_lease=config.WIFI_REUSE_LEASE,
+                       roam_rssi=config.WIFI_ROAM_RSSI, roam_margin_db=config.WIFI_ROAM_MARGIN_DB,
+                       roam_low_ms=config.WIFI_ROAM_LOW_MS,
+                       scan_interval_ms=config.WIFI_SCAN_INTERVAL_MS)
+    state.wifi = wifi
+    state.wlan = wifi.wlan
+
+    if not state.wlan.isconnected():
+        print(f"Conectando WiFi a {wifi.ssid}...")
+        wifi.begin()
+
+    return state.wlan
+
+
+def wait_wifi(timeout_ms):
+    """Espera la conexión inicial. Retorna True si conectó"""
+    start = time.ticks_ms()
+    while not state.wifi.poll() and time.ticks_diff(time.ticks_ms(), start) < timeout_ms:
+        time.sleep_ms(100)
+    if not state.wlan.isconnected():
+        return False
+    state.wifi_connected = True
+    print(f"✓ WiFi conectado: {state.wlan.ifconfig()[0]}")
+    wifi_led.on()
+    return True
+
+
+def sync_time():
+    """NTP: timesync.py (y ntptime) se importan la primera vez"""
+    try:
+        from monitor import timesync
+    except ImportError as e:
+        print(f"⚠ Error NTP: {e}")
+        return False
+    return timesync.sync()
+
+
+def tarea_wifi():
+    """Verifica el WiFi y reconecta si hace falta"""
+    global wifi_was_connected, ws_reconnect_attempts
+    wifi = state.wifi
+    wlan = state.wlan
+    ws = state.ws
+    log = state.log
+    try:
+        if wifi and wifi.poll():
+            if not state.wifi_connected:
+                rssi = wlan.status('rssi')
+                log.record(EV_WIFI_UP, rssi)
+                log.info("\n✅ WiFi RECONECTADO\n   IP: {}\n   RSSI: {} dBm",
+                         wlan.ifconfig()[0], rssi)
+                state.wifi_connected = True
+                wifi_led.on()
+                ws_reconnect_attempts = 0
+
+                if wifi_was_connected:
+                    # El socket viejo quedó colgado del WiFi anterior
+                    try:
+                        ws.close()
+                    except:
+                        pass
+
+                if not state.time_synced:
+                    sync_time()
+
+            wifi_was_connected = True
+            state.net_sched.set_period(state.t_wifi, config.WIFI_CHECK_INTERVAL_MS)
+        else:
+            if state.wifi_connected:
+                log.record(EV_WIFI_DOWN, level=WARN)
+                log.warn("\n⚠️  WiFi DESCONECTADO")
+                state.wifi_connected = False
+                wifi_was_connected = False
+                wifi_led.off()
+                if ws:
+                    try:
+                        ws.close()
+                    except:
+                        pass
+                    ws.connected = False
+                    log.warn("⚠️ WebSocket marcado como desconectado (sin WiFi)")
+
+            # wifi.poll() ya reintenta (rápida -> completa); revisar seguido
+            # para que el tiempo medido sea el real
+            state.net_sched.set_period(state.t_wifi, config.WIFI_CONNECTING_INTERVAL_MS)
+
+    except Exception as e:
+        log.warn("Error verificando WiFi: {}", e)
+
+
+def tarea_ntp():
+    if state.wifi_connected:
+        sync_time()
+
+
+def tarea_dns():
+    """Renueva la caché de DNS mientras hay conexión: las reconexiones
+    usan la dirección guardada sin consultar el DNS"""
+    if state.wifi_connected and state.ws.connected:
+        dns_cache.refresh()
+
+
+def confirmar_ota():
+    """La versión a prueba llegó al servidor: ya no hace falta la anterior"""
+    import ota  # Ya importado por app.init() (había un diario)
+    if state.ota_state.get("state") == ota.TRIAL:
+        ota.confirm()
+        state.ota_state = ota.load_state()
+
+
+def tarea_ws_connect():
+    """Conecta el WebSocket si está caído. El período de esta tarea es la
+    espera entre intentos: WS_CHECK_INTERVAL_MS conectado; si falla, lo que
+    diga ws_backoff (exponencial con jitter, circuit breaker).
+    Con ws_client_v2.py el connect va por etapas (connect_step): cada vuelta
+    espera como mucho WS_CONNECT_SLICE_MS y el resto del loop sigue andando"""
+    global ws_reconnect_attempts
+    ws = state.ws
+    net_sched = state.net_sched
+    mem = state.mem
+    log = state.log
+    if not state.wifi_connected or ws.connected:
+        if getattr(ws, "connecting", False):
+            ws.close()    # Se cayó el WiFi en medio del connect: abandonarlo
+        mem.tls_end()     # Sin handshake en curso no hace nada
+        return
+
+    try:
+        if getattr(ws, "connecting", False):
+            result = ws.connect_step(config.WS_CONNECT_SLICE_MS)
+            if result is None:
+                return
+        else:
+            if not ws_backoff.allow():
+                # Circuito abierto: esperar hasta que se pueda probar de nuevo
+                net_sched.set_period(state.t_ws_connect,
+                                     max(ws_backoff.remaining(), config.WS_CHECK_INTERVAL_MS))
+                return
+            ws_reconnect_attempts += 1
+            log.record(EV_WS_CONNECT, ws_reconnect_attempts)
+            log.info("\n🔌 Conectando WebSocket (intento {})...", ws_reconnect_attempts)
+            # Recolectar ahora y no durante el handshake (ver memory.py)
+            mem.tls_begin()
+            if hasattr(ws, "connect_start"):
+                ws.connect_start(config.WEBSOCKET_URL)
+                if ws.connecting or ws.connected:
+                    net_sched.set_period(state.t_ws_connect, config.WS_CONNECTING_INTERVAL_MS)
+                    return
+                result = False  # Falló al empezar (URL inválida): como cualquier fallo
+            else:
+                connect_start = time.ticks_ms()
+                result = ws.connect(config.WEBSOCKET_URL)
+                ws.connect_ms = time.ticks_diff(time.ticks_ms(), connect_start)
+    except Exception as e:
+        log.warn("❌ Error conectando WebSocket: {}", e)
+        try:
+            ws.close()
+        except:
+            pass
+        result = False
+    mem.tls_end()
+
+    if result:
+        resumed = getattr(ws, "resumed", False)
+        log.record(EV_WS_UP, ws.connect_ms, 1 if resumed else 0)
+        log.info("✓ WebSocket conectado en {}ms{}", ws.connect_ms,
+                 " (sesión TLS reanudada)" if resumed else "")
+
+        time.sleep_ms(500)
+        ws.send(json.dumps({"username": config.USERNAME}))
+        log.info("✓ Username enviado: {}", config.USERNAME)
+
+        ws_reconnect_attempts = 0
+        telemetry.reset()
+        if state.ota_state:
+            confirmar_ota()
+        ws_backoff.success()
+        net_sched.set_period(state.t_ws_connect, config.WS_CHECK_INTERVAL_MS)
+        # Reiniciar la cuenta de recv, envío y ping
+        now = time.ticks_ms()
+        net_sched.restart(state.t_ws_recv, now)
+        net_sched.restart(state.t_ws_send, now)
+        net_sched.restart(state.t_ws_ping, now)
+    else:
+        # El mismo objeto WebSocket sirve para el próximo intento
+        delay = ws_backoff.failure()
+        log.record(EV_WS_FAIL, ws_reconnect_attempts, delay, level=WARN)
+        log.warn("❌ WebSocket no conectado (intento {})", ws_reconnect_attempts)
+        if ws_backoff.state == OPEN:
+            log.warn("⛔ Circuito abierto: {} fallos seguidos, próximo intento en {}s",
+                     ws_backoff.fails, delay // 1000)
+        else:
+            log.info("⏳ Próximo intento en {:.1f}s", delay / 1000)
+        net_sched.set_period(state.t_ws_connect, delay)
+
+
+def tarea_ws_recv():
+    """Recibe mensajes del servidor: los comandos se encolan y los ejecuta
+    remote.tarea_comandos (ver commands.py)"""
+    ws = state.ws
+    if not (state.wifi_connected and ws.connected):
+        return
+    net_sched = state.net_sched
+    log = state.log
+    try:
+        msg = ws.recv()
+        keepalive = getattr(ws, "keepalive", None)
+        if keepalive and keepalive.pending is not None:
+            net_sched.wake(state.t_ws_recv, config.WS_PONG_POLL_MS)
+        commands = remote.commands
+        if isinstance(msg, bytes):
+            # Frames del OTA: antes, los comandos en cola (ota_begin/ota_end)
+            while commands.pending:
+                commands.run()
+            if not (remote.ota_rx and remote.ota_rx.write(msg)):
+                log.record(EV_RECV, len(msg), 1)
+                if __debug__:
+                    log.debug("📥 Servidor: {} bytes binarios", len(msg))
+        elif msg:
+            log.record(EV_RECV, len(msg))
+            if __debug__:
+                log.debug("📥 Servidor: {}", msg)
+            # Los pongs llegan como frames de control (ws.keepalive) y
+            # commands.feed() solo decodifica los comandos
+            if commands.feed(msg):
+                net_sched.wake(state.t_commands)
+        if remote.ota_rx and remote.ota_rx.active:
+            # Llegando un archivo: leer seguido en vez de cada WS_RECV_INTERVAL_MS
+            net_sched.wake(state.t_ws_recv, 0 if msg else config.OTA_POLL_MS)
+    except OSError as e:
+        if e.args[0] != 11:  # 11 = EAGAIN
+            log.record(EV_RECV_ERR, e.args[0], level=WARN)
+            log.warn("⚠️ Error recv OSError: {}", e)
+    except Exception as e:
+        if "timeout" not in str(e).lower():
+            log.record(EV_RECV_ERR, 0, level=WARN)
+            log.warn("⚠️ Error en recv: {}", e)
+
+
+def tarea_ws_ping():
+    """Keepalive. Con ws_client_v2.py el período lo decide ws.keepalive
+    (ping de protocolo, espera del pong, período adaptativo); con el
+    ws_client.py viejo, ping JSON cada WS_PING_INTERVAL_MS"""
+    ws = state.ws
+    if not (state.wifi_connected and ws.connected):
+        return
+    keepalive = getattr(ws, "keepalive", None)
+    if keepalive is None:
+        try:
+            ws.send('{"type":"ping"}')
+            state.log.record(EV_PING)
+            if __debug__:
+                state.log.debug("📶 Ping enviado")
+        except:
+            ws.connected = False
+        return
+
+    net_sched = state.net_sched
+    sent = keepalive.sent
+    net_sched.set_period(state.t_ws_ping, keepalive.tick(ws))
+    if keepalive.sent != sent:
+        state.log.record(EV_PING, keepalive.last_rtt or 0)
+    if keepalive.pending is not None:
+        net_sched.wake(state.t_ws_recv, config.WS_PONG_POLL_MS)
+    if not ws.connected:
+        state.log.record(EV_PONG_LOST, keepalive.max_missed, keepalive.interval, level=WARN)
+        state.log.warn("💀 Sin PONG del servidor ({} perdidos): reconectando "
+                       "(keepalive cada {}s)", keepalive.max_missed, keepalive.interval // 1000)
+        ws.close()
+        net_sched.wake(state.t_ws_connect)
+
+
+def network_thread():
+    """Hilo que maneja WiFi y WebSocket en núcleo separado"""
+    state.network_thread_running = True
+    print("🔷 Núcleo de Red iniciado (Core 0)")
+
+    # Crear WebSocket
+    if Keepalive:
+        state.ws = WebSocket(keepalive=Keepalive(
+            interval_ms=config.WS_PING_INTERVAL_MS, min_ms=config.WS_PING_MIN_MS,
+            max_ms=config.WS_PING_MAX_MS, timeout_ms=config.WS_PONG_TIMEOUT_MS,
+            max_missed=config.WS_PING_MAX_MISSED))
+    else:
+        state.ws = WebSocket()
+    state.ws.debug = state.log.debug  # PING/PONG del servidor: solo con nivel debug
+    remote.setup(state.ws)
+
+    # Tareas del núcleo de red (intervalos en la configuración)
+    net_sched = state.net_sched
+    state.t_wifi = net_sched.add("wifi", tarea_wifi, config.WIFI_CHECK_INTERVAL_MS,
+                                 delay_ms=config.WIFI_CHECK_INTERVAL_MS)
+    net_sched.add("ntp", tarea_ntp, config.NTP_INTERVAL_MS, delay_ms=config.NTP_INTERVAL_MS)
+    if dns_cache:
+        net_sched.add("dns", tarea_dns, config.DNS_REFRESH_INTERVAL_MS,
+                      delay_ms=config.DNS_REFRESH_INTERVAL_MS)
+    state.t_ws_connect = net_sched.add("ws_connect", tarea_ws_connect,
+                                       config.WS_CHECK_INTERVAL_MS, priority=1, overrun=DELAY)
+    recv_ms = (config.WS_RECV_INTERVAL_MS if config.POWER_MODE == "normal"
+               else config.POWER_WS_RECV_INTERVAL_MS)
+    state.t_ws_recv = net_sched.add("ws_recv", tarea_ws_recv, recv_ms, priority=3)
+    state.t_ws_send = net_sched.add("ws_send", telemetry.tarea_ws_send,
+                                    config.WS_SEND_INTERVAL_MS, priority=2)
+    state.t_ws_ping = net_sched.add("ws_ping", tarea_ws_ping, config.WS_PING_INTERVAL_MS)
+    state.t_commands = net_sched.add("commands", remote.tarea_comandos,
+                                     config.CMD_CHECK_INTERVAL_MS, priority=2)
+    if config.LOOP_PROFILE and config.LOOP_STATS_INTERVAL_MS:
+        net_sched.add("loop_stats", telemetry.tarea_loop_stats, config.LOOP_STATS_INTERVAL_MS,
+                      delay_ms=config.LOOP_STATS_INTERVAL_MS)
+
+    try:
+        net_sched.run(lambda: not state.network_thread_running)
+
+    except Exception as e:
+        state.log.error("💥 Error crítico en núcleo de red: {}", e)
+        state.log.record(EV_FAULT, 2, level=ERROR)
+        state.log.save()
+    finally:
+        state.network_thread_running = False
+        print("🔷 Núcleo de Red detenido")
+
+
+def stop():
+    """Detiene el hilo de red y cierra la conexión"""
+    state.network_thread_running = False
+    time.sleep(1)
+    if state.ws:
+        state.ws.close()
+    if wifi_led:
+        wifi_led.off()
@@ -0,0 +1,153 @@
+# remote.py - Comandos del servidor (ver commands.py) y recepción del OTA
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# setup(ws) registra los handlers. Cada handler recibe el mensaje y retorna
+# el resultado; ValueError = comando rechazado (el servidor recibe el texto
+# del error). ota.py se importa con el primer ota_begin. request_log y
+# set_log_level leen el buffer y cambian el nivel del log (ver log.py).
+
+import machine
+from commands import Commands
+from monitor import config, state, telemetry
+
+commands = None
+ota_rx = None                   # ota.OtaReceiver, creado con el primer ota_begin
+
+
+def setup(ws):
+    """Crea la cola de comandos (los pedidos "get_..." viejos siguen andando)"""
+    global commands
+    commands = Commands(ws.send)
+    commands.register("set_interval", cmd_set_interval)
+    commands.register("set_deadband", cmd_set_deadband)
+    commands.register("request_snapshot", cmd_request_snapshot)
+    commands.register("request_stats", cmd_request_stats)
+    commands.register("request_log", cmd_request_log)
+    commands.register("set_log_level", cmd_set_log_level)
+    commands.register("reboot", cmd_reboot)
+    commands.register("ota_begin", cmd_ota_begin)
+    commands.register("ota_end", cmd_ota_end)
+    commands.register("ota_apply", cmd_ota_apply)
+    commands.register("ota_abort", cmd_ota_abort)
+    commands.alias("get_loop_stats", "request_stats", what="loop")
+    commands.alias("get_display_stats", "request_stats", what="display")
+    return commands
+
+
+def tarea_comandos():
+    """Ejecuta los comandos del servidor de a uno por vuelta"""
+    if commands.run():
+        state.net_sched.wake(state.t_commands)
+
+
+def cmd_set_interval(msg):
+    """{"cmd": "set_interval", "task": "ws_send", "ms": 5000}"""
+    name = msg.get("task")
+    net_sched = state.net_sched
+    task = net_sched.get(name) if name in config.CMD_INTERVAL_TASKS else None
+    if task is None:
+        raise ValueError(f"tarea no ajustable: {name}")
+    ms = int(msg.get("ms", 0))
+    if ms < config.CMD_MIN_INTERVAL_MS:
+        raise ValueError(f"período mínimo {config.CMD_MIN_INTERVAL_MS}ms")
+    net_sched.set_period(task, ms)
+    print(f"⚙️ {name}: cada {ms}ms")
+    return {"task": name, "ms": ms}
+
+
+def cmd_set_deadband(msg):
+    """{"cmd": "set_deadband", "temp": 0.2, "hum": 1, "maxSilenceMs": 60000}"""
+    temp = float(msg.get("temp", config.WS_DEADBAND_TEMP))
+    hum = float(msg.get("hum", config.WS_DEADBAND_HUM))
+    silence = int(msg.get("maxSilenceMs", config.WS_MAX_SILENCE_MS))
+    if temp < 0 or hum < 0 or silence < config.CMD_MIN_INTERVAL_MS:
+        raise ValueError("valores fuera de rango")
+    config.WS_DEADBAND_TEMP, config.WS_DEADBAND_HUM, config.WS_MAX_SILENCE_MS = temp, hum, silence
+    print(f"⚙️ Banda muerta: {temp}°C / {hum}%, silencio máximo {silence // 1000}s")
+    return {"temp": temp, "hum": hum, "maxSilenceMs": silence}
+
+
+def cmd_request_snapshot(msg):
+    """{"cmd": "request_snapshot"}: envía los datos ahora"""
+    telemetry.tarea_ws_send(force=True)
+
+
+def cmd_request_stats(msg):
+    """{"cmd": "request_stats", "what": "loop" | "display"}"""
+    what = msg.get("what", "loop")
+    if what not in ("loop", "display"):
+        raise ValueError(f"estadística desconocida: {what}")
+    from monitor import diag
+    if what == "loop":
+        diag.enviar_loop_stats()
+    else:
+        diag.enviar_display_stats()
+
+
+def cmd_request_log(msg):
+    """{"cmd": "request_log", "last": 32, "previous": false}: últimos eventos
+    del buffer (o los de la falla anterior) como [ms, nivel, evento, a, b, c]"""
+    log = state.log
+    last = int(msg.get("last", config.LOG_RING))
+    if msg.get("previous"):
+        if log.previous is None:
+            raise ValueError("no hay log de una falla anterior")
+        return {"previous": True, "events": log.previous[-last:] if last else []}
+    return {"previous": False, "events": log.entries(last)}
+
+
+def cmd_set_log_level(msg):
+    """{"cmd": "set_log_level", "level": "debug"}"""
+    level = state.log.set_level(str(msg.get("level")))  # ValueError si no existe
+    print(f"⚙️ Log: nivel {level}")
+    return {"level": level}
+
+
+def cmd_reboot(msg):
+    """{"cmd": "reboot"}: reinicia tras CMD_REBOOT_DELAY_MS (sale la respuesta)"""
+    delay = config.CMD_REBOOT_DELAY_MS
+    if state.net_sched.get("reboot") is None:
+        state.net_sched.add("reboot", reiniciar, delay, delay_ms=delay)
+    return {"inMs": delay}
+
+
+def cmd_ota_begin(msg):
+    """{"cmd": "ota_begin", "file": "boot.py", "size": 23817, "sha256": "...", "sig": "..."}"""
+    global ota_rx
+    import ota
+    if ota_rx is None:
+        ota_rx = ota.OtaReceiver(lambda data: state.ws.send(data), config.OTA_ACK_BYTES)
+    ota_rx.begin(msg.get("file"), int(msg.get("size", 0)), str(msg.get("sha256", "")),
+                 msg.get("sig"))
+    state.net_sched.wake(state.t_ws_recv)
+    return {"file": msg.get("file"), "ackBytes": config.OTA_ACK_BYTES,
+            "counter": ota.counter()}  # Lo que firma ota_apply (ver ota.py)
+
+
+def _receiver():
+    if ota_rx is None:
+        raise ValueError("no hay archivo en curso")
+    return ota_rx
+
+
+def cmd_ota_end(msg):
+    """{"cmd": "ota_end"}: verifica el archivo; retorna bytes, ms y KB/s"""
+    return _receiver().end()
+
+
+def cmd_ota_apply(msg):
+    """{"cmd": "ota_apply", "version": "3.3", "sig": "..."}: cambia los archivos y reinicia"""
+    result = _receiver().apply(msg.get("version"), msg.get("sig"))
+    cmd_reboot(msg)
+    return result
+
+
+def cmd_ota_abort(msg):
+    """{"cmd": "ota_abort"}: descarta lo recibido"""
+    return {"discarded": ota_rx.abort() if ota_rx else 0}
+
+
+def reiniciar():
+    print("🔁 Reiniciando por pedido del servidor...")
+    state.ws.close()
+    machine.reset()
@@ -0,0 +1,144 @@
+# sensors.py - DHT22, DS18B20 y puerta MC-38 del monitor
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# init() crea los pines y hace la primera detección; las tareas del Core 1
+# (read_sensors, detect_sensors, check_door) escriben en state.current_data.
+# on_door(now) se llama cuando cambia la puerta (app.py despierta la OLED).
+# Cada cambio de la puerta queda en el buffer del log (ver log.py).
+
+import time
+import dht
+import onewire
+import ds18x20
+from machine import Pin
+from log import event
+from monitor import config, state
+
+EV_DOOR = event("door")  # a = 1 cerrada, 0 abierta
+
+dht22 = None
+ds_sensor = None
+ds_devices = []
+mc38_sensor = None
+mc38_led = None
+on_door = None
+
+
+def init():
+    """Crea los pines y hace la primera detección"""
+    global dht22, ds_sensor, mc38_sensor, mc38_led, ds_devices
+    dht22 = dht.DHT22(Pin(config.DHT22_PIN))
+    ds_sensor = ds18x20.DS18X20(onewire.OneWire(Pin(config.DS18B20_PIN)))
+    mc38_sensor = Pin(config.MC38_SENSOR_PIN, Pin.IN, Pin.PULL_DOWN)
+    mc38_led = Pin(config.MC38_LED_PIN, Pin.OUT)
+    mc38_led.off()
+
+    print("\nInicializando sensores...")
+
+    # DS18B20 - Primera detección
+    try:
+        ds_devices = ds_sensor.scan()
+        if ds_devices:
+            print(f"✓ DS18B20: {len(ds_devices)} sensor(es)")
+            for i, dev in enumerate(ds_devices):
+                print(f"  Sensor {i}: {dev.hex()}")
+        else:
+            print("⚠ DS18B20: No encontrado (se seguirá buscando)")
+    except Exception as e:
+        print(f"⚠ DS18B20: Error al escanear - {e}")
+        ds_devices = []
+
+    # DHT22 - Solo informar, se detectará en primera lectura
+    print("⏳ DHT22: Se verificará en primera lectura")
+
+    # MC-38
+    try:
+        state.door_closed = mc38_sensor.value()
+        if state.door_closed:
+            mc38_led.off()
+            print("✓ Puerta: CERRADA (LED OFF)")
+        else:
+            mc38_led.on()
+            print("⚠ Puerta: ABIERTA (LED ON)")
+    except Exception as e:
+        print(f"⚠ MC-38: Error - {e}")
+        state.door_closed = False
+
+
+def detect_sensors():
+    """Detecta sensores conectados dinámicamente"""
+    global ds_devices
+
+    # Detectar DS18B20
+    try:
+        devices = ds_sensor.scan()
+        if devices != ds_devices:
+            ds_devices = devices
+            if ds_devices:
+                print(f"🔍 DS18B20 detectado: {len(ds_devices)} sensor(es)")
+                for i, dev in enumerate(ds_devices):
+                    print(f"  Sensor {i}: {dev.hex()}")
+            else:
+                print("⚠ DS18B20 desconectado")
+    except Exception as e:
+        print(f"Error escaneando DS18B20: {e}")
+        ds_devices = []
+
+
+def read_sensors():
+    """Lee sensores (no bloqueante)"""
+    data = state.current_data
+    lock = state.data_lock
+    # DHT22
+    try:
+        dht22.measure()
+        with lock:
+            data.dht_temp = dht22.temperature()
+            data.dht_humidity = dht22.humidity()
+            data.dht_valid = True
+    except Exception:
+        with lock:
+            data.dht_valid = False
+
+    # DS18B20
+    if ds_devices:
+        try:
+            ds_sensor.convert_temp()
+            time.sleep_ms(750)
+            temp = ds_sensor.read_temp(ds_devices[0])
+            if temp and temp != -127.0:
+                with lock:
+                    data.ds18b20_temp = temp
+                    data.ds18b20_valid = True
+            else:
+                with lock:
+                    data.ds18b20_valid = False
+        except Exception:  # No tragarse Ctrl+C durante el sleep_ms(750)
+            with lock:
+                data.ds18b20_valid = False
+    else:
+        # Si no hay dispositivos, marcar como inválido
+        with lock:
+            data.ds18b20_valid = False
+
+
+def check_door():
+    """Verifica estado de la puerta"""
+    value = mc38_sensor.value()
+
+    if value != state.door_closed:
+        state.door_closed = value
+        state.log.record(EV_DOOR, value)
+        if on_door:
+            on_door(time.ticks_ms())
+        if value:
+            mc38_led.off()
+            state.log.info("\n🚪 PUERTA CERRADA - LED OFF")
+        else:
+            mc38_led.on()
+            state.log.info("\n⚠️  PUERTA ABIERTA - LED ON")
+
+
+def stop():
+    if mc38_led:
+        mc38_led.off()
@@ -0,0 +1,60 @@
+# state.py - Estado compartido entre los módulos del monitor y entre núcleos
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# Lo que en bootv3_2.py eran globales del script. Los módulos escriben
+# state.NOMBRE (no `from state import ...`, que copiaría el valor).
+# Los datos de los sensores se leen y escriben con data_lock.
+
+import gc
+import _thread
+
+
+def heap_libre():
+    try:
+        return gc.mem_free()
+    except AttributeError:
+        return None  # CPython (tools/sim)
+
+
+# Arranque: en el ESP32 ticks_ms() cuenta desde el reset, así que importMs
+# incluye compilar (o cargar los .mpy) de lo importado hasta app.py.
+# stages: [etapa, ms] de cada paso de app.init()
+boot = {"importMs": None, "heapFreeAfterImport": None, "stages": [],
+        "firstTelemetryMs": None, "heapFreeAtTelemetry": None}
+
+# Estado del sistema
+time_synced = False
+wifi_connected = False
+door_closed = False
+wlan = None
+wifi = None                    # WifiManager
+ws = None
+network_thread_running = False
+ota_state = None               # Diario de ota.py si había una actualización en curso
+
+
+# Datos de sensores
+class SensorData:
+    def __init__(self):
+        self.dht_temp = 0.0
+        self.dht_humidity = 0.0
+        self.ds18b20_temp = 0.0
+        self.dht_valid = False
+        self.ds18b20_valid = False
+
+
+current_data = SensorData()
+data_lock = _thread.allocate_lock()
+
+# Los crea app.init(): memoria, log, scheduler del Core 1, del Core 0 y el profiler
+mem = None
+log = None
+sched = None
+net_sched = None
+loop_prof = None
+power = None
+
+# Tareas (para wake/set_period desde otros módulos)
+t_oled = None
+t_door = None
+t_wifi = t_ws_connect = t_ws_recv = t_ws_send = t_ws_ping = t_commands = None
@@ -0,0 +1,124 @@
+# telemetry.py - Envío de los datos de los sensores por el WebSocket
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# tarea_ws_send() (Core 0) arma el JSON de state.current_data y lo envía si
+# pasa la banda muerta (config.WS_DEADBAND_*, ajustable con set_deadband).
+# El primer envío completa state.boot (tiempo hasta la primera telemetría).
+# Cada envío queda en el buffer del log; la línea 📤 es debug (ver log.py).
+
+import time
+import json
+from log import event, DEBUG, WARN
+from monitor import config, state
+
+EV_SEND = event("ws_send")        # a = DS18B20 x10, b = DHT22 x10, c = humedad (-32768 = error)
+EV_SEND_FAIL = event("send_fail")  # a = 1 si fue una excepción
+
+ws_last_sent = None             # Último envío de datos (para la banda muerta)
+ws_last_sent_ms = 0
+ws_send_skipped = 0
+
+
+def reset():
+    """WebSocket reconectado: el primer envío va siempre"""
+    global ws_last_sent
+    ws_last_sent = None
+
+
+def envio_necesario(data):
+    """True si hay que enviar: una medición se movió al menos la banda
+    muerta (o dejó de ser válida), cambió la puerta o pasó WS_MAX_SILENCE_MS"""
+    last = ws_last_sent
+    band_temp = config.WS_DEADBAND_TEMP
+    band_hum = config.WS_DEADBAND_HUM
+    if last is None or not (band_temp or band_hum):
+        return True
+    if time.ticks_diff(time.ticks_ms(), ws_last_sent_ms) >= config.WS_MAX_SILENCE_MS:
+        return True
+    if data["doorStatus"] != last["doorStatus"]:
+        return True
+    for key, band in (("dsTemperature", band_temp), ("temperature", band_temp),
+                      ("humidity", band_hum)):
+        new, old = data[key], last[key]
+        if (new is None) != (old is None):
+            return True
+        if new is not None and abs(new - old) >= band:
+            return True
+    return False
+
+
+def _x10(value):
+    return -32768 if value is None else int(round(value * 10))
+
+
+def tarea_ws_send(force=False):
+    """Envía los datos de los sensores (con banda muerta salvo `force`)"""
+    global ws_last_sent, ws_last_sent_ms, ws_send_skipped
+    ws = state.ws
+    log = state.log
+    if not (state.wifi_connected and ws.connected):
+        return
+    try:
+        t = time.gmtime()
+        datetime_utc = f"{t[0]:04d}-{t[1]:02d}-{t[2]:02d}T{t[3]:02d}:{t[4]:02d}:{t[5]:02d}Z"
+
+        current = state.current_data
+        with state.data_lock:
+            data = {
+                "username": config.USERNAME,
+                "dsTemperature": round(current.ds18b20_temp, 1) if current.ds18b20_valid else None,
+                "temperature": round(current.dht_temp, 1) if current.dht_valid else None,
+                "humidity": int(round(current.dht_humidity, 0)) if current.dht_valid else None,
+                "datetime": datetime_utc,
+                "doorStatus": "closed" if state.door_closed else "open"
+            }
+        heap = state.heap_libre()
+        if heap is not None:
+            data["heapFree"] = heap  # Detalle por tarea en loop_stats ("memory")
+
+        if not force and not envio_necesario(data):
+            ws_send_skipped += 1
+            return
+
+        json_str = json.dumps(data)
+
+        if ws.send(json_str):
+            ws_last_sent = data
+            ws_last_sent_ms = time.ticks_ms()
+            boot = state.boot
+            if boot["firstTelemetryMs"] is None:
+                boot["firstTelemetryMs"] = ws_last_sent_ms
+                boot["heapFreeAtTelemetry"] = state.heap_libre()
+                log.info("⏱ Primera telemetría a {}ms del reset (imports {}ms)",
+                         ws_last_sent_ms, boot["importMs"])
+            humidity = data["humidity"]
+            log.record(EV_SEND, _x10(data["dsTemperature"]), _x10(data["temperature"]),
+                       -32768 if humidity is None else humidity)
+            if __debug__ and log.enabled(DEBUG):  # El texto se arma solo si se imprime
+                ds_temp_str = f"{data['dsTemperature']}°C" if data['dsTemperature'] is not None else "ERROR"
+                dht_temp_str = f"{data['temperature']}°C" if data['temperature'] is not None else "ERROR"
+                humidity_str = f"{humidity}%" if humidity is not None else "ERROR"
+                door_icon = "🚪✅" if state.door_closed else "🚪⚠️"
+                log.debug("📤 WS | T.OUT: {} | T.IN: {} | H: {} | {}",
+                          ds_temp_str, dht_temp_str, humidity_str, door_icon)
+        else:
+            log.record(EV_SEND_FAIL, level=WARN)
+            log.warn("❌ Error enviando datos")
+            ws.connected = False
+
+    except Exception as e:
+        log.record(EV_SEND_FAIL, 1, level=WARN)
+        log.warn("❌ Error en envío: {}", e)
+        ws.connected = False
+
+
+def tarea_loop_stats():
+    """Resumen del profiler del loop principal (diag.py se importa aquí)"""
+    ws = state.ws
+    if not (state.wifi_connected and ws.connected):
+        return
+    try:
+        from monitor import diag
+        diag.enviar_loop_stats()
+    except Exception as e:
+        state.log.warn("⚠️ Error enviando loop_stats: {}", e)
@@ -0,0 +1,21 @@
+# timesync.py - Hora por NTP (se importa al conectar el WiFi por primera vez)
+# Guarda este archivo en el ESP32 dentro de monitor/
+#
+# ntptime se importa una sola vez, con este módulo, y no en cada sync().
+
+import time
+import ntptime
+from monitor import state
+
+
+def sync():
+    """Sincronizar tiempo con NTP"""
+    try:
+        ntptime.settime()
+        state.time_synced = True
+        t = time.localtime()
+        print(f"✓ Tiempo: {t[2]:02d}/{t[1]:02d}/{t[0]} {t[3]:02d}:{t[4]:02d}")
+        return True
+    except Exception as e:
+        print(f"⚠ Error NTP: {e}")
+        return False
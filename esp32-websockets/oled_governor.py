@@ -0,0 +1,128 @@
+# oled_governor.py - Estadísticas de render y governor de refresco para la OLED
+# Guarda este archivo en el ESP32 junto con ssd1306.py / sh1106.py
+
+import time
+
+
+class FrameStats:
+    """Tiempos por frame de la OLED (render, flush y bytes enviados por I2C)"""
+
+    def __init__(self):
+        self.frames = 0
+        self.skipped = 0
+        self.last_render_us = 0
+        self.last_flush_us = 0
+        self.last_bytes = 0
+        self.max_render_us = 0
+        self.max_flush_us = 0
+        # Promedios móviles (EWMA 1/8), enteros para no asignar floats
+        self.avg_render_us = 0
+        self.avg_flush_us = 0
+        self.total_bytes = 0
+
+    def record(self, render_us, flush_us, sent_bytes):
+        self.frames += 1
+        self.last_render_us = render_us
+        self.last_flush_us = flush_us
+        self.last_bytes = sent_bytes
+        self.total_bytes += sent_bytes
+        if render_us > self.max_render_us:
+            self.max_render_us = render_us
+        if flush_us > self.max_flush_us:
+            self.max_flush_us = flush_us
+        if self.frames == 1:
+            self.avg_render_us = render_us
+            self.avg_flush_us = flush_us
+        else:
+            self.avg_render_us += (render_us - self.avg_render_us) >> 3
+            self.avg_flush_us += (flush_us - self.avg_flush_us) >> 3
+
+    def skip(self):
+        self.skipped += 1
+
+    def reset_max(self):
+        self.max_render_us = 0
+        self.max_flush_us = 0
+
+    def as_dict(self, interval_ms=None):
+        data = {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "renderUs": self.last_render_us,
+            "flushUs": self.last_flush_us,
+            "avgRenderUs": self.avg_render_us,
+            "avgFlushUs": self.avg_flush_us,
+            "maxRenderUs": self.max_render_us,
+            "maxFlushUs": self.max_flush_us,
+            "bytes": self.last_bytes,
+            "totalBytes": self.total_bytes,
+        }
+        if interval_ms is not None:
+            data["intervalMs"] = interval_ms
+        return data
+
+    def report(self, interval_ms=None):
+        """Imprime las estadísticas (para usar desde el REPL)"""
+        print("📺 OLED stats")
+        print(f"   Frames: {self.frames} (omitidos sin cambios: {self.skipped})")
+        print(f"   Render: {self.last_render_us}us (avg {self.avg_render_us}, max {self.max_render_us})")
+        print(f"   Flush:  {self.last_flush_us}us (avg {self.avg_flush_us}, max {self.max_flush_us})")
+        print(f"   Bytes:  {self.last_bytes}/frame, {self.total_bytes} total")
+        if interval_ms is not None:
+            print(f"   Intervalo actual: {interval_ms}ms")
+
+
+class FrameGovernor:
+    """Decide cuándo refrescar la OLED según la carga del loop y los eventos
+
+    - Baja la frecuencia (sube el intervalo) si el frame llega tarde o si la
+      pantalla se come más de `budget_pct` % del núcleo.
+    - La sube a `min_interval` durante `boost_ms` tras un evento interactivo
+      (p. ej. la puerta se abre).
+    - Vuelve poco a poco a `base_interval` cuando todo está tranquilo.
+    """
+
+    def __init__(self, base_interval=1000, min_interval=250, max_interval=5000,
+                 boost_ms=10000, budget_pct=20):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.boost_ms = boost_ms
+        self.budget_pct = budget_pct
+        self.interval = base_interval
+        self.last_frame = time.ticks_ms()
+        self.boost_until = self.last_frame
+        self.boosted = False
+
+    def due(self, now):
+        return time.ticks_diff(now, self.last_frame) >= self.interval
+
+    def boost(self, now):
+        """Evento interactivo: refrescar rápido durante un rato"""
+        self.boost_until = time.ticks_add(now, self.boost_ms)
+        self.boosted = True
+        self.interval = self.min_interval
+        # Frame inmediato, sin contarlo como retraso del loop
+        self.last_frame = time.ticks_add(now, -self.min_interval)
+
+    def frame_done(self, now, frame_us):
+        """Ajusta el intervalo tras un frame (frame_us = render + flush)"""
+        late_ms = time.ticks_diff(now, self.last_frame) - self.interval
+        self.last_frame = now
+
+        if self.boosted and time.ticks_diff(now, self.boost_until) >= 0:
+            self.boosted = False
+
+        # % del intervalo que se fue en dibujar y enviar el frame
+        load_pct = frame_us // (self.interval * 10) if self.interval else 100
+        overloaded = load_pct > self.budget_pct or late_ms > self.interval // 2
+
+        if overloaded:
+            self.interval = min(self.max_interval, self.interval * 2)
+        elif self.boosted:
+            self.interval = self.min_interval
+        elif self.interval > self.base_interval:
+            self.interval = max(self.base_interval, self.interval - self.base_interval // 4)
+        elif self.interval < self.base_interval:
+            self.interval = self.base_interval
+        return self.interval
@@ -0,0 +1,101 @@
+# oled_hal.py - Capa común para las pantallas OLED (SSD1306, SSD1309, SH1106)
+# Guarda este archivo en el ESP32 junto con el driver de tu pantalla y oledfont.py
+#
+# Uso:
+#   import oled_hal
+#   oled = oled_hal.create("SH1106", i2c, rotate=180)
+#   F_SMALL = oled.font('small')          # resolver fuentes una sola vez
+#   oled.fill(0)
+#   oled.text("Hola", 0, 0, F_SMALL)
+#   oled.show()                            # solo envía las páginas modificadas
+#
+# Todo lo que depende del panel se resuelve en create(): en el render por
+# frame no hay hasattr() ni comparaciones de strings.
+
+import oledfont
+
+# Tipo de panel -> (módulo del driver, clase I2C, soporta rotate=)
+# Para agregar un panel nuevo (p. ej. SH1107) basta con su driver y una línea
+# aquí, siempre que el driver tenga fill/text/show/register_updates/contrast/
+# poweron/poweroff como ssd1306.py y sh1106.py.
+_PANELS = {
+    "SSD1306": ("ssd1306", "SSD1306_I2C", False),
+    "SSD1309": ("ssd1306", "SSD1306_I2C", False),  # Mismos comandos que SSD1306
+    "SH1106": ("sh1106", "SH1106_I2C", True),
+}
+
+
+def panels():
+    """Tipos de panel soportados"""
+    return tuple(_PANELS)
+
+
+def create(kind, i2c, width=128, height=64, rotate=0, addr=0x3C):
+    """Crea el driver del panel `kind` y lo envuelve en un Display"""
+    entry = _PANELS.get(kind)
+    if entry is None:
+        raise ValueError(f"DISPLAY_TYPE inválido: {kind}. Usar uno de {panels()}")
+    module_name, class_name, native_rotate = entry
+
+    module = __import__(module_name)
+    driver_class = getattr(module, class_name)
+    if native_rotate:
+        driver = driver_class(width, height, i2c, addr=addr, rotate=rotate)
+    else:
+        driver = driver_class(width, height, i2c, addr=addr)
+        if rotate == 180:
+            driver.flip(True)
+        elif rotate:
+            raise ValueError(f"{kind} solo soporta rotate=0 o 180")
+    return Display(driver, kind)
+
+
+class Display:
+    """API común sobre cualquier driver: texto, fuentes, páginas sucias y flush"""
+
+    def __init__(self, driver, kind):
+        self.driver = driver
+        self.kind = kind
+        self.width = driver.width
+        self.height = driver.height
+
+        # Métodos del driver resueltos una sola vez
+        self.fill = driver.fill
+        self.pixel = driver.pixel
+        self.text8 = driver.text  # Fuente 8x8 del framebuf
+        self.hline = driver.hline
+        self.vline = driver.vline
+        self.rect = driver.rect
+        self.fill_rect = driver.fill_rect
+        self.contrast = driver.contrast
+        self.poweron = driver.poweron
+        self.poweroff = driver.poweroff
+        self.mark = driver.register_updates
+        self._show = driver.show
+
+    @property
+    def bytes_sent(self):
+        return self.driver.bytes_sent
+
+    def font(self, name):
+        """Paquete de fuente de oledfont ('small', 'tiny', 'prop', 'big2', 'big3')"""
+        font = oledfont.get(name)
+        if font is None:
+            raise ValueError(f"Fuente desconocida: {name}")
+        return font
+
+    def text(self, text, x, y, font, color=1):
+        """Dibuja con un paquete de fuente resuelto con font(); retorna la x final"""
+        x_end = oledfont.draw_font(self.driver, text, x, y, font, color)
+        self.mark(y, y + font.HEIGHT - 1)
+        return x_end
+
+    def text_width(self, text, font):
+        """Ancho en píxeles sin dibujar (None = fuente 8x8)"""
+        if font is None:
+            return len(text) * 8
+        return oledfont.width_font(text, font)
+
+    def show(self, full_update=False):
+        """Envía al panel las páginas modificadas desde el último show()"""
+        self._show(full_update)
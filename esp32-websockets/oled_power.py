@@ -0,0 +1,95 @@
+# oled_power.py - Política de energía de la OLED: atenuar, apagar y mover el layout
+# Guarda este archivo en el ESP32 junto con ssd1306.py / sh1106.py
+#
+# Estados:
+#   on   -> contraste normal, se dibuja
+#   dim  -> sin actividad durante `dim_after_ms`: contraste bajo, se dibuja
+#   off  -> fuera del horario y sin actividad: panel apagado, NO se dibuja
+# La actividad (puerta) vuelve a "on" con wake().
+
+import time
+
+# Desplazamientos del layout para evitar quemado (se recorren en orden)
+_SHIFTS = ((0, 0), (1, 0), (2, 1), (1, 2), (0, 1), (2, 0), (1, 1), (0, 2))
+SHIFT_MAX = 2
+
+
+class OledPower:
+    def __init__(self, oled, dim_after_ms=120000, contrast=0xFF, contrast_dim=0x08,
+                 on_hour=6, off_hour=22, shift_ms=300000):
+        self.oled = oled
+        self.dim_after_ms = dim_after_ms
+        self.contrast_on = contrast
+        self.contrast_dim = contrast_dim
+        self.on_hour = on_hour
+        self.off_hour = off_hour
+        self.shift_ms = shift_ms
+
+        now = time.ticks_ms()
+        self.state = "on"
+        self.last_activity = now
+        self.last_shift = now
+        self.shift_index = 0
+        self.off_since = now
+        self.off_ms_total = 0  # Tiempo total con el panel apagado
+        self.blanks = 0
+
+    def in_hours(self, hour):
+        """True si `hour` está dentro del horario activo (None = sin hora, siempre)"""
+        if hour is None or self.on_hour == self.off_hour:
+            return True
+        if self.on_hour < self.off_hour:
+            return self.on_hour <= hour < self.off_hour
+        return hour >= self.on_hour or hour < self.off_hour  # p. ej. 22 -> 6
+
+    def wake(self, now):
+        """Actividad del usuario (puerta): encender y reiniciar el temporizador"""
+        self.last_activity = now
+        if self.state != "on":
+            self._set_state("on", now)
+
+    def offset(self):
+        """(dx, dy) actual del layout, cada uno entre 0 y SHIFT_MAX"""
+        return _SHIFTS[self.shift_index]
+
+    def update(self, now, hour=None):
+        """Aplica la política. Retorna True si hay que dibujar este frame"""
+        idle = time.ticks_diff(now, self.last_activity)
+
+        if idle >= self.dim_after_ms:
+            target = "dim" if self.in_hours(hour) else "off"
+        else:
+            target = "on"
+        if target != self.state:
+            self._set_state(target, now)
+
+        if self.state == "off":
+            return False
+
+        if time.ticks_diff(now, self.last_shift) >= self.shift_ms:
+            self.shift_index = (self.shift_index + 1) % len(_SHIFTS)
+            self.last_shift = now
+        return True
+
+    def off_ms(self, now):
+        """Milisegundos acumulados con el panel apagado"""
+        if self.state == "off":
+            return self.off_ms_total + time.ticks_diff(now, self.off_since)
+        return self.off_ms_total
+
+    def _set_state(self, state, now):
+        oled = self.oled
+        if self.state == "off":
+            self.off_ms_total += time.ticks_diff(now, self.off_since)
+            oled.poweron()
+
+        if state == "off":
+            oled.poweroff()
+            self.off_since = now
+            self.blanks += 1
+            print("🌙 OLED apagada (fuera de horario)")
+        elif state == "dim":
+            oled.contrast(self.contrast_dim)
+        else:
+            oled.contrast(self.contrast_on)
+        self.state = state
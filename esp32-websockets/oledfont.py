@@ -0,0 +1,124 @@
+# oledfont.py - Motor de fuentes para los drivers OLED (ssd1306.py y sh1106.py)
+# Usa los paquetes generados por tools/bdf2font.py (font_*.py).
+# Guarda este archivo en el ESP32 junto con los font_*.py que uses.
+
+from micropython import const
+import framebuf
+
+_DEGREE = const(0xB0)
+
+# Nombre de fuente -> módulo. Se importan la primera vez que se usan,
+# así las fuentes grandes no ocupan RAM si el dashboard no las pide.
+_MODULES = {
+    'small': 'font_5x7',   # 5x7 ancho fijo, ASCII completo + '°'
+    'tiny': 'font_4x6',    # 4x6 ancho fijo, números
+    'prop': 'font_prop',   # 5x7 proporcional
+    'big2': 'font_big2',   # dígitos 2x (10x14), pre-renderizados
+    'big3': 'font_big3',   # dígitos 3x (15x21), pre-renderizados
+}
+_loaded = {}
+
+# vline de la clase base: evita el registro de páginas de SH1106 por cada
+# trazo, el driver registra el área completa al terminar
+_vline = framebuf.FrameBuffer.vline
+
+
+def get(name):
+    """Devuelve el paquete de fuente o None si el nombre no existe"""
+    font = _loaded.get(name)
+    if font is None:
+        module = _MODULES.get(name)
+        if module is None:
+            return None
+        font = __import__(module)
+        _loaded[name] = font
+    return font
+
+
+def height(name):
+    """Alto en píxeles de la fuente (0 si no existe)"""
+    font = get(name)
+    return font.HEIGHT if font else 0
+
+
+def width(text, name='small'):
+    """Ancho en píxeles de `text` sin dibujar nada (para layout)"""
+    font = get(name)
+    if font is None:
+        return 0
+    return width_font(text, font)
+
+
+def width_font(text, font):
+    """Como width() pero con el paquete ya resuelto (ver oled_hal.py)"""
+    widths = font.WIDTHS
+    first = font.FIRST
+    last = font.LAST
+    spacing = font.SPACING
+    total = 0
+    for char in str(text):
+        code = ord(char)
+        if code == _DEGREE:
+            code = last
+        elif code < first or code > last:
+            code = 32
+        total += widths[code - first] + spacing
+    return total - spacing if total else 0
+
+
+def draw(fb, text, x, y, name='small', color=1):
+    """Dibuja `text` en el framebuffer `fb` y retorna la siguiente posición x
+
+    Cada columna del glifo se dibuja como tramos verticales (vline), así los
+    dígitos grandes cuestan lo mismo que uno pequeño por tramo, no por píxel.
+    """
+    font = get(name)
+    if font is None:
+        return x
+    return draw_font(fb, text, x, y, font, color)
+
+
+def draw_font(fb, text, x, y, font, color=1):
+    """Como draw() pero con el paquete ya resuelto (ver oled_hal.py)"""
+    index = font.INDEX
+    widths = font.WIDTHS
+    glyphs = font.GLYPHS
+    first = font.FIRST
+    last = font.LAST
+    pages = font.PAGES
+    h = font.HEIGHT
+    spacing = font.SPACING
+    vline = _vline
+
+    for char in str(text):
+        code = ord(char)
+        if code == _DEGREE:
+            code = last
+        elif code < first or code > last:
+            code = 32  # Carácter desconocido: espacio
+        i = code - first
+        offset = index[2 * i] | (index[2 * i + 1] << 8)
+        w = widths[i]
+
+        for col in range(w):
+            # Reunir los bytes de la columna (1 para fuentes de 8px o menos)
+            bits = glyphs[offset]
+            for p in range(1, pages):
+                bits |= glyphs[offset + p] << (8 * p)
+            offset += pages
+
+            row = 0
+            while bits and row < h:
+                if bits & 1:
+                    start = row
+                    while bits & 1:
+                        bits >>= 1
+                        row += 1
+                    vline(fb, x + col, y + start, row - start, color)
+                else:
+                    bits >>= 1
+                    row += 1
+
+        x += w + spacing
+
+    return x
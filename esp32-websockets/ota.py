@@ -0,0 +1,455 @@
+# ota.py - Actualización de scripts por el WebSocket (OTA)
+# Guarda este archivo en el ESP32 junto con tu boot.py, y ota_main.py como main.py
+#
+# Protocolo (servidor -> equipo), por la conexión que ya existe:
+#   {"cmd": "ota_begin", "file": "boot.py", "size": 23817, "sha256": "9f2c...",
+#    "sig": "51ab...", "id": 1}
+#   frames binarios: b"O" + offset (4 bytes, big endian) + datos (hasta ~4 KB)
+#   {"cmd": "ota_end", "id": 2}                       -> verifica tamaño y SHA-256
+#   ...otro archivo: ota_begin / frames / ota_end...
+#   {"cmd": "ota_apply", "version": "3.3", "sig": "07c4...", "id": 9}
+#                                                     -> cambia todo y reinicia
+#   {"cmd": "ota_abort"}                              -> descarta lo recibido
+# El equipo responde cada comando con cmd_result (ver commands.py) y cada
+# `ack_bytes` manda {"type": "ota_ack", "file": ..., "offset": N}: el
+# servidor no debería adelantarse más de una ventana (igual TCP frena si
+# el ESP32 no lee). Un frame fuera de orden cancela el archivo (ota_error).
+#
+#   - Cada frame se escribe directo a "<archivo>.new" y el SHA-256 se
+#     calcula por partes: el archivo nunca está entero en la RAM
+#   - apply(): primero se guarda el diario (ota_state.json) y después se
+#     renombra archivo -> .bak y .new -> archivo. Si se corta la luz en el
+#     medio, boot_check() termina los renombres al arrancar
+#   - La versión nueva queda "a prueba": boot_check() cuenta los arranques y
+#     si llegan a `max_boots` sin confirm() vuelve a los .bak y reinicia.
+#     confirm() (boot.py, al conectar el WebSocket) borra los .bak
+#   - Si el boot.py nuevo ni siquiera corre (error de sintaxis), MicroPython
+#     sigue con main.py: ota_main.py vuelve a la versión anterior
+#   - ota.py y main.py no se actualizan por OTA: son la red de seguridad
+#   - `file` puede ir en una carpeta que ya existe ("monitor/net.py"),
+#     nunca con ".." ni desde la raíz
+#   - Firma: el TLS no verifica el certificado, así que el equipo no confía
+#     en quien le habla. ota_begin y ota_apply traen `sig`, un HMAC-SHA256
+#     con la clave de este equipo (KEY_FILE, se graba una vez por USB y no
+#     se puede cambiar por OTA). Se firma "ota_begin:archivo:tamaño:sha256"
+#     (sign_begin) y "ota_apply:contador:versión:archivo=sha256,..."
+#     (sign_apply). El contador está en el diario, sube con cada apply()
+#     y nunca baja (tampoco al revertir): una firma de ota_apply sirve una
+#     sola vez, y como cubre el SHA-256 de cada archivo no se le puede
+#     colar otro archivo firmado antes. El servidor lo lee en la respuesta
+#     de ota_begin ("counter") o en summary(). Sin KEY_FILE el equipo no
+#     acepta OTA. El servidor firma con las mismas funciones (ota.py corre
+#     también en CPython)
+#
+# Clave (una por equipo, guardarla también del lado del servidor):
+#   python -c "import os; open('ota_key.bin', 'wb').write(os.urandom(32))"
+#   mpremote cp ota_key.bin :ota_key.bin
+#
+# Uso (boot.py):
+#   import ota
+#   ota.boot_check(3)                  # lo primero, antes del hardware
+#   ota_rx = ota.OtaReceiver(ws.send)
+#   ota_rx.begin("boot.py", 23817, "9f2c...", sig)
+#   ota_rx.write(frame)                # por cada frame binario
+#   ota_rx.end()                       # -> {"bytes", "ms", "kBps", ...}
+#   ota_rx.apply("3.3", sig)           # y machine.reset()
+#   ota.confirm()                      # cuando la versión nueva funciona
+#
+# Servidor:
+#   sig = ota.sign_begin(key, "boot.py", 23817, "9f2c...")
+#   sig = ota.sign_apply(key, 7, "3.3", [("boot.py", "9f2c...")])   # contador 7
+
+import os
+import time
+import json
+import struct
+import hashlib
+import binascii
+
+STATE_FILE = "ota_state.json"
+KEY_FILE = "ota_key.bin"      # Clave HMAC de este equipo
+MAGIC = 0x4F                  # b"O": primer byte de los frames binarios del OTA
+PROTECTED = ("ota.py", "ota.mpy", "main.py", STATE_FILE, KEY_FILE)
+EXTENSIONS = (".py", ".mpy", ".json")
+
+# Estados del diario
+APPLYING = "aplicando"
+TRIAL = "a prueba"
+OK = "ok"
+ROLLED_BACK = "revertida"
+
+_user_stop = False            # Ctrl+C: boot.py terminó sin fallar
+
+
+def _exists(path):
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def load_key(path=KEY_FILE):
+    """Clave HMAC del equipo (bytes) o None si no hay"""
+    try:
+        with open(path, "rb") as f:
+            return f.read() or None
+    except OSError:
+        return None
+
+
+def hmac_sha256(key, msg):
+    """HMAC-SHA256 (RFC 2104) en hex: MicroPython no trae el módulo hmac"""
+    if len(key) > 64:
+        key = hashlib.sha256(key).digest()
+    key = key + bytes(64 - len(key))
+    inner = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+    inner.update(msg)
+    outer = hashlib.sha256(bytes(b ^ 0x5C for b in key))
+    outer.update(inner.digest())
+    return binascii.hexlify(outer.digest()).decode()
+
+
+def sign_begin(key, name, size, sha256):
+    return hmac_sha256(key, f"ota_begin:{name}:{size}:{sha256.lower()}".encode())
+
+
+def sign_apply(key, counter, version, files):
+    """counter: contador del diario (counter()); files: [(archivo, sha256)]"""
+    files = ",".join(f"{name}={sha256.lower()}" for name, sha256 in files)
+    return hmac_sha256(key, f"ota_apply:{counter}:{version or ''}:{files}".encode())
+
+
+def _same(a, b):
+    # Compara sin cortar en el primer byte distinto (no filtra cuánto acertó)
+    if len(a) != len(b):
+        return False
+    diff = 0
+    for x, y in zip(a, b):
+        diff |= ord(x) ^ ord(y)
+    return diff == 0
+
+
+def load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def counter(state=None):
+    """Contador de apply() del diario: lo que firma el próximo ota_apply"""
+    if state is None:
+        state = load_state()
+    return (state or {}).get("counter", 0)
+
+
+def installed(state):
+    """Versión que corre ahora según el diario (None si nunca hubo OTA)"""
+    if not state:
+        return None
+    if state.get("state") == ROLLED_BACK:
+        return state.get("previous")
+    return state.get("version")
+
+
+def _save_state(state):
+    # Escribir aparte y renombrar: el diario nunca queda a medias
+    with open(STATE_FILE + ".tmp", "w") as f:
+        json.dump(state, f)
+    _remove(STATE_FILE)
+    os.rename(STATE_FILE + ".tmp", STATE_FILE)
+
+
+def _swap(files):
+    """archivo -> .bak y .new -> archivo. Se puede repetir tras un corte"""
+    for name in files:
+        if not _exists(name + ".new"):
+            continue  # Ya cambiado
+        if _exists(name):
+            _remove(name + ".bak")
+            os.rename(name, name + ".bak")
+        os.rename(name + ".new", name)
+
+
+def rollback(state, reason):
+    """Vuelve a los .bak de la última actualización"""
+    for name in state.get("files", ()):
+        _remove(name + ".new")
+        if _exists(name + ".bak"):
+            _remove(name)
+            os.rename(name + ".bak", name)
+        elif name in state.get("created", ()):
+            _remove(name)
+    print(f"↩️ OTA {state.get('version')} revertida: {reason}")
+    state["state"] = ROLLED_BACK
+    state["reason"] = reason
+    _save_state(state)
+
+
+def boot_check(max_boots=3):
+    """Llamar al principio de boot.py. Termina una actualización cortada y
+    cuenta los arranques a prueba (con `max_boots` sin confirmar: rollback
+    y reinicio). Retorna el diario (o None)"""
+    state = load_state()
+    if not state:
+        return None
+    if state.get("state") == APPLYING:
+        _swap(state["files"])
+        state["state"] = TRIAL
+        state["boots"] = 0
+    if state.get("state") == TRIAL:
+        state["boots"] = state.get("boots", 0) + 1
+        if state["boots"] > max_boots:
+            rollback(state, f"sin confirmar tras {max_boots} arranques")
+            import machine
+            machine.reset()
+        _save_state(state)
+        print(f"🧪 OTA {state.get('version')} a prueba (arranque {state['boots']}/{max_boots})")
+    return state
+
+
+def confirm():
+    """La versión a prueba funciona: borra los .bak. True si había algo que confirmar"""
+    state = load_state()
+    if not state or state.get("state") != TRIAL:
+        return False
+    for name in state["files"]:
+        _remove(name + ".bak")
+    state["state"] = OK
+    _save_state(state)
+    print(f"✅ OTA {state.get('version')} confirmada")
+    return True
+
+
+def user_stop():
+    """boot.py lo llama al detenerse con Ctrl+C: no es una falla"""
+    global _user_stop
+    _user_stop = True
+
+
+def after_boot():
+    """Para main.py: boot.py terminó (falló). Con una actualización a
+    prueba, volver a la versión anterior y reiniciar"""
+    if _user_stop:
+        return
+    state = load_state()
+    if state and state.get("state") in (APPLYING, TRIAL):
+        rollback(state, "boot.py terminó con error")
+        import machine
+        machine.reset()
+
+
+class OtaReceiver:
+    def __init__(self, send=None, ack_bytes=16384, key=None):
+        """key: clave HMAC (bytes); por defecto la de KEY_FILE"""
+        self.send = send              # send(str) para ota_ack / ota_error
+        self.ack_bytes = ack_bytes
+        self.key = key or load_key()
+        self.file = None
+        self.size = 0
+        self.offset = 0
+        self.staged = []              # Archivos verificados (.new) esperando apply()
+        self._sums = {}               # SHA-256 de cada archivo de staged
+        self._f = None
+        self._hash = None
+        self._sha = None
+        self._start = 0
+        self._next_ack = 0
+        self._flash_ms = 0
+        # Estadísticas
+        self.files_ok = 0
+        self.errors = 0
+        self.total_bytes = 0
+        self.last = None              # Resultado del último archivo
+        self.last_error = None
+
+    @property
+    def active(self):
+        return self._f is not None
+
+    def _check(self, sig, sign, *args):
+        if not self.key:
+            self.errors += 1
+            raise ValueError(f"OTA deshabilitado: falta la clave {KEY_FILE}")
+        if not isinstance(sig, str) or not _same(sig.lower(), sign(self.key, *args)):
+            self.errors += 1
+            raise ValueError("firma inválida")
+
+    def begin(self, name, size, sha256, sig=None):
+        """Empieza a recibir `name` (`size` bytes, SHA-256 en hex). sig:
+        sign_begin() con la clave del equipo"""
+        if not isinstance(name, str) or name.startswith("/") or ".." in name \
+                or name in PROTECTED or not any(name.endswith(ext) for ext in EXTENSIONS):
+            raise ValueError(f"archivo no permitido: {name}")
+        if size <= 0 or len(sha256) != 64:
+            raise ValueError("tamaño o SHA-256 inválido")
+        self._check(sig, sign_begin, name, size, sha256)
+        if self._f:
+            self._cancel("reemplazado por otro archivo")
+        try:
+            st = os.statvfs("/")
+            free = st[0] * st[4]
+            if free < size + 4096:
+                raise ValueError(f"sin espacio: {free} bytes libres")
+        except (AttributeError, OSError):
+            pass
+        self._f = open(name + ".new", "wb")
+        self._hash = hashlib.sha256()
+        self._sha = sha256.lower()
+        self.file = name
+        self.size = size
+        self.offset = 0
+        self._next_ack = self.ack_bytes
+        self._flash_ms = 0
+        self._start = time.ticks_ms()
+        print(f"⬇️ OTA: recibiendo {name} ({size} bytes)")
+
+    def write(self, frame):
+        """Frame binario recibido. Retorna True si era del OTA"""
+        if not frame or frame[0] != MAGIC or len(frame) < 5:
+            return False
+        if self._f is None:
+            self.errors += 1
+            return True  # Restos de un archivo cancelado
+        offset = struct.unpack(">I", frame[1:5])[0]
+        data = memoryview(frame)[5:]
+        if offset != self.offset:
+            self._cancel(f"offset {offset}, esperado {self.offset}")
+            return True
+        if offset + len(data) > self.size:
+            self._cancel(f"más datos que {self.size} bytes")
+            return True
+        t0 = time.ticks_ms()
+        self._f.write(data)
+        self._flash_ms += time.ticks_diff(time.ticks_ms(), t0)
+        self._hash.update(data)
+        self.offset += len(data)
+        self.total_bytes += len(data)
+        if self.offset >= self._next_ack or self.offset == self.size:
+            self._next_ack = self.offset + self.ack_bytes
+            self._notify({"type": "ota_ack", "file": self.file, "offset": self.offset})
+        return True
+
+    def end(self):
+        """Cierra el archivo en curso y verifica tamaño y SHA-256"""
+        if self._f is None:
+            raise ValueError(self.last_error or "no hay archivo en curso")
+        name = self.file
+        self._f.close()
+        self._f = None
+        if self.offset != self.size:
+            _remove(name + ".new")
+            self.errors += 1
+            raise ValueError(f"{name}: llegaron {self.offset} de {self.size} bytes")
+        digest = binascii.hexlify(self._hash.digest()).decode()
+        if digest != self._sha:
+            _remove(name + ".new")
+            self.errors += 1
+            raise ValueError(f"{name}: SHA-256 no coincide")
+        ms = max(1, time.ticks_diff(time.ticks_ms(), self._start))
+        if name not in self.staged:
+            self.staged.append(name)
+        self._sums[name] = digest
+        self.files_ok += 1
+        self.last = {"file": name, "bytes": self.size, "ms": ms,
+                     "kBps": round(self.size / ms, 1), "flashMs": self._flash_ms}
+        print(f"✓ OTA: {name} verificado, {self.size} bytes en {ms}ms "
+              f"({self.last['kBps']} KB/s, flash {self._flash_ms}ms)")
+        return self.last
+
+    def abort(self):
+        """Descarta el archivo en curso y los que esperaban apply()"""
+        if self._f:
+            self._f.close()
+            self._f = None
+            _remove(self.file + ".new")
+        for name in self.staged:
+            _remove(name + ".new")
+        count = len(self.staged)
+        self.staged = []
+        self._sums = {}
+        return count
+
+    def apply(self, version=None, sig=None):
+        """Cambia los archivos verificados (con diario) y los deja a prueba.
+        Después hay que reiniciar. sig: sign_apply() con el contador del diario"""
+        if self._f:
+            raise ValueError(f"{self.file} todavía se está recibiendo")
+        if not self.staged:
+            raise ValueError("no hay archivos verificados")
+        previous = load_state() or {}
+        count = counter(previous)
+        self._check(sig, sign_apply, count, version,
+                    [(name, self._sums[name]) for name in self.staged])
+        state = {
+            "state": APPLYING,
+            "files": self.staged,
+            "created": [name for name in self.staged if not _exists(name)],
+            "version": version,
+            "previous": installed(previous),
+            "boots": 0,
+            "counter": count + 1,     # Antes de cambiar nada: la firma ya no sirve
+        }
+        _save_state(state)
+        _swap(self.staged)
+        state["state"] = TRIAL
+        _save_state(state)
+        print(f"🔁 OTA {version}: {', '.join(self.staged)} (a prueba tras reiniciar)")
+        self.staged = []
+        self._sums = {}
+        return {"files": state["files"], "version": version}
+
+    def _cancel(self, reason):
+        self._f.close()
+        self._f = None
+        _remove(self.file + ".new")
+        self.errors += 1
+        self.last_error = f"{self.file}: {reason}"
+        print(f"❌ OTA: {self.last_error}")
+        self._notify({"type": "ota_error", "file": self.file, "error": reason})
+
+    def _notify(self, msg):
+        if self.send:
+            try:
+                self.send(json.dumps(msg))
+            except Exception as e:
+                print(f"⚠️ OTA: no se pudo avisar al servidor: {e}")
+
+    def summary(self):
+        state = load_state() or {}
+        return {
+            "version": state.get("version"),
+            "installed": installed(state),
+            "counter": counter(state),      # El que firma el próximo ota_apply
+            "state": state.get("state"),
+            "receiving": self.file if self._f else None,
+            "progress": self.offset if self._f else None,
+            "staged": len(self.staged),
+            "filesOk": self.files_ok,
+            "errors": self.errors,
+            "bytes": self.total_bytes,
+            "last": self.last,
+        }
+
+    def report(self):
+        """Imprime el estado del OTA (para usar desde el REPL)"""
+        state = load_state() or {}
+        print(f"⬇️ OTA: versión {state.get('version')} ({state.get('state') or 'sin OTA'})")
+        if self._f:
+            print(f"   Recibiendo {self.file}: {self.offset}/{self.size} bytes")
+        if self.last:
+            print(f"   Último: {self.last['file']} {self.last['bytes']} bytes en {self.last['ms']}ms "
+                  f"({self.last['kBps']} KB/s, flash {self.last['flashMs']}ms)")
+        print(f"   Archivos {self.files_ok}, errores {self.errors}, {self.total_bytes} bytes, "
+              f"esperando apply {len(self.staged)}")
+        if self.last_error:
+            print(f"   Último error: {self.last_error}")
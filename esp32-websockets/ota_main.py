@@ -0,0 +1,11 @@
+# ota_main.py - Red de seguridad del OTA: guardar en el ESP32 como main.py
+#
+# MicroPython corre main.py cuando termina boot.py. El loop de boot.py no
+# termina nunca salvo que falle (un error de sintaxis en una versión nueva,
+# por ejemplo): si había una actualización a prueba, se vuelve a la versión
+# anterior y se reinicia (ver ota.py). Sin OTA pendiente, o si boot.py se
+# detuvo con Ctrl+C (ota.user_stop()), no hace nada.
+
+import ota
+
+ota.after_boot()
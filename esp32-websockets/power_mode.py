@@ -0,0 +1,224 @@
+# power_mode.py - Modo de energía entre tareas: modem sleep y lightsleep
+# Guarda este archivo en el ESP32 junto con scheduler.py
+#
+# Modos:
+#   normal   -> WiFi siempre despierto (PM_NONE), sleep_ms entre tareas
+#   ahorro   -> WiFi en modem sleep (PM_POWERSAVE): la radio duerme entre
+#               beacons del AP. La CPU duerme igual que en normal
+#   bateria  -> ahorro + machine.lightsleep() cuando el hueco hasta la
+#               próxima tarea es largo y NO hay WiFi conectado (corte de luz:
+#               el AP también está caído). lightsleep detiene los dos núcleos
+#
+# Despiertan antes de tiempo:
+#   - la puerta: IRQ del pin (y wake_on_ext0 durante lightsleep)
+#   - en el hilo de red, datos en el socket (SocketWake)
+#
+# Uso:
+#   power = PowerManager("ahorro", wake_pin=mc38_sensor, battery_mah=2000)
+#   power.set_wlan(wlan)
+#   sched = Scheduler(idle=power.idle)
+#   power.on_wake = lambda: sched.wake(t_puerta)
+#   power.report()                    # presupuesto de energía (desde el REPL)
+
+import time
+import select
+import machine
+import network
+
+NORMAL = "normal"
+AHORRO = "ahorro"
+BATERIA = "bateria"
+
+# Consumo aproximado (mA) según la hoja de datos del ESP32 (240 MHz).
+# Solo sirve para comparar modos: medir con un amperímetro para valores reales
+MA_CPU = 50            # Ejecutando tareas
+MA_CPU_IDLE = 25       # sleep_ms: la CPU espera con el reloj encendido
+MA_LIGHTSLEEP = 0.8    # machine.lightsleep(): CPU y radio detenidas
+MA_RADIO = 80          # WiFi despierto (PM_NONE o buscando el AP)
+MA_RADIO_AHORRO = 15   # Modem sleep: promedio con la radio dormida entre beacons
+
+
+class PowerManager:
+    def __init__(self, mode=NORMAL, lightsleep_min_ms=200, wake_pin=None,
+                 on_wake=None, battery_mah=0):
+        if mode not in (NORMAL, AHORRO, BATERIA):
+            raise ValueError(f"modo de energía desconocido: {mode}")
+        self.mode = mode
+        self.lightsleep_min_ms = lightsleep_min_ms
+        self.wake_pin = wake_pin
+        self.on_wake = on_wake   # Se llama (fuera de la IRQ) si la puerta cambió
+        self.battery_mah = battery_mah
+        self.wlan = None
+        self.pending = False
+
+        if wake_pin is not None and mode != NORMAL:
+            wake_pin.irq(handler=self._irq,
+                         trigger=machine.Pin.IRQ_RISING | machine.Pin.IRQ_FALLING)
+        self.reset()
+
+    def reset(self):
+        now = time.ticks_ms()
+        self.started = now
+        self._mark = now
+        self.awake_ms = 0
+        self.idle_ms = 0
+        self.light_ms = 0
+        self.radio_ms = 0        # Radio despierta
+        self.radio_save_ms = 0   # Radio en modem sleep
+        self.light_sleeps = 0
+        self.wakes = 0           # Despertares por la puerta
+
+    def set_wlan(self, wlan):
+        """Aplica el modo de la radio (llamar después de wlan.active(True))"""
+        self.wlan = wlan
+        pm = wlan.PM_NONE if self.mode == NORMAL else wlan.PM_POWERSAVE
+        try:
+            wlan.config(pm=pm)
+        except Exception as e:
+            print(f"⚠ WiFi sin modo de energía: {e}")
+
+    def _irq(self, pin):
+        # Solo una bandera: la IRQ puede llegar en medio de una tarea
+        self.pending = True
+
+    def lightsleep_ok(self, gap):
+        if self.mode != BATERIA or gap < self.lightsleep_min_ms:
+            return False
+        wlan = self.wlan
+        if wlan is None:
+            return True
+        # Conectado o conectándose: lightsleep cortaría la asociación con el AP
+        return not wlan.isconnected() and wlan.status() != network.STAT_CONNECTING
+
+    def _arm_door(self):
+        """Despertar del lightsleep cuando la puerta cambie de estado"""
+        level = self.wake_pin.value()
+        try:
+            import esp32
+            esp32.wake_on_ext0(pin=self.wake_pin,
+                               level=esp32.WAKEUP_ALL_LOW if level else esp32.WAKEUP_ANY_HIGH)
+        except (ImportError, ValueError, TypeError):
+            pass
+        return level
+
+    def idle(self, gap):
+        """Duerme `gap` ms (para Scheduler(idle=...)) y lleva la cuenta"""
+        t0 = time.ticks_ms()
+        awake = time.ticks_diff(t0, self._mark)
+        self.awake_ms += awake
+        self._radio(awake)
+
+        if self.lightsleep_ok(gap):
+            level = self._arm_door() if self.wake_pin is not None else None
+            machine.lightsleep(gap)
+            self.light_sleeps += 1
+            if level is not None and self.wake_pin.value() != level:
+                self.pending = True
+            now = time.ticks_ms()
+            self.light_ms += time.ticks_diff(now, t0)
+        else:
+            time.sleep_ms(gap)
+            now = time.ticks_ms()
+            slept = time.ticks_diff(now, t0)
+            self.idle_ms += slept
+            self._radio(slept)
+        self._mark = now
+
+        if self.pending:
+            self.pending = False
+            self.wakes += 1
+            if self.on_wake:
+                self.on_wake()
+
+    def _radio(self, ms):
+        wlan = self.wlan
+        if wlan is None or not wlan.active():
+            return
+        if self.mode != NORMAL and wlan.isconnected():
+            self.radio_save_ms += ms
+        else:
+            self.radio_ms += ms
+
+    # ----- presupuesto de energía -----
+    def avg_ma(self):
+        total = self.awake_ms + self.idle_ms + self.light_ms
+        if not total:
+            return 0
+        charge = (MA_CPU * self.awake_ms + MA_CPU_IDLE * self.idle_ms +
+                  MA_LIGHTSLEEP * self.light_ms + MA_RADIO * self.radio_ms +
+                  MA_RADIO_AHORRO * self.radio_save_ms)
+        return charge / total
+
+    def duty_pct(self):
+        total = self.awake_ms + self.idle_ms + self.light_ms
+        return 100 * self.awake_ms / total if total else 0
+
+    def summary(self):
+        """Resumen compacto para el WebSocket"""
+        ma = self.avg_ma()
+        total = self.awake_ms + self.idle_ms + self.light_ms
+        data = {
+            "mode": self.mode,
+            "dutyPct": round(self.duty_pct(), 1),
+            "lightSleepPct": round(100 * self.light_ms / total, 1) if total else 0,
+            "lightSleeps": self.light_sleeps,
+            "doorWakes": self.wakes,
+            "avgMa": round(ma, 1),
+            "mAhPerDay": round(ma * 24, 0),
+        }
+        if self.battery_mah and ma:
+            data["batteryHours"] = round(self.battery_mah / ma, 1)
+        return data
+
+    def report(self):
+        """Imprime el presupuesto de energía (para usar desde el REPL)"""
+        total = self.awake_ms + self.idle_ms + self.light_ms
+        ma = self.avg_ma()
+        print(f"🔋 Energía: modo {self.mode} ({total // 1000}s medidos)")
+        print(f"   CPU activa {self.awake_ms}ms ({self.duty_pct():.1f}%), "
+              f"sleep_ms {self.idle_ms}ms, lightsleep {self.light_ms}ms ({self.light_sleeps}x)")
+        print(f"   Radio despierta {self.radio_ms}ms, modem sleep {self.radio_save_ms}ms")
+        print(f"   Promedio estimado: {ma:.1f} mA = {ma * 24:.0f} mAh/día")
+        if self.battery_mah and ma:
+            print(f"   Batería de {self.battery_mah} mAh: ~{self.battery_mah / ma:.0f} h")
+        print(f"   Despertares por la puerta: {self.wakes}")
+
+
+class SocketWake:
+    """idle() para el hilo de red: duerme hasta el vencimiento o hasta que
+    llegan datos al socket, lo que pase primero"""
+
+    def __init__(self, get_sock, on_ready, min_ms=50):
+        self.get_sock = get_sock    # Socket a vigilar (None = solo dormir)
+        self.on_ready = on_ready
+        self.min_ms = min_ms        # Si el socket sigue listo tan seguido, dormir normal
+        self.poller = select.poll()
+        self.sock = None
+        self.last_ready = time.ticks_ms()
+        self.wakes = 0
+
+    def idle(self, gap):
+        sock = self.get_sock()
+        if sock is not self.sock:
+            if self.sock is not None:
+                try:
+                    self.poller.unregister(self.sock)
+                except Exception:
+                    pass
+            self.sock = sock
+            if sock is not None:
+                self.poller.register(sock, select.POLLIN)
+
+        # Datos que nadie consume (p. ej. recv() falla) no deben girar el loop
+        if sock is None or time.ticks_diff(time.ticks_ms(), self.last_ready) < self.min_ms:
+            time.sleep_ms(gap)
+            return
+        try:
+            ready = self.poller.poll(gap)
+        except OSError:
+            time.sleep_ms(gap)
+            return
+        if ready:
+            self.last_ready = time.ticks_ms()
+            self.wakes += 1
+            self.on_ready()
@@ -0,0 +1,202 @@
+# rtc_log.py - Estado y muestras que sobreviven al deep sleep (memoria RTC)
+# Guarda este archivo en el ESP32 junto con boot_deepsleep.py
+#
+# La memoria RTC (2 KB en el ESP32) se conserva en deep sleep pero se borra
+# al cortar la alimentación. Guarda una cabecera con contadores y las
+# muestras pendientes de enviar. Si se llena (muchas horas sin WiFi), las
+# muestras pasan a un archivo en la flash y se envían primero.
+#
+# Uso:
+#   log = RtcLog.load()
+#   log.append(time.time(), ds_temp, ds_ok, dht_temp, dht_hum, dht_ok, flags)
+#   for seq, epoch, ds, t, h, flags in log.pending(): ...
+#   log.clear_pending()
+#   log.save()
+
+import struct
+import machine
+
+_MAGIC = 0x4453  # "SD"
+_RTC_SIZE = 2048
+# magic, muestras en RTC, muestras en flash, próximo seq, último NTP (epoch),
+# corrección del último NTP (s), despertares desde el envío, envíos fallidos,
+# último despertar (ms), máximo (ms), suma (ms), despertares medidos
+_HEADER = "<HHHIIiHHHHIH"
+_HEADER_SIZE = struct.calcsize(_HEADER)
+# epoch, DS18B20 x10, DHT22 x10, humedad, flags
+_RECORD = "<IhhBB"
+RECORD_SIZE = struct.calcsize(_RECORD)
+CAPACITY = (_RTC_SIZE - _HEADER_SIZE) // RECORD_SIZE
+
+FLASH_FILE = "muestras.bin"
+
+# Flags de cada muestra
+DOOR_CLOSED = 0x01
+DS_VALID = 0x02
+DHT_VALID = 0x04
+PIN_WAKE = 0x08      # La tomó un despertar por la puerta
+TIME_VALID = 0x10    # Había hora de NTP cuando se tomó
+
+_INVALID = -32768
+
+
+def _x10(value, valid):
+    return int(round(value * 10)) if valid else _INVALID
+
+
+def _fix_records(buf, count, offset):
+    """Suma `offset` a las muestras de `buf` tomadas sin hora. Retorna cuántas"""
+    fixed = 0
+    for i in range(count):
+        at = i * RECORD_SIZE
+        fields = struct.unpack_from(_RECORD, buf, at)
+        if not fields[4] & TIME_VALID:
+            struct.pack_into(_RECORD, buf, at, fields[0] + offset,
+                             fields[1], fields[2], fields[3], fields[4] | TIME_VALID)
+            fixed += 1
+    return fixed
+
+
+class RtcLog:
+    def __init__(self):
+        self.count = 0
+        self.flash_count = 0
+        self.seq = 0
+        self.ntp_epoch = 0
+        self.ntp_offset = 0
+        self.wakes = 0
+        self.fails = 0
+        self.last_wake_ms = 0
+        self.max_wake_ms = 0
+        self.sum_wake_ms = 0
+        self.wake_count = 0
+        self.records = bytearray()
+        self.fresh = True   # No había estado válido (encendido o RTC borrada)
+
+    @classmethod
+    def load(cls):
+        log = cls()
+        data = machine.RTC().memory()
+        if len(data) < _HEADER_SIZE:
+            return log
+        fields = struct.unpack_from(_HEADER, data)
+        if fields[0] != _MAGIC:
+            return log
+        (_, log.count, log.flash_count, log.seq, log.ntp_epoch, log.ntp_offset,
+         log.wakes, log.fails, log.last_wake_ms, log.max_wake_ms,
+         log.sum_wake_ms, log.wake_count) = fields
+        log.count = min(log.count, CAPACITY)
+        log.records = bytearray(data[_HEADER_SIZE:_HEADER_SIZE + log.count * RECORD_SIZE])
+        log.count = len(log.records) // RECORD_SIZE
+        log.fresh = False
+        return log
+
+    def save(self):
+        header = struct.pack(_HEADER, _MAGIC, self.count, self.flash_count, self.seq,
+                             self.ntp_epoch, self.ntp_offset, self.wakes, self.fails,
+                             min(self.last_wake_ms, 0xFFFF), min(self.max_wake_ms, 0xFFFF),
+                             self.sum_wake_ms, self.wake_count)
+        machine.RTC().memory(header + self.records)
+
+    # ----- muestras -----
+    def append(self, epoch, ds_temp, ds_valid, dht_temp, dht_hum, dht_valid, flags):
+        """Agrega una muestra; retorna su número de secuencia"""
+        if ds_valid:
+            flags |= DS_VALID
+        if dht_valid:
+            flags |= DHT_VALID
+        if self.count >= CAPACITY:
+            self._spill()
+        self.records += struct.pack(_RECORD, epoch, _x10(ds_temp, ds_valid),
+                                    _x10(dht_temp, dht_valid),
+                                    int(round(dht_hum)) if dht_valid else 255, flags)
+        self.count += 1
+        seq = self.seq
+        self.seq += 1
+        return seq
+
+    def _spill(self):
+        """RTC llena: mover las muestras a la flash (lento, pero raro)"""
+        with open(FLASH_FILE, "ab") as f:
+            f.write(self.records)
+        self.flash_count += self.count
+        self.count = 0
+        self.records = bytearray()
+
+    def pending_count(self):
+        return self.flash_count + self.count
+
+    def pending(self):
+        """Muestras sin enviar, las de la flash primero:
+        (seq, epoch, ds_x10, dht_x10, humedad, flags); _INVALID / 255 = sin dato"""
+        seq = self.seq - self.pending_count()
+        if self.flash_count:
+            try:
+                with open(FLASH_FILE, "rb") as f:
+                    for _ in range(self.flash_count):
+                        raw = f.read(RECORD_SIZE)
+                        if len(raw) < RECORD_SIZE:
+                            break
+                        yield (seq,) + struct.unpack(_RECORD, raw)
+                        seq += 1
+            except OSError:
+                pass
+            seq = self.seq - self.count
+        for i in range(self.count):
+            yield (seq + i,) + struct.unpack_from(_RECORD, self.records, i * RECORD_SIZE)
+
+    def fix_time(self, offset, chunk=32):
+        """Primer NTP: corrige las muestras tomadas sin hora, las de la RTC y
+        las que ya pasaron a la flash (el RTC siguió contando en deep sleep,
+        solo estaba desplazado). La flash se corrige en su lugar, de a
+        `chunk` muestras"""
+        _fix_records(self.records, self.count, offset)
+        if not self.flash_count:
+            return
+        try:
+            with open(FLASH_FILE, "r+b") as f:
+                pos = 0
+                left = self.flash_count
+                while left > 0:
+                    n = min(chunk, left)
+                    f.seek(pos)
+                    buf = bytearray(f.read(n * RECORD_SIZE))
+                    n = len(buf) // RECORD_SIZE
+                    if not n:
+                        break
+                    if _fix_records(buf, n, offset):
+                        f.seek(pos)
+                        f.write(buf)
+                    pos += n * RECORD_SIZE
+                    left -= n
+        except OSError as e:
+            print(f"⚠ No se pudo corregir la hora en {FLASH_FILE}: {e}")
+
+    def clear_pending(self):
+        if self.flash_count:
+            try:
+                import os
+                os.remove(FLASH_FILE)
+            except OSError:
+                pass
+        self.flash_count = 0
+        self.count = 0
+        self.records = bytearray()
+
+    # ----- tiempo despierto -----
+    def note_wake(self, ms):
+        self.last_wake_ms = ms
+        if ms > self.max_wake_ms:
+            self.max_wake_ms = ms
+        self.sum_wake_ms += ms
+        self.wake_count += 1
+
+    def wake_stats(self):
+        avg = self.sum_wake_ms // self.wake_count if self.wake_count else 0
+        return {"lastMs": self.last_wake_ms, "avgMs": avg, "maxMs": self.max_wake_ms,
+                "wakes": self.wake_count}
+
+    def reset_wake_stats(self):
+        self.max_wake_ms = 0
+        self.sum_wake_ms = 0
+        self.wake_count = 0
@@ -0,0 +1,273 @@
+# scheduler.py - Planificador de tareas periódicas para el loop principal
+# Guarda este archivo en el ESP32 junto con tu boot.py
+#
+# Reemplaza el patrón "last_x = ticks_ms() / if ticks_diff(now, last_x) >= N"
+# por una tabla de tareas. Entre tareas duerme exactamente hasta el próximo
+# vencimiento (o lightsleep si el hueco es largo) en vez de un sleep fijo.
+#
+# Uso:
+#   from scheduler import Scheduler, SKIP, DELAY
+#   sched = Scheduler()
+#   sched.add("puerta", check_door, 100, priority=3)
+#   sched.add("sensores", read_sensors, 2000, priority=1)
+#   oled = sched.add("oled", update_oled, 1000, overrun=DELAY)
+#   sched.run()                      # o sched.run_once() dentro de un loop propio
+#   sched.wake(oled)                 # adelantar una tarea (p. ej. al abrir la puerta)
+#
+# Política cuando una tarea se atrasa más de un período (overrun):
+#   SKIP     mantiene la fase y salta los vencimientos perdidos (por defecto)
+#   CATCHUP  ejecuta los perdidos uno tras otro (hasta `max_catchup`)
+#   DELAY    el próximo vencimiento es `period` después de terminar la tarea
+
+from micropython import const
+import time
+import heapq
+
+SKIP = const(0)
+CATCHUP = const(1)
+DELAY = const(2)
+
+# Los vencimientos se guardan relativos a `base` (enteros chicos) y se
+# rebasan cada ~3 días para que ticks_ms no dé la vuelta dentro del heap
+_REBASE_MS = const(1 << 28)
+
+
+class Task:
+    def __init__(self, name, fn, period, priority, overrun, max_catchup, prof):
+        self.name = name
+        self.fn = fn
+        self.period = period
+        self.priority = priority
+        self.overrun = overrun
+        self.max_catchup = max_catchup
+        self.prof = prof          # Tarea de loop_profiler (o None)
+        self.mem = None           # Tarea de memory.py (o None)
+        self.enabled = True
+        self.runs = 0
+        self.overruns = 0         # Veces que llegó tarde más de un período
+        self.skipped = 0          # Vencimientos perdidos (SKIP)
+        self.catchup = 0
+        # [vencimiento, -prioridad, orden, tarea]: se reutiliza en cada push
+        self.entry = [0, -priority, 0, self]
+        self.queued = False
+
+
+class Scheduler:
+    def __init__(self, lightsleep_ms=0, max_sleep_ms=1000, profiler=None, idle=None,
+                 memory=None):
+        """lightsleep_ms: huecos de al menos esto se duermen con
+        machine.lightsleep() (0 = nunca; ojo: corta el WiFi y el otro hilo).
+        max_sleep_ms: tope de cada sleep, para revisar la condición de parada.
+        idle: función idle(ms) que duerme en lugar del scheduler (ver power_mode.py)
+        memory: memory.Memory: heap por tarea y gc.collect() en los huecos"""
+        self.lightsleep_ms = lightsleep_ms
+        self.max_sleep_ms = max_sleep_ms
+        self.profiler = profiler
+        self.idle = idle
+        self.memory = memory
+        self.tasks = []
+        self.heap = []
+        self.base = time.ticks_ms()
+        self._seq = 0
+        self._due = []
+        self.sleeps = 0
+        self.slept_ms = 0
+        self.light_sleeps = 0
+
+    # ----- tareas -----
+    def add(self, name, fn, period_ms, priority=0, overrun=SKIP, delay_ms=0,
+            max_catchup=3):
+        """Agrega una tarea periódica. La primera ejecución es en `delay_ms`"""
+        prof = self.profiler.task(name, period_ms) if self.profiler else None
+        task = Task(name, fn, period_ms, priority, overrun, max_catchup, prof)
+        if self.memory:
+            task.mem = self.memory.task(name)
+        self.tasks.append(task)
+        self._push(task, time.ticks_add(time.ticks_ms(), delay_ms))
+        return task
+
+    def get(self, name):
+        for task in self.tasks:
+            if task.name == name:
+                return task
+        return None
+
+    def set_period(self, task, period_ms, now=None):
+        """Cambia el período; el próximo vencimiento se recalcula desde ahora"""
+        task.period = period_ms
+        if task.prof:
+            task.prof.interval = period_ms
+        self.restart(task, now)
+
+    def restart(self, task, now=None):
+        """Reinicia la cuenta: próxima ejecución en `period` desde ahora"""
+        if now is None:
+            now = time.ticks_ms()
+        self._move(task, time.ticks_add(now, task.period))
+
+    def wake(self, task, delay_ms=0):
+        """Adelanta la tarea para que corra en `delay_ms` (nunca la atrasa)"""
+        at = time.ticks_add(time.ticks_ms(), delay_ms)
+        if task.queued and self._key(at) >= task.entry[0]:
+            return
+        self._move(task, at)
+
+    def enable(self, task, on=True):
+        task.enabled = on
+        if on and not task.queued:
+            self._push(task, time.ticks_ms())
+
+    # ----- heap -----
+    def _key(self, ticks):
+        return time.ticks_diff(ticks, self.base)
+
+    def _push(self, task, at):
+        entry = task.entry
+        entry[0] = self._key(at)
+        self._seq += 1
+        entry[2] = self._seq
+        task.queued = True
+        heapq.heappush(self.heap, entry)
+
+    def _move(self, task, at):
+        if task.queued:
+            self.heap.remove(task.entry)
+            heapq.heapify(self.heap)
+        self._push(task, at)
+
+    def _rebase(self, now):
+        shift = self._key(now)
+        if shift < _REBASE_MS:
+            return
+        # Restar lo mismo a todas las claves no cambia el orden del heap
+        for entry in self.heap:
+            entry[0] -= shift
+        self.base = now
+
+    def next_deadline(self):
+        """ticks_ms del próximo vencimiento (None si no hay tareas)"""
+        if not self.heap:
+            return None
+        return time.ticks_add(self.base, self.heap[0][0])
+
+    # ----- ejecución -----
+    def run_pending(self, now=None):
+        """Ejecuta las tareas vencidas (por prioridad). Retorna cuántas corrió"""
+        if now is None:
+            now = time.ticks_ms()
+        self._rebase(now)
+        heap = self.heap
+        due = self._due
+        key_now = self._key(now)
+        while heap and heap[0][0] <= key_now:
+            entry = heapq.heappop(heap)
+            entry[3].queued = False
+            # Inserción ordenada por prioridad (pocas tareas: sin asignar)
+            i = len(due)
+            due.append(entry)
+            while i and due[i - 1][1] > entry[1]:
+                due[i] = due[i - 1]
+                i -= 1
+            due[i] = entry
+
+        count = 0
+        for entry in due:
+            task = entry[3]
+            deadline = entry[0]
+            if not task.enabled:
+                continue
+            late = key_now - deadline
+            prof = task.prof
+            mem = task.mem
+            if mem:
+                a0 = mem.start()
+            if prof:
+                t0 = prof.start(now)
+                task.fn()
+                prof.stop(t0)
+            else:
+                task.fn()
+            if mem:
+                mem.stop(a0)
+            task.runs += 1
+            count += 1
+            self._reschedule(task, deadline, late)
+        due.clear()
+        return count
+
+    def _reschedule(self, task, deadline, late):
+        if task.queued:
+            return  # La tarea se reprogramó a sí misma (wake/restart)
+        period = task.period
+        if late >= period:
+            task.overruns += 1
+        if task.overrun == DELAY:
+            nxt = self._key(time.ticks_ms()) + period
+        elif task.overrun == CATCHUP and late >= period and task.catchup < task.max_catchup:
+            task.catchup += 1
+            nxt = deadline + period
+        else:
+            task.catchup = 0
+            nxt = deadline + period
+            if late >= period:
+                missed = late // period
+                task.skipped += missed
+                nxt += missed * period
+        entry = task.entry
+        entry[0] = nxt
+        self._seq += 1
+        entry[2] = self._seq
+        task.queued = True
+        heapq.heappush(self.heap, entry)
+
+    def sleep_until_next(self):
+        """Duerme hasta el próximo vencimiento (con tope max_sleep_ms)"""
+        deadline = self.next_deadline()
+        if deadline is None:
+            gap = self.max_sleep_ms
+        else:
+            gap = time.ticks_diff(deadline, time.ticks_ms())
+            if gap <= 0:
+                return 0
+            if self.memory and self.memory.idle(gap):
+                # Recolectó en el hueco: dormir lo que quede
+                gap = time.ticks_diff(deadline, time.ticks_ms())
+                if gap <= 0:
+                    return 0
+            if gap > self.max_sleep_ms:
+                gap = self.max_sleep_ms
+        self.sleeps += 1
+        self.slept_ms += gap
+        if self.idle:
+            self.idle(gap)
+        elif self.lightsleep_ms and gap >= self.lightsleep_ms:
+            import machine
+            self.light_sleeps += 1
+            machine.lightsleep(gap)
+        else:
+            time.sleep_ms(gap)
+        return gap
+
+    def run_once(self):
+        """Ejecuta lo vencido y duerme hasta el siguiente"""
+        now = time.ticks_ms()
+        if self.profiler:
+            self.profiler.tick(now)
+        self.run_pending(now)
+        self.sleep_until_next()
+
+    def run(self, stop=None):
+        """Loop infinito (o hasta que stop() retorne True)"""
+        while stop is None or not stop():
+            self.run_once()
+
+    def report(self):
+        """Imprime el estado de las tareas (para usar desde el REPL)"""
+        print(f"🗓️  Scheduler: {self.sleeps} sleeps, {self.slept_ms}ms dormido"
+              f" ({self.light_sleeps} lightsleep)")
+        print("   tarea           período  prio  veces  tarde  saltadas  próxima")
+        now = time.ticks_ms()
+        for t in self.tasks:
+            nxt = time.ticks_diff(time.ticks_add(self.base, t.entry[0]), now) if t.queued else "-"
+            print("   {:<14} {:>7}ms {:>5} {:>6} {:>6} {:>9}  {}ms".format(
+                t.name, t.period, t.priority, t.runs, t.overruns, t.skipped, nxt))
@@ -21,71 +21,8 @@ SET_PRECHARGE = const(0xD9)
 SET_VCOM_DESEL = const(0xDB)
 SET_CHARGE_PUMP = const(0x8D)
 
-# Fuente pequeña 5x7 píxeles - Solo caracteres esenciales para tu proyecto
-SMALL_FONT_5x7 = {
-    '0': [0x3E, 0x51, 0x49, 0x45, 0x3E],
-    '1': [0x00, 0x42, 0x7F, 0x40, 0x00],
-    '2': [0x42, 0x61, 0x51, 0x49, 0x46],
-    '3': [0x21, 0x41, 0x45, 0x4B, 0x31],
-    '4': [0x18, 0x14, 0x12, 0x7F, 0x10],
-    '5': [0x27, 0x45, 0x45, 0x45, 0x39],
-    '6': [0x3C, 0x4A, 0x49, 0x49, 0x30],
-    '7': [0x01, 0x71, 0x09, 0x05, 0x03],
-    '8': [0x36, 0x49, 0x49, 0x49, 0x36],
-    '9': [0x06, 0x49, 0x49, 0x29, 0x1E],
-    ':': [0x00, 0x36, 0x36, 0x00, 0x00],
-    '/': [0x20, 0x10, 0x08, 0x04, 0x02],
-    '-': [0x08, 0x08, 0x08, 0x08, 0x08],
-    '.': [0x00, 0x60, 0x60, 0x00, 0x00],
-    ' ': [0x00, 0x00, 0x00, 0x00, 0x00],
-    'A': [0x7E, 0x11, 0x11, 0x11, 0x7E],
-    'B': [0x7F, 0x49, 0x49, 0x49, 0x36],
-    'C': [0x3E, 0x41, 0x41, 0x41, 0x22],
-    'D': [0x7F, 0x41, 0x41, 0x22, 0x1C],
-    'E': [0x7F, 0x49, 0x49, 0x49, 0x41],
-    'F': [0x7F, 0x09, 0x09, 0x09, 0x01],
-    'G': [0x3E, 0x41, 0x49, 0x49, 0x7A],
-    'H': [0x7F, 0x08, 0x08, 0x08, 0x7F],
-    'I': [0x00, 0x41, 0x7F, 0x41, 0x00],
-    'J': [0x20, 0x40, 0x41, 0x3F, 0x01],
-    'K': [0x7F, 0x08, 0x14, 0x22, 0x41],
-    'L': [0x7F, 0x40, 0x40, 0x40, 0x40],
-    'M': [0x7F, 0x02, 0x0C, 0x02, 0x7F],
-    'N': [0x7F, 0x04, 0x08, 0x10, 0x7F],
-    'O': [0x3E, 0x41, 0x41, 0x41, 0x3E],
-    'P': [0x7F, 0x09, 0x09, 0x09, 0x06],
-    'Q': [0x3E, 0x41, 0x51, 0x21, 0x5E],
-    'R': [0x7F, 0x09, 0x19, 0x29, 0x46],
-    'S': [0x46, 0x49, 0x49, 0x49, 0x31],
-    'T': [0x01, 0x01, 0x7F, 0x01, 0x01],
-    'U': [0x3F, 0x40, 0x40, 0x40, 0x3F],
-    'V': [0x1F, 0x20, 0x40, 0x20, 0x1F],
-    'W': [0x3F, 0x40, 0x38, 0x40, 0x3F],
-    'X': [0x63, 0x14, 0x08, 0x14, 0x63],
-    'Y': [0x07, 0x08, 0x70, 0x08, 0x07],
-    'Z': [0x61, 0x51, 0x49, 0x45, 0x43],
-    '%': [0x46, 0x26, 0x10, 0x08, 0x32],
-}
-
-# Fuente muy pequeña 4x6 píxeles - Solo números
-TINY_FONT_4x6 = {
-    '0': [0x3E, 0x41, 0x41, 0x3E],
-    '1': [0x42, 0x7F, 0x40, 0x00],
-    '2': [0x62, 0x51, 0x49, 0x46],
-    '3': [0x22, 0x49, 0x49, 0x36],
-    '4': [0x18, 0x14, 0x7F, 0x10],
-    '5': [0x27, 0x45, 0x45, 0x39],
-    '6': [0x3E, 0x49, 0x49, 0x30],
-    '7': [0x01, 0x71, 0x09, 0x07],
-    '8': [0x36, 0x49, 0x49, 0x36],
-    '9': [0x06, 0x49, 0x49, 0x3E],
-    '.': [0x60, 0x60, 0x00, 0x00],
-    ':': [0x36, 0x36, 0x00, 0x00],
-    'C': [0x3E, 0x41, 0x41, 0x22],
-    '%': [0x46, 0x26, 0x32, 0x31],
-    ' ': [0x00, 0x00, 0x00, 0x00],
-    '-': [0x08, 0x08, 0x08, 0x08],
-}
+# Motor de fuentes compartido con sh1106.py (paquetes font_*.py)
+import oledfont
 
 class SSD1306(framebuf.FrameBuffer):
     def __init__(self, width, height, external_vcc):
@@ -94,6 +31,8 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        self.buffer_mv = memoryview(self.buffer)
+        self.pages_to_update = 0  # Bit por página modificada desde el último show()
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
@@ -132,7 +71,28 @@ class SSD1306(framebuf.FrameBuffer):
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
-    def show(self):
+    def flip(self, flag=True):
+        """Rota la imagen 180° (espejo horizontal + vertical)"""
+        self.write_cmd(SET_SEG_REMAP | (0x00 if flag else 0x01))
+        self.write_cmd(SET_COM_OUT_DIR | (0x00 if flag else 0x08))
+        self.show(True)
+
+    def show(self, full_update=False):
+        """Envía al panel solo el rango de páginas modificadas"""
+        if full_update:
+            pages_to_update = (1 << self.pages) - 1
+        else:
+            pages_to_update = self.pages_to_update
+        if not pages_to_update:
+            return
+
+        first = 0
+        while not pages_to_update & (1 << first):
+            first += 1
+        last = self.pages - 1
+        while not pages_to_update & (1 << last):
+            last -= 1
+
         x0 = 0
         x1 = self.width - 1
         if self.width == 64:
@@ -142,9 +102,68 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(x0)
         self.write_cmd(x1)
         self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        self.write_cmd(first)
+        self.write_cmd(last)
+        if first == 0 and last == self.pages - 1:
+            self.write_data(self.buffer)
+        else:
+            self.write_data(self.buffer_mv[first * self.width:(last + 1) * self.width])
+        self.pages_to_update = 0
+
+    # ============ SEGUIMIENTO DE PÁGINAS MODIFICADAS ============
+
+    def register_updates(self, y0, y1=None):
+        """Marca como modificadas las páginas entre y0 e y1"""
+        start_page = max(0, y0 // 8)
+        end_page = max(0, y1 // 8) if y1 is not None else start_page
+        if start_page > end_page:
+            start_page, end_page = end_page, start_page
+        end_page = min(end_page, self.pages - 1)
+        for page in range(start_page, end_page + 1):
+            self.pages_to_update |= 1 << page
+
+    def pixel(self, x, y, color=None):
+        if color is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, color)
+        if 0 <= y < self.height:
+            self.pages_to_update |= 1 << (y // 8)
+
+    def text(self, text, x, y, color=1):
+        super().text(text, x, y, color)
+        self.register_updates(y, y + 7)
+
+    def line(self, x0, y0, x1, y1, color):
+        super().line(x0, y0, x1, y1, color)
+        self.register_updates(y0, y1)
+
+    def hline(self, x, y, w, color):
+        super().hline(x, y, w, color)
+        self.register_updates(y)
+
+    def vline(self, x, y, h, color):
+        super().vline(x, y, h, color)
+        self.register_updates(y, y + h - 1)
+
+    def fill(self, color):
+        super().fill(color)
+        self.pages_to_update = (1 << self.pages) - 1
+
+    def fill_rect(self, x, y, w, h, color):
+        super().fill_rect(x, y, w, h, color)
+        self.register_updates(y, y + h - 1)
+
+    def rect(self, x, y, w, h, color):
+        super().rect(x, y, w, h, color)
+        self.register_updates(y, y + h - 1)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        super().blit(fbuf, x, y, key, palette)
+        self.register_updates(y, self.height - 1)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.pages_to_update = (1 << self.pages) - 1
 
     # ============ NUEVAS FUNCIONES PARA FUENTES PEQUEÑAS ============
 
@@ -152,36 +171,23 @@ class SSD1306(framebuf.FrameBuffer):
         """Dibuja un carácter con fuente pequeña
         font_size: 'small' (5x7) o 'tiny' (4x6)
         """
-        if font_size == 'small':
-            font = SMALL_FONT_5x7
-            width = 5
-            height = 7
-        elif font_size == 'tiny':
-            font = TINY_FONT_4x6
-            width = 4
-            height = 6
-        else:
-            return x  # Retorna x sin cambios si font_size no es válido
-
-        if char.upper() in font:
-            bitmap = font[char.upper()]
-            for col in range(width):
-                if col < len(bitmap):
-                    byte = bitmap[col]
-                    for row in range(height):
-                        if byte & (1 << row):
-                            self.pixel(x + col, y + row, 1)
-
-        return x + width + 1  # Retorna siguiente posición x
+        return self.text_small(char, x, y, font_size)
 
     def text_small(self, text, x, y, font_size='small'):
-        """Dibuja texto con fuente pequeña
-        font_size: 'small' (5x7) o 'tiny' (4x6)
+        """Dibuja texto con las fuentes de oledfont
+        font_size: 'small' (5x7), 'tiny' (4x6), 'prop' (proporcional),
+                   'big2' / 'big3' (dígitos 2x / 3x)
         """
-        current_x = x
-        for char in str(text):
-            current_x = self.draw_char_small(char, current_x, y, font_size)
-        return current_x
+        x_end = oledfont.draw(self, text, x, y, font_size)
+        if x_end != x:
+            self.register_updates(y, y + oledfont.height(font_size) - 1)
+        return x_end
+
+    def text_width(self, text, font_size='small'):
+        """Ancho en píxeles del texto sin dibujarlo ('normal' = fuente 8x8)"""
+        if font_size == 'normal':
+            return len(str(text)) * 8
+        return oledfont.width(text, font_size)
 
     def text_auto(self, text, x, y, max_width=None):
         """Selecciona automáticamente el mejor tamaño de fuente"""
@@ -191,23 +197,19 @@ class SSD1306(framebuf.FrameBuffer):
         if max_width is None:
             max_width = self.width - x
 
-        # Calcular ancho estimado con diferentes fuentes
-        tiny_width = len(text_str) * 5  # 4 + 1 espacio
-        small_width = len(text_str) * 6  # 5 + 1 espacio
-        normal_width = len(text_str) * 8  # 8 píxeles por char
-
-        # Seleccionar la fuente más grande que quepa
-        if normal_width <= max_width:
-            self.text(text_str, x, y)
-        elif small_width <= max_width:
-            self.text_small(text_str, x, y, 'small')
-        elif tiny_width <= max_width:
-            self.text_small(text_str, x, y, 'tiny')
-        else:
-            # Si ni siquiera la fuente tiny cabe, truncar el texto
-            max_chars = max_width // 5
-            truncated = text_str[:max_chars-1] + "." if len(text_str) > max_chars else text_str
-            self.text_small(truncated, x, y, 'tiny')
+        # Seleccionar la fuente más grande que quepa (medida real, sin dibujar)
+        for font_size in ('normal', 'small', 'prop', 'tiny'):
+            if self.text_width(text_str, font_size) <= max_width:
+                if font_size == 'normal':
+                    self.text(text_str, x, y)
+                else:
+                    self.text_small(text_str, x, y, font_size)
+                return
+
+        # Si ni siquiera la fuente tiny cabe, truncar el texto
+        while text_str and oledfont.width(text_str + ".", 'tiny') > max_width:
+            text_str = text_str[:-1]
+        self.text_small(text_str + ".", x, y, 'tiny')
 
 class SSD1306_I2C(SSD1306):
     def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
@@ -215,13 +217,16 @@ class SSD1306_I2C(SSD1306):
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
+        self.bytes_sent = 0  # Bytes enviados por I2C (para estadísticas)
         super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
         self.temp[0] = 0x80  # Co=1, D/C#=0
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
+        self.bytes_sent += 2
 
     def write_data(self, buf):
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)
+        self.bytes_sent += len(buf) + 1
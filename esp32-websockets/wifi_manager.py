@@ -0,0 +1,378 @@
+# wifi_manager.py - Reconexión WiFi rápida (BSSID e IP en caché) y roaming
+# entre varias redes
+# Guarda este archivo en el ESP32 junto con tu boot.py
+#
+# wlan.connect(SSID, PASSWORD) escanea todos los canales y pide IP por DHCP
+# en cada intento (2-5 s). Después de la primera conexión se guarda en la
+# flash, por red, el AP (BSSID y canal) y la IP de DHCP:
+#   rápida    connect(..., bssid=) sin escaneo y, si hay IP fija (o se
+#             reutiliza la de DHCP), sin DHCP
+#   completa  si la rápida falla o no hay caché: connect() normal con DHCP;
+#             al conectar se escanea una vez para aprender el BSSID
+# El canal se guarda solo como diagnóstico: connect() de MicroPython no
+# acepta canal, el BSSID es lo que evita el escaneo.
+#
+# Roaming: la lista de redes va en orden de prioridad. Cada SCAN_INTERVAL_MS
+# (y cuando el RSSI del enlace queda bajo ROAM_RSSI durante ROAM_LOW_MS) se
+# escanea y se ordenan los APs conocidos por RSSI. Se cambia de AP solo si:
+#   - el enlace actual está bajo y el candidato es ROAM_MARGIN_DB mejor, o
+#   - una red de más prioridad volvió con señal buena (ROAM_RSSI + margen)
+# El margen y la espera evitan saltar entre dos APs parecidos. Si la
+# conexión completa falla (tiempo agotado, clave incorrecta o AP no
+# encontrado), se prueba el mejor AP visible de otra red de la lista: las
+# que ya fallaron se saltean hasta que fallen todas (ahí empieza otra vuelta)
+# y el roaming no vuelve a una red que falló hasta pasado FAIL_HOLD_MS.
+# Ojo: wlan.scan() bloquea ~2 s; llamar poll() desde el hilo de red.
+#
+# Se mide el tiempo hasta conectar de cada intento y, tras una caída o un
+# cambio de AP, el tiempo total sin WiFi.
+#
+# Uso (no bloqueante):
+#   wifi = WifiManager([("motog35", "12345678"), ("MACHETE", "clave")])
+#   wifi.begin()
+#   while not wifi.poll():       # poll() también reconecta y hace roaming
+#       time.sleep_ms(100)
+#   wifi.report()
+
+import network
+import time
+import json
+import binascii
+
+CACHE_FILE = "wifi_cache.json"
+
+FAST = "rápida"
+FULL = "completa"
+
+# Estados que no van a mejorar esperando
+_FAILED = (network.STAT_NO_AP_FOUND, network.STAT_WRONG_PASSWORD)
+
+
+class WifiManager:
+    def __init__(self, networks, reuse_lease=False, fast_timeout_ms=4000,
+                 full_timeout_ms=15000, roam_rssi=-75, roam_margin_db=8,
+                 roam_low_ms=20000, scan_interval_ms=300000, fail_hold_ms=600000):
+        """networks: [(ssid, password), ...] en orden de prioridad; se puede
+        agregar un tercer elemento (ip, máscara, gateway, dns) para IP fija.
+        reuse_lease: en la conexión rápida usar la última IP de DHCP como fija
+        (ahorra el DHCP; solo si el router reserva la IP para este equipo).
+        scan_interval_ms=0 desactiva el escaneo periódico.
+        fail_hold_ms: tiempo que una red que no conectó queda fuera del roaming."""
+        self.networks = [(n[0], n[1], tuple(n[2]) if len(n) > 2 and n[2] else None)
+                         for n in networks]
+        if not self.networks:
+            raise ValueError("WifiManager sin redes")
+        self.reuse_lease = reuse_lease
+        self.fast_timeout_ms = fast_timeout_ms
+        self.full_timeout_ms = full_timeout_ms
+        self.roam_rssi = roam_rssi
+        self.roam_margin_db = roam_margin_db
+        self.roam_low_ms = roam_low_ms
+        self.scan_interval_ms = scan_interval_ms
+        self.fail_hold_ms = fail_hold_ms
+        self.wlan = network.WLAN(network.STA_IF)
+        self.cache = self._load()
+        self.current = self._index(self.cache.get("last")) or 0
+        self.bssid = None          # BSSID del intento en curso (None = cualquiera)
+        self.mode = None           # Intento en curso: FAST, FULL o None
+        self.attempt_start = 0
+        self.connected = False
+        self.drop_at = None
+        self._static_set = False
+        # Roaming
+        self.rssi = None
+        self.low_since = None
+        self.last_scan = time.ticks_ms()
+        self.ranking = []          # [(rssi, índice de red, bssid, canal)] del último escaneo
+        self.failed = {}           # Índice de red -> ticks_ms de la última falla
+        # Estadísticas
+        self.last_connect_ms = 0   # Inicio del intento -> conectado
+        self.last_outage_ms = 0    # Caída -> conectado
+        self.max_outage_ms = 0
+        self.fast_ok = 0
+        self.fast_fail = 0
+        self.full_ok = 0
+        self.drops = 0
+        self.switches = 0
+        self.scans = 0
+
+    @property
+    def ssid(self):
+        return self.networks[self.current][0]
+
+    def _index(self, ssid):
+        for i, net in enumerate(self.networks):
+            if net[0] == ssid:
+                return i
+        return None
+
+    # ----- caché en flash -----
+    def _load(self):
+        try:
+            with open(CACHE_FILE) as f:
+                cache = json.load(f)
+            if isinstance(cache.get("aps"), dict):
+                return cache
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"aps": {}}
+
+    def _save(self, cache):
+        if cache == self.cache:
+            return  # Sin cambios: no gastar la flash
+        self.cache = cache
+        try:
+            with open(CACHE_FILE, "w") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            print(f"⚠ No se pudo guardar {CACHE_FILE}: {e}")
+
+    def forget(self):
+        """Borrar la caché (p. ej. se cambió el router)"""
+        self.cache = {"aps": {}}
+        try:
+            import os
+            os.remove(CACHE_FILE)
+        except OSError:
+            pass
+
+    # ----- conexión -----
+    def _set_ip(self, ip):
+        if ip:
+            self.wlan.ifconfig(tuple(ip))
+            self._static_set = True
+        elif self._static_set:
+            # Volver a DHCP
+            try:
+                self.wlan.ipconfig(dhcp4=True)
+            except (AttributeError, TypeError, ValueError):
+                self.wlan.active(False)
+                self.wlan.active(True)
+            self._static_set = False
+
+    def begin(self, fast=True, index=None, bssid=None):
+        """Empieza un intento (no bloquea): rápido si hay BSSID (de la caché
+        o de un escaneo)"""
+        wlan = self.wlan
+        wlan.active(True)
+        try:
+            wlan.disconnect()
+        except OSError:
+            pass
+        if index is not None:
+            self.current = index
+        ssid, password, static_ip = self.networks[self.current]
+        ap = self.cache["aps"].get(ssid, {})
+        self.attempt_start = time.ticks_ms()
+        if fast and bssid is None and ap.get("bssid"):
+            bssid = binascii.unhexlify(ap["bssid"])
+        if fast and bssid:
+            lease = ap.get("ifconfig") if self.reuse_lease else None
+            self._set_ip(static_ip or lease)
+            self.mode = FAST
+            self.bssid = bytes(bssid)
+            wlan.connect(ssid, password, bssid=self.bssid)
+        else:
+            self._set_ip(static_ip)
+            self.mode = FULL
+            self.bssid = None
+            wlan.connect(ssid, password)
+
+    def poll(self):
+        """Llamar seguido: detecta caídas, reintenta, hace roaming y mide.
+        True si hay WiFi"""
+        now = time.ticks_ms()
+        wlan = self.wlan
+        if wlan.isconnected():
+            if self.mode is not None:
+                self._done(now)
+            self.connected = True
+            self._roam(now)
+            return self.wlan.isconnected()
+
+        if self.connected:
+            self.connected = False
+            self.drops += 1
+            self.drop_at = now
+            self.rssi = None
+            print("⚠️  WiFi caído: reconexión rápida")
+            self.begin()
+            return False
+        if self.mode is None:
+            self.begin()
+            return False
+
+        elapsed = time.ticks_diff(now, self.attempt_start)
+        if self.mode == FAST:
+            if elapsed >= self.fast_timeout_ms or wlan.status() in _FAILED:
+                self.fast_fail += 1
+                print(f"⚠️  Conexión rápida falló ({elapsed}ms): escaneo completo")
+                self.begin(fast=False)
+        elif elapsed >= self.full_timeout_ms or wlan.status() in _FAILED:
+            self._fail_over()
+        return False
+
+    def _fail_over(self):
+        """La red actual no conecta (ni rápida ni completa): probar el mejor
+        AP visible de una red que no haya fallado o, si no se ve ninguno, la
+        siguiente de la lista. Si ya fallaron todas, empieza otra vuelta"""
+        now = time.ticks_ms()
+        self.failed[self.current] = now
+        if all(self._failed(i, now) for i in range(len(self.networks))):
+            self.failed = {}  # Nueva vuelta (el AP puede haber vuelto)
+        self._scan()
+        for rssi, index, bssid, channel in self.ranking:
+            if not self._failed(index, now):
+                break
+        else:
+            index, bssid = self.current, None
+            for step in range(1, len(self.networks) + 1):
+                index = (self.current + step) % len(self.networks)
+                if not self._failed(index, now):
+                    break
+        if index != self.current:
+            print(f"🔀 Probando red {self.networks[index][0]}")
+        self.begin(index=index, bssid=bssid)
+
+    def _failed(self, index, now):
+        """True si la red `index` no conectó hace menos de fail_hold_ms"""
+        at = self.failed.get(index)
+        return at is not None and time.ticks_diff(now, at) < self.fail_hold_ms
+
+    def _done(self, now):
+        elapsed = time.ticks_diff(now, self.attempt_start)
+        self.last_connect_ms = elapsed
+        mode = self.mode
+        self.mode = None
+        self.failed.pop(self.current, None)
+        if mode == FAST:
+            self.fast_ok += 1
+        else:
+            self.full_ok += 1
+        msg = f"✓ WiFi {self.ssid} en {elapsed}ms (conexión {mode})"
+        if self.drop_at is not None:
+            outage = time.ticks_diff(now, self.drop_at)
+            self.last_outage_ms = outage
+            if outage > self.max_outage_ms:
+                self.max_outage_ms = outage
+            self.drop_at = None
+            msg += f", {outage}ms sin WiFi"
+        print(msg)
+        self._remember(mode)
+
+    def _remember(self, mode):
+        """Guardar AP e IP de esta conexión para la próxima"""
+        ssid = self.ssid
+        ap = dict(self.cache["aps"].get(ssid, {}))
+        if mode == FULL:
+            bssid, channel = self._scan_bssid()
+            if bssid is None:
+                return
+        else:
+            bssid, channel = self.bssid, ap.get("channel", 0)
+            for rssi, index, scanned, ch in self.ranking:
+                if scanned == bssid:
+                    channel = ch
+        ap["bssid"] = binascii.hexlify(bssid).decode()
+        ap["channel"] = channel
+        self.bssid = bssid
+        if not self._static_set:
+            ap["ifconfig"] = list(self.wlan.ifconfig())
+        aps = dict(self.cache["aps"])
+        aps[ssid] = ap
+        self._save({"last": ssid, "aps": aps})
+
+    def _scan_bssid(self):
+        """BSSID y canal del AP más fuerte de la red actual (escaneo de ~2 s)"""
+        self._scan()
+        for rssi, index, bssid, channel in self.ranking:
+            if index == self.current:
+                return bssid, channel
+        return None, 0
+
+    # ----- roaming -----
+    def _scan(self):
+        """Escanea y ordena por RSSI los APs de las redes conocidas"""
+        ranking = []
+        try:
+            for ssid, bssid, channel, rssi, auth, hidden in self.wlan.scan():
+                index = self._index(ssid.decode())
+                if index is not None:
+                    ranking.append((rssi, index, bytes(bssid), channel))
+        except (OSError, UnicodeError):
+            pass
+        ranking.sort(key=lambda ap: (-ap[0], ap[1]))
+        self.ranking = ranking
+        self.last_scan = time.ticks_ms()
+        self.scans += 1
+
+    def _roam(self, now):
+        try:
+            self.rssi = self.wlan.status('rssi')
+        except OSError:
+            return
+        if self.rssi < self.roam_rssi:
+            if self.low_since is None:
+                self.low_since = now
+        else:
+            self.low_since = None
+        low = (self.low_since is not None and
+               time.ticks_diff(now, self.low_since) >= self.roam_low_ms)
+
+        since_scan = time.ticks_diff(now, self.last_scan)
+        if low and since_scan >= self.roam_low_ms:
+            print(f"📶 RSSI bajo ({self.rssi} dBm): buscando otro AP")
+        elif not (self.scan_interval_ms and since_scan >= self.scan_interval_ms):
+            return
+        self._scan()
+
+        margin = self.roam_margin_db
+        for rssi, index, bssid, channel in self.ranking:
+            if index == self.current and bssid == self.bssid:
+                continue
+            if self._failed(index, now):
+                continue  # No conectó hace poco (clave, AP sin servicio...)
+            better = low and rssi >= self.rssi + margin
+            home = index < self.current and rssi >= self.roam_rssi + margin
+            if better or home:
+                self._switch(index, bssid, rssi)
+                return
+
+    def _switch(self, index, bssid, rssi):
+        self.switches += 1
+        print(f"🔀 Roaming: {self.ssid} ({self.rssi} dBm) -> "
+              f"{self.networks[index][0]} ({rssi} dBm)")
+        self.connected = False
+        self.drop_at = time.ticks_ms()  # Se mide como caída corta
+        self.low_since = None
+        self.rssi = None
+        self.begin(index=index, bssid=bssid)
+
+    # ----- estadísticas -----
+    def summary(self):
+        return {
+            "ssid": self.ssid,
+            "bssid": binascii.hexlify(self.bssid).decode() if self.bssid else None,
+            "rssi": self.rssi,
+            "switches": self.switches,
+            "connectMs": self.last_connect_ms,
+            "outageMs": self.last_outage_ms,
+            "maxOutageMs": self.max_outage_ms,
+            "drops": self.drops,
+            "fastOk": self.fast_ok,
+            "fastFail": self.fast_fail,
+            "fullOk": self.full_ok,
+        }
+
+    def report(self):
+        """Imprime las redes, la caché y los tiempos (para usar desde el REPL)"""
+        for i, (ssid, password, static_ip) in enumerate(self.networks):
+            ap = self.cache["aps"].get(ssid, {})
+            mark = "➤" if i == self.current else " "
+            print(f"📶 {mark} {i + 1}. {ssid}: BSSID {ap.get('bssid', '-')}, canal {ap.get('channel', '-')}, "
+                  f"IP {'fija' if static_ip else ('DHCP reutilizada' if self.reuse_lease else 'DHCP')}")
+        print(f"   En uso {self.ssid} ({self.rssi} dBm), {self.switches} cambios de AP, "
+              f"{self.scans} escaneos")
+        print(f"   Última conexión {self.last_connect_ms}ms, última caída {self.last_outage_ms}ms "
+              f"(máx {self.max_outage_ms}ms, {self.drops} caídas)")
+        print(f"   Rápidas OK {self.fast_ok}, rápidas fallidas {self.fast_fail}, completas {self.full_ok}")
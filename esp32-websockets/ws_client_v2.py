@@ -7,14 +7,461 @@ import ssl
 import struct
 import binascii
 import time
+import select
+import errno
+
+class TlsSessions:
+    """Contexto SSL y sesiones TLS compartidos por todas las conexiones
+
+    El handshake TLS completo le cuesta 1-3 s de CPU al ESP32. Con la sesión
+    (ticket o ID) de la conexión anterior el servidor puede reanudarla con un
+    handshake abreviado. Si no la acepta hace el completo sin error; si el
+    handshake reanudado falla, la sesión se olvida y se reintenta completo.
+
+    Limitación: el ssl de MicroPython (SSLContext incluido) no acepta
+    session= ni expone la sesión del socket, así que con el firmware de
+    siempre no se reanuda nunca. Se detecta en el primer handshake (socket
+    sin .session): supported pasa a False y summary() dice
+    "resume": "unsupported". Solo sirve con un firmware que agregue las dos
+    cosas. Sin ssl.SSLContext se usa wrap_socket, como siempre. Si el
+    socket no dice si reanudó (session_reused), se cuenta como reanudada
+    cuando se ofreció la sesión."""
+
+    def __init__(self, resume=True):
+        self.resume = resume
+        self.ctx = None
+        self.sessions = {}            # (host, puerto) -> sesión
+        self.context = hasattr(ssl, "SSLContext")
+        self.supported = self.context  # False: el firmware no puede reanudar
+        # Contadores
+        self.offered = 0              # Conexiones que ofrecieron una sesión
+        self.resumed = 0              # ...y el servidor la aceptó
+        self.full = 0                 # Handshakes completos
+        self.failed = 0               # Handshakes reanudados que fallaron
+        self.full_ms = 0              # Suma de tiempos de connect() por tipo
+        self.resumed_ms = 0
+        self.last_ms = 0
+
+    def _context(self):
+        if self.ctx is None:
+            self.ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            self.ctx.verify_mode = ssl.CERT_NONE  # Igual que wrap_socket()
+        return self.ctx
+
+    def can_resume(self, host, port):
+        return self.resume and self.supported and (host, port) in self.sessions
+
+    def wrap(self, sock, host, port, resume, handshake=True):
+        """Aplica TLS (con la sesión guardada si resume). handshake=False:
+        el handshake se hace en los primeros send()/recv(), sin bloquear"""
+        if not self.context:
+            # Firmware viejo: el handshake siempre bloquea
+            sock.settimeout(15)
+            sock = self._wrap_legacy(sock, host)
+            if not handshake:
+                sock.setblocking(False)
+            return sock
+        if resume:
+            try:
+                sock = self._context().wrap_socket(sock, server_hostname=host,
+                                                   do_handshake_on_connect=handshake,
+                                                   session=self.sessions[(host, port)])
+                print("SSL aplicado (reanudando sesión)")
+                return sock
+            except TypeError:
+                # Firmware sin session=: conectar siempre completo
+                self.supported = False
+                self.sessions.clear()
+        sock = self._context().wrap_socket(sock, server_hostname=host,
+                                           do_handshake_on_connect=handshake)
+        print("SSL aplicado con SNI")
+        return sock
+
+    def _wrap_legacy(self, sock, host):
+        try:
+            # Intentar con SNI
+            sock = ssl.wrap_socket(sock, server_hostname=host)
+            print("SSL aplicado con SNI")
+        except:
+            # Fallback sin SNI
+            try:
+                sock = ssl.wrap_socket(sock)
+                print("SSL aplicado sin SNI")
+            except Exception as e:
+                print(f"Error SSL: {e}")
+                raise
+        return sock
+
+    def forget(self, host, port):
+        """El handshake reanudado falló: la próxima vez, completo"""
+        self.sessions.pop((host, port), None)
+        self.offered += 1
+        self.failed += 1
+
+    def done(self, sock, host, port, offered, ms):
+        """Conexión lista: guardar la sesión y contar. Retorna si reanudó"""
+        reused = getattr(sock, "session_reused", offered)
+        if offered:
+            self.offered += 1
+        if reused:
+            self.resumed += 1
+            self.resumed_ms += ms
+        else:
+            self.full += 1
+            self.full_ms += ms
+        self.last_ms = ms
+        session = getattr(sock, "session", None)
+        if session is None:
+            # MicroPython no expone la sesión: no hay nada que reanudar
+            self.supported = False
+        elif self.resume:
+            self.sessions[(host, port)] = session
+        return reused
+
+    def summary(self):
+        if not self.supported:
+            resume = "unsupported"
+        else:
+            resume = "on" if self.resume else "off"
+        return {
+            "resume": resume,
+            "resumed": self.resumed,
+            "full": self.full,
+            "failed": self.failed,
+            "hitPct": (round(100 * self.resumed / self.offered) if self.offered else 0)
+                      if self.supported else None,
+            "resumedMs": self.resumed_ms // self.resumed if self.resumed else 0,
+            "fullMs": self.full_ms // self.full if self.full else 0,
+            "lastMs": self.last_ms,
+        }
+
+    def report(self):
+        """Imprime los contadores (para usar desde el REPL)"""
+        d = self.summary()
+        if not self.supported:
+            print(f"🔐 TLS: reanudación no soportada por el firmware, {d['full']} handshakes "
+                  f"completos, connect() promedio {d['fullMs']}ms (último {d['lastMs']}ms)")
+            return
+        print(f"🔐 TLS: {d['resumed']} reanudadas de {self.offered} ofrecidas ({d['hitPct']}%), "
+              f"{d['full']} completas, {d['failed']} fallidas")
+        print(f"   connect() promedio: reanudada {d['resumedMs']}ms, completa {d['fullMs']}ms "
+              f"(última {d['lastMs']}ms)")
+
+
+class DnsCache:
+    """Caché de DNS con TTL para connect()
+
+    getaddrinfo() es el paso que más se cuelga en hotspots inestables.
+    Las direcciones se guardan con la hora en que se resolvieron:
+      - vigente (menos de ttl_s): se usa sin consultar el DNS
+      - vencida: se vuelve a resolver; si el DNS falla, se usa la última
+        dirección buena
+    refresh() resuelve de nuevo las que pasaron la mitad del TTL: llamarlo
+    con la conexión activa para que las reconexiones no pasen por el DNS.
+    La caché se guarda en la flash solo cuando cambia una IP (la hora no
+    cuenta): tras un reinicio se resuelve una vez, con la IP anterior de
+    respaldo. MicroPython no da el TTL del registro DNS: se usa ttl_s."""
+
+    def __init__(self, ttl_s=3600, path="dns_cache.json"):
+        self.ttl_s = ttl_s
+        self.path = path
+        self.entries = {}             # host -> [ip, time.time() al resolver o None = vencida]
+        self.hits = 0                 # Dirección vigente: sin DNS
+        self.lookups = 0              # Consultas al DNS que salieron bien
+        self.fallbacks = 0            # DNS falló: se usó la última buena
+        self.failures = 0             # DNS falló sin respaldo
+        self.last_lookup_ms = 0
+        self._load()
+
+    def _load(self):
+        try:
+            import json
+            with open(self.path) as f:
+                for host, ip in json.load(f).items():
+                    self.entries[host] = [ip, None]  # Sin hora: vencida
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def _save(self):
+        try:
+            import json
+            with open(self.path, "w") as f:
+                json.dump({host: e[0] for host, e in self.entries.items()}, f)
+        except OSError as e:
+            print(f"⚠ No se pudo guardar {self.path}: {e}")
+
+    @staticmethod
+    def _is_ip(host):
+        return all(part.isdigit() for part in host.split("."))
+
+    def _lookup(self, host, port):
+        start = time.ticks_ms()
+        ip = socket.getaddrinfo(host, port)[0][-1][0]
+        self.last_lookup_ms = time.ticks_diff(time.ticks_ms(), start)
+        self.lookups += 1
+        old = self.entries.get(host)
+        self.entries[host] = [ip, time.time()]
+        if old is None or old[0] != ip:
+            self._save()
+        return ip
+
+    @staticmethod
+    def _fresh(entry, now, ttl_s):
+        # None (y no 0): antes del NTP time.time() cuenta desde 2000 y
+        # `now - 0` sería menor que el TTL durante la primera hora
+        return entry[1] is not None and now - entry[1] < ttl_s
+
+    def resolve(self, host, port):
+        """Dirección para socket.connect()"""
+        if self._is_ip(host):
+            return socket.getaddrinfo(host, port)[0][-1]
+        entry = self.entries.get(host)
+        if entry is not None and self._fresh(entry, time.time(), self.ttl_s):
+            self.hits += 1
+            ip = entry[0]
+        else:
+            try:
+                ip = self._lookup(host, port)
+            except OSError as e:
+                if entry is None:
+                    self.failures += 1
+                    raise
+                self.fallbacks += 1
+                print(f"⚠ DNS falló ({e}): usando {entry[0]}")
+                ip = entry[0]
+        # Con una IP numérica getaddrinfo() no consulta la red
+        return socket.getaddrinfo(ip, port)[0][-1]
+
+    def expire(self, host):
+        """La dirección no respondió: resolver de nuevo en el próximo intento"""
+        entry = self.entries.get(host)
+        if entry is not None:
+            entry[1] = None
+
+    def refresh(self, port=443):
+        """Resuelve de nuevo las entradas con más de medio TTL (bloquea
+        mientras consulta). Retorna cuántas se actualizaron"""
+        count = 0
+        now = time.time()
+        for host, entry in list(self.entries.items()):
+            if self._fresh(entry, now, self.ttl_s // 2):
+                continue
+            try:
+                self._lookup(host, port)
+                count += 1
+            except OSError as e:
+                print(f"⚠ DNS {host}: {e}")
+        return count
+
+    def summary(self):
+        return {
+            "hits": self.hits,
+            "lookups": self.lookups,
+            "fallbacks": self.fallbacks,
+            "failures": self.failures,
+            "lastLookupMs": self.last_lookup_ms,
+        }
+
+    def report(self):
+        """Imprime la caché y los contadores (para usar desde el REPL)"""
+        now = time.time()
+        for host, (ip, at) in self.entries.items():
+            age = now - at if at is not None else None
+            state = "vigente" if age is not None and age < self.ttl_s else "vencida"
+            print(f"🌐 {host} -> {ip} ({state}{f', {age}s' if age is not None else ''})")
+        print(f"   Sin DNS {self.hits}, consultas {self.lookups} (última {self.last_lookup_ms}ms), "
+              f"respaldo {self.fallbacks}, fallidas {self.failures}")
+
+
+class Keepalive:
+    """Ping/pong de protocolo (opcodes 0x9/0xA) con RTT y período adaptativo
+
+    Cada ping lleva ticks_ms() en el payload y el servidor lo devuelve en el
+    pong: el RTT sale sin estado extra y un pong viejo o ajeno no se cuenta.
+    Se guardan las últimas `window` muestras (mín/prom/máx).
+    tick() decide qué hacer y retorna los ms hasta la próxima llamada:
+      - sin ping pendiente: envía uno cada `interval`
+      - pong pendiente más de `timeout_ms`: se cuenta como perdido y se
+        reintenta enseguida; con `max_missed` perdidos seguidos el servidor
+        se da por muerto (connected = False)
+    Período adaptativo: el router (NAT) olvida las conexiones inactivas tras
+    un tiempo que no se conoce. Con `grow_after` pongs seguidos el período
+    sube `step_ms` (hasta `max_ms`); si la conexión muere por pongs perdidos,
+    el período vuelve al último que funcionó y ese pasa a ser el tope.
+    Los datos enviados no prueban que el servidor siga vivo: el ping va
+    igual aunque haya tráfico."""
+
+    def __init__(self, interval_ms=30000, min_ms=15000, max_ms=240000, step_ms=15000,
+                 timeout_ms=10000, max_missed=2, grow_after=3, window=16):
+        self.interval = interval_ms
+        self.min_ms = min_ms
+        self.max_ms = max_ms          # Tope aprendido (baja al morir por NAT)
+        self.step_ms = step_ms
+        self.timeout_ms = timeout_ms
+        self.max_missed = max_missed
+        self.grow_after = grow_after
+        self.window = window
+        self.rtts = []                # Últimas muestras (ms)
+        self.last_rtt = None
+        self.pending = None           # ticks_ms() del ping sin pong
+        self.last_ping = None
+        self.missed = 0               # Pongs perdidos seguidos
+        self.streak = 0               # Pongs seguidos en este período
+        # Estadísticas
+        self.sent = 0
+        self.pongs = 0
+        self.total_missed = 0
+        self.deaths = 0
+
+    def reset(self):
+        """Conexión nueva: el primer ping sale tras `interval`"""
+        self.pending = None
+        self.last_ping = time.ticks_ms()
+        self.missed = 0
+        self.streak = 0
+
+    def tick(self, ws):
+        """Envía el ping si toca y vigila el pong. Retorna ms hasta la próxima llamada"""
+        now = time.ticks_ms()
+        if self.pending is not None:
+            waited = time.ticks_diff(now, self.pending)
+            if waited < self.timeout_ms:
+                return self.timeout_ms - waited
+            self.pending = None
+            self.missed += 1
+            self.total_missed += 1
+            self.streak = 0
+            if self.missed >= self.max_missed:
+                self._dead()
+                ws.connected = False
+                return self.interval
+        elif self.last_ping is not None:
+            idle = time.ticks_diff(now, self.last_ping)
+            if idle < self.interval:
+                return self.interval - idle
+
+        if not ws.send_ping(struct.pack(">I", now & 0xFFFFFFFF)):
+            return self.interval
+        self.pending = now
+        self.last_ping = now
+        self.sent += 1
+        return self.timeout_ms
+
+    def pong(self, payload):
+        """Llamado por recv() con el payload de cada PONG"""
+        if self.pending is None or len(payload) != 4:
+            return
+        if struct.unpack(">I", payload)[0] != self.pending & 0xFFFFFFFF:
+            return  # Pong de un ping anterior
+        rtt = time.ticks_diff(time.ticks_ms(), self.pending)
+        self.pending = None
+        self.missed = 0
+        self.pongs += 1
+        self.last_rtt = rtt
+        self.rtts.append(rtt)
+        if len(self.rtts) > self.window:
+            self.rtts.pop(0)
+        self.streak += 1
+        if self.streak >= self.grow_after and self.interval < self.max_ms:
+            self.interval = min(self.max_ms, self.interval + self.step_ms)
+            self.streak = 0
+
+    def _dead(self):
+        self.deaths += 1
+        # Si el período había subido, el NAT pudo haber cortado: volver al anterior
+        if self.interval > self.min_ms:
+            self.max_ms = max(self.min_ms, self.interval - self.step_ms)
+            self.interval = self.max_ms
+
+    def rtt(self):
+        """(mín, promedio, máx) de las últimas muestras, o None"""
+        if not self.rtts:
+            return None
+        return min(self.rtts), sum(self.rtts) // len(self.rtts), max(self.rtts)
+
+    def summary(self):
+        rtt = self.rtt()
+        return {
+            "intervalMs": self.interval,
+            "rttMs": self.last_rtt,
+            "rttMinMs": rtt[0] if rtt else None,
+            "rttAvgMs": rtt[1] if rtt else None,
+            "rttMaxMs": rtt[2] if rtt else None,
+            "sent": self.sent,
+            "pongs": self.pongs,
+            "missed": self.total_missed,
+            "deaths": self.deaths,
+        }
+
+    def report(self):
+        """Imprime RTT y período (para usar desde el REPL)"""
+        rtt = self.rtt()
+        if rtt:
+            print(f"📶 Keepalive: RTT {self.last_rtt}ms (mín {rtt[0]} / prom {rtt[1]} / máx {rtt[2]}ms)")
+        else:
+            print("📶 Keepalive: sin muestras de RTT")
+        print(f"   Período {self.interval // 1000}s (tope {self.max_ms // 1000}s), pings {self.sent}, "
+              f"pongs {self.pongs}, perdidos {self.total_missed}, caídas {self.deaths}")
+
+
+# Compartidos por todas las conexiones (y por varios WebSocket())
+tls_sessions = TlsSessions()
+dns_cache = DnsCache()
+
+# Etapas de connect_step()
+RESOLVE = "dns"
+TCP = "tcp"
+TCP_WAIT = "tcp (esperando)"
+TLS = "tls"
+UPGRADE = "upgrade"
+RESPONSE = "respuesta"
+
+# Socket no bloqueante: la operación sigue en curso
+_PENDING = (errno.EAGAIN, errno.EINPROGRESS)
+
+RECV_CHUNK = 1024       # Lectura máxima por vuelta de recv()
 
 class WebSocket:
-    def __init__(self):
+    def __init__(self, tls=None, dns=None, keepalive=None, max_frame=8192,
+                 send_timeout_ms=5000):
         self.sock = None
         self.connected = False
+        self.tls = tls or tls_sessions
+        self.dns = dns or dns_cache
+        self.keepalive = keepalive or Keepalive()
+        self.connect_ms = 0
+        self.resumed = False
+        self.state = None             # Etapa del connect en curso (None = ninguno)
+        self._poller = None
+        self.max_frame = max_frame    # Frame más grande que se acepta (memoria)
+        self.send_timeout_ms = send_timeout_ms  # Espera máxima para escribir un frame
+        self.debug = print            # Avisos de PING/PONG (monitor/net.py: log.debug)
+        self._rx = b""                # Bytes recibidos sin frame completo
+        self._frag = None             # Partes de un mensaje fragmentado
+        self._frag_op = 0
+
+    @property
+    def connecting(self):
+        return self.state is not None
 
     def connect(self, url):
-        """Conecta a servidor WebSocket (ws:// o wss://)"""
+        """Conecta a servidor WebSocket (ws:// o wss://). Bloquea hasta terminar"""
+        self.connect_start(url)
+        result = None
+        while result is None:
+            result = self.connect_step(1000)
+        return result
+
+    def connect_start(self, url, timeout_ms=15000, response_ms=5000):
+        """Empieza a conectar sin bloquear: después llamar connect_step()
+        hasta que retorne True o False"""
+        if self.sock:
+            self.close()
+        self.connected = False
+        self.resumed = False
+        self._start = time.ticks_ms()
+        self._deadline = time.ticks_add(self._start, timeout_ms)
+        self._response_ms = response_ms
         try:
             # Parsear URL
             if url.startswith("wss://"):
@@ -34,83 +481,204 @@ class WebSocket:
             if ":" in host and "/" not in host:
                 host, port = host.split(":")
                 port = int(port)
-
-            print(f"Conectando a {host}:{port} (SSL: {use_ssl})")
-
+        except ValueError as e:
+            self._fail(e)
+            return
+
+        print(f"Conectando a {host}:{port} (SSL: {use_ssl})")
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self._resume = use_ssl and self.tls.can_resume(host, port)
+
+        key = binascii.b2a_base64(b'0123456789ABCDEF')[:-1]
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            f"Upgrade: websocket\r\n"
+            f"Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key.decode()}\r\n"
+            f"Sec-WebSocket-Version: 13\r\n"
+            f"\r\n"
+        )
+        self._out = memoryview(request.encode())
+        self._response = b""
+        self.state = RESOLVE
+
+    def connect_step(self, slice_ms=50):
+        """Avanza el connect empezado con connect_start() esperando al socket
+        como mucho slice_ms. Retorna True (conectado), False (falló) o None
+        (sigue: volver a llamar). Lo único que no se puede cortar es el DNS
+        sin caché y el cálculo del handshake TLS (menos si se reanuda)"""
+        if self.state is None:
+            return self.connected
+        start = time.ticks_ms()
+        while True:
+            try:
+                now = time.ticks_ms()
+                if time.ticks_diff(now, self._deadline) >= 0:
+                    raise OSError(f"timeout en la etapa {self.state}")
+                if self._step():
+                    if self.state is None:
+                        return True
+                    continue
+                left = min(slice_ms - time.ticks_diff(now, start),
+                           time.ticks_diff(self._deadline, now))
+                if left <= 0:
+                    return None
+                self._poll(self._want, left)
+            except Exception as e:
+                if not (self._resume and self.state in (TLS, UPGRADE)):
+                    self._fail(e)
+                    return False
+                # Sesión vencida o rechazada: otra vez con handshake completo
+                print(f"⚠ Sesión TLS rechazada ({e}): handshake completo")
+                self.tls.forget(self.host, self.port)
+                self._resume = False
+                self._close_sock()
+                self.state = TCP
+
+    def _step(self):
+        """Hace la etapa actual. True si avanzó, False si hay que esperar al
+        socket (self._want dice a qué)"""
+        state = self.state
+        if state == RESOLVE:
+            self._addr = self.dns.resolve(self.host, self.port)
+            self.state = TCP
+
+        elif state == TCP:
             # Crear socket TCP
-            addr = socket.getaddrinfo(host, port)[0][-1]
             self.sock = socket.socket()
-            self.sock.settimeout(15)
-            self.sock.connect(addr)
-
+            self.sock.setblocking(False)
+            try:
+                self.sock.connect(self._addr)
+            except OSError as e:
+                if e.args[0] not in _PENDING:
+                    self.dns.expire(self.host)  # Quizás cambió la IP
+                    raise
+            self.state = TCP_WAIT
+
+        elif state == TCP_WAIT:
+            events = self._poll(select.POLLOUT, 0)
+            if not events:
+                self._want = select.POLLOUT
+                return False
+            if events & (select.POLLERR | select.POLLHUP):
+                self.dns.expire(self.host)
+                raise OSError(errno.ECONNREFUSED, "conexión rechazada")
             print("Socket conectado")
-
-            # Aplicar SSL si es necesario
-            if use_ssl:
-                print("Aplicando SSL...")
-                try:
-                    # Intentar con SNI
-                    self.sock = ssl.wrap_socket(self.sock, server_hostname=host)
-                    print("SSL aplicado con SNI")
-                except:
-                    # Fallback sin SNI
-                    try:
-                        self.sock = ssl.wrap_socket(self.sock)
-                        print("SSL aplicado sin SNI")
-                    except Exception as e:
-                        print(f"Error SSL: {e}")
-                        raise
-
-            # WebSocket handshake
+            self.state = TLS if self.use_ssl else UPGRADE
+
+        elif state == TLS:
+            # Aplicar SSL: el handshake corre en los send()/recv() siguientes
+            print("Aplicando SSL...")
+            self.sock = self.tls.wrap(self.sock, self.host, self.port, self._resume,
+                                      handshake=False)
+            self._poller = None   # El poller tenía registrado el socket TCP
+            self.state = UPGRADE
             print("Enviando handshake WebSocket...")
-            key = binascii.b2a_base64(b'0123456789ABCDEF')[:-1]
-
-            request = (
-                f"GET {path} HTTP/1.1\r\n"
-                f"Host: {host}\r\n"
-                f"Upgrade: websocket\r\n"
-                f"Connection: Upgrade\r\n"
-                f"Sec-WebSocket-Key: {key.decode()}\r\n"
-                f"Sec-WebSocket-Version: 13\r\n"
-                f"\r\n"
-            )
-
-            self.sock.send(request.encode())
-
-            # Leer respuesta con timeout
-            response = b""
-            start = time.ticks_ms()
-            while time.ticks_diff(time.ticks_ms(), start) < 5000:
-                try:
-                    chunk = self.sock.recv(1024)
-                    response += chunk
-                    if b"\r\n\r\n" in response:
-                        break
-                except:
-                    time.sleep_ms(100)
-
-            if b"101" not in response or b"Upgrade" not in response:
-                print(f"Handshake fallido. Respuesta: {response[:200]}")
-                raise Exception("WebSocket handshake failed")
-
-            print("Handshake exitoso")
-
-            # ⬇️ NUEVO: Configurar socket como no bloqueante para recv()
-            self.sock.setblocking(False)
 
-            self.connected = True
-            return True
+        elif state == UPGRADE:
+            try:
+                sent = self.sock.send(self._out)
+            except OSError as e:
+                if e.args[0] not in _PENDING:
+                    raise
+                sent = None
+            if not sent:
+                # Con TLS se espera la respuesta del servidor al handshake
+                self._want = select.POLLIN if self.use_ssl else select.POLLOUT
+                return False
+            self._out = self._out[sent:]
+            if not len(self._out):
+                self.state = RESPONSE
+                deadline = time.ticks_add(time.ticks_ms(), self._response_ms)
+                if time.ticks_diff(deadline, self._deadline) < 0:
+                    self._deadline = deadline
+
+        elif state == RESPONSE:
+            try:
+                chunk = self.sock.recv(1024)
+            except OSError as e:
+                if e.args[0] not in _PENDING:
+                    raise
+                chunk = None
+            if chunk is None:
+                self._want = select.POLLIN
+                return False
+            if not chunk:
+                raise OSError("el servidor cerró durante el handshake")
+            self._response += chunk
+            if b"\r\n\r\n" in self._response:
+                self._finish()
+        return True
+
+    def _finish(self):
+        response = self._response
+        self._response = b""
+        if b"101" not in response or b"Upgrade" not in response:
+            print(f"Handshake fallido. Respuesta: {response[:200]}")
+            raise Exception("WebSocket handshake failed")
+
+        print("Handshake exitoso")
+        self.connect_ms = time.ticks_diff(time.ticks_ms(), self._start)
+        if self.use_ssl:
+            self.resumed = self.tls.done(self.sock, self.host, self.port, self._resume,
+                                         self.connect_ms)
+        # El socket queda no bloqueante para recv()
+        self._poller = None
+        self.state = None
+        self.connected = True
+        self._rx = b""
+        self._frag = None
+        self.keepalive.reset()
+
+    def _poll(self, mask, ms):
+        """Espera hasta ms a que el socket esté listo. Retorna los eventos"""
+        if self._poller is None:
+            self._poller = select.poll()
+        self._poller.register(self.sock, mask)
+        for obj, events in self._poller.poll(ms):
+            if obj is self.sock:
+                return events
+        return 0
+
+    def _write(self, frame):
+        """Escribe el frame entero. El socket es no bloqueante: send() puede
+        escribir una parte o fallar con EAGAIN si el buffer está lleno; se
+        espera POLLOUT hasta send_timeout_ms. Un frame a medias deja el
+        stream corrupto, así que el timeout es un error (OSError)"""
+        data = memoryview(frame)
+        deadline = time.ticks_add(time.ticks_ms(), self.send_timeout_ms)
+        while len(data):
+            try:
+                sent = self.sock.send(data)
+            except OSError as e:
+                if e.args[0] not in _PENDING:
+                    raise
+                sent = None
+            if sent:
+                data = data[sent:]
+                continue
+            left = time.ticks_diff(deadline, time.ticks_ms())
+            if left <= 0:
+                raise OSError(errno.ETIMEDOUT, "timeout en send()")
+            self._poll(select.POLLOUT, left)
+
+    def _fail(self, e):
+        print(f"Error en connect(): {e}")
+        self._close_sock()
+        self.state = None
+        self.connected = False
 
-        except Exception as e:
-            print(f"Error en connect(): {e}")
-            if self.sock:
-                try:
-                    self.sock.close()
-                except:
-                    pass
-            self.sock = None
-            self.connected = False
-            return False
+    def _close_sock(self):
+        if self.sock:
+            try:
+                self.sock.close()
+            except:
+                pass
+        self.sock = None
+        self._poller = None
 
     def send(self, data):
         """Envía mensaje por WebSocket"""
@@ -142,7 +710,7 @@ class WebSocket:
             # Data (no necesita XOR si mask es 0x00000000)
             frame.extend(data)
 
-            self.sock.send(frame)
+            self._write(frame)
             return True
 
         except Exception as e:
@@ -152,80 +720,122 @@ class WebSocket:
 
     # ⬇️ NUEVO MÉTODO CRÍTICO
     def recv(self):
-        """Recibe mensaje del servidor WebSocket (maneja PING/PONG automáticamente)"""
+        """Recibe un mensaje del servidor: str (texto), bytes (binario) o
+        None si todavía no llegó uno completo. No bloquea: lee lo que haya
+        en el socket y arma los frames en self._rx, así un frame partido en
+        varios segmentos TCP no pierde el sincronismo. Los mensajes
+        fragmentados (FIN=0 + continuación) se entregan enteros y los
+        PING/PONG/CLOSE se atienden acá, aunque lleguen en el medio"""
         if not self.connected or not self.sock:
             return None
 
         try:
-            # Leer primer byte (FIN + opcode)
-            first_byte = self.sock.recv(1)
-            if not first_byte:
-                return None
-
-            opcode = first_byte[0] & 0x0F
-
-            # Leer segundo byte (MASK + payload length)
-            second_byte = self.sock.recv(1)
-            if not second_byte:
-                return None
-
-            payload_len = second_byte[0] & 0x7F
-
-            # Leer longitud extendida si es necesario
-            if payload_len == 126:
-                len_bytes = self.sock.recv(2)
-                payload_len = struct.unpack(">H", len_bytes)[0]
-            elif payload_len == 127:
-                len_bytes = self.sock.recv(8)
-                payload_len = struct.unpack(">Q", len_bytes)[0]
-
-            # Leer payload
-            payload = b""
-            while len(payload) < payload_len:
-                chunk = self.sock.recv(payload_len - len(payload))
-                if not chunk:
-                    break
-                payload += chunk
-
-            # Procesar según opcode
-            if opcode == 0x1:  # Text frame
-                return payload.decode('utf-8')
-
-            elif opcode == 0x2:  # Binary frame
+            while True:
+                frame = self._next_frame()
+                if frame is None:
+                    if not self._fill():
+                        return None
+                    continue
+                fin, opcode, payload = frame
+
+                if opcode == 0x9:  # PING frame ⬅️ CRÍTICO
+                    self.debug("📶 PING recibido, enviando PONG...")
+                    self._send_pong(payload)
+                    continue  # No es un mensaje de aplicación
+
+                elif opcode == 0xA:  # PONG frame: RTT del keepalive
+                    self.keepalive.pong(payload)
+                    continue
+
+                elif opcode == 0x8:  # Close frame
+                    print("📪 Servidor cerró conexión")
+                    self.connected = False
+                    return None
+
+                elif opcode in (0x1, 0x2):  # Texto / binario
+                    if not fin:
+                        self._frag_op = opcode
+                        self._frag = [payload]
+                        continue
+                    self._frag = None
+
+                elif opcode == 0x0:  # Continuación
+                    if self._frag is None:
+                        print("⚠️ Continuación sin mensaje inicial")
+                        continue
+                    self._frag.append(payload)
+                    if not fin:
+                        continue
+                    opcode = self._frag_op
+                    payload = b"".join(self._frag)
+                    self._frag = None
+
+                else:
+                    print(f"⚠️ Opcode desconocido: 0x{opcode:02X}")
+                    continue
+
+                if opcode == 0x1:
+                    return payload.decode('utf-8')
                 return payload
 
-            elif opcode == 0x8:  # Close frame
-                print("📪 Servidor cerró conexión")
-                self.connected = False
-                return None
-
-            elif opcode == 0x9:  # PING frame ⬅️ CRÍTICO
-                print("📶 PING recibido, enviando PONG...")
-                self._send_pong(payload)
-                return None  # No es un mensaje de aplicación
-
-            elif opcode == 0xA:  # PONG frame
-                print("📶 PONG recibido del servidor")
-                return None  # No es un mensaje de aplicación
-
-            else:
-                print(f"⚠️ Opcode desconocido: 0x{opcode:02X}")
-                return None
-
         except OSError as e:
-            # OSError 11 = EAGAIN (no hay datos disponibles, normal en non-blocking)
-            if e.args[0] == 11:
-                return None
-            else:
-                print(f"Error OSError en recv(): {e}")
-                self.connected = False
-                return None
+            print(f"Error OSError en recv(): {e}")
+            self.connected = False
+            return None
 
         except Exception as e:
             print(f"Error en recv(): {e}")
             self.connected = False
             return None
 
+    def _fill(self):
+        """Lee lo disponible del socket a self._rx. False si no había nada"""
+        try:
+            chunk = self.sock.recv(RECV_CHUNK)
+        except OSError as e:
+            # EAGAIN = no hay datos disponibles, normal en non-blocking
+            if e.args[0] in _PENDING:
+                return False
+            raise
+        if chunk is None:  # SSL no bloqueante sin datos
+            return False
+        if not chunk:
+            raise OSError("el servidor cerró la conexión")
+        self._rx += chunk
+        return True
+
+    def _next_frame(self):
+        """Saca el próximo frame completo de self._rx: (fin, opcode, payload) o None"""
+        rx = self._rx
+        if len(rx) < 2:
+            return None
+        payload_len = rx[1] & 0x7F
+        pos = 2
+        if payload_len == 126:
+            if len(rx) < 4:
+                return None
+            payload_len = struct.unpack(">H", rx[2:4])[0]
+            pos = 4
+        elif payload_len == 127:
+            if len(rx) < 10:
+                return None
+            payload_len = struct.unpack(">Q", rx[2:10])[0]
+            pos = 10
+        if payload_len > self.max_frame:
+            raise ValueError(f"frame de {payload_len} bytes (máximo {self.max_frame})")
+        mask = None
+        if rx[1] & 0x80:  # El servidor no debería enmascarar, pero se tolera
+            mask = rx[pos:pos + 4]
+            pos += 4
+        end = pos + payload_len
+        if len(rx) < end:
+            return None
+        payload = rx[pos:end]
+        self._rx = rx[end:]
+        if mask and len(mask) == 4:
+            payload = bytes(b ^ mask[i & 3] for i, b in enumerate(payload))
+        return bool(rx[0] & 0x80), rx[0] & 0x0F, payload
+
     # ⬇️ NUEVO MÉTODO AUXILIAR
     def _send_pong(self, data):
         """Envía frame PONG en respuesta a PING"""
@@ -247,8 +857,8 @@ class WebSocket:
             # Payload
             frame.extend(data)
 
-            self.sock.send(frame)
-            print("✅ PONG enviado")
+            self._write(frame)
+            self.debug("✅ PONG enviado")
 
         except Exception as e:
             print(f"Error enviando PONG: {e}")
@@ -272,7 +882,7 @@ class WebSocket:
             frame.extend(mask)
             frame.extend(data)
 
-            self.sock.send(frame)
+            self._write(frame)
             return True
 
         except Exception as e:
@@ -281,13 +891,13 @@ class WebSocket:
             return False
 
     def close(self):
-        """Cierra la conexión WebSocket"""
-        if self.sock:
+        """Cierra la conexión WebSocket (o corta un connect en curso)"""
+        if self.sock and self.connected:
             try:
                 # Enviar frame de cierre
                 self.sock.send(b'\x88\x00')
-                self.sock.close()
             except:
                 pass
-            self.sock = None
+        self._close_sock()
+        self.state = None
         self.connected = False
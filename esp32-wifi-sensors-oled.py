@@ -15,6 +15,13 @@ except ImportError:
     OLED_AVAILABLE = False
     print("⚠ Librería ssd1306 no encontrada - OLED deshabilitado")
 
+# Profiler del loop (opcional): tiempos por evento, ver loop_profiler.py
+try:
+    from loop_profiler import LoopProfiler
+    PROFILER_AVAILABLE = True
+except ImportError:
+    PROFILER_AVAILABLE = False
+
 # Configuración WiFi
 SSID = "motog35"
 PASSWORD = "12345678"
@@ -51,6 +58,7 @@ WIFI_CHECK_INTERVAL = 10000
 LED_BLINK_INTERVAL = 500
 OLED_UPDATE_INTERVAL = 1000
 DOOR_CHECK_INTERVAL = 100  # 🆕 Verificar puerta cada 100ms
+LOOP_STATS_INTERVAL = 300000  # Resumen del profiler en consola cada 5 min
 
 # Variables de tiempo
 last_sensor_read = 0
@@ -540,6 +548,33 @@ def display_sensor_data():
     print(f"{timestamp_str} {dht_str} | {ds_str} | {door_str} | {oled_status}")
     print(f"          {wifi_str} | {real_time_str}")
 
+# Profiler: una tarea por evento del loop (intervalo 0 = en cada vuelta)
+loop_prof = None
+if PROFILER_AVAILABLE:
+    loop_prof = LoopProfiler(loop_ms=10)
+    t_sensors = loop_prof.task("sensores", SENSOR_INTERVAL)
+    t_console = loop_prof.task("consola", SENSOR_INTERVAL)
+    t_wifi = loop_prof.task("wifi", WIFI_CHECK_INTERVAL)
+    t_wifi_led = loop_prof.task("wifi_led")
+    t_oled = loop_prof.task("oled", OLED_UPDATE_INTERVAL)
+    t_ntp = loop_prof.task("ntp")
+    t_door = loop_prof.task("puerta", DOOR_CHECK_INTERVAL)
+
+def medir(tarea, fn, now):
+    """Ejecuta fn() midiendo su duración si el profiler está disponible"""
+    if loop_prof:
+        return tarea.run(fn, now)
+    return fn()
+
+def loop_stats(reset=False):
+    """Muestra los tiempos del loop principal (llamar desde el REPL)"""
+    if not loop_prof:
+        print("⚠ loop_profiler.py no encontrado")
+        return
+    loop_prof.report()
+    if reset:
+        loop_prof.reset()
+
 def main():
     """Función principal con arquitectura de eventos"""
     global last_sensor_read, last_wifi_check, last_oled_update, last_door_check
@@ -572,39 +607,47 @@ def main():
     last_wifi_check = start_time
     last_oled_update = start_time
     last_door_check = start_time
+    last_loop_stats = start_time
 
     try:
         while True:
             current_time = get_time_ms()
+            if loop_prof:
+                loop_prof.tick(current_time)
 
             # EVENTO 1: Leer sensores cada 2 segundos
             if time.ticks_diff(current_time, last_sensor_read) >= SENSOR_INTERVAL:
-                read_sensors_event()
-                display_sensor_data()
+                medir(t_sensors, read_sensors_event, current_time)
+                medir(t_console, display_sensor_data, current_time)
                 last_sensor_read = current_time
 
             # EVENTO 2: Verificar WiFi cada 10 segundos (solo si está disponible)
             if wlan and time.ticks_diff(current_time, last_wifi_check) >= WIFI_CHECK_INTERVAL:
-                check_wifi_event()
+                medir(t_wifi, check_wifi_event, current_time)
                 last_wifi_check = current_time
 
             # EVENTO 3: Actualizar LED WiFi (continuo)
-            update_wifi_led()
+            medir(t_wifi_led, update_wifi_led, current_time)
 
             # EVENTO 4: Actualizar OLED cada segundo
             if oled_initialized and time.ticks_diff(current_time, last_oled_update) >= OLED_UPDATE_INTERVAL:
-                update_oled_display()
+                medir(t_oled, update_oled_display, current_time)
                 last_oled_update = current_time
 
             # EVENTO 5: Verificar sincronización NTP (solo si WiFi disponible)
             if wlan:
-                check_ntp_sync()
+                medir(t_ntp, check_ntp_sync, current_time)
 
             # 🆕 EVENTO 6: Verificar sensor de puerta cada 100ms
             if time.ticks_diff(current_time, last_door_check) >= DOOR_CHECK_INTERVAL:
-                check_door_sensor()
+                medir(t_door, check_door_sensor, current_time)
                 last_door_check = current_time
 
+            # Resumen del profiler cada 5 minutos
+            if loop_prof and time.ticks_diff(current_time, last_loop_stats) >= LOOP_STATS_INTERVAL:
+                print(f"⏱️  {loop_prof.summary()}")
+                last_loop_stats = current_time
+
             time.sleep_ms(10)
 
     except KeyboardInterrupt:
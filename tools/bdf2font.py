@@ -0,0 +1,253 @@
+# bdf2font.py - Genera paquetes de fuentes para los drivers OLED desde archivos BDF
+#
+# Se ejecuta en la PC (CPython), no en el ESP32. El resultado es un módulo
+# MicroPython con las fuentes como constantes `bytes` planas + tabla de
+# índices, que se puede copiar al ESP32 o congelar en el firmware (quedan en
+# flash y no ocupan heap).
+#
+# Uso:
+#   python tools/bdf2font.py tools/fonts/small-5x7.bdf -o esp32-websockets/font_5x7.py
+#   python tools/bdf2font.py tools/fonts/tiny-4x6.bdf -o esp32-websockets/font_4x6.py --fold-case
+#   python tools/bdf2font.py tools/fonts/small-5x7.bdf -o esp32-websockets/font_prop.py --proportional
+#   python tools/bdf2font.py tools/fonts/small-5x7.bdf -o esp32-websockets/font_big3.py \
+#       --scale 3 --only "0123456789.-+ " --proportional --tabular-digits
+#
+# Formato del paquete generado:
+#   HEIGHT        alto en píxeles
+#   PAGES         bytes por columna ((HEIGHT + 7) // 8)
+#   SPACING       separación entre caracteres en píxeles
+#   FIRST, LAST   rango de códigos cubiertos (LAST = 127 se usa para '°')
+#   INDEX         offset de cada glifo dentro de GLYPHS (uint16 little-endian)
+#   WIDTHS        columnas de cada glifo (1 byte por carácter): tabla de avance
+#   GLYPHS        columnas MONO_VLSB (bit 0 = fila superior), PAGES bytes
+#                 por columna, de arriba hacia abajo
+# Los caracteres que no están en el BDF apuntan al glifo por defecto
+# (DEFAULT_CHAR o espacio), igual que hacían los diccionarios antiguos.
+
+import argparse
+import os
+import shlex
+import sys
+
+FIRST = 32
+LAST = 127
+# El slot de DEL (127) no se dibuja nunca: lo usamos para el símbolo de grado
+DEFAULT_MAP = {0xB0: 127}
+
+
+def parse_bdf(path):
+    """Lee un BDF y devuelve (ascent, default_char, {codigo: glifo})"""
+    glyphs = {}
+    ascent = None
+    default_char = 32
+    bbox = None
+    cur = None
+    bitmap = None
+
+    with open(path) as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            key, _, rest = line.partition(" ")
+
+            if bitmap is not None:
+                if key == "ENDCHAR":
+                    cur["rows"] = bitmap
+                    if cur["encoding"] >= 0:
+                        glyphs[cur["encoding"]] = cur
+                    cur = None
+                    bitmap = None
+                else:
+                    bitmap.append(int(key, 16))
+                continue
+
+            if key == "FONTBOUNDINGBOX":
+                bbox = [int(v) for v in rest.split()]
+            elif key == "FONT_ASCENT":
+                ascent = int(rest)
+            elif key == "DEFAULT_CHAR":
+                default_char = int(rest)
+            elif key == "STARTCHAR":
+                cur = {"encoding": -1, "dwidth": None, "bbx": None}
+            elif key == "ENCODING" and cur is not None:
+                cur["encoding"] = int(rest.split()[0])
+            elif key == "DWIDTH" and cur is not None:
+                cur["dwidth"] = int(rest.split()[0])
+            elif key == "BBX" and cur is not None:
+                cur["bbx"] = [int(v) for v in rest.split()]
+            elif key == "BITMAP" and cur is not None:
+                bitmap = []
+
+    if bbox is None:
+        raise ValueError(f"{path}: falta FONTBOUNDINGBOX")
+    if ascent is None:
+        ascent = bbox[1] + bbox[3]
+    return ascent, bbox, default_char, glyphs
+
+
+def glyph_columns(glyph, ascent, height):
+    """Convierte las filas del BDF (MSB a la izquierda) a columnas VLSB"""
+    w, h, xoff, yoff = glyph["bbx"]
+    advance = glyph["dwidth"] if glyph["dwidth"] is not None else w
+    row_bytes = (w + 7) // 8
+    top = ascent - (h + yoff)
+    cols = [0] * max(advance, w + max(xoff, 0))
+
+    for r, bits in enumerate(glyph["rows"]):
+        y = top + r
+        if y < 0 or y >= height:
+            continue
+        for c in range(w):
+            if bits & (1 << (row_bytes * 8 - 1 - c)):
+                x = c + xoff
+                if 0 <= x < len(cols):
+                    cols[x] |= 1 << y
+    return cols[:advance] if advance else cols
+
+
+def trim_columns(cols, space_width):
+    """Quita columnas vacías a los lados (fuente proporcional)"""
+    while cols and not cols[0]:
+        cols = cols[1:]
+    while cols and not cols[-1]:
+        cols = cols[:-1]
+    return cols if cols else [0] * space_width
+
+
+def scale_columns(cols, scale):
+    """Escala el glifo ahora, en la PC, para no escalar píxel a píxel en el ESP32"""
+    out = []
+    for col in cols:
+        big = 0
+        bit = 0
+        while col >> bit:
+            if col & (1 << bit):
+                big |= ((1 << scale) - 1) << (bit * scale)
+            bit += 1
+        out.extend([big] * scale)
+    return out
+
+
+def build_pack(path, fold_case=False, charmap=None, proportional=False,
+               tabular_digits=False, scale=1, only=None):
+    """Construye (height, index, widths, glyph_data) para FIRST..LAST"""
+    ascent, bbox, default_char, glyphs = parse_bdf(path)
+    height = bbox[1]
+    charmap = dict(DEFAULT_MAP if charmap is None else charmap)
+    space_width = max(1, (bbox[0] + 1) // 2)
+
+    slots = {}
+    for code, glyph in glyphs.items():
+        slot = charmap.get(code, code)
+        if only is not None and slot not in only:
+            continue
+        if FIRST <= slot <= LAST and (slot not in slots or code == slot):
+            cols = glyph_columns(glyph, ascent, height)
+            if proportional and not (tabular_digits and 48 <= slot <= 57):
+                cols = trim_columns(cols, space_width)
+            slots[slot] = cols
+
+    if fold_case:
+        # Sin minúsculas en el BDF: reutilizar el glifo de la mayúscula
+        for code in range(ord("a"), ord("z") + 1):
+            if code not in slots and code - 32 in slots:
+                slots[code] = slots[code - 32]
+
+    if default_char not in slots:
+        default_char = 32
+    if default_char not in slots:
+        raise ValueError(f"{path}: no hay glifo por defecto (espacio)")
+
+    height *= scale
+    pages = (height + 7) // 8
+    index = bytearray()
+    widths = bytearray()
+    data = bytearray()
+    offsets = {}
+    for code in range(FIRST, LAST + 1):
+        cols = slots.get(code, slots[default_char])
+        if scale > 1:
+            cols = scale_columns(cols, scale)
+        key = b"".join(col.to_bytes(pages, "little") for col in cols)
+        if key not in offsets:
+            offsets[key] = len(data)
+            data.extend(key)
+        off = offsets[key]
+        index.append(off & 0xFF)
+        index.append(off >> 8)
+        widths.append(len(cols))
+    return height, bytes(index), bytes(widths), bytes(data)
+
+
+def bytes_literal(name, data, per_line=16):
+    lines = [f"{name} = ("]
+    for i in range(0, len(data), per_line):
+        chunk = "".join(f"\\x{b:02x}" for b in data[i:i + per_line])
+        lines.append(f"    b'{chunk}'")
+    lines.append(")")
+    return "\n".join(lines)
+
+
+def render_module(src, out_name, height, spacing, index, widths, data, args_line):
+    return "\n".join([
+        f"# {out_name} - Generado por tools/bdf2font.py desde {src}",
+        "# ¡No editar a mano! Regenerar con:",
+        f"#   python tools/bdf2font.py {args_line}",
+        "from micropython import const",
+        "",
+        f"HEIGHT = const({height})",
+        f"PAGES = const({(height + 7) // 8})",
+        f"SPACING = const({spacing})",
+        f"FIRST = const({FIRST})",
+        f"LAST = const({LAST})  # 127 = '°'",
+        "",
+        "# Offset de cada glifo en GLYPHS (uint16 little-endian)",
+        bytes_literal("INDEX", index),
+        "",
+        "# Columnas de cada glifo",
+        bytes_literal("WIDTHS", widths),
+        "",
+        "# Columnas MONO_VLSB (bit 0 = fila superior)",
+        bytes_literal("GLYPHS", data),
+        "",
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BDF -> paquete de fuente MicroPython")
+    parser.add_argument("bdf")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--fold-case", action="store_true",
+                        help="usar mayúsculas si el BDF no trae minúsculas")
+    parser.add_argument("--proportional", action="store_true",
+                        help="recortar columnas vacías (ancho variable)")
+    parser.add_argument("--tabular-digits", action="store_true",
+                        help="con --proportional, dígitos de ancho fijo")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="pre-renderizar la fuente a 2x, 3x...")
+    parser.add_argument("--only", default=None,
+                        help="solo incluir estos caracteres (resto = espacio)")
+    args = parser.parse_args(argv)
+
+    only = None
+    if args.only is not None:
+        only = {DEFAULT_MAP.get(ord(c), ord(c)) for c in args.only + " "}
+    height, index, widths, data = build_pack(
+        args.bdf, fold_case=args.fold_case, proportional=args.proportional,
+        tabular_digits=args.tabular_digits, scale=args.scale, only=only)
+    if height > 255:
+        raise SystemExit("Fuente demasiado alta")
+    if len(data) > 0xFFFF:
+        raise SystemExit("Demasiados datos de glifos para INDEX de 16 bits")
+
+    out_name = os.path.basename(args.output)
+    args_line = shlex.join(sys.argv[1:] if argv is None else argv)
+    with open(args.output, "w") as f:
+        f.write(render_module(os.path.basename(args.bdf), out_name, height,
+                              args.scale, index, widths, data, args_line))
+    print(f"✓ {out_name}: {len(data)} bytes de glifos, alto {height}px")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# bench_display.py - Benchmark de los drivers OLED (ssd1306.py / sh1106.py) en la PC
+#
+# Dibuja el dashboard REAL de esp32-websockets/bootv3_2.py (update_oled()) con
+# el arnés de tools/sim: framebuf en Python puro y un bus I2C que registra
+# todo lo que se envía. Por panel y escenario reporta transacciones, bytes y
+# tiempo de bus a distintas frecuencias de I2C, más el tiempo de CPU en la PC
+# (solo sirve para comparar revisiones, no es el tiempo del ESP32).
+#
+# Escenarios:
+#   dashboard  cambian los sensores en cada frame (uso normal)
+#   clock      solo cambia la hora
+#   door       se abre y cierra la puerta
+#   idle       no cambia nada (la firma evita redibujar)
+#   full       redibujado completo con show(full_update=True)
+#
+# Golden: el tráfico I2C se interpreta con tools/sim/panel.py y se compara lo
+# que muestra el panel contra tools/golden/display. Así una optimización de
+# text_small(), show() o la rotación tiene que dar EXACTAMENTE la misma imagen.
+#
+# Ejemplos:
+#   python tools/bench_display.py                      # todo, verifica golden
+#   python tools/bench_display.py --panel sh1106 --scenario clock --freq 100000,400000
+#   python tools/bench_display.py --out antes.json     # y después del cambio:
+#   python tools/bench_display.py --compare antes.json
+#   python tools/bench_display.py --update-golden      # solo si el cambio de imagen es intencional
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, TOOLS_DIR)
+
+import sim  # noqa: E402
+from sim.panel import PanelModel, to_pbm, from_pbm  # noqa: E402
+from bench_ws import compare  # noqa: E402
+
+BOOT = os.path.join(REPO_DIR, "esp32-websockets", "bootv3_2.py")
+GOLDEN_DIR = os.path.join(TOOLS_DIR, "golden", "display")
+EPOCH = 1767268800  # 2026-01-01 12:00 UTC: fecha fija para que la imagen no cambie
+
+# Nombre -> (DISPLAY_TYPE, rotación)
+PANELS = {
+    "ssd1306": ("SSD1306", 0),
+    "ssd1306-r180": ("SSD1306", 180),
+    "ssd1309": ("SSD1309", 0),
+    "sh1106": ("SH1106", 0),
+    "sh1106-r180": ("SH1106", 180),
+}
+SCENARIOS = ("dashboard", "clock", "door", "idle", "full")
+
+
+class _Wlan:
+    """Solo lo que usa update_oled(): status('rssi')"""
+
+    def __init__(self):
+        self.rssi = -58
+
+    def status(self, param=None):
+        return self.rssi
+
+    def isconnected(self):
+        return True
+
+
+class _Ws:
+    connected = True
+
+
+def _setup_state(boot):
+    boot.time_synced = True
+    boot.wifi_connected = True
+    boot.door_closed = True
+    boot.wlan = _Wlan()
+    boot.ws = _Ws()
+    data = boot.current_data
+    data.ds18b20_temp, data.ds18b20_valid = 4.5, True
+    data.dht_temp, data.dht_humidity, data.dht_valid = 22.5, 55.0, True
+    boot.ultima_firma_oled = None
+
+
+def _step(boot, scenario, i):
+    """Cambia el estado para el frame i. Retorna cómo dibujar"""
+    data = boot.current_data
+    if scenario in ("dashboard", "full"):
+        data.ds18b20_temp = 4.5 - 0.3 * i
+        data.dht_temp = 22.5 + 0.1 * (i % 7)
+        data.dht_humidity = 55.0 + (i % 5)
+        boot.wlan.rssi = -50 - 7 * (i % 6)
+        sim.clock.us += 60 * 1000000
+        data.ds18b20_valid = i % 9 != 8  # De vez en cuando un sensor falla
+        return "full" if scenario == "full" else "update"
+    if scenario == "clock":
+        sim.clock.us += 60 * 1000000
+    elif scenario == "door":
+        boot.door_closed = not boot.door_closed
+    return "update"
+
+
+def run_panel(boot, name, scenarios, frames, freqs):
+    import machine
+    kind, rotate = PANELS[name]
+    i2c = machine.SoftI2C(freq=400000)
+    i2c.start_recording()
+    display = sim.device_import("oled_hal").create(kind, i2c, 128, 64, rotate=rotate)
+    panel = PanelModel(kind)
+
+    # Tiempo de show() aparte del render
+    show_us = [0]
+    driver_show = display._show
+
+    def timed_show(full_update=False):
+        t0 = time.perf_counter()
+        driver_show(full_update)
+        show_us[0] += (time.perf_counter() - t0) * 1e6
+
+    display._show = timed_show
+    boot.oled = display
+    # Lo que debería verse: el buffer VLSB que el driver envía al panel
+    driver = display.driver
+    framebuffer = driver.buffer if hasattr(driver, "buffer") else driver.displaybuf
+
+    results = {}
+    images = {}
+    for scenario in scenarios:
+        sim.clock.us = 0
+        _setup_state(boot)
+        for addr, data in i2c.record:
+            panel.feed(data)  # Tráfico anterior (init, otro escenario)
+        i2c.reset_counters()
+        host_us = 0
+        show_us[0] = 0
+        drawn = 0
+        mismatches = 0
+        frame_hash = hashlib.sha256()
+        for i in range(frames):
+            how = _step(boot, scenario, i)
+            sent_before = display.bytes_sent
+            t0 = time.perf_counter()
+            if how == "full":
+                display.fill(0)
+                boot.dibujar_dashboard(0, 0, 0)
+                display.show(True)
+            else:
+                boot.update_oled()
+            host_us += (time.perf_counter() - t0) * 1e6
+            if display.bytes_sent != sent_before:
+                drawn += 1
+            for addr, data in i2c.record:
+                panel.feed(data)
+            i2c.record = []
+            image = panel.image(rotate)
+            frame_hash.update(image)
+            if image != framebuffer:
+                mismatches += 1  # El panel no muestra lo que hay en el framebuffer
+        images[scenario] = (bytes(image), frame_hash.hexdigest())
+        per_frame_bits = i2c.bus_bits / frames
+        results[scenario] = {
+            "frames": frames,
+            "drawn": drawn,
+            "transactions": i2c.transactions,
+            "bytes": i2c.bytes,
+            "bytesPerFrame": round(i2c.bytes / frames, 1),
+            "busMsPerFrame": {str(f): round(per_frame_bits * 1000 / f, 3) for f in freqs},
+            "hostUsPerFrame": round(host_us / frames, 1),
+            "hostShowUsPerFrame": round(show_us[0] / frames, 1),
+            "panelMismatches": mismatches,
+        }
+    return results, images
+
+
+def _golden_path(scenario):
+    return os.path.join(GOLDEN_DIR, f"{scenario}.pbm")
+
+
+def check_golden(all_images, update):
+    """Compara (o reescribe) la imagen final y el hash de todos los frames
+
+    La imagen es la misma para todos los paneles: lo que ve el usuario no
+    depende del controlador ni de si el panel está montado al revés."""
+    index_path = os.path.join(GOLDEN_DIR, "frames.json")
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path) as f:
+            index = json.load(f)
+    failures = []
+    by_scenario = {}
+    for name, images in all_images.items():
+        for scenario, result in images.items():
+            by_scenario.setdefault(scenario, []).append((name, result))
+
+    for scenario, results in by_scenario.items():
+        first_name, (first_image, first_digest) = results[0]
+        for name, (image, digest) in results[1:]:
+            if (image, digest) != (first_image, first_digest):
+                failures.append(f"{scenario}: {name} no muestra lo mismo que {first_name}")
+        path = _golden_path(scenario)
+        if update:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(to_pbm(first_image, 128, 64))
+            index[scenario] = first_digest
+            continue
+        if scenario not in index or not os.path.exists(path):
+            failures.append(f"{scenario}: sin golden (correr con --update-golden)")
+            continue
+        with open(path, "rb") as f:
+            expected, _, _ = from_pbm(f.read())
+        for name, (image, digest) in results:
+            if bytes(expected) != image:
+                failures.append(f"{scenario}: la imagen final de {name} cambió")
+            elif index[scenario] != digest:
+                failures.append(f"{scenario}: algún frame intermedio de {name} cambió")
+    if update:
+        with open(index_path, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los drivers OLED en la PC")
+    parser.add_argument("--panel", default=",".join(PANELS),
+                        help=f"paneles separados por coma ({','.join(PANELS)})")
+    parser.add_argument("--scenario", default=",".join(SCENARIOS),
+                        help=f"escenarios separados por coma ({','.join(SCENARIOS)})")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--freq", default="100000,400000,1000000",
+                        help="frecuencias de I2C para el tiempo de bus (Hz)")
+    parser.add_argument("--out", help="guardar el JSON en este archivo")
+    parser.add_argument("--compare", help="JSON de una corrida anterior")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    parser.add_argument("--update-golden", action="store_true",
+                        help="reescribir tools/golden/display con las imágenes actuales")
+    parser.add_argument("--no-golden", action="store_true")
+    args = parser.parse_args(argv)
+
+    panels = [p.strip() for p in args.panel.split(",") if p.strip()]
+    scenarios = [s.strip() for s in args.scenario.split(",") if s.strip()]
+    for p in panels:
+        if p not in PANELS:
+            parser.error(f"panel desconocido: {p}")
+    for s in scenarios:
+        if s not in SCENARIOS:
+            parser.error(f"escenario desconocido: {s}")
+    freqs = [int(f) for f in args.freq.split(",")]
+
+    sim.install(epoch=EPOCH)
+    boot = sim.load(BOOT, name="bench_boot")
+
+    result = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "frames": args.frames,
+            "freqs": freqs,
+        },
+        "panels": {},
+    }
+    all_images = {}
+    for name in panels:
+        print(f"⏱ {name}", file=sys.stderr)
+        result["panels"][name], all_images[name] = run_panel(
+            boot, name, scenarios, args.frames, freqs)
+
+    status = 0
+    if not args.no_golden:
+        failures = check_golden(all_images, args.update_golden)
+        result["golden"] = "updated" if args.update_golden else (failures or "ok")
+        for failure in failures:
+            print(f"❌ golden {failure}", file=sys.stderr)
+        status = 1 if failures else 0
+    if any(s["panelMismatches"] for r in result["panels"].values() for s in r.values()):
+        print("❌ el panel no coincide con el framebuffer (ver panelMismatches)", file=sys.stderr)
+        status = 1
+
+    text = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        if compare(old, result, args.threshold, section="panels"):
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,774 @@
+# bench_ws.py - Benchmarks del cliente WebSocket del ESP32 corriendo en la PC
+#
+# Corre el cliente real (ws_client.py / ws_client_v2.py, sin modificar) con el
+# arnés de tools/sim contra un servidor WebSocket local, en ws:// y en wss://
+# con un certificado autofirmado (hace falta `openssl` en el PATH). Mide:
+#   - handshake: tiempo de connect() (TCP + TLS + upgrade); con clientes que
+#     reanudan sesiones TLS, aparte los reanudados (resumedMs, resumedPct).
+#     El ssl del sim es como el de MicroPython, que no reanuda: "tls" dice
+#     si el cliente lo detectó ("unsupported")
+#   - send: frames/s y bytes/s enviados, por tamaño de payload
+#   - echo: ida y vuelta send() + recv() por tamaño de payload
+#   - burst: latencia de recv() cuando el servidor manda muchos frames seguidos
+#   - alloc: memoria asignada por frame (pico y neto, con tracemalloc)
+#   - replay: tráfico del servidor grabado (tools/ws_captures/*.json o .bin)
+# El resultado es JSON, para comparar revisiones del cliente.
+#
+# Ejemplos:
+#   python tools/bench_ws.py                                   # ws_client_v2.py
+#   python tools/bench_ws.py --client esp32-websockets/ws_client.py \
+#       --client esp32-websockets/ws_client_v2.py
+#   python tools/bench_ws.py --rev HEAD~5 --rev HEAD --out bench.json
+#   python tools/bench_ws.py --compare bench.json               # contra una corrida anterior
+#   python tools/bench_ws.py --only replay --replay tools/ws_captures/ping_flood.json
+#
+# El servidor corre en otro proceso: no le quita GIL al cliente ni ensucia
+# las mediciones de tracemalloc.
+
+import argparse
+import base64
+import contextlib
+import datetime
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import ssl
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, TOOLS_DIR)
+
+import sim  # noqa: E402
+
+DEFAULT_CLIENT = os.path.join(REPO_DIR, "esp32-websockets", "ws_client_v2.py")
+CAPTURES_DIR = os.path.join(TOOLS_DIR, "ws_captures")
+BENCHES = ("handshake", "send", "echo", "burst", "alloc", "replay")
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODES = {"cont": 0x0, "text": 0x1, "binary": 0x2, "close": 0x8, "ping": 0x9, "pong": 0xA}
+
+
+# ---------------------------------------------------------------------------
+# Servidor (proceso aparte)
+# ---------------------------------------------------------------------------
+
+def ws_frame(opcode, payload=b"", fin=True):
+    """Frame servidor -> cliente (sin máscara)"""
+    head = bytearray([(0x80 if fin else 0) | opcode])
+    n = len(payload)
+    if n < 126:
+        head.append(n)
+    elif n < 65536:
+        head.append(126)
+        head += struct.pack(">H", n)
+    else:
+        head.append(127)
+        head += struct.pack(">Q", n)
+    return bytes(head) + payload
+
+
+def _read_exact(sock, n):
+    data = b""
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("cliente cerró")
+        data += chunk
+    return data
+
+
+def _read_frame(sock):
+    b0, b1 = _read_exact(sock, 2)
+    n = b1 & 0x7F
+    if n == 126:
+        n = struct.unpack(">H", _read_exact(sock, 2))[0]
+    elif n == 127:
+        n = struct.unpack(">Q", _read_exact(sock, 8))[0]
+    mask = _read_exact(sock, 4) if b1 & 0x80 else None
+    payload = _read_exact(sock, n) if n else b""
+    if mask and mask != b"\x00\x00\x00\x00":
+        payload = bytes(c ^ mask[i & 3] for i, c in enumerate(payload))
+    return b0 & 0x0F, payload
+
+
+def capture_stream(path):
+    """Bytes servidor -> cliente de una captura y cómo escribirlos
+
+    .bin: bytes crudos después del handshake (p. ej. "Follow TCP stream" de
+    Wireshark, dirección servidor -> cliente, guardado como Raw).
+    .json: {"frames": [{"op": "ping", "data": "x", "repeat": 100, "fin": true}],
+            "tcp_chunk": 0, "chunk_delay_ms": 0, "expect": ["mensajes..."]}
+    """
+    if path.endswith(".bin"):
+        with open(path, "rb") as f:
+            return f.read(), {}
+    with open(path) as f:
+        spec = json.load(f)
+    stream = bytearray()
+    for frame in spec["frames"]:
+        data = frame.get("data", "")
+        if frame.get("hex"):
+            data = bytes.fromhex(frame["hex"])
+        elif isinstance(data, str):
+            data = data.encode()
+        one = ws_frame(OPCODES[frame["op"]], data, frame.get("fin", True))
+        stream += one * frame.get("repeat", 1)
+    return bytes(stream), spec
+
+
+class _ServerState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.frames_in = 0
+        self.bytes_in = 0
+        self.sink_frames = 0
+        self.pings_in = 0
+        self.pongs_in = 0
+        self.closes_in = 0
+        self.handshakes = 0
+        self.errors = 0
+
+    def as_dict(self):
+        with self.lock:
+            return {k: v for k, v in vars(self).items() if k != "lock"}
+
+
+def _handshake(sock):
+    request = b""
+    while b"\r\n\r\n" not in request:
+        chunk = sock.recv(1024)
+        if not chunk:
+            raise ConnectionError("cliente cerró en el handshake")
+        request += chunk
+    key = b""
+    for line in request.split(b"\r\n"):
+        if line.lower().startswith(b"sec-websocket-key:"):
+            key = line.split(b":", 1)[1].strip()
+    accept = base64.b64encode(hashlib.sha1(key + WS_GUID).digest())
+    sock.sendall(b"HTTP/1.1 101 Switching Protocols\r\n"
+                 b"Upgrade: websocket\r\n"
+                 b"Connection: Upgrade\r\n"
+                 b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+
+
+def _burst(sock, count, size):
+    """`count` frames seguidos; cada uno lleva "seq:monotonic_ns" al inicio"""
+    for seq in range(count):
+        head = f"{seq}:{time.monotonic_ns()}:".encode()
+        sock.sendall(ws_frame(0x1, head + b"x" * max(0, size - len(head))))
+
+
+def _replay(sock, path):
+    stream, spec = capture_stream(path)
+    chunk = spec.get("tcp_chunk") or len(stream) or 1
+    delay = spec.get("chunk_delay_ms", 0) / 1000
+    for i in range(0, len(stream), chunk):
+        sock.sendall(stream[i:i + chunk])
+        if delay:
+            time.sleep(delay)
+
+
+def _client_loop(sock, state):
+    try:
+        _handshake(sock)
+        with state.lock:
+            state.handshakes += 1
+        while True:
+            opcode, payload = _read_frame(sock)
+            with state.lock:
+                state.frames_in += 1
+                state.bytes_in += len(payload)
+            if opcode == 0x8:
+                with state.lock:
+                    state.closes_in += 1
+                break
+            if opcode == 0x9:
+                with state.lock:
+                    state.pings_in += 1
+                sock.sendall(ws_frame(0xA, payload))
+            elif opcode == 0xA:
+                with state.lock:
+                    state.pongs_in += 1
+            elif payload.startswith(b"__bench "):
+                cmd = payload.decode().split()
+                if cmd[1] == "burst":
+                    _burst(sock, int(cmd[2]), int(cmd[3]))
+                elif cmd[1] == "replay":
+                    _replay(sock, " ".join(cmd[2:]))
+            elif payload.startswith(b"__sink"):
+                with state.lock:
+                    state.sink_frames += 1  # Solo contar (benchmark de send)
+            else:
+                sock.sendall(ws_frame(opcode or 0x1, payload))  # Eco
+    except (ConnectionError, OSError, ValueError):
+        with state.lock:
+            state.errors += 1
+    finally:
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+
+def _accept_loop(listener, state, tls_ctx):
+    while True:
+        sock, _ = listener.accept()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if tls_ctx is not None:
+            try:
+                sock = tls_ctx.wrap_socket(sock, server_side=True)
+            except (ssl.SSLError, OSError):
+                with state.lock:
+                    state.errors += 1
+                sock.close()
+                continue
+        threading.Thread(target=_client_loop, args=(sock, state), daemon=True).start()
+
+
+def serve(control, cert=None, key=None):
+    """Proceso servidor: ws:// siempre, wss:// si hay certificado"""
+    state = _ServerState()
+    ports = {}
+    for scheme in ("ws", "wss"):
+        tls_ctx = None
+        if scheme == "wss":
+            if not cert:
+                continue
+            tls_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            tls_ctx.load_cert_chain(cert, key)
+        listener = socket.socket()
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(16)
+        ports[scheme] = listener.getsockname()[1]
+        threading.Thread(target=_accept_loop, args=(listener, state, tls_ctx),
+                         daemon=True).start()
+    control.send(ports)
+    while True:
+        cmd = control.recv()
+        if cmd == "stats":
+            control.send(state.as_dict())
+        elif cmd == "reset":
+            with state.lock:
+                state.reset()
+            control.send(True)
+        elif cmd == "quit":
+            break
+
+
+class ServerProcess:
+    def __init__(self, tls=True):
+        self.tmp = tempfile.TemporaryDirectory()
+        cert = key = None
+        self.tls_error = None
+        if tls:
+            cert = os.path.join(self.tmp.name, "cert.pem")
+            key = os.path.join(self.tmp.name, "key.pem")
+            try:
+                subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                                "-keyout", key, "-out", cert, "-days", "1",
+                                "-subj", "/CN=127.0.0.1"],
+                               check=True, capture_output=True)
+            except (OSError, subprocess.CalledProcessError) as e:
+                self.tls_error = f"sin certificado TLS: {e}"
+                cert = key = None
+        self.control, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=serve, args=(child, cert, key), daemon=True)
+        self.process.start()
+        self.ports = self.control.recv()
+
+    def url(self, scheme):
+        return f"{scheme}://127.0.0.1:{self.ports[scheme]}/"
+
+    def stats(self):
+        self.control.send("stats")
+        return self.control.recv()
+
+    def reset(self):
+        self.control.send("reset")
+        return self.control.recv()
+
+    def wait_sink(self, count, timeout_s=10.0):
+        """Espera a que lleguen `count` frames "__sink" (benchmark de send)"""
+        deadline = time.monotonic() + timeout_s
+        while True:
+            stats = self.stats()
+            if stats["sink_frames"] >= count or time.monotonic() > deadline:
+                return stats
+            time.sleep(0.001)
+
+    def close(self):
+        try:
+            self.control.send("quit")
+        except OSError:
+            pass
+        self.process.join(2)
+        self.tmp.cleanup()
+
+
+# ---------------------------------------------------------------------------
+# Cliente
+# ---------------------------------------------------------------------------
+
+def quiet():
+    """Los clientes imprimen en cada connect/ping: no medir la consola"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def summarize(values):
+    """min/p50/p90/p99/max/avg de una lista de tiempos (ms)"""
+    if not values:
+        return {"n": 0}
+    v = sorted(values)
+    n = len(v)
+
+    def pct(p):
+        return round(v[min(n - 1, int(p * n))], 3)
+
+    return {"n": n, "min": round(v[0], 3), "p50": pct(0.50), "p90": pct(0.90),
+            "p99": pct(0.99), "max": round(v[-1], 3), "avg": round(sum(v) / n, 3)}
+
+
+def load_clients(paths, revs, rev_path):
+    """(etiqueta, módulo) por cada --client y cada --rev"""
+    clients = []
+    for i, path in enumerate(paths):
+        module = sim.load(path, name=f"bench_client_{i}")
+        clients.append((os.path.basename(path), module))
+    for i, rev in enumerate(revs):
+        rel = os.path.relpath(rev_path, REPO_DIR)
+        source = subprocess.run(["git", "-C", REPO_DIR, "show", f"{rev}:{rel}"],
+                                check=True, capture_output=True).stdout
+        sha = subprocess.run(["git", "-C", REPO_DIR, "rev-parse", "--short", rev],
+                             check=True, capture_output=True, text=True).stdout.strip()
+        tmp = os.path.join(tempfile.mkdtemp(prefix="bench_ws_"), os.path.basename(rel))
+        with open(tmp, "wb") as f:
+            f.write(source)
+        module = sim.load(tmp, name=f"bench_rev_{i}")
+        clients.append((f"{os.path.basename(rel)}@{rev}({sha})", module))
+    return clients
+
+
+def connect(module, url):
+    ws = module.WebSocket()
+    with quiet():
+        ok = ws.connect(url)
+    return ws if ok else None
+
+
+def close(ws):
+    with quiet():
+        ws.close()
+
+
+def wait_recv(ws, timeout_s=2.0):
+    """Llama recv() como el loop del dispositivo hasta recibir un mensaje"""
+    deadline = time.monotonic() + timeout_s
+    while ws.connected:
+        msg = ws.recv()
+        if msg is not None:
+            return msg
+        if time.monotonic() > deadline:
+            return None
+        time.sleep(0)
+    return None
+
+
+def bench_handshake(module, url, server, iterations):
+    times = []
+    resumed = []
+    failures = 0
+    tls = getattr(module, "tls_sessions", None)
+    if tls is not None:
+        tls.sessions.clear()  # La primera conexión de cada corrida es completa
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        ws = connect(module, url)
+        elapsed = (time.perf_counter() - t0) * 1000
+        if ws is None:
+            failures += 1
+            continue
+        (resumed if getattr(ws, "resumed", False) else times).append(elapsed)
+        close(ws)
+    result = {"ms": summarize(times), "failures": failures}
+    if resumed:
+        # Clientes con reanudación de sesión TLS: "ms" son los handshakes completos
+        result["resumedMs"] = summarize(resumed)
+        result["resumedPct"] = round(100 * len(resumed) / (len(resumed) + len(times)), 1)
+    if tls is not None and url.startswith("wss"):
+        result["tls"] = tls.summary()["resume"]
+    return result
+
+
+def bench_send(module, url, server, sizes, count):
+    results = {}
+    for size in sizes:
+        ws = connect(module, url)
+        if ws is None:
+            results[str(size)] = {"error": "connect"}
+            continue
+        payload = b"__sink" + b"x" * max(0, size - 6)
+        server.reset()
+        t0 = time.perf_counter()
+        sent = 0
+        for _ in range(count):
+            if not ws.send(payload):
+                break
+            sent += 1
+        send_s = time.perf_counter() - t0
+        stats = server.wait_sink(sent)
+        elapsed = time.perf_counter() - t0
+        close(ws)
+        received = stats["sink_frames"]
+        results[str(size)] = {
+            "frames": sent,
+            "received": received,
+            # Lo que tarda send() en volver (el loop queda libre)...
+            "sendFramesPerS": round(sent / send_s, 1),
+            # ...y lo que tarda en llegar todo al servidor (incluye Nagle)
+            "framesPerS": round(received / elapsed, 1),
+            "bytesPerS": round(received * len(payload) / elapsed),
+        }
+    return results
+
+
+def bench_echo(module, url, server, sizes, count):
+    if not hasattr(module.WebSocket, "recv"):
+        return {"unsupported": "sin recv()"}
+    results = {}
+    for size in sizes:
+        ws = connect(module, url)
+        if ws is None:
+            results[str(size)] = {"error": "connect"}
+            continue
+        payload = "e" * size
+        rtts = []
+        mismatches = 0
+        lost = 0
+        t0 = time.perf_counter()
+        for _ in range(count):
+            t1 = time.perf_counter()
+            if not ws.send(payload):
+                lost += 1
+                break
+            with quiet():
+                msg = wait_recv(ws)
+            if msg is None:
+                lost += 1
+                if not ws.connected:
+                    break
+                continue
+            rtts.append((time.perf_counter() - t1) * 1000)
+            if msg != payload:
+                mismatches += 1
+        elapsed = time.perf_counter() - t0
+        results[str(size)] = {
+            "rttMs": summarize(rtts),
+            "framesPerS": round(len(rtts) / elapsed, 1),
+            "bytesPerS": round(2 * len(rtts) * size / elapsed),
+            "lost": lost,
+            "mismatches": mismatches,
+            "connected": ws.connected,
+        }
+        close(ws)
+    return results
+
+
+def bench_burst(module, url, server, count, size, poll_ms):
+    if not hasattr(module.WebSocket, "recv"):
+        return {"unsupported": "sin recv()"}
+    ws = connect(module, url)
+    if ws is None:
+        return {"error": "connect"}
+    latencies = []
+    seen = set()
+    garbage = 0
+    ws.send(f"__bench burst {count} {size}")
+    deadline = time.monotonic() + 10
+    idle_since = time.monotonic()
+    with quiet():
+        while ws.connected and len(seen) < count and time.monotonic() < deadline:
+            msg = ws.recv()
+            now_ns = time.monotonic_ns()
+            if msg is None:
+                if time.monotonic() - idle_since > 1.0:
+                    break  # El servidor ya terminó y no llega nada más
+                if poll_ms:
+                    time.sleep(poll_ms / 1000)
+                else:
+                    time.sleep(0)
+                continue
+            idle_since = time.monotonic()
+            try:
+                seq, sent_ns, _ = msg.split(":", 2)
+                seen.add(int(seq))
+                latencies.append((now_ns - int(sent_ns)) / 1e6)
+            except (ValueError, AttributeError):
+                garbage += 1
+    result = {
+        "frames": count,
+        "size": size,
+        "pollMs": poll_ms,
+        "received": len(seen),
+        "garbage": garbage,
+        "latencyMs": summarize(latencies),
+        "connected": ws.connected,
+    }
+    close(ws)
+    return result
+
+
+def bench_alloc(module, url, server, sizes, count):
+    has_recv = hasattr(module.WebSocket, "recv")
+    results = {}
+    for size in sizes:
+        ws = connect(module, url)
+        if ws is None:
+            results[str(size)] = {"error": "connect"}
+            continue
+        payload = ("__sink" if not has_recv else "a") + "a" * max(0, size - 6)
+        # Calentar (primer frame asigna cachés del intérprete)
+        ws.send(payload)
+        if has_recv:
+            wait_recv(ws)
+        peaks = []
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        with quiet():
+            for _ in range(count):
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                ws.send(payload)
+                if has_recv:
+                    wait_recv(ws)
+                peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        net = sum(s.size_diff for s in after.compare_to(before, "filename"))
+        results[str(size)] = {
+            "mode": "send+recv" if has_recv else "send",
+            "peakBytesPerFrame": round(sum(peaks) / len(peaks)),
+            "maxPeakBytes": max(peaks),
+            "netBytesPerFrame": round(net / count, 1),
+        }
+        close(ws)
+    return results
+
+
+def bench_replay(module, url, server, captures):
+    if not hasattr(module.WebSocket, "recv"):
+        return {"unsupported": "sin recv()"}
+    results = {}
+    for path in captures:
+        _, spec = capture_stream(path)
+        ws = connect(module, url)
+        if ws is None:
+            results[os.path.basename(path)] = {"error": "connect"}
+            continue
+        server.reset()
+        messages = []
+        out = io.StringIO()
+        t0 = last = time.perf_counter()
+        ws.send(f"__bench replay {os.path.abspath(path)}")
+        with contextlib.redirect_stdout(out):
+            while ws.connected and time.perf_counter() - last < 0.5:
+                msg = ws.recv()
+                if msg is None:
+                    time.sleep(0)
+                    continue
+                last = time.perf_counter()
+                messages.append(msg if isinstance(msg, str) else msg.hex())
+        elapsed = (last - t0) * 1000
+        stats = server.stats()
+        log = out.getvalue()
+        result = {
+            "ms": round(elapsed, 2),  # Hasta el último mensaje
+            "messages": len(messages),
+            "pongsSent": stats["pongs_in"],
+            "connected": ws.connected,
+            "clientErrors": log.count("Error"),
+            "unknownOpcodes": log.count("Opcode desconocido"),
+        }
+        if "expect" in spec:
+            result["expected"] = len(spec["expect"])
+            result["ok"] = messages == spec["expect"]
+        pings = sum(f.get("repeat", 1) for f in spec.get("frames", ()) if f["op"] == "ping")
+        if pings:
+            result["pings"] = pings
+        results[os.path.basename(path)] = result
+        close(ws)
+    return results
+
+
+def run_client(module, server, schemes, args):
+    result = {}
+    for scheme in schemes:
+        url = server.url(scheme)
+        r = {}
+        if "handshake" in args.only:
+            r["handshake"] = bench_handshake(module, url, server, args.handshakes)
+        if "send" in args.only:
+            r["send"] = bench_send(module, url, server, args.sizes, args.count)
+        if "echo" in args.only:
+            r["echo"] = bench_echo(module, url, server, args.sizes, args.count)
+        if "burst" in args.only:
+            r["burst"] = bench_burst(module, url, server, args.burst, args.burst_size, args.poll_ms)
+        if "alloc" in args.only:
+            r["alloc"] = bench_alloc(module, url, server, args.sizes, min(args.count, 200))
+        if "replay" in args.only:
+            r["replay"] = bench_replay(module, url, server, args.replay)
+        result[scheme] = r
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Comparación
+# ---------------------------------------------------------------------------
+
+# Métricas donde más es mejor; el resto (tiempos, bytes asignados) menos es mejor
+_HIGHER_BETTER = ("framesPerS", "sendFramesPerS", "bytesPerS", "received", "messages",
+                  "pongsSent")
+
+
+def flatten(data, prefix=""):
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(old, new, threshold_pct, section="clients"):
+    """Imprime las métricas que cambiaron más de `threshold_pct` %
+
+    También la usa bench_display.py (section="panels"). Retorna la cantidad
+    de regresiones."""
+    old_flat = flatten(old[section])
+    new_flat = flatten(new[section])
+    rows = []
+    for key in sorted(set(old_flat) & set(new_flat)):
+        if key.endswith(".n") or ".min" in key:
+            continue
+        a, b = old_flat[key], new_flat[key]
+        if a == b:
+            continue
+        change = (b - a) * 100 / a if a else 100.0
+        if abs(change) < threshold_pct:
+            continue
+        better = change > 0 if key.rsplit(".", 1)[-1] in _HIGHER_BETTER else change < 0
+        rows.append((key, a, b, change, better))
+    if not rows:
+        print(f"Sin cambios mayores a {threshold_pct}%")
+        return 0
+    regressions = 0
+    for key, a, b, change, better in rows:
+        mark = "✅" if better else "❌"
+        regressions += not better
+        print(f"{mark} {key}: {a} -> {b} ({change:+.1f}%)")
+    print(f"{len(rows)} cambios, {regressions} regresiones (umbral {threshold_pct}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de ws_client en la PC")
+    parser.add_argument("--client", action="append", default=[],
+                        help="archivo del cliente (por defecto ws_client_v2.py)")
+    parser.add_argument("--rev", action="append", default=[],
+                        help="revisión git del cliente a medir (ver --rev-path)")
+    parser.add_argument("--rev-path", default=DEFAULT_CLIENT,
+                        help="archivo que se toma de cada --rev")
+    parser.add_argument("--only", default=",".join(BENCHES),
+                        help=f"benchmarks separados por coma ({','.join(BENCHES)})")
+    parser.add_argument("--no-tls", action="store_true", help="solo ws://")
+    parser.add_argument("--sizes", default="16,125,1024,4096",
+                        help="tamaños de payload en bytes")
+    parser.add_argument("--count", type=int, default=500, help="frames por tamaño")
+    parser.add_argument("--handshakes", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=500, help="frames por ráfaga")
+    parser.add_argument("--burst-size", type=int, default=64)
+    parser.add_argument("--poll-ms", type=int, default=0,
+                        help="pausa entre recv() vacíos en la ráfaga (el loop del ESP32 usa 10)")
+    parser.add_argument("--replay", action="append", default=None,
+                        help="captura .json/.bin (por defecto todas las de tools/ws_captures)")
+    parser.add_argument("--out", help="guardar el JSON en este archivo")
+    parser.add_argument("--compare", help="JSON de una corrida anterior")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="%% de cambio a reportar con --compare")
+    args = parser.parse_args(argv)
+
+    args.only = [b.strip() for b in args.only.split(",") if b.strip()]
+    unknown = set(args.only) - set(BENCHES)
+    if unknown:
+        parser.error(f"benchmark desconocido: {', '.join(sorted(unknown))}")
+    args.sizes = [int(s) for s in args.sizes.split(",")]
+    if args.replay is None:
+        args.replay = sorted(os.path.join(CAPTURES_DIR, f) for f in os.listdir(CAPTURES_DIR)
+                             if f.endswith((".json", ".bin")))
+    if not args.client and not args.rev:
+        args.client = [DEFAULT_CLIENT]
+
+    sim.install(realtime=True)
+    clients = load_clients(args.client, args.rev, args.rev_path)
+
+    server = ServerProcess(tls=not args.no_tls)
+    schemes = ["ws"] + (["wss"] if "wss" in server.ports else [])
+    if server.tls_error and not args.no_tls:
+        print(f"⚠️ {server.tls_error}: solo ws://", file=sys.stderr)
+
+    result = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "count": args.count,
+            "sizes": args.sizes,
+            "schemes": schemes,
+        },
+        "clients": {},
+    }
+    try:
+        for label, module in clients:
+            print(f"⏱ {label}", file=sys.stderr)
+            result["clients"][label] = run_client(module, server, schemes, args)
+    finally:
+        server.close()
+
+    text = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        # Una sola etiqueta en cada lado: comparar aunque se llamen distinto
+        if len(old["clients"]) == 1 and len(result["clients"]) == 1:
+            old = {"clients": {"c": next(iter(old["clients"].values()))}}
+            new = {"clients": {"c": next(iter(result["clients"].values()))}}
+        else:
+            new = result
+        return 1 if compare(old, new, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+# build_mpy.py - Precompila los módulos del ESP32 a .mpy y arma el manifest para congelarlos
+#
+# MicroPython compila cada .py en el equipo al importarlo: en cada arranque
+# el ESP32 gasta tiempo y heap compilando ws_client, los drivers OLED y las
+# 1000 líneas de bootv3_2.py. Con mpy-cross se compila en la PC. Los
+# archivos salen de tools/deploy.json (nombre en el equipo -> archivo del repo):
+#   build/esp32/          lo que se copia al ESP32
+#     boot.py             dos líneas: import app / app.main()
+#     main.py             ota_main.py (red de seguridad del OTA)
+#     app.mpy             bootv4.py compilado
+#     monitor/*.mpy       el paquete de la app (módulos "monitor.x" en deploy.json)
+#     ws_client.mpy, ...  los módulos
+#   build/frozen/         los .py con el nombre del equipo y manifest.py para
+#                         congelarlos en un firmware propio: el código queda en
+#                         la flash y no ocupa heap (lo mejor para las fuentes)
+#
+# --emit native compila a código Xtensa los módulos "hot" de deploy.json
+# (drivers OLED, oledfont): más rápidos, .mpy más grandes. Probar en el equipo.
+# mpy-cross tiene que ser de la misma versión que el firmware
+# (pip install mpy-cross==1.22.2, por ejemplo): el ESP32 rechaza otro formato.
+# Si en el ESP32 quedan los .py viejos, el import los prefiere a los .mpy:
+# --upload los borra.
+#
+# Ejemplos:
+#   python tools/build_mpy.py                         # build/esp32 con .mpy
+#   python tools/build_mpy.py --emit native           # drivers nativos
+#   python tools/build_mpy.py -O 1                    # sin asserts ni los "if __debug__:" (log.py)
+#   python tools/build_mpy.py --source                # mismos archivos sin compilar (para comparar)
+#   python tools/build_mpy.py --upload /dev/ttyUSB0   # copiar con mpremote
+#   python tools/build_mpy.py --bench /dev/ttyUSB0 --out mpy.json   # import_bench.py en el equipo
+#   python tools/build_mpy.py --bench /dev/ttyUSB0 --compare py.json
+#   make -C micropython/ports/esp32 BOARD=ESP32_GENERIC FROZEN_MANIFEST=$PWD/build/frozen/manifest.py
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, TOOLS_DIR)
+
+from bench_ws import compare  # noqa: E402
+
+DEVICE_DIR = os.path.join(REPO_DIR, "esp32-websockets")
+DEPLOY = os.path.join(TOOLS_DIR, "deploy.json")
+IMPORT_BENCH = os.path.join(DEVICE_DIR, "import_bench.py")
+
+BOOT_STUB = """# boot.py generado por tools/build_mpy.py: la app es el módulo {module} (.mpy o congelado)
+import {module}
+{module}.main()
+"""
+
+MANIFEST_HEAD = """# manifest.py generado por tools/build_mpy.py: congela los módulos del
+# monitor en el firmware. boot.py y main.py siguen en la flash (los corre
+# el arranque de MicroPython)
+#   make -C ports/esp32 BOARD=ESP32_GENERIC FROZEN_MANIFEST={path}
+include("$(PORT_DIR)/boards/manifest.py")
+"""
+
+
+def mpy_cross_cmd():
+    """Comando de mpy-cross (binario o paquete de pip), o None"""
+    exe = shutil.which("mpy-cross")
+    if exe:
+        return [exe]
+    try:
+        import mpy_cross  # noqa: F401
+        return [sys.executable, "-m", "mpy_cross"]
+    except ImportError:
+        return None
+
+
+def device_path(name):
+    """"monitor.net" -> "monitor/net" (sin extensión)"""
+    return name.replace(".", "/")
+
+
+def load_deploy(path=DEPLOY):
+    with open(path) as f:
+        return json.load(f)
+
+
+def build(deploy, out, source=False, emit=None, arch="xtensawin", opt=None):
+    """Arma out/esp32 y out/frozen. Retorna las filas de la tabla"""
+    device_out = os.path.join(out, "esp32")
+    frozen_out = os.path.join(out, "frozen")
+    for folder in (device_out, frozen_out):
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+
+    cross = None
+    if not source:
+        cross = mpy_cross_cmd()
+        if cross is None:
+            raise SystemExit("❌ No se encontró mpy-cross: pip install mpy-cross==<versión del "
+                             "firmware> (o --source para copiar los .py)")
+        version = subprocess.run(cross + ["--version"], capture_output=True, text=True)
+        print(f"🔧 {version.stdout.strip() or version.stderr.strip()}")
+
+    app = deploy["app"]
+    modules = dict(deploy["modules"])
+    modules[app["module"]] = {"source": app["source"]}
+
+    rows = []
+    for name, spec in modules.items():
+        src = os.path.join(DEVICE_DIR, spec["source"])
+        path = device_path(name)
+        for folder in (device_out, frozen_out):
+            os.makedirs(os.path.dirname(os.path.join(folder, path)), exist_ok=True)
+        shutil.copyfile(src, os.path.join(frozen_out, path + ".py"))
+        size = os.path.getsize(src)
+        if source:
+            shutil.copyfile(src, os.path.join(device_out, path + ".py"))
+            rows.append((name, spec["source"], size, size, "py"))
+            continue
+        target = os.path.join(device_out, path + ".mpy")
+        cmd = cross + ["-o", target, "-s", path + ".py"]
+        if arch:
+            cmd.append(f"-march={arch}")
+        if opt is not None:
+            cmd.append(f"-O{opt}")
+        kind = "bytecode"
+        if emit and spec.get("hot"):
+            cmd += ["-X", f"emit={emit}"]
+            kind = emit
+        cmd.append(src)
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode:
+            raise SystemExit(f"❌ mpy-cross {spec['source']}:\n{result.stderr}")
+        rows.append((name, spec["source"], size, os.path.getsize(target), kind))
+
+    with open(os.path.join(device_out, "boot.py"), "w") as f:
+        f.write(BOOT_STUB.format(module=app["module"]))
+    shutil.copyfile(os.path.join(DEVICE_DIR, deploy["main"]), os.path.join(device_out, "main.py"))
+
+    manifest = os.path.join(frozen_out, "manifest.py")
+    packages = []
+    with open(manifest, "w") as f:
+        f.write(MANIFEST_HEAD.format(path=os.path.abspath(manifest)))
+        for name in modules:
+            if "." not in name:
+                f.write(f'module("{name}.py")\n')
+            elif name.split(".")[0] not in packages:
+                packages.append(name.split(".")[0])
+                f.write(f'package("{packages[-1]}")\n')
+    return rows
+
+
+# Corre en el ESP32 antes de copiar: crea las carpetas y borra los .py viejos
+_PREPARE = """import os
+for d in %r:
+    try:
+        os.mkdir(d)
+    except OSError:
+        pass
+for f in %r:
+    try:
+        os.remove(f)
+    except OSError:
+        pass"""
+
+
+def upload(port, out, deploy):
+    """Copia out/esp32 al equipo con mpremote y borra los .py que taparían a los .mpy"""
+    device_out = os.path.join(out, "esp32")
+    files = []
+    for root, _, names in os.walk(device_out):
+        rel = os.path.relpath(root, device_out)
+        files += sorted(name if rel == "." else rel + "/" + name for name in names)
+    folders = sorted({name.rsplit("/", 1)[0] for name in files if "/" in name})
+    stale = [name[:-4] + ".py" for name in files if name.endswith(".mpy")]
+    cmd = ["mpremote", "connect", port,
+           "exec", _PREPARE % (folders, stale), "+"]
+    for name in files:
+        cmd += ["fs", "cp", os.path.join(device_out, name), ":" + name, "+"]
+    cmd[-1:] = []
+    print(f"⬆️ {len(files)} archivos a {port} (borrando {len(stale)} .py viejos)")
+    subprocess.run(cmd, check=True)
+
+
+def bench(port):
+    """Corre import_bench.py en el equipo y retorna su JSON"""
+    cmd = ["mpremote", "connect", port, "fs", "cp", IMPORT_BENCH, ":import_bench.py", "+",
+           "exec", "import import_bench; import_bench.run(as_json=True)"]
+    output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    for line in output.splitlines():
+        if line.startswith("{"):
+            data = json.loads(line)
+            return {
+                "modules": {r.pop("module"): r for r in data["modules"]},
+                "totalMs": data["totalMs"],
+                "heapFree": data["heapFree"],
+                "heapFreeBefore": data["heapFreeBefore"],
+            }
+    raise SystemExit(f"❌ import_bench no devolvió JSON:\n{output}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompila los módulos del ESP32 (.mpy)")
+    parser.add_argument("--deploy", default=DEPLOY, help="lista de archivos (tools/deploy.json)")
+    parser.add_argument("--build-dir", default=os.path.join(REPO_DIR, "build"))
+    parser.add_argument("--source", action="store_true", help="copiar los .py sin compilar")
+    parser.add_argument("--emit", choices=("native", "viper"),
+                        help="emisor para los módulos hot (viper solo con código preparado)")
+    parser.add_argument("--arch", default="xtensawin",
+                        help="-march de mpy-cross (xtensawin: ESP32/S2/S3, rv32imc: C3)")
+    parser.add_argument("-O", dest="opt", type=int, help="nivel de optimización de mpy-cross (1: __debug__ = False, "
+                        "borra los log.debug() del camino caliente)")
+    parser.add_argument("--upload", metavar="PUERTO", help="copiar al ESP32 con mpremote")
+    parser.add_argument("--bench", metavar="PUERTO", help="medir los imports en el ESP32")
+    parser.add_argument("--out", help="guardar el resultado de --bench (JSON)")
+    parser.add_argument("--compare", help="JSON de un --bench anterior")
+    parser.add_argument("--threshold", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    deploy = load_deploy(args.deploy)
+    if not args.bench or args.upload:
+        rows = build(deploy, args.build_dir, args.source, args.emit, args.arch, args.opt)
+        print(f"{'módulo':<18} {'fuente':<20} {'.py':>7} {'salida':>7}  tipo")
+        for name, src, size, out_size, kind in rows:
+            print(f"{name:<18} {src:<20} {size:>7} {out_size:>7}  {kind}")
+        total_in = sum(r[2] for r in rows)
+        total_out = sum(r[3] for r in rows)
+        print(f"Total {total_in} -> {total_out} bytes en {os.path.join(args.build_dir, 'esp32')}")
+        print(f"Firmware con los módulos congelados: {os.path.join(args.build_dir, 'frozen', 'manifest.py')}")
+    if args.upload:
+        upload(args.upload, args.build_dir, deploy)
+
+    if args.bench:
+        result = bench(args.bench)
+        print(f"{'módulo':<18} {'tipo':<6} {'ms':>7} {'pico':>8} {'queda':>7}")
+        for name, r in result["modules"].items():
+            if "error" in r:
+                print(f"{name:<18} {r['kind']:<6} error: {r['error']}")
+                continue
+            peak = r["peak"] if r["peak"] is not None else "-"
+            print(f"{name:<18} {r['kind']:<6} {r['ms']:>7} {peak:>8} {r['kept']:>7}")
+        print(f"Total {result['totalMs']:.1f}ms, heap libre {result['heapFreeBefore']} -> "
+              f"{result['heapFree']} bytes")
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(result, f, indent=2)
+        if args.compare:
+            with open(args.compare) as f:
+                old = json.load(f)
+            if compare(old, result, args.threshold, section="modules"):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,607 @@
+# sim - Arnés para correr los scripts del ESP32 en la PC (CPython)
+#
+# Provee módulos falsos (machine, network, framebuf, dht, onewire, ds18x20,
+# ntptime, micropython...) en tools/sim/upy/, un reloj virtual compartido por
+# todos los hilos y un "mundo" con sensores y WiFi que se puede programar.
+#
+# Uso típico:
+#   import sim
+#   world, clock = sim.install(limit_ms=60000)
+#   world.at(10000, lambda w: w.set_door(False))   # abrir la puerta a los 10s
+#   boot = sim.load("esp32-websockets/bootv3_2.py")
+#   boot.main()                                    # termina con Ctrl+C virtual
+#
+# O directamente: python tools/sim/run.py esp32-websockets/bootv3_2.py --seconds 60
+
+import _thread as _real_thread
+import calendar
+import errno
+import heapq
+import importlib.machinery
+import importlib.util
+import os
+import select
+import ssl
+import sys
+import threading
+import time as _real_time
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+UPY_DIR = os.path.join(HERE, "upy")
+REPO_DIR = os.path.dirname(os.path.dirname(HERE))
+DEVICE_DIR = os.path.join(REPO_DIR, "esp32-websockets")
+
+# ticks_* de MicroPython dan la vuelta en 2**30 (puertos ESP32)
+TICKS_PERIOD = 1 << 30
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALFPERIOD = TICKS_PERIOD >> 1
+
+world = None
+clock = None
+host_epoch = None  # Hora de la PC al instalar: la que "responde" el NTP falso
+
+
+class VirtualClock:
+    """Reloj virtual compartido por todos los hilos del dispositivo
+
+    El tiempo solo avanza cuando TODOS los hilos registrados están dormidos
+    (sleep/sleep_ms/lightsleep): entonces salta al despertar más cercano. Así
+    un minuto de loop se simula en milisegundos reales y de forma repetible.
+    Una operación bloqueante real (socket) congela el tiempo virtual mientras
+    dura, como si fuera instantánea.
+
+    Al llegar a `limit_ms` cada hilo recibe una sola vez KeyboardInterrupt (el
+    hilo principal) o SystemExit (los demás) en su siguiente sleep.
+    """
+
+    def __init__(self, epoch=None, limit_ms=None):
+        self.us = 0
+        # Como el ESP32 recién encendido: RTC en 2000-01-01 hasta que haya NTP
+        self.epoch = 946684800 if epoch is None else epoch
+        self.rtc_offset = 0  # Lo ajusta ntptime.settime()/RTC.datetime()
+        self.limit_us = None if limit_ms is None else limit_ms * 1000
+        self.slept_us = {}   # Tiempo dormido por hilo (para duty cycle)
+        self._cv = threading.Condition()
+        self._active = {threading.get_ident()}
+        self._sleepers = {}
+        self._stopped = set()
+        self._events = []
+        self._seq = 0
+
+    # ----- hilos -----
+    def register_thread(self):
+        with self._cv:
+            self._active.add(threading.get_ident())
+
+    def unregister_thread(self):
+        with self._cv:
+            tid = threading.get_ident()
+            self._active.discard(tid)
+            self._sleepers.pop(tid, None)
+            self._advance()
+
+    def start_thread(self, fn, args=(), kwargs=None):
+        """_thread.start_new_thread() con el hilo registrado en el reloj"""
+        started = threading.Event()
+
+        def runner():
+            self.register_thread()
+            started.set()
+            try:
+                fn(*args, **(kwargs or {}))
+            except SystemExit:
+                pass
+            finally:
+                self.unregister_thread()
+
+        ident = _real_thread.start_new_thread(runner, ())
+        started.wait()
+        return ident
+
+    # ----- eventos programados -----
+    def at(self, ms, fn):
+        """Ejecuta fn() cuando el reloj virtual llegue a `ms`"""
+        with self._cv:
+            self._seq += 1
+            heapq.heappush(self._events, (int(ms * 1000), self._seq, fn))
+
+    def _run_events(self):
+        while self._events and self._events[0][0] <= self.us:
+            _, _, fn = heapq.heappop(self._events)
+            fn()
+
+    # ----- tiempo -----
+    def _advance(self):
+        """Avanza al próximo despertar si todos los hilos duermen (con lock)"""
+        if self._sleepers and len(self._sleepers) >= len(self._active):
+            target = min(self._sleepers.values())
+            if self._events and self._events[0][0] < target:
+                target = max(self.us, self._events[0][0])
+            if target > self.us:
+                self.us = target
+            self._run_events()
+            self._cv.notify_all()
+
+    def sleep_us(self, us):
+        tid = threading.get_ident()
+        with self._cv:
+            if tid not in self._active:
+                # Hilo no registrado (p. ej. un servidor de pruebas): no coordina
+                self.us += max(0, int(us))
+                self._run_events()
+                return
+            wake = self.us + max(0, int(us))
+            self._sleepers[tid] = wake
+            self.slept_us[tid] = self.slept_us.get(tid, 0) + (wake - self.us)
+            self._advance()
+            while self.us < wake:
+                self._cv.wait(1.0)
+                self._advance()
+            del self._sleepers[tid]
+            stop = (self.limit_us is not None and self.us >= self.limit_us
+                    and tid not in self._stopped)
+            if stop:
+                self._stopped.add(tid)
+        if stop:
+            if tid == threading.main_thread().ident:
+                raise KeyboardInterrupt("fin de la simulación")
+            raise SystemExit
+
+    def now_ms(self):
+        return self.us // 1000
+
+    def unix_time(self):
+        return self.epoch + self.rtc_offset + self.us / 1000000
+
+
+class RealClock:
+    """Reloj real con la misma interfaz que VirtualClock
+
+    Para benchmarks (tools/bench_ws.py): sleep_ms() duerme de verdad y los
+    ticks_* salen del reloj monotónico de la PC.
+    """
+
+    def __init__(self, epoch=None, limit_ms=None):
+        self.epoch = _real_time.time() if epoch is None else epoch
+        self.rtc_offset = 0
+        self.slept_us = {}
+        self._start_ns = _real_time.monotonic_ns()
+
+    @property
+    def us(self):
+        return (_real_time.monotonic_ns() - self._start_ns) // 1000
+
+    def register_thread(self):
+        pass
+
+    def unregister_thread(self):
+        pass
+
+    def start_thread(self, fn, args=(), kwargs=None):
+        return _real_thread.start_new_thread(fn, args, kwargs or {})
+
+    def at(self, ms, fn):
+        timer = threading.Timer(max(0, ms / 1000 - self.us / 1000000), fn)
+        timer.daemon = True
+        timer.start()
+
+    def sleep_us(self, us):
+        _real_time.sleep(max(0, us) / 1000000)
+
+    def now_ms(self):
+        return self.us // 1000
+
+    def unix_time(self):
+        return self.epoch + self.rtc_offset + self.us / 1000000
+
+
+class World:
+    """Estado físico simulado: sensores, puerta, APs WiFi, NTP
+
+    Todo se puede cambiar en cualquier momento o programar con at().
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        # DHT22
+        self.dht_temp = 22.5
+        self.dht_humidity = 55.0
+        self.dht_ok = True
+        # DS18B20: una entrada por sensor en el bus (ROM -> temperatura)
+        self.ds_sensors = {bytes.fromhex("28ff641e0f16035c"): 4.5}
+        # Pines de entrada (número -> valor). 15 = MC-38, 1 = puerta cerrada
+        self.pins = {15: 1}
+        self.pin_irqs = {}
+        # WiFi: ssid -> dict(password, rssi, bssid, channel)
+        self.aps = {
+            "motog35": {"password": "12345678", "rssi": -58,
+                        "bssid": bytes.fromhex("aabbccddee01"), "channel": 6},
+        }
+        # Tiempos de conexión: escaneo de canales (si no se da bssid),
+        # asociación y DHCP (si no hay IP estática)
+        self.wifi_connect_scan_ms = 1200
+        self.wifi_assoc_ms = 300
+        self.wifi_dhcp_ms = 800
+        self.wifi_scan_ms = 2000      # wlan.scan() explícito
+        self.ntp_ok = True
+        self.i2c_devices = {0x3C}
+        self.log = []
+
+    def at(self, ms, fn):
+        """Programa fn(world) en el instante virtual `ms`"""
+        self.clock.at(ms, lambda: fn(self))
+
+    def set_pin(self, pin, value):
+        old = self.pins.get(pin, 0)
+        self.pins[pin] = value
+        irq = self.pin_irqs.get(pin)
+        if irq is not None and old != value:
+            handler, trigger, pin_obj = irq
+            rising = value and not old
+            if (rising and trigger & 1) or (not rising and trigger & 2):
+                handler(pin_obj)
+
+    def set_door(self, closed, pin=15):
+        self.set_pin(pin, 1 if closed else 0)
+
+    def set_ap(self, ssid, **kwargs):
+        self.aps.setdefault(ssid, {"password": "", "rssi": -70,
+                                   "bssid": os.urandom(6), "channel": 1}).update(kwargs)
+
+    def drop_ap(self, ssid):
+        self.aps.pop(ssid, None)
+
+
+def _make_time_module(clock):
+    """Módulo `time` estilo MicroPython sobre el reloj virtual"""
+    t = types.ModuleType("time")
+
+    def ticks_ms():
+        return (clock.us // 1000) & TICKS_MAX
+
+    def ticks_us():
+        return clock.us & TICKS_MAX
+
+    def ticks_diff(a, b):
+        return ((a - b + TICKS_HALFPERIOD) & TICKS_MAX) - TICKS_HALFPERIOD
+
+    def ticks_add(a, delta):
+        return (a + delta) & TICKS_MAX
+
+    def sleep(s):
+        clock.sleep_us(s * 1000000)
+
+    def sleep_ms(ms):
+        clock.sleep_us(ms * 1000)
+
+    def sleep_us(us):
+        clock.sleep_us(us)
+
+    def time_():
+        return int(clock.unix_time())
+
+    def time_ns():
+        return int(clock.unix_time() * 1000000000)
+
+    def _tuple(st):
+        return (st.tm_year, st.tm_mon, st.tm_mday, st.tm_hour, st.tm_min,
+                st.tm_sec, st.tm_wday, st.tm_yday)
+
+    def gmtime(secs=None):
+        return _tuple(_real_time.gmtime(time_() if secs is None else secs))
+
+    localtime = gmtime  # El ESP32 no tiene zona horaria: localtime == gmtime
+
+    def mktime(tup):
+        return calendar.timegm(tuple(tup[:6]) + (0, 0, 0))
+
+    for name, fn in (("ticks_ms", ticks_ms), ("ticks_us", ticks_us),
+                     ("ticks_cpu", ticks_us), ("ticks_diff", ticks_diff),
+                     ("ticks_add", ticks_add), ("sleep", sleep),
+                     ("sleep_ms", sleep_ms), ("sleep_us", sleep_us),
+                     ("time", time_), ("time_ns", time_ns), ("gmtime", gmtime),
+                     ("localtime", localtime), ("mktime", mktime)):
+        setattr(t, name, fn)
+    return t
+
+
+def _make_thread_module(clock):
+    """Módulo `_thread` cuyos hilos se registran en el reloj virtual"""
+    th = types.ModuleType("_thread")
+    th.allocate_lock = _real_thread.allocate_lock
+    th.get_ident = _real_thread.get_ident
+    th.stack_size = lambda size=0: 0
+    th.start_new_thread = clock.start_thread
+    return th
+
+
+_swap = {}
+
+
+def install(limit_ms=None, epoch=None, realtime=False):
+    """Instala los módulos falsos y crea mundo + reloj. Retorna (world, clock)
+
+    Con realtime=True el reloj es el de la PC (RealClock), para medir tiempos.
+    """
+    global world, clock, host_epoch
+    # Importar ya los módulos de CPython que usan los scripts, para que no
+    # queden ligados al `time` simulado durante device_import()/load()
+    import array, binascii, errno, gc, hashlib, json, os as _os, random  # noqa
+    import select, socket, struct  # noqa
+    clock = (RealClock if realtime else VirtualClock)(epoch=epoch, limit_ms=limit_ms)
+    world = World(clock)
+    host_epoch = int(_real_time.time())
+
+    for path in (UPY_DIR, DEVICE_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    # `time`, `_thread`, `ssl` y `select` ya están importados en CPython: se reemplazan solo
+    # mientras se importan módulos del dispositivo (ver load()).
+    _swap["time"] = _make_time_module(clock)
+    _swap["_thread"] = _make_thread_module(clock)
+    _swap["utime"] = _swap["time"]
+
+    # ssl.wrap_socket() con la semántica de MicroPython (Python 3.12 la quitó)
+    _swap["ssl"] = _make_ssl_module()
+    # select.poll() cuyo timeout corre en el reloj virtual
+    _swap["select"] = _make_select_module(clock)
+
+    # Módulos del dispositivo ya importados (de otra simulación) se descartan
+    for name in list(sys.modules):
+        mod = sys.modules[name]
+        path = getattr(mod, "__file__", None) or ""
+        if path.startswith(DEVICE_DIR) or path.startswith(UPY_DIR):
+            del sys.modules[name]
+    sys.modules["utime"] = _swap["time"]
+    if _DeviceFinder not in sys.meta_path:
+        sys.meta_path.insert(0, _DeviceFinder)
+    return world, clock
+
+
+def _make_ssl_module():
+    """Módulo `ssl` del dispositivo: el de CPython con wrap_socket() propio"""
+    m = types.ModuleType("ssl")
+    m.__dict__.update({k: v for k, v in vars(ssl).items() if not k.startswith("__")})
+    m.wrap_socket = _wrap_socket
+    m.SSLContext = UpySSLContext
+    return m
+
+
+def _wrap_socket(sock, server_hostname=None, **kwargs):
+    return UpySSLContext().wrap_socket(sock, server_hostname=server_hostname)
+
+
+class UpySSLContext:
+    """ssl.SSLContext de MicroPython: sin check_hostname y con sockets
+    UpySSLSocket. Como en el ESP32, wrap_socket() no acepta session= y el
+    socket no expone .session: no hay reanudación de sesiones TLS"""
+
+    def __init__(self, protocol=ssl.PROTOCOL_TLS_CLIENT):
+        self._ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        self._ctx.check_hostname = False
+        self._ctx.verify_mode = ssl.CERT_NONE
+
+    @property
+    def verify_mode(self):
+        return self._ctx.verify_mode
+
+    @verify_mode.setter
+    def verify_mode(self, mode):
+        self._ctx.verify_mode = mode
+
+    def load_verify_locations(self, cadata=None, cafile=None):
+        self._ctx.load_verify_locations(cafile=cafile, cadata=cadata)
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True,
+                    server_hostname=None):
+        return UpySSLSocket(self._ctx.wrap_socket(
+            sock, server_side=server_side, do_handshake_on_connect=do_handshake_on_connect,
+            server_hostname=server_hostname))
+
+
+def _make_select_module(clock):
+    """Módulo `select` del dispositivo: poll(timeout) espera en el reloj del sim"""
+    m = types.ModuleType("select")
+    m.__dict__.update({k: v for k, v in vars(select).items() if not k.startswith("__")})
+    m.poll = lambda: _Poll(clock)
+    return m
+
+
+class _Poll:
+    """select.poll() que mira los sockets reales sin bloquear y duerme en
+    pasos de 10ms virtuales, así el hilo no congela el reloj"""
+
+    def __init__(self, clock):
+        self._clock = clock
+        self._poll = select.poll()
+        self._objs = {}
+
+    def register(self, obj, mask=select.POLLIN | select.POLLOUT):
+        self._objs[obj.fileno()] = obj
+        self._poll.register(obj, mask)
+
+    def unregister(self, obj):
+        self._objs.pop(obj.fileno(), None)
+        self._poll.unregister(obj)
+
+    def modify(self, obj, mask):
+        self._poll.modify(obj, mask)
+
+    def poll(self, timeout=-1):
+        left = None if timeout is None or timeout < 0 else timeout
+        while True:
+            # Datos ya descifrados en el SSL no se ven en el descriptor
+            ready = [(obj, select.POLLIN) for obj in self._objs.values()
+                     if getattr(obj, "pending", lambda: 0)()]
+            ready = ready or [(self._objs.get(fd, fd), ev) for fd, ev in self._poll.poll(0)]
+            if ready or left == 0:
+                return ready
+            step = 10 if left is None else min(10, left)
+            if isinstance(self._clock, RealClock):
+                self._poll.poll(step)  # Reloj real: esperar en el socket (vuelve con datos)
+            else:
+                self._clock.sleep_us(step * 1000)
+            if left is not None:
+                left -= step
+
+    def ipoll(self, timeout=-1, flags=0):
+        return iter(self.poll(timeout))
+
+
+class UpySSLSocket:
+    """Socket SSL con la semántica de MicroPython
+
+    Sin datos en modo no bloqueante CPython lanza SSLWantReadError; en el
+    ESP32 es OSError(EAGAIN), que es lo que esperan los scripts.
+    """
+
+    def __init__(self, sock):
+        self._sock = sock
+
+    def recv(self, n):
+        try:
+            return self._sock.recv(n)
+        except (ssl.SSLWantReadError, ssl.SSLWantWriteError):
+            raise OSError(errno.EAGAIN, "EAGAIN")
+
+    def send(self, data):
+        try:
+            return self._sock.send(data)
+        except (ssl.SSLWantReadError, ssl.SSLWantWriteError):
+            raise OSError(errno.EAGAIN, "EAGAIN")
+
+    def write(self, data):
+        return self.send(data)
+
+    def read(self, n=-1):
+        return self.recv(n if n > 0 else 4096)
+
+    def __getattr__(self, name):
+        if name in _NOT_IN_MICROPYTHON:
+            raise AttributeError(name)
+        return getattr(self._sock, name)
+
+
+# Atributos del SSLSocket de CPython que el de MicroPython no tiene
+_NOT_IN_MICROPYTHON = ("session", "session_reused")
+
+
+class _DeviceImport:
+    """Contexto: `time`, `_thread`, `ssl` y `select` apuntan a las versiones simuladas"""
+
+    def __enter__(self):
+        self.saved = {name: sys.modules.get(name) for name in ("time", "_thread", "ssl", "select")}
+        for name in self.saved:
+            sys.modules[name] = _swap[name]
+        return self
+
+    def __exit__(self, *exc):
+        for name, mod in self.saved.items():
+            sys.modules[name] = mod
+
+
+class _DeviceLoader:
+    """Loader que ejecuta el módulo con los fakes (ver _DeviceFinder)"""
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        with _DeviceImport():
+            self.loader.exec_module(module)
+
+
+class _DeviceFinder:
+    """Los imports de módulos del dispositivo que se hacen ya corriendo
+    (`import ota` o `from monitor import diag` dentro de una función) también
+    ven el `time`, `_thread`, `ssl` y `select` simulados"""
+
+    @staticmethod
+    def find_spec(fullname, path=None, target=None):
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or not spec.origin or not spec.origin.startswith(_device_dirs()):
+            return None
+        spec.loader = _DeviceLoader(spec.loader)
+        return spec
+
+
+def _device_dirs():
+    return (DEVICE_DIR, UPY_DIR) + tuple(_script_dirs)
+
+
+_script_dirs = set()
+
+
+def device_import(name):
+    """Importa un módulo del dispositivo (p. ej. 'ws_client') con los fakes"""
+    with _DeviceImport():
+        return importlib.import_module(name)
+
+
+def load(path, name=None, overrides=None):
+    """Carga un script del dispositivo sin ejecutar su main()
+
+    `overrides` reemplaza constantes de configuración DESPUÉS de cargar, p. ej.
+    {"WEBSOCKET_URL": "ws://127.0.0.1:8765/"}. Las que se usan al importar
+    (pines, DISPLAY_TYPE) ya quedaron aplicadas: para esas, editar el script.
+    Si el script tiene la configuración en un módulo `config` (bootv4.py ->
+    monitor/config.py) se reemplazan ahí, y como nada se inicializa al
+    importar, valen también las de pines y pantalla.
+    """
+    if clock is None:
+        raise RuntimeError("Llamar sim.install() primero")
+    path = os.path.abspath(path)
+    folder = os.path.dirname(path)
+    if folder not in sys.path:
+        sys.path.insert(1, folder)
+    _script_dirs.add(folder)
+    name = name or "device_" + os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    with _DeviceImport():
+        spec.loader.exec_module(module)
+    target = getattr(module, "config", None)
+    if not isinstance(target, types.ModuleType):
+        target = module
+    for key, value in (overrides or {}).items():
+        setattr(target, key, value)
+    return module
+
+
+def deep_sleep():
+    """Simula el deep sleep pedido por machine.deepsleep(): avanza el reloj
+    hasta el timer o hasta que cambie el pin de esp32.wake_on_ext0(). Luego
+    el script se vuelve a cargar como tras un reset. Retorna machine.*_WAKE"""
+    import esp32
+    import machine
+    machine.lightsleep(machine.deepsleep_ms)
+    reason = machine.TIMER_WAKE
+    if esp32.ext0 is not None:
+        pin, level = esp32.ext0
+        if bool(pin.value()) == bool(level):
+            reason = machine.PIN_WAKE
+    machine._reset_cause = machine.DEEPSLEEP_RESET
+    machine._wake_reason = reason
+    return reason
+
+
+def i2c_buses():
+    """Buses I2C creados por el dispositivo (para estadísticas)"""
+    import machine
+    return list(machine.I2C_BUSES)
+
+
+def framebuffer_ascii(fb, width=None, height=None):
+    """Dibuja un framebuffer como texto (# = píxel encendido)"""
+    width = width or fb.width
+    height = height or fb.height
+    rows = []
+    for y in range(height):
+        rows.append("".join("#" if fb.pixel(x, y) else "." for x in range(width)))
+    return "\n".join(rows)
@@ -0,0 +1,200 @@
+# panel.py - Modelo del controlador OLED reconstruido desde el tráfico I2C
+#
+# Interpreta los bytes que el driver (ssd1306.py / sh1106.py) manda por I2C
+# y mantiene la GDDRAM y la orientación como lo haría el controlador. image()
+# devuelve lo que se ve en el vidrio, sin importar cómo lo envió el driver
+# (todas las páginas, solo las modificadas, en uno o varios bloques...).
+#
+# Uso:
+#   panel = PanelModel("SH1106")
+#   for addr, data in i2c.record:
+#       panel.feed(data)
+#   panel.image()   # bytearray VLSB de width * height // 8, como el framebuffer
+#   panel.image(180)  # lo mismo con el panel montado al revés
+
+# Comandos con argumentos -> cantidad de bytes extra
+_ARGS_SSD1306 = {0x20: 1, 0x21: 2, 0x22: 2, 0x81: 1, 0xA8: 1, 0xD3: 1, 0xDA: 1,
+                 0xD5: 1, 0xD9: 1, 0xDB: 1, 0x8D: 1, 0x26: 6, 0x27: 6, 0x29: 5,
+                 0x2A: 5, 0xA3: 2}
+_ARGS_SH1106 = {0x81: 1, 0xA8: 1, 0xD3: 1, 0xD5: 1, 0xD9: 1, 0xDA: 1, 0xDB: 1,
+                0xAD: 1}
+
+# Panel -> (controlador, ancho de la GDDRAM, columna visible 0)
+_CONTROLLERS = {
+    "SSD1306": ("ssd1306", 128, 0),
+    "SSD1309": ("ssd1306", 128, 0),
+    "SH1106": ("sh1106", 132, 2),
+}
+
+
+class PanelModel:
+    def __init__(self, kind, width=128, height=64):
+        self.controller, self.ram_width, self.col_offset = _CONTROLLERS[kind]
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.ram = bytearray(self.ram_width * 8)
+        self.on = False
+        self.contrast = 0x7F
+        self.inverted = False
+        self.seg_remap = False
+        self.com_reverse = False
+        self.commands = 0
+        self.data_bytes = 0
+        # Direccionamiento: SSD1306 horizontal (ventana) / SH1106 por página
+        self.mem_mode = 2
+        self.col_start, self.col_end = 0, self.ram_width - 1
+        self.page_start, self.page_end = 0, 7
+        self.col = 0
+        self.page = 0
+        self._pending = None
+        self._args = []
+        self._arg_table = _ARGS_SSD1306 if self.controller == "ssd1306" else _ARGS_SH1106
+
+    # ----- bus -----
+    def feed(self, data):
+        """Una transacción I2C (sin el byte de dirección)"""
+        i = 0
+        n = len(data)
+        while i < n:
+            control = data[i]
+            i += 1
+            is_data = control & 0x40
+            if control & 0x80:  # Co=1: un solo byte y luego otro byte de control
+                if i < n:
+                    self._data(data[i]) if is_data else self._command(data[i])
+                    i += 1
+            else:  # Co=0: el resto de la transacción es del mismo tipo
+                for b in data[i:]:
+                    self._data(b) if is_data else self._command(b)
+                return
+
+    def _command(self, b):
+        self.commands += 1
+        if self._pending is not None:
+            self._args.append(b)
+            if len(self._args) == self._arg_table[self._pending]:
+                self._apply(self._pending, self._args)
+                self._pending = None
+            return
+        if b in self._arg_table:
+            self._pending = b
+            self._args = []
+            return
+        self._apply(b, ())
+
+    def _apply(self, cmd, args):
+        if cmd in (0xAE, 0xAF):
+            self.on = cmd == 0xAF
+        elif cmd == 0x81:
+            self.contrast = args[0]
+        elif cmd in (0xA6, 0xA7):
+            self.inverted = cmd == 0xA7
+        elif cmd in (0xA0, 0xA1):
+            self.seg_remap = cmd == 0xA1
+        elif 0xC0 <= cmd <= 0xCF:
+            self.com_reverse = bool(cmd & 0x08)
+        elif self.controller == "ssd1306":
+            if cmd == 0x20:
+                self.mem_mode = args[0] & 3
+            elif cmd == 0x21:
+                self.col_start, self.col_end = args
+                self.col = self.col_start
+            elif cmd == 0x22:
+                self.page_start, self.page_end = args[0] & 7, args[1] & 7
+                self.page = self.page_start
+            elif 0xB0 <= cmd <= 0xB7:
+                self.page = cmd & 7
+            elif cmd <= 0x0F:
+                self.col = (self.col & 0xF0) | cmd
+            elif cmd <= 0x1F:
+                self.col = (self.col & 0x0F) | ((cmd & 0x0F) << 4)
+        else:
+            if 0xB0 <= cmd <= 0xB7:
+                self.page = cmd & 7
+            elif cmd <= 0x0F:
+                self.col = (self.col & 0xF0) | cmd
+            elif cmd <= 0x1F:
+                self.col = (self.col & 0x0F) | ((cmd & 0x0F) << 4)
+
+    def _data(self, b):
+        self.data_bytes += 1
+        if self.col < self.ram_width and self.page < 8:
+            self.ram[self.page * self.ram_width + self.col] = b
+        if self.controller == "sh1106" or self.mem_mode == 2:
+            # Direccionamiento por página: la columna avanza y se queda al final
+            if self.col < self.ram_width - 1:
+                self.col += 1
+            return
+        # Horizontal (SSD1306): recorre la ventana columna por columna y
+        # pasa a la página siguiente al llegar a col_end
+        if self.col >= self.col_end:
+            self.col = self.col_start
+            self.page = self.page_start if self.page >= self.page_end else self.page + 1
+        else:
+            self.col += 1
+
+    # ----- imagen -----
+    def _mirrors(self):
+        if self.controller == "ssd1306":
+            # El driver inicializa con A1/C8 como orientación normal
+            return not self.seg_remap, not self.com_reverse
+        return self.seg_remap, self.com_reverse
+
+    def pixel(self, x, y, rotate=0):
+        """Píxel visible (x, y) tal como se ve en el panel
+
+        rotate=180: el panel está montado al revés (DISPLAY_ROTATE_180), se
+        devuelve lo que ve quien lo mira."""
+        if rotate == 180:
+            x = self.width - 1 - x
+            y = self.height - 1 - y
+        mirror_x, mirror_y = self._mirrors()
+        if mirror_x:
+            col = self.col_offset + self.width - 1 - x
+        else:
+            col = self.col_offset + x
+        row = self.height - 1 - y if mirror_y else y
+        bit = (self.ram[(row >> 3) * self.ram_width + col] >> (row & 7)) & 1
+        return bit ^ self.inverted
+
+    def image(self, rotate=0):
+        """Imagen visible en formato MONO_VLSB (comparable con el framebuffer)"""
+        out = bytearray(self.pages * self.width)
+        for y in range(self.height):
+            mask = 1 << (y & 7)
+            base = (y >> 3) * self.width
+            for x in range(self.width):
+                if self.pixel(x, y, rotate):
+                    out[base + x] |= mask
+        return out
+
+
+def to_pbm(image, width, height):
+    """Imagen VLSB -> PBM binario (P4), se abre con cualquier visor"""
+    row_bytes = (width + 7) // 8
+    out = bytearray(f"P4\n{width} {height}\n".encode())
+    for y in range(height):
+        mask = 1 << (y & 7)
+        base = (y >> 3) * width
+        row = bytearray(row_bytes)
+        for x in range(width):
+            if image[base + x] & mask:
+                row[x >> 3] |= 0x80 >> (x & 7)
+        out += row
+    return bytes(out)
+
+
+def from_pbm(data):
+    """PBM P4 -> (imagen VLSB, ancho, alto)"""
+    magic, size, pixels = data.split(b"\n", 2)
+    if magic != b"P4":
+        raise ValueError("solo PBM P4")
+    width, height = (int(v) for v in size.split())
+    row_bytes = (width + 7) // 8
+    image = bytearray((height // 8) * width)
+    for y in range(height):
+        for x in range(width):
+            if pixels[y * row_bytes + (x >> 3)] & (0x80 >> (x & 7)):
+                image[(y >> 3) * width + x] |= 1 << (y & 7)
+    return image, width, height
@@ -0,0 +1,112 @@
+# run.py - Corre un script del ESP32 en la PC con el arnés de simulación
+#
+# Ejemplos:
+#   python tools/sim/run.py esp32-websockets/bootv3_2.py --seconds 60
+#   python tools/sim/run.py esp32-websockets/bootv4.py --seconds 60 --set DISPLAY_TYPE='"SH1106"'
+#   python tools/sim/run.py esp32-websockets/bootv3_2.py --seconds 120 \
+#       --scenario tools/sim/scenarios/door_wifi.py --ws-url ws://127.0.0.1:8765/
+#   python tools/sim/run.py esp32-wifi-sensors-oled.py --seconds 30 --set SSID='"motog35"'
+#   python tools/sim/run.py esp32-websockets/boot_deepsleep.py --deepsleep --seconds 7200
+#
+# El tiempo es virtual: 10 minutos de loop corren en pocos segundos reales.
+# Al final se imprime un resumen y la última imagen de la OLED.
+
+import argparse
+import ast
+import os
+import runpy
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sim  # noqa: E402
+
+
+def find_screen(module):
+    oled = getattr(module, "oled", None)
+    if oled is None:
+        # bootv4.py: la OLED está en el paquete monitor/
+        oled = getattr(sys.modules.get("monitor.display"), "oled", None)
+    if oled is None:
+        return None
+    return getattr(oled, "driver", oled)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simula un script del ESP32 en la PC")
+    parser.add_argument("script")
+    parser.add_argument("--seconds", type=float, default=60,
+                        help="segundos virtuales a simular")
+    parser.add_argument("--scenario", action="append", default=[],
+                        help="archivo .py con setup(world, clock)")
+    parser.add_argument("--set", action="append", default=[], metavar="NOMBRE=VALOR",
+                        help="reemplazar una constante del script (literal Python)")
+    parser.add_argument("--ws-url", default=None,
+                        help="WEBSOCKET_URL a usar (por defecto uno local sin servidor)")
+    parser.add_argument("--entry", default="main", help="función a ejecutar")
+    parser.add_argument("--no-screen", action="store_true",
+                        help="no imprimir la imagen final de la OLED")
+    parser.add_argument("--deepsleep", action="store_true",
+                        help="tras machine.deepsleep() dormir y volver a correr el script")
+    parser.add_argument("--flash", default=None,
+                        help="carpeta que hace de flash del ESP32 (por defecto una temporal)")
+    args = parser.parse_args(argv)
+    script = os.path.abspath(args.script)
+    scenarios = [os.path.abspath(p) for p in args.scenario]
+    # Los archivos que escribe el script (caché WiFi, muestras...) van a la "flash"
+    flash = args.flash or tempfile.mkdtemp(prefix="sim-flash-")
+    os.makedirs(flash, exist_ok=True)
+    os.chdir(flash)
+
+    world, clock = sim.install(limit_ms=int(args.seconds * 1000))
+    for path in scenarios:
+        runpy.run_path(path)["setup"](world, clock)
+
+    overrides = {}
+    for item in args.set:
+        name, _, value = item.partition("=")
+        overrides[name] = ast.literal_eval(value)
+    # Nunca conectar al backend de producción desde una simulación
+    overrides["WEBSOCKET_URL"] = args.ws_url or "ws://127.0.0.1:9/"
+
+    real_start = time.perf_counter()
+    wakes = {}
+    while True:
+        module = sim.load(script, overrides=overrides)
+        entry = getattr(module, args.entry)
+        try:
+            entry()
+        except KeyboardInterrupt:
+            break
+        except SystemExit as e:
+            if not (args.deepsleep and str(e) == "machine.deepsleep"):
+                print(f"⏹ SystemExit: {e}")
+                break
+            try:
+                reason = sim.deep_sleep()
+            except KeyboardInterrupt:
+                break
+            wakes[reason] = wakes.get(reason, 0) + 1
+            print(f"\n⏰ [{clock.now_ms() / 1000:.1f}s] despertar "
+                  f"{'por pin' if reason == 2 else 'por timer'}")
+        else:
+            break
+    real_s = time.perf_counter() - real_start
+
+    print("\n" + "=" * 50)
+    print(f"Simulación: {clock.now_ms() / 1000:.1f}s virtuales en {real_s:.2f}s reales")
+    if wakes:
+        print(f"Despertares: {sum(wakes.values())} (pin: {wakes.get(2, 0)})")
+    for i, bus in enumerate(sim.i2c_buses()):
+        print(f"I2C[{i}] @ {bus.freq // 1000}kHz: {bus.transactions} transacciones, "
+              f"{bus.bytes} bytes, {bus.bus_us / 1000:.1f}ms de bus")
+    screen = find_screen(module)
+    if screen is not None and not args.no_screen:
+        print(sim.framebuffer_ascii(screen))
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# Escenario: puerta abierta un rato, DHT22 que falla y corte de WiFi
+#   python tools/sim/run.py esp32-websockets/bootv3_2.py --seconds 90 \
+#       --scenario tools/sim/scenarios/door_wifi.py
+
+
+def setup(world, clock):
+    world.at(10000, lambda w: w.set_door(False))
+    world.at(25000, lambda w: w.set_door(True))
+    world.at(30000, lambda w: setattr(w, "dht_ok", False))
+    world.at(36000, lambda w: setattr(w, "dht_ok", True))
+
+    saved = dict(world.aps["motog35"])
+    world.at(40000, lambda w: w.drop_ap("motog35"))
+    world.at(55000, lambda w: w.set_ap("motog35", **saved))
+
+    # Temperatura exterior bajando de a poco
+    for i in range(1, 9):
+        world.at(i * 10000, lambda w, i=i: w.ds_sensors.update(
+            {rom: 4.5 - 0.3 * i for rom in w.ds_sensors}))
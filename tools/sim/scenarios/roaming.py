@@ -0,0 +1,14 @@
+# Escenario: dos redes; la principal se degrada y después vuelve
+#   python tools/sim/run.py esp32-websockets/bootv3_2.py --seconds 240 \
+#       --scenario tools/sim/scenarios/roaming.py \
+#       --set 'WIFI_NETWORKS=[("motog35", "12345678"), ("MACHETE", "clave")]' \
+#       --set WIFI_SCAN_INTERVAL_MS=60000
+
+
+def setup(world, clock):
+    world.set_ap("MACHETE", password="clave", rssi=-64,
+                 bssid=bytes.fromhex("aabbccddee02"), channel=11)
+    # La principal se aleja: RSSI bajo sostenido -> roaming a MACHETE
+    world.at(20000, lambda w: w.set_ap("motog35", rssi=-86))
+    # Vuelve con buena señal: en el próximo escaneo se regresa a la principal
+    world.at(120000, lambda w: w.set_ap("motog35", rssi=-55))
@@ -0,0 +1,210 @@
+# storm.py - Tormenta de reconexiones: muchos equipos contra un backend que reinicia
+#
+# Todos los equipos pierden el WebSocket a la vez (t=0: el backend reinicia)
+# y el servidor vuelve a los --down segundos. Cada intento tarda --connect-ms
+# (TCP + TLS); el servidor atiende como mucho --capacity conexiones por
+# segundo y los intentos que sobran fallan (sobrecarga). Se comparan:
+#   escalera  la política anterior de bootv3_2.py: 5s, 30s tras 3 fallos,
+#             60s tras 5, y 500ms más recreando el WebSocket
+#   backoff   esp32-websockets/backoff.py (el mismo archivo que va al ESP32)
+# y se imprimen los intentos por segundo que recibe el servidor, el pico y
+# cuánto tardan todos en reconectar.
+#
+# Ejemplos:
+#   python tools/sim/storm.py
+#   python tools/sim/storm.py --devices 500 --capacity 50 --down 120
+#   python tools/sim/storm.py --policy backoff --base-ms 1000 --json
+#
+# Usa el reloj virtual de tools/sim: 15 minutos de tormenta corren en
+# menos de un segundo y con --seed el resultado es repetible.
+
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sim  # noqa: E402
+
+BACKOFF_PY = os.path.join(sim.DEVICE_DIR, "backoff.py")
+DETECT_MS = 500    # Los equipos notan la caída dentro de WS_CHECK_INTERVAL_MS
+REFUSED_MS = 50    # Servidor caído: el connect() falla enseguida
+
+
+class Ladder:
+    """Política anterior de bootv3_2.py (misma interfaz que Backoff)"""
+
+    def __init__(self):
+        self.attempts = 0
+
+    def allow(self, now=None):
+        return True
+
+    def success(self):
+        self.attempts = 0
+
+    def failure(self):
+        self.attempts += 1
+        if self.attempts >= 5:
+            return 60000 + 500
+        if self.attempts >= 3:
+            return 30000 + 500
+        return 5000
+
+
+class Server:
+    def __init__(self, down_ms, capacity, connect_ms):
+        self.down_ms = down_ms
+        self.capacity = capacity
+        self.connect_ms = connect_ms
+        self.load = {}      # segundo -> conexiones aceptadas
+        self.attempts = {}  # segundo -> intentos recibidos
+
+    def attempt(self, now):
+        """Retorna (ok, ms hasta saber el resultado)"""
+        second = now // 1000
+        self.attempts[second] = self.attempts.get(second, 0) + 1
+        if now < self.down_ms:
+            return False, REFUSED_MS
+        if self.load.get(second, 0) >= self.capacity:
+            return False, self.connect_ms  # Sobrecarga: timeout del handshake
+        self.load[second] = self.load.get(second, 0) + 1
+        return True, self.connect_ms
+
+
+def storm(make_policy, args, clock):
+    server = Server(args.down * 1000, args.capacity, args.connect_ms)
+    start = clock.now_ms()
+    events = []  # (ms, equipo, "try" | "ok" | "fail")
+    policies = []
+    for i in range(args.devices):
+        policies.append(make_policy())
+        heapq.heappush(events, (random.randint(0, DETECT_MS), i, "try"))
+
+    connected_at = {}
+    fails = 0
+    opens = 0
+    while events and len(connected_at) < args.devices:
+        at, dev, kind = heapq.heappop(events)
+        if at > args.seconds * 1000:
+            break
+        now = clock.now_ms() - start
+        if at > now:
+            clock.sleep_us((at - now) * 1000)
+        policy = policies[dev]
+        if kind == "try":
+            if not policy.allow():
+                heapq.heappush(events, (at + max(policy.remaining(), 1), dev, "try"))
+                continue
+            ok, ms = server.attempt(at)
+            heapq.heappush(events, (at + ms, dev, "ok" if ok else "fail"))
+        elif kind == "ok":
+            policy.success()
+            connected_at[dev] = at
+        else:
+            fails += 1
+            was_open = getattr(policy, "state", None) == "abierto"
+            delay = policy.failure()
+            if not was_open and getattr(policy, "state", None) == "abierto":
+                opens += 1
+            heapq.heappush(events, (at + delay, dev, "try"))
+
+    times = sorted(connected_at.values())
+    attempts = server.attempts
+    up = args.down
+    after = [n for s, n in attempts.items() if s >= up]
+
+    def pct(p):
+        if not times:
+            return None
+        return round(times[min(len(times) - 1, int(p * len(times)))] / 1000, 1)
+
+    return {
+        "connected": len(times),
+        "attempts": sum(attempts.values()),
+        "failed": fails,
+        "breakerOpens": opens,
+        "peakPerS": max(attempts.values()) if attempts else 0,
+        "peakAfterUpPerS": max(after) if after else 0,
+        "p50s": pct(0.5),
+        "p90s": pct(0.9),
+        "allS": round(times[-1] / 1000, 1) if len(times) == args.devices else None,
+        "perSecond": attempts,
+    }
+
+
+def histogram(per_second, bucket_s, width=50, until_s=None):
+    buckets = {}
+    for second, count in per_second.items():
+        buckets[second // bucket_s] = buckets.get(second // bucket_s, 0) + count
+    if not buckets:
+        return []
+    last = max(buckets) if until_s is None else until_s // bucket_s
+    peak = max(buckets.values())
+    lines = []
+    for b in range(0, last + 1):
+        count = buckets.get(b, 0)
+        bar = "█" * max(1 if count else 0, count * width // peak)
+        lines.append(f"  {b * bucket_s:5d}s {bar} {count if count else ''}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tormenta de reconexiones WebSocket")
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--down", type=int, default=30, help="segundos que el backend está caído")
+    parser.add_argument("--capacity", type=int, default=20, help="conexiones por segundo que atiende")
+    parser.add_argument("--connect-ms", type=int, default=1500, help="duración de un intento")
+    parser.add_argument("--seconds", type=int, default=900, help="tiempo máximo simulado")
+    parser.add_argument("--policy", action="append", choices=("escalera", "backoff"),
+                        help="política a simular (por defecto las dos)")
+    parser.add_argument("--base-ms", type=int, default=2000)
+    parser.add_argument("--cap-ms", type=int, default=60000)
+    parser.add_argument("--breaker-after", type=int, default=8)
+    parser.add_argument("--breaker-ms", type=int, default=300000)
+    parser.add_argument("--bucket", type=int, default=5, help="segundos por barra del histograma")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="salida JSON")
+    args = parser.parse_args(argv)
+
+    _, clock = sim.install()
+    backoff = sim.load(BACKOFF_PY, name="storm_backoff")
+    makers = {
+        "escalera": Ladder,
+        "backoff": lambda: backoff.Backoff(base_ms=args.base_ms, cap_ms=args.cap_ms,
+                                           breaker_after=args.breaker_after,
+                                           breaker_ms=args.breaker_ms),
+    }
+
+    results = {}
+    for name in args.policy or ("escalera", "backoff"):
+        random.seed(args.seed)
+        results[name] = storm(makers[name], args, clock)
+
+    if args.json:
+        for r in results.values():
+            r["perSecond"] = {str(k): v for k, v in sorted(r["perSecond"].items())}
+        print(json.dumps({"args": vars(args), "results": results}, indent=2))
+        return
+
+    print(f"🌩  {args.devices} equipos, backend caído {args.down}s, "
+          f"capacidad {args.capacity} conexiones/s, intento {args.connect_ms}ms")
+    until = max(max(r["perSecond"], default=0) for r in results.values())
+    for name, r in results.items():
+        print(f"\n== {name} ==")
+        print(f"   Intentos {r['attempts']} ({r['failed']} fallidos), pico {r['peakPerS']}/s "
+              f"({r['peakAfterUpPerS']}/s con el backend arriba)")
+        if r.get("breakerOpens"):
+            print(f"   Circuit breaker abierto {r['breakerOpens']} veces")
+        print(f"   Reconectados {r['connected']}/{args.devices}: p50 {r['p50s']}s, p90 {r['p90s']}s, "
+              f"todos {r['allS'] if r['allS'] is not None else '-'}s")
+        print(f"   Intentos por {args.bucket}s:")
+        for line in histogram(r["perSecond"], args.bucket, until_s=until):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# Falso `dht` para el arnés de simulación: lee del mundo simulado (sim.world)
+import sim
+
+
+class DHT22:
+    def __init__(self, pin):
+        self.pin = pin
+        self._t = None
+        self._h = None
+
+    def measure(self):
+        world = sim.world
+        if not world.dht_ok:
+            raise OSError(116)  # ETIMEDOUT, como el driver real
+        self._t = round(world.dht_temp, 1)
+        self._h = round(world.dht_humidity, 1)
+
+    def temperature(self):
+        return self._t
+
+    def humidity(self):
+        return self._h
+
+
+class DHT11(DHT22):
+    pass
@@ -0,0 +1,20 @@
+# Falso `ds18x20` para el arnés de simulación: sensores en sim.world.ds_sensors
+import sim
+
+
+class DS18X20:
+    def __init__(self, onewire):
+        self.ow = onewire
+
+    def scan(self):
+        return [bytearray(rom) for rom in sim.world.ds_sensors]
+
+    def convert_temp(self):
+        pass
+
+    def read_temp(self, rom):
+        temp = sim.world.ds_sensors.get(bytes(rom))
+        if temp is None:
+            from onewire import OneWireError
+            raise OneWireError("CRC error")
+        return temp
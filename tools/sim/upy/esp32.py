@@ -0,0 +1,23 @@
+# Falso `esp32` para el arnés de simulación (tools/sim)
+#
+# wake_on_ext0() arma el despertar de machine.lightsleep() por un pin
+# (ver machine.lightsleep()).
+
+WAKEUP_ALL_LOW = False
+WAKEUP_ANY_HIGH = True
+
+# (pin, nivel) que despierta del lightsleep, o None
+ext0 = None
+
+
+def wake_on_ext0(pin, level):
+    global ext0
+    ext0 = None if pin is None else (pin, level)
+
+
+def wake_on_ext1(pins, level):
+    pass
+
+
+def wake_on_touch(wake):
+    pass
@@ -0,0 +1,143 @@
+# Falso `framebuf` en Python puro para el arnés de simulación (tools/sim)
+#
+# Soporta los formatos monocromo que usan los drivers (MONO_VLSB, MONO_HLSB,
+# MONO_HMSB). text() dibuja los glifos 5x7 de font_5x7.py dentro de la celda
+# de 8x8: NO es la fuente petme128 del firmware, pero ocupa lo mismo y es
+# determinista, suficiente para comparar imágenes entre versiones.
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+MVLSB = MONO_VLSB
+
+_font = None
+
+
+def _glyph(char):
+    global _font
+    if _font is None:
+        import font_5x7
+        _font = font_5x7
+    code = ord(char)
+    if code == 0xB0:
+        code = _font.LAST
+    elif code < _font.FIRST or code > _font.LAST:
+        code = 32
+    i = code - _font.FIRST
+    off = _font.INDEX[2 * i] | (_font.INDEX[2 * i + 1] << 8)
+    return _font.GLYPHS[off:off + _font.WIDTHS[i]]
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        self._buf = buffer
+        self._w = width
+        self._h = height
+        self._fmt = format
+        self._stride = width if stride is None else stride
+
+    def _addr(self, x, y):
+        if self._fmt == MONO_VLSB:
+            return (y >> 3) * self._stride + x, y & 7
+        if self._fmt == MONO_HLSB:
+            return (y * self._stride + x) >> 3, 7 - (x & 7)
+        return (y * self._stride + x) >> 3, x & 7  # MONO_HMSB
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self._w and 0 <= y < self._h):
+            return None if c is not None else 0
+        i, bit = self._addr(x, y)
+        if c is None:
+            return (self._buf[i] >> bit) & 1
+        if c:
+            self._buf[i] |= 1 << bit
+        else:
+            self._buf[i] &= ~(1 << bit) & 0xFF
+
+    def fill(self, c):
+        v = 0xFF if c else 0
+        buf = self._buf
+        for i in range(len(buf)):
+            buf[i] = v
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = min(self._w, x + w)
+        y1 = min(self._h, y + h)
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self.pixel(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.hline(x, y, w, c)
+        self.hline(x, y + h - 1, w, c)
+        self.vline(x, y, h, c)
+        self.vline(x + w - 1, y, h, c)
+
+    def line(self, x0, y0, x1, y1, c):
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x0, y0, c)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0xF):
+        for yy in range(-yr, yr + 1):
+            for xx in range(-xr, xr + 1):
+                if xr and yr and (xx * xx * yr * yr + yy * yy * xr * xr) <= xr * xr * yr * yr:
+                    edge = f or (xx * xx * yr * yr + yy * yy * xr * xr) > (xr - 1) * (xr - 1) * yr * yr
+                    if edge:
+                        self.pixel(x + xx, y + yy, c)
+
+    def text(self, s, x, y, c=1):
+        for char in str(s):
+            cols = _glyph(char)
+            for col, bits in enumerate(cols):
+                for row in range(7):
+                    if bits & (1 << row):
+                        self.pixel(x + 1 + col, y + row, c)
+            x += 8
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        for yy in range(fbuf._h):
+            for xx in range(fbuf._w):
+                v = fbuf.pixel(xx, yy)
+                if palette is not None:
+                    v = palette.pixel(v, 0)
+                if v != key:
+                    self.pixel(x + xx, y + yy, v)
+
+    def scroll(self, xstep, ystep):
+        w, h = self._w, self._h
+        snapshot = [[self.pixel(x, y) for x in range(w)] for y in range(h)]
+        for y in range(h):
+            for x in range(w):
+                sx = x - xstep
+                sy = y - ystep
+                if 0 <= sx < w and 0 <= sy < h:
+                    self.pixel(x, y, snapshot[sy][sx])
+
+
+def FrameBuffer1(buffer, width, height, stride=None):
+    return FrameBuffer(buffer, width, height, MONO_VLSB, stride)
@@ -0,0 +1,238 @@
+# Falso `machine` para el arnés de simulación (tools/sim)
+#
+# Pin lee/escribe sim.world.pins; SoftI2C/I2C registran cada transacción
+# (bytes y tiempo de bus estimado) para los benchmarks de pantalla.
+import os
+
+import sim
+
+I2C_BUSES = []
+
+PWRON_RESET = 1
+HARD_RESET = 2
+WDT_RESET = 3
+DEEPSLEEP_RESET = 4
+SOFT_RESET = 5
+
+PIN_WAKE = 2
+RTC_WAKE = 3
+TIMER_WAKE = 4
+
+_freq = 160000000
+_reset_cause = PWRON_RESET
+_wake_reason = 0
+deepsleep_ms = None  # Lo que pidió el último machine.deepsleep() (ver sim.deep_sleep())
+
+
+class Pin:
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 2
+    PULL_DOWN = 1
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+    WAKE_LOW = 4
+    WAKE_HIGH = 5
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self.pull = pull
+        if value is not None:
+            self.value(value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        self.mode = mode
+        if value is not None:
+            self.value(value)
+
+    def value(self, v=None):
+        if v is None:
+            return sim.world.pins.get(self.id, 0)
+        sim.world.pins[self.id] = 1 if v else 0
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=IRQ_RISING | IRQ_FALLING, wake=None):
+        if handler is None:
+            sim.world.pin_irqs.pop(self.id, None)
+        else:
+            sim.world.pin_irqs[self.id] = (handler, trigger, self)
+
+    def __repr__(self):
+        return f"Pin({self.id})"
+
+
+class SoftI2C:
+    """Bus I2C que registra transacciones (no hay dispositivos reales)
+
+    bus_us estima el tiempo de bus: 9 bits por byte (8 + ACK) más START,
+    byte de dirección y STOP por transacción, a la frecuencia `freq`.
+    bus_bits es lo mismo en bits, para recalcularlo a otra frecuencia.
+    """
+
+    def __init__(self, scl=None, sda=None, freq=400000, timeout=50000, id=None):
+        self.scl = scl
+        self.sda = sda
+        self.freq = freq
+        self.transactions = 0
+        self.bytes = 0
+        self.bus_us = 0.0
+        self.bus_bits = 0
+        self.record = None  # Lista de (addr, bytes) si se activa con start_recording()
+        I2C_BUSES.append(self)
+
+    def start_recording(self):
+        self.record = []
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.bus_us = 0.0
+        self.bus_bits = 0
+        if self.record is not None:
+            self.record = []
+
+    def _account(self, addr, data):
+        if addr not in sim.world.i2c_devices:
+            raise OSError(19)  # ENODEV, como sin pantalla conectada
+        n = len(data)
+        self.transactions += 1
+        self.bytes += n
+        # START + dirección(9 bits) + datos(9 bits c/u) + STOP
+        bits = 2 + 9 * (n + 1)
+        self.bus_bits += bits
+        self.bus_us += bits * 1000000 / self.freq
+        if self.record is not None:
+            self.record.append((addr, bytes(data)))
+
+    def scan(self):
+        return sorted(sim.world.i2c_devices)
+
+    def writeto(self, addr, buf, stop=True):
+        self._account(addr, buf)
+        return len(buf)
+
+    def writevto(self, addr, vector, stop=True):
+        data = b"".join(bytes(b) for b in vector)
+        self._account(addr, data)
+        return len(data)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        self._account(addr, b"\x00" * nbytes)
+        return bytes(nbytes)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        self._account(addr, bytes(len(buf)))
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        self._account(addr, bytes([memaddr]) + bytes(buf))
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        self._account(addr, bytes([memaddr]))
+        return bytes(nbytes)
+
+
+class I2C(SoftI2C):
+    def __init__(self, id=0, scl=None, sda=None, freq=400000, timeout=50000):
+        super().__init__(scl=scl, sda=sda, freq=freq, timeout=timeout, id=id)
+
+
+class RTC:
+    _memory = b""
+
+    def __init__(self, id=0):
+        pass
+
+    def datetime(self, dt=None):
+        import time
+        clock = sim.clock
+        if dt is None:
+            t = time.gmtime()
+            return (t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0)
+        secs = time.mktime((dt[0], dt[1], dt[2], dt[4], dt[5], dt[6], 0, 0))
+        clock.rtc_offset = secs - clock.epoch - clock.us // 1000000
+
+    def memory(self, data=None):
+        if data is None:
+            return RTC._memory
+        if len(data) > 2048:
+            raise ValueError("RTC memory: máximo 2048 bytes")
+        RTC._memory = bytes(data)
+
+
+def freq(hz=None):
+    global _freq
+    if hz is None:
+        return _freq
+    _freq = hz
+
+
+def unique_id():
+    return b"\x24\x6f\x28\x00\x00\x01"
+
+
+def reset_cause():
+    return _reset_cause
+
+
+def reset():
+    print("🔁 machine.reset() (simulado)")
+    raise SystemExit("machine.reset")
+
+
+def soft_reset():
+    reset()
+
+
+def idle():
+    sim.clock.sleep_us(1000)
+
+
+def lightsleep(ms=None):
+    """Duerme `ms`; termina antes si cambia el pin armado con esp32.wake_on_ext0()"""
+    import esp32
+    if esp32.ext0 is None:
+        sim.clock.sleep_us((ms or 0) * 1000)
+        return
+    pin, level = esp32.ext0
+    left = ms or 0
+    while left > 0 and bool(pin.value()) != bool(level):
+        step = min(left, 10)
+        sim.clock.sleep_us(step * 1000)
+        left -= step
+
+
+def wake_reason():
+    return _wake_reason
+
+
+def deepsleep(ms=None):
+    global deepsleep_ms
+    print(f"💤 machine.deepsleep({ms}) (simulado)")
+    deepsleep_ms = ms
+    raise SystemExit("machine.deepsleep")
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
+
+
+def bootloader():
+    reset()
+
+
+def rng():
+    return int.from_bytes(os.urandom(4), "little") & 0xFFFFFF
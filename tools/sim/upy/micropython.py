@@ -0,0 +1,37 @@
+# Falso `micropython` para el arnés de simulación (tools/sim)
+
+
+def const(value):
+    return value
+
+
+def native(fn):
+    return fn
+
+
+def viper(fn):
+    return fn
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def opt_level(level=None):
+    return 0
+
+
+def schedule(fn, arg):
+    fn(arg)
+
+
+def mem_info(verbose=False):
+    print("mem: (simulado)")
+
+
+def heap_lock():
+    return 0
+
+
+def heap_unlock():
+    return 0
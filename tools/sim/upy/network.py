@@ -0,0 +1,158 @@
+# Falso `network` para el arnés de simulación: APs en sim.world.aps
+#
+# El tiempo de conexión se modela como escaneo de canales (se salta si se
+# pasa bssid=) + asociación + DHCP (se salta con IP estática vía ifconfig()).
+import sim
+
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 1000
+STAT_CONNECTING = 1001
+STAT_GOT_IP = 1010
+STAT_NO_AP_FOUND = 201
+STAT_WRONG_PASSWORD = 202
+STAT_BEACON_TIMEOUT = 200
+STAT_ASSOC_FAIL = 203
+STAT_HANDSHAKE_TIMEOUT = 204
+
+AUTH_OPEN = 0
+AUTH_WPA2_PSK = 3
+
+_instances = {}
+
+
+def _connected():
+    sta = _instances.get(STA_IF)
+    return bool(sta and sta.isconnected())
+
+
+class WLAN:
+    PM_NONE = 0
+    PM_PERFORMANCE = 1
+    PM_POWERSAVE = 2
+
+    def __new__(cls, interface=STA_IF):
+        inst = _instances.get(interface)
+        if inst is None:
+            inst = super().__new__(cls)
+            inst._init(interface)
+            _instances[interface] = inst
+        return inst
+
+    def _init(self, interface):
+        self.interface = interface
+        self._active = False
+        self._ssid = None
+        self._key = None
+        self._bssid = None
+        self._ready_us = None
+        self._static = None
+        self._pm = WLAN.PM_PERFORMANCE
+        self._dhcp_ip = "192.168.43.%d" % (100 + interface)
+        self.connects = 0
+
+    # ----- estado -----
+    def _ap(self):
+        if not self._active or self._ssid is None:
+            return None
+        ap = sim.world.aps.get(self._ssid)
+        if ap is None or ap.get("password", "") != (self._key or ""):
+            return None
+        if self._bssid is not None and bytes(self._bssid) != ap["bssid"]:
+            return None
+        return ap
+
+    def active(self, value=None):
+        if value is None:
+            return self._active
+        self._active = bool(value)
+        if not self._active:
+            self._ssid = None
+
+    def connect(self, ssid=None, key=None, *, bssid=None):
+        if not self._active:
+            raise OSError("Wifi Not Started")
+        world = sim.world
+        self._ssid = ssid
+        self._key = key
+        self._bssid = bssid
+        self.connects += 1
+        delay = world.wifi_assoc_ms
+        if bssid is None:
+            delay += world.wifi_connect_scan_ms
+        if self._static is None:
+            delay += world.wifi_dhcp_ms
+        self._ready_us = sim.clock.us + delay * 1000
+
+    def disconnect(self):
+        self._ssid = None
+        self._ready_us = None
+
+    def isconnected(self):
+        return (self._ap() is not None and self._ready_us is not None
+                and sim.clock.us >= self._ready_us)
+
+    def status(self, param=None):
+        if param == "rssi":
+            if not self.isconnected():
+                raise OSError("STA is not connected")
+            return self._ap()["rssi"]
+        if param is not None:
+            raise ValueError("unknown status param")
+        if self._ssid is None:
+            return STAT_IDLE
+        if self.isconnected():
+            return STAT_GOT_IP
+        ap = sim.world.aps.get(self._ssid)
+        if ap is None or (self._bssid is not None and bytes(self._bssid) != ap["bssid"]):
+            return STAT_NO_AP_FOUND
+        if ap.get("password", "") != (self._key or ""):
+            return STAT_WRONG_PASSWORD
+        return STAT_CONNECTING
+
+    def ifconfig(self, cfg=None):
+        if cfg is not None:
+            self._static = tuple(cfg)
+            return None
+        if not self.isconnected():
+            return ("0.0.0.0", "0.0.0.0", "0.0.0.0", "0.0.0.0")
+        if self._static is not None:
+            return self._static
+        return (self._dhcp_ip, "255.255.255.0", "192.168.43.1", "192.168.43.1")
+
+    def ipconfig(self, *args, **kwargs):
+        if kwargs.get("dhcp4"):
+            self._static = None
+
+    def scan(self):
+        if not self._active:
+            raise OSError("Wifi Not Started")
+        sim.clock.sleep_us(sim.world.wifi_scan_ms * 1000)
+        result = []
+        for ssid, ap in sim.world.aps.items():
+            auth = AUTH_WPA2_PSK if ap.get("password") else AUTH_OPEN
+            result.append((ssid.encode(), ap["bssid"], ap["channel"], ap["rssi"], auth, False))
+        return result
+
+    def config(self, *args, **kwargs):
+        if args:
+            key = args[0]
+            if key == "mac":
+                return b"\x24\x6f\x28\x00\x00\x01"
+            if key in ("ssid", "essid"):
+                return self._ssid or ""
+            if key == "pm":
+                return self._pm
+            if key == "channel":
+                ap = self._ap()
+                return ap["channel"] if ap else 0
+            if key == "txpower":
+                return 20
+            raise ValueError("unknown config param")
+        if "pm" in kwargs:
+            self._pm = kwargs["pm"]
+
+
+def hostname(name=None):
+    return "esp32-sim" if name is None else None
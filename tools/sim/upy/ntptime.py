@@ -0,0 +1,21 @@
+# Falso `ntptime` para el arnés de simulación: ajusta el reloj virtual
+#
+# La hora "del servidor" es la de la PC al instalar el arnés (sim.host_epoch)
+# más lo que avanzó el reloj virtual. No sirve `import time` acá: este módulo
+# se importa con el `time` simulado, que antes de NTP está en 2000-01-01.
+import sim
+
+host = "pool.ntp.org"
+timeout = 1
+
+
+def time():
+    import network
+    if not sim.world.ntp_ok or not network._connected():
+        raise OSError(110)  # ETIMEDOUT
+    return sim.host_epoch + sim.clock.us // 1000000
+
+
+def settime():
+    clock = sim.clock
+    clock.rtc_offset = time() - clock.epoch - clock.us // 1000000
@@ -0,0 +1,13 @@
+# Falso `onewire` para el arnés de simulación (tools/sim)
+
+
+class OneWireError(Exception):
+    pass
+
+
+class OneWire:
+    def __init__(self, pin):
+        self.pin = pin
+
+    def reset(self, required=False):
+        return True